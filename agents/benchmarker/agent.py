@@ -1,14 +1,20 @@
 """벤치마킹 에이전트 - YouTube 채널 분석 및 복제 가이드 생성"""
 
 import sys
+import asyncio
 import json
 import re
 import base64
+import time
+from contextvars import ContextVar
+from dataclasses import asdict
+from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 sys.path.append("/app")
 
 from agents.base import BaseAgent, AgentResult, AgentStatus
+from agents.config import agent_settings
 from apps.api.services.llm import llm_service
 from apps.api.services.vision import vision_service
 
@@ -23,6 +29,7 @@ from .schemas import (
     BenchmarkReport,
 )
 from .youtube_service import youtube_service
+from .collection import CollectionProgress
 from .prompts import (
     REPLICATION_CHANNEL_SETUP_PROMPT,
     REPLICATION_CONTENT_PLANNING_PROMPT,
@@ -40,10 +47,35 @@ from .prompts import (
     INDIVIDUAL_THUMBNAIL_ANALYSIS_PROMPT,
 )
 from .screenshot_service import screenshot_service, ChannelScreenshot
-from .cache_service import find_benchmark, save_benchmark, get_cache_summary, delete_benchmark
+from .cache_service import find_benchmark, save_benchmark, get_cache_summary, delete_benchmark, get_cache_key
+from .channel_artifacts import channel_artifacts
+from .report_dag import ReportDAG, ReportStage, StageCache, StageOutcome
+
+# 복제 가이드 섹션 (리포트 표시 순서)
+REPLICATION_SECTIONS = (
+    "channel_setup",
+    "content_planning",
+    "thumbnail_guide",
+    "script_template",
+    "engagement_strategy",
+    "first_10_videos",
+)
+
+report_stage_cache = StageCache(
+    Path(agent_settings.report_stage_cache_dir),
+    agent_settings.report_stage_cache_ttl_hours * 3600,
+)
+
+# 백그라운드 갱신 태스크에서는 진행 상황을 사용자 화면에 보내지 않음
+_progress_muted: ContextVar[bool] = ContextVar("benchmark_progress_muted", default=False)
+
+# 채널 조합(cache_key)별 진행 중인 백그라운드 갱신
+_refresh_tasks: Dict[str, asyncio.Task] = {}
 
 def emit_progress(status: str, detail: str = ""):
     """진행 상황 발생"""
+    if _progress_muted.get():
+        return
     try:
         import builtins
         if hasattr(builtins, "emit_agent_progress"):
@@ -71,6 +103,7 @@ class BenchmarkerAgent(BaseAgent):
         self.cached_report: Optional[Dict[str, Any]] = None
         self.use_cached: bool = False
         self.cached_report_shown: bool = False  # 캐시 리포트를 보여줬는지 여부
+        self.force_refresh: bool = False  # 사용자가 직접 다시 분석 요청 - 저장된 분석 결과를 쓰지 않음
 
     async def execute(self, input_data: Dict[str, Any]) -> AgentResult:
         """에이전트 실행 시작 - 초기 질문"""
@@ -162,7 +195,15 @@ class BenchmarkerAgent(BaseAgent):
             # 캐시된 벤치마크 확인
             emit_progress("캐시 확인 중", url[:50])
             cached = find_benchmark(url)
-            
+
+            # TTL이 지난 결과: swr 모드면 바로 보여주고 백그라운드에서 갱신, 아니면 새로 분석
+            if cached and not cached["fresh"]:
+                if agent_settings.benchmark_cache_mode == "swr":
+                    schedule_benchmark_refresh(cached["channel_urls"])
+                    cached["refreshing"] = True
+                else:
+                    cached = None
+
             if cached:
                 self.cached_report = cached
                 self.pending_url = url
@@ -180,6 +221,8 @@ class BenchmarkerAgent(BaseAgent):
                     data={
                         "phase": "cached",
                         "cached": True,
+                        "fresh": cached["fresh"],
+                        "refreshing": cached.get("refreshing", False),
                         "report": cached.get("report", {})
                     }
                 )
@@ -259,12 +302,18 @@ class BenchmarkerAgent(BaseAgent):
         # 다시 분석 요청 (캐시된 결과가 있을 때)
         reanalyze_keywords = ["다시 분석", "다시분석", "재분석", "업데이트", "새로 분석", "update", "refresh"]
         if self.use_cached and any(kw in feedback_lower for kw in reanalyze_keywords):
-            # 캐시 삭제
-            if self.pending_url:
-                delete_benchmark(self.pending_url)
+            # 캐시 삭제 (직접 다시 분석하므로 백그라운드 갱신은 취소)
+            # 조합 리포트의 다른 채널도 수집/비전 산출물을 지워야 새로 수집됨
+            stale_urls = [self.pending_url] if self.pending_url else []
+            if self.cached_report:
+                cancel_benchmark_refresh(self.cached_report["channel_urls"])
+                stale_urls += self.cached_report["channel_urls"]
+            for url in dict.fromkeys(stale_urls):
+                delete_benchmark(url)
             
             # 상태 초기화
             self.use_cached = False
+            self.force_refresh = True
             self.cached_report = None
             url = self.pending_url
             self.pending_url = None
@@ -474,7 +523,7 @@ class BenchmarkerAgent(BaseAgent):
         try:
             await self._analyze_channels()
             self.phase = BenchmarkPhase.REPORT
-            return await self._generate_report()
+            return await self._generate_report(refresh=self.force_refresh)
         except Exception as e:
             self.status = AgentStatus.ERROR
             return AgentResult(
@@ -486,16 +535,42 @@ class BenchmarkerAgent(BaseAgent):
             )
 
     async def _analyze_channels(self):
-        """채널들 분석"""
-        for idx, url in enumerate(self.channel_urls, 1):
-            emit_progress(f"채널 분석 중 ({idx}/{len(self.channel_urls)})", url[:50])
-            channel_data = await self._analyze_single_channel(url)
-            if channel_data:
-                self.channels_data.append(channel_data)
-
-    async def _analyze_single_channel(self, url: str) -> Optional[Dict[str, Any]]:
-        """단일 채널 분석"""
-        emit_progress("채널 정보 수집", "메타데이터 가져오는 중...")
+        """채널들 분석 (채널 간, 채널 내 수집 작업 모두 동시 실행)
+
+        yt-dlp 동시 실행 수와 호스트별 요청 간격은 youtube_service.gate가 전역으로 제한한다.
+        """
+        emit_progress("채널 분석 중", f"{len(self.channel_urls)}개 채널 동시 수집")
+        progress = CollectionProgress(emit_progress)
+
+        results = await asyncio.gather(*[
+            self._analyze_single_channel(url, progress) for url in self.channel_urls
+        ], return_exceptions=True)
+
+        errors = []
+        for url, result in zip(self.channel_urls, results):
+            if isinstance(result, Exception):
+                print(f"Channel collection failed ({url}): {result}")
+                errors.append(result)
+                continue
+            if result:
+                self.channels_data.append(result)
+
+        # 모든 채널이 실패한 경우에만 분석 오류로 처리
+        if errors and not self.channels_data:
+            raise errors[0]
+
+    async def _analyze_single_channel(
+        self,
+        url: str,
+        progress: Optional[CollectionProgress] = None
+    ) -> Optional[Dict[str, Any]]:
+        """단일 채널 분석 - 다른 채널 조합 분석에서 수집한 데이터가 있으면 재사용"""
+        progress = progress or CollectionProgress(emit_progress)
+        cached = channel_artifacts.load_collection(url)
+        if cached:
+            emit_progress("수집 데이터 재사용", url[:50])
+            return cached
+
         data = {
             "url": url,
             "channel_info": None,
@@ -504,14 +579,18 @@ class BenchmarkerAgent(BaseAgent):
             "thumbnail_urls": [],
         }
 
-        # 채널 정보 가져오기
+        # 채널 정보 + 영상 목록 (yt-dlp 2회 동시 실행)
         if youtube_service.is_channel_url(url):
-            data["channel_info"] = await youtube_service.get_channel_info(url)
-            videos = await youtube_service.get_channel_videos(url, self.MAX_VIDEOS_PER_CHANNEL)
-            data["videos"] = videos
+            data["channel_info"], data["videos"] = await progress.track(
+                f"채널 정보: {url[:50]}",
+                youtube_service.get_channel_overview(url, self.MAX_VIDEOS_PER_CHANNEL)
+            )
         elif youtube_service.is_video_url(url):
             # 단일 영상 URL인 경우
-            video_info = await youtube_service.get_video_info(url)
+            video_info = await progress.track(
+                f"영상 정보: {url[:50]}",
+                youtube_service.get_video_info(url)
+            )
             if video_info:
                 data["videos"] = [video_info]
 
@@ -521,10 +600,16 @@ class BenchmarkerAgent(BaseAgent):
             self.MAX_THUMBNAILS_FOR_ANALYSIS
         )
 
-        # 자막 수집 (상위 영상들)
-        for video in data["videos"][:self.MAX_TRANSCRIPTS]:
-            video_url = f"https://youtube.com/watch?v={video.video_id}"
-            transcript = await youtube_service.get_video_transcript(video_url)
+        # 자막 수집 (상위 영상들, 동시 실행)
+        top_videos = data["videos"][:self.MAX_TRANSCRIPTS]
+        transcripts = await asyncio.gather(*[
+            progress.track(
+                f"자막: {video.title[:30]}",
+                youtube_service.get_video_transcript(f"https://youtube.com/watch?v={video.video_id}")
+            )
+            for video in top_videos
+        ])
+        for video, transcript in zip(top_videos, transcripts):
             if transcript:
                 data["transcripts"].append({
                     "video_id": video.video_id,
@@ -532,11 +617,18 @@ class BenchmarkerAgent(BaseAgent):
                     "transcript": transcript[:5000]  # 토큰 제한
                 })
 
+        if data["channel_info"] or data["videos"]:
+            data["collected_at"] = time.time()
+            channel_artifacts.save_collection(data)
         return data
 
-    async def _generate_report(self) -> AgentResult:
+    async def _generate_report(self, save_partial: bool = True, refresh: bool = False) -> AgentResult:
         emit_progress("리포트 생성", "복제 가이드 작성 중...")
-        """종합 리포트 생성"""
+        """종합 리포트 생성
+
+        save_partial=False면 실패한 스테이지가 있을 때 저장하지 않는다 (백그라운드 갱신용).
+        refresh=True면 스테이지 캐시를 읽지 않고 모든 분석을 다시 실행한다 (다시 분석/백그라운드 갱신).
+        """
         self.report = BenchmarkReport()
         # 채널 URL과 이름 모두 저장
         self.report.analyzed_channels = self.channel_urls
@@ -548,33 +640,49 @@ class BenchmarkerAgent(BaseAgent):
             len(ch.get("videos", [])) for ch in self.channels_data
         )
 
-        # 1. 썸네일 패턴 분석
-        await self._analyze_thumbnail_patterns()
-
-        # 2. 스크립트 패턴 분석
-        await self._analyze_script_patterns()
-
-        # 3. 콘텐츠 전략 분석
-        await self._analyze_content_strategy()
-
-        # 4. 채널 컨셉 분석
-        await self._analyze_channel_concept()
-
-        # 5. 타겟 오디언스 분석
-        await self._analyze_audience()
+        # 썸네일/스크립트/콘텐츠 전략은 동시에, 컨셉·오디언스는 콘텐츠 전략 후,
+        # 복제 가이드 섹션은 각자 필요한 분석이 끝나는 대로 실행
+        stages = self._build_report_stages()
+        total = len(stages)
+        done = 0
+
+        def on_stage_done(outcome: StageOutcome):
+            nonlocal done
+            done += 1
+            status = {"cached": " (캐시)", "failed": " (실패)"}.get(outcome.status, "")
+            emit_progress(f"리포트 생성 ({done}/{total})", f"{outcome.name}{status}")
+
+        outcomes = await ReportDAG(
+            stages,
+            cache=report_stage_cache,
+            max_attempts=agent_settings.report_stage_max_attempts,
+            on_stage_done=on_stage_done,
+        ).run(refresh=refresh)
+
+        # 섹션 완료 순서와 무관하게 가이드 항목 순서 고정
+        self.report.replication_guide = {
+            key: self.report.replication_guide[key]
+            for key in REPLICATION_SECTIONS if key in self.report.replication_guide
+        }
 
-        # 6. 복제 가이드 생성
-        await self._generate_replication_guide()
+        failed = [name for name, outcome in outcomes.items() if outcome.status == "failed"]
+        if failed:
+            # 성공한 스테이지는 캐시되므로 같은 입력으로 다시 생성하면 실패한 스테이지만 재실행됨 (refresh 제외)
+            print(f"[BenchmarkerAgent] Failed report stages: {', '.join(failed)}")
 
         # 리포트 출력
         report_message = self._format_report()
 
         # 벤치마크 결과 캐시에 저장
-        try:
-            cache_key = save_benchmark(self.channel_urls, self.report.to_dict())
-            emit_progress("캐시 저장", f"벤치마크 결과 저장 완료 (key: {cache_key})")
-        except Exception as e:
-            print(f"[BenchmarkerAgent] Failed to save cache: {e}")
+        if failed and not save_partial:
+            # 기존(stale) 리포트를 유지해 다음 조회 때 다시 갱신되도록 함
+            print("[BenchmarkerAgent] Keeping previous report (stages failed)")
+        else:
+            try:
+                cache_key = save_benchmark(self.channel_urls, self.report.to_dict())
+                emit_progress("캐시 저장", f"벤치마크 결과 저장 완료 (key: {cache_key})")
+            except Exception as e:
+                print(f"[BenchmarkerAgent] Failed to save cache: {e}")
 
         self.status = AgentStatus.COMPLETED
 
@@ -618,85 +726,145 @@ class BenchmarkerAgent(BaseAgent):
             }
         )
 
-    async def _analyze_thumbnail_patterns(self):
-        emit_progress("썸네일 분석", "채널 스크린샷 캡처 중...")
-        """Playwright 스크린샷으로 썸네일 패턴 분석"""
-
-        # 1. 채널 스크린샷 캡처
-        print("Capturing channel screenshots with Playwright...")
+    def _build_report_stages(self) -> List[ReportStage]:
+        """리포트 분석 DAG 구성 - 의존 관계는 각 스테이지가 읽는 리포트 필드 기준"""
+        report = self.report
+        report.replication_guide = {}
+
+        def set_pattern(attr: str, cls):
+            return lambda value: setattr(report, attr, cls(**value))
+
+        def set_concept(value: Dict[str, str]):
+            report.channel_concept = value["channel_concept"]
+            report.unique_selling_point = value["unique_selling_point"]
+            report.brand_voice = value["brand_voice"]
+
+        def set_section(key: str):
+            return lambda value: report.replication_guide.__setitem__(key, value)
+
+        def failed(cls):
+            return lambda error: asdict(cls(summary=f"(분석 실패: {error})"))
+
+        def section_failed(error: str) -> Dict[str, str]:
+            return {"error": error}
+
+        stages = [
+            ReportStage(
+                name="thumbnail_pattern",
+                run=self._analyze_thumbnail_patterns,
+                apply=set_pattern("thumbnail_pattern", ThumbnailPattern),
+                fallback=lambda error: asdict(ThumbnailPattern()),
+                inputs=lambda: [self.channel_urls, [ch.get("thumbnail_urls", []) for ch in self.channels_data]],
+            ),
+            ReportStage(
+                name="script_pattern",
+                run=self._analyze_script_patterns,
+                apply=set_pattern("script_pattern", ScriptPattern),
+                fallback=failed(ScriptPattern),
+                inputs=lambda: [ch.get("transcripts", []) for ch in self.channels_data],
+            ),
+            ReportStage(
+                name="content_strategy",
+                run=self._analyze_content_strategy,
+                apply=set_pattern("content_strategy", ContentStrategy),
+                fallback=failed(ContentStrategy),
+                inputs=self._channel_digest,
+            ),
+            ReportStage(
+                name="channel_concept",
+                run=self._analyze_channel_concept,
+                apply=set_concept,
+                fallback=lambda error: dict.fromkeys(
+                    ("channel_concept", "unique_selling_point", "brand_voice"), f"(분석 실패: {error})"
+                ),
+                deps=("content_strategy",),
+                inputs=self._channel_digest,
+            ),
+            ReportStage(
+                name="audience_profile",
+                run=self._analyze_audience,
+                apply=set_pattern("audience_profile", AudienceProfile),
+                fallback=failed(AudienceProfile),
+                deps=("content_strategy",),
+                inputs=self._channel_digest,
+            ),
+        ]
 
-        try:
-            for url in self.channel_urls:
-                screenshot = await screenshot_service.capture_channel(
-                    url,
-                    capture_individual_thumbnails=True,
-                    max_thumbnails=6,
-                    scroll_count=2
-                )
-                self.channel_screenshots.append(screenshot)
-                print(f"Captured screenshots for: {screenshot.channel_name or url}")
-        except Exception as e:
-            print(f"Screenshot capture failed: {e}")
-            # 폴백: 기존 방식으로 썸네일 분석
-            return await self._analyze_thumbnail_patterns_fallback()
-        finally:
-            try:
-                await screenshot_service.close()
-            except:
-                pass
+        # 복제 가이드 섹션: 프롬프트에 들어가는 분석 결과만 의존성으로 둠
+        section_deps = {
+            "channel_setup": ("channel_concept",),
+            "content_planning": ("channel_concept", "content_strategy", "audience_profile"),
+            "thumbnail_guide": ("thumbnail_pattern", "channel_concept"),
+            "script_template": ("script_pattern", "channel_concept", "audience_profile"),
+            "engagement_strategy": ("content_strategy", "audience_profile"),
+            "first_10_videos": ("channel_concept", "content_strategy", "content_planning"),
+        }
+        for key in REPLICATION_SECTIONS:
+            stages.append(ReportStage(
+                name=key,
+                run=lambda key=key: self._generate_replication_section(key),
+                apply=set_section(key),
+                fallback=(lambda error: [section_failed(error)]) if key == "first_10_videos" else section_failed,
+                deps=section_deps[key],
+            ))
+        return stages
+
+    def _channel_digest(self) -> List[Any]:
+        """채널/영상 메타데이터 요약 (콘텐츠 전략·컨셉·오디언스 스테이지 캐시 키)"""
+        digest = []
+        for ch in self.channels_data:
+            info = ch.get("channel_info")
+            digest.append({
+                "channel": [info.channel_name, info.description, info.subscriber_count] if info else None,
+                "videos": [
+                    [v.video_id, v.title, v.view_count, v.upload_date, v.duration]
+                    for v in ch.get("videos", [])
+                ],
+            })
+        return digest
+
+    async def _analyze_thumbnail_patterns(self) -> Dict[str, Any]:
+        emit_progress("썸네일 분석", "채널 스크린샷 분석 중...")
+        """채널별 썸네일 비전 분석(저장된 분석 재사용) 후 채널 간 패턴 종합"""
+        self.channel_screenshots = []
+        results = await asyncio.gather(
+            *[self._analyze_channel_thumbnails(url) for url in self.channel_urls],
+            return_exceptions=True
+        )
 
-        if not self.channel_screenshots:
-            return
+        grid_analyses = []
+        errors = []
+        for url, result in zip(self.channel_urls, results):
+            if isinstance(result, BaseException):
+                print(f"Thumbnail vision failed for {url}: {result}")
+                errors.append(result)
+            elif result and result.get("grid"):
+                grid_analyses.append(result)
+
+        if not grid_analyses:
+            if errors:
+                # 폴백: 기존 방식으로 썸네일 분석
+                return await self._analyze_thumbnail_patterns_fallback()
+            return asdict(ThumbnailPattern())
 
-        # 2. /videos 페이지 스크린샷으로 전체 패턴 분석
         try:
-            grid_analyses = []
-
-            for screenshot in self.channel_screenshots:
-                if screenshot.videos_page:
-                    result = await vision_service.analyze_image_with_thinking(
-                        screenshot.videos_page,
-                        THUMBNAIL_GRID_ANALYSIS_PROMPT
-                    )
-                    thinking = result.get("thinking", "")
-                    analysis = result.get("answer", "")
-                    
-                    # thinking 과정 표시
-                    if thinking:
-                        thinking_preview = thinking[:200] + "..." if len(thinking) > 200 else thinking
-                        emit_progress("AI 분석 중", f"[{screenshot.channel_name or 'Channel'}] {thinking_preview}")
-                    
-                    grid_analyses.append({
-                        "channel": screenshot.channel_name or screenshot.channel_url,
-                        "analysis": analysis,
-                        "thinking": thinking
-                    })
-
-            # 개별 썸네일도 분석 (더 상세한 패턴 파악)
-            individual_analyses = []
-            for screenshot in self.channel_screenshots:
-                for i, thumb in enumerate(screenshot.thumbnail_screenshots[:4]):
-                    analysis = await vision_service.analyze_image(
-                        thumb,
-                        INDIVIDUAL_THUMBNAIL_ANALYSIS_PROMPT
-                    )
-                    individual_analyses.append(analysis)
+            # 개별 썸네일 분석 (더 상세한 패턴 파악)
+            individual_analyses = [a for analysis in grid_analyses for a in analysis["thumbnails"]]
 
             # LLM으로 패턴 종합
-            if grid_analyses:
-                combined = "\n\n".join([
-                    f"Channel: {a['channel']}\nGrid Analysis: {a['analysis']}"
-                    for a in grid_analyses
-                ])
+            combined = "\n\n".join([
+                f"Channel: {a['channel']}\nGrid Analysis: {a['grid']}"
+                for a in grid_analyses
+            ])
 
-                if individual_analyses:
-                    combined += "\n\n--- Individual Thumbnail Details ---\n"
-                    combined += "\n\n".join([
-                        f"Thumbnail {i+1}: {a}"
-                        for i, a in enumerate(individual_analyses[:4])
-                    ])
+            if individual_analyses:
+                combined += "\n\n--- Individual Thumbnail Details ---\n"
+                combined += "\n\n".join([
+                    f"Thumbnail {i+1}: {a}"
+                    for i, a in enumerate(individual_analyses[:4])
+                ])
 
-                prompt = f"""Based on these thumbnail analyses from YouTube channel screenshots:
+            prompt = f"""Based on these thumbnail analyses from YouTube channel screenshots:
 
 {combined}
 
@@ -712,71 +880,110 @@ Synthesize the patterns and return JSON:
     "summary": "2-3 sentence summary of thumbnail style"
 }}"""
 
-                response = await llm_service.generate(prompt, temperature=0.5)
-                pattern_data = self._parse_json(response)
-
-                if pattern_data:
-                    self.report.thumbnail_pattern = ThumbnailPattern(
-                        color_palette=pattern_data.get("color_palette", []),
-                        text_style=pattern_data.get("text_style", ""),
-                        face_expression=pattern_data.get("face_expression", ""),
-                        layout_style=pattern_data.get("layout_style", ""),
-                        common_elements=pattern_data.get("common_elements", []),
-                        summary=pattern_data.get("summary", ""),
-                    )
+            response = await llm_service.generate(prompt, temperature=0.5)
+            pattern_data = self._parse_json(response)
+            if not pattern_data:
+                raise ValueError("LLM 응답 파싱 실패")
+            return self._thumbnail_pattern_from(pattern_data)
 
         except Exception as e:
             print(f"Thumbnail pattern analysis failed: {e}")
-            await self._analyze_thumbnail_patterns_fallback()
+            return await self._analyze_thumbnail_patterns_fallback()
 
-    async def _analyze_thumbnail_patterns_fallback(self):
-        """기존 방식의 썸네일 분석 (폴백)"""
+    async def _analyze_channel_thumbnails(self, url: str) -> Optional[Dict[str, Any]]:
+        """채널 하나의 /videos 그리드 + 개별 썸네일 비전 분석 (채널별 산출물로 저장)"""
+        cached = channel_artifacts.load_vision(url)
+        if cached:
+            emit_progress("AI 분석 중", f"[{cached['channel']}] 저장된 썸네일 분석 사용")
+            return cached
+
+        screenshot = await screenshot_service.capture_channel(
+            url,
+            capture_individual_thumbnails=True,
+            max_thumbnails=6,
+            scroll_count=2
+        )
+        self.channel_screenshots.append(screenshot)
+        name = screenshot.channel_name or screenshot.channel_url
+        print(f"Captured screenshots for: {name}")
+
+        # 그리드와 개별 썸네일을 한 번에 동시 요청 (vision_service가 해상도 축소/동시성 제한)
+        grids = [screenshot.videos_page] if screenshot.videos_page else []
+        thumbs = screenshot.thumbnail_screenshots[:4]
+        if not grids and not thumbs:
+            return None
+        results = await vision_service.analyze_images(
+            grids + thumbs,
+            [THUMBNAIL_GRID_ANALYSIS_PROMPT] * len(grids) + [INDIVIDUAL_THUMBNAIL_ANALYSIS_PROMPT] * len(thumbs),
+            return_exceptions=True
+        )
+
+        grid = None
+        if grids:
+            if isinstance(results[0], BaseException):
+                print(f"Grid analysis failed for {name}: {results[0]}")
+            else:
+                grid = results[0]
+                emit_progress("AI 분석 중", f"[{name}] 썸네일 그리드 분석 완료")
+
+        analysis = {
+            "channel": name,
+            "grid": grid,
+            "thumbnails": [a for a in results[len(grids):] if not isinstance(a, BaseException)],
+        }
+        if grid:
+            channel_artifacts.save_vision(url, analysis)
+        return analysis
+
+    async def _analyze_thumbnail_patterns_fallback(self) -> Dict[str, Any]:
+        """기존 방식의 썸네일 분석 (폴백) - 실패는 스테이지 재시도로 전달"""
         all_thumbnails = []
         for ch in self.channels_data:
             all_thumbnails.extend(ch.get("thumbnail_urls", []))
 
         if not all_thumbnails:
-            return
+            return asdict(ThumbnailPattern())
 
         thumbnails_to_analyze = all_thumbnails[:4]
 
-        try:
-            analyses = []
-            for thumb_url in thumbnails_to_analyze:
-                thumb_data = await youtube_service.download_thumbnail(thumb_url)
-                if thumb_data:
-                    b64_data = base64.b64encode(thumb_data).decode("utf-8")
-                    analysis = await vision_service.analyze_image(
-                        b64_data,
-                        "Analyze this YouTube thumbnail. Describe: colors, text style, face/expression if any, layout, visual elements."
-                    )
-                    analyses.append(analysis)
+        downloads = await asyncio.gather(
+            *[youtube_service.download_thumbnail(url) for url in thumbnails_to_analyze]
+        )
+        images = [base64.b64encode(data).decode("utf-8") for data in downloads if data]
+        analyses = await vision_service.analyze_images(
+            images,
+            "Analyze this YouTube thumbnail. Describe: colors, text style, face/expression if any, layout, visual elements."
+        )
 
-            if analyses:
-                combined_analysis = "\n\n".join([f"Thumbnail {i+1}: {a}" for i, a in enumerate(analyses)])
+        if not analyses:
+            raise ValueError("썸네일 다운로드 실패")
 
-                prompt = f"""Based on these thumbnail analyses, identify common patterns:
+        combined_analysis = "\n\n".join([f"Thumbnail {i+1}: {a}" for i, a in enumerate(analyses)])
+
+        prompt = f"""Based on these thumbnail analyses, identify common patterns:
 
 {combined_analysis}
 
 {THUMBNAIL_ANALYSIS_PROMPT}"""
 
-                response = await llm_service.generate(prompt, temperature=0.5)
-                pattern_data = self._parse_json(response)
-
-                if pattern_data:
-                    self.report.thumbnail_pattern = ThumbnailPattern(
-                        color_palette=pattern_data.get("color_palette", []),
-                        text_style=pattern_data.get("text_style", ""),
-                        face_expression=pattern_data.get("face_expression", ""),
-                        layout_style=pattern_data.get("layout_style", ""),
-                        common_elements=pattern_data.get("common_elements", []),
-                        summary=pattern_data.get("summary", ""),
-                    )
-        except Exception as e:
-            print(f"Fallback thumbnail analysis failed: {e}")
-
-    async def _analyze_script_patterns(self):
+        response = await llm_service.generate(prompt, temperature=0.5)
+        pattern_data = self._parse_json(response)
+        if not pattern_data:
+            raise ValueError("LLM 응답 파싱 실패")
+        return self._thumbnail_pattern_from(pattern_data)
+
+    @staticmethod
+    def _thumbnail_pattern_from(pattern_data: Dict[str, Any]) -> Dict[str, Any]:
+        return asdict(ThumbnailPattern(
+            color_palette=pattern_data.get("color_palette", []),
+            text_style=pattern_data.get("text_style", ""),
+            face_expression=pattern_data.get("face_expression", ""),
+            layout_style=pattern_data.get("layout_style", ""),
+            common_elements=pattern_data.get("common_elements", []),
+            summary=pattern_data.get("summary", ""),
+        ))
+
+    async def _analyze_script_patterns(self) -> Dict[str, Any]:
         emit_progress("스크립트 분석", "영상 자막 추출 중...")
         """스크립트 패턴 분석"""
         all_transcripts = []
@@ -788,40 +995,34 @@ Synthesize the patterns and return JSON:
                 channel_name = ch["channel_info"].channel_name
 
         if not all_transcripts:
-            self.report.script_pattern = ScriptPattern(summary="(분석 실패: 자막 데이터 없음)")
-            return
-
-        try:
-            transcripts_text = "\n\n---\n\n".join([
-                f"Title: {t['title']}\nTranscript: {t['transcript'][:2000]}"
-                for t in all_transcripts[:3]
-            ])
+            return asdict(ScriptPattern(summary="(분석 실패: 자막 데이터 없음)"))
 
-            prompt = SCRIPT_ANALYSIS_PROMPT.format(
-                channel_name=channel_name,
-                transcripts=transcripts_text
-            )
-
-            response = await llm_service.generate(prompt, temperature=0.5, max_tokens=2048)
-            pattern_data = self._parse_json(response)
+        transcripts_text = "\n\n---\n\n".join([
+            f"Title: {t['title']}\nTranscript: {t['transcript'][:2000]}"
+            for t in all_transcripts[:3]
+        ])
 
-            if pattern_data:
-                self.report.script_pattern = ScriptPattern(
-                    hook_style=pattern_data.get("hook_style", ""),
-                    structure=pattern_data.get("structure", ""),
-                    tone_and_voice=pattern_data.get("tone_and_voice", ""),
-                    recurring_phrases=pattern_data.get("recurring_phrases", []),
-                    cta_patterns=pattern_data.get("cta_patterns", []),
-                    average_length=pattern_data.get("average_length_words", 0),
-                    summary=pattern_data.get("summary", ""),
-                )
-            else:
-                self.report.script_pattern = ScriptPattern(summary="(분석 실패: LLM 응답 파싱 실패)")
-        except Exception as e:
-            print(f"Script analysis failed: {e}")
-            self.report.script_pattern = ScriptPattern(summary=f"(분석 실패: {str(e)[:150]})")
+        prompt = SCRIPT_ANALYSIS_PROMPT.format(
+            channel_name=channel_name,
+            transcripts=transcripts_text
+        )
 
-    async def _analyze_content_strategy(self):
+        response = await llm_service.generate(prompt, temperature=0.5, max_tokens=2048)
+        pattern_data = self._parse_json(response)
+        if not pattern_data:
+            raise ValueError("LLM 응답 파싱 실패")
+
+        return asdict(ScriptPattern(
+            hook_style=pattern_data.get("hook_style", ""),
+            structure=pattern_data.get("structure", ""),
+            tone_and_voice=pattern_data.get("tone_and_voice", ""),
+            recurring_phrases=pattern_data.get("recurring_phrases", []),
+            cta_patterns=pattern_data.get("cta_patterns", []),
+            average_length=pattern_data.get("average_length_words", 0),
+            summary=pattern_data.get("summary", ""),
+        ))
+
+    async def _analyze_content_strategy(self) -> Dict[str, Any]:
         emit_progress("콘텐츠 전략 분석", "영상 메타데이터 분석 중...")
         """콘텐츠 전략 분석"""
         all_videos = []
@@ -835,42 +1036,36 @@ Synthesize the patterns and return JSON:
                 channel_description = ch["channel_info"].description
 
         if not all_videos:
-            self.report.content_strategy = ContentStrategy(summary="(분석 실패: 영상 데이터 없음)")
-            return
+            return asdict(ContentStrategy(summary="(분석 실패: 영상 데이터 없음)"))
 
-        try:
-            video_data = "\n".join([
-                f"- {v.title} | Views: {v.view_count} | Date: {v.upload_date} | Duration: {v.duration}s"
-                for v in all_videos[:15]
-            ])
-
-            prompt = CONTENT_STRATEGY_PROMPT.format(
-                channel_name=channel_name,
-                channel_description=channel_description[:500],
-                video_data=video_data
-            )
+        video_data = "\n".join([
+            f"- {v.title} | Views: {v.view_count} | Date: {v.upload_date} | Duration: {v.duration}s"
+            for v in all_videos[:15]
+        ])
 
-            response = await llm_service.generate(prompt, temperature=0.5, max_tokens=2048)
-            strategy_data = self._parse_json(response)
-
-            if strategy_data:
-                self.report.content_strategy = ContentStrategy(
-                    content_pillars=strategy_data.get("content_pillars", []),
-                    upload_frequency=strategy_data.get("upload_frequency", ""),
-                    video_length_pattern=strategy_data.get("video_length_pattern", ""),
-                    trending_topics=strategy_data.get("trending_topics", []),
-                    engagement_tactics=strategy_data.get("engagement_tactics", []),
-                    summary=strategy_data.get("summary", ""),
-                )
-            else:
-                self.report.content_strategy = ContentStrategy(summary="(분석 실패: LLM 응답 파싱 실패)")
-        except Exception as e:
-            print(f"Content strategy analysis failed: {e}")
-            self.report.content_strategy = ContentStrategy(summary=f"(분석 실패: {str(e)[:150]})")
+        prompt = CONTENT_STRATEGY_PROMPT.format(
+            channel_name=channel_name,
+            channel_description=channel_description[:500],
+            video_data=video_data
+        )
 
-    async def _analyze_channel_concept(self):
+        response = await llm_service.generate(prompt, temperature=0.5, max_tokens=2048)
+        strategy_data = self._parse_json(response)
+        if not strategy_data:
+            raise ValueError("LLM 응답 파싱 실패")
+
+        return asdict(ContentStrategy(
+            content_pillars=strategy_data.get("content_pillars", []),
+            upload_frequency=strategy_data.get("upload_frequency", ""),
+            video_length_pattern=strategy_data.get("video_length_pattern", ""),
+            trending_topics=strategy_data.get("trending_topics", []),
+            engagement_tactics=strategy_data.get("engagement_tactics", []),
+            summary=strategy_data.get("summary", ""),
+        ))
+
+    async def _analyze_channel_concept(self) -> Dict[str, str]:
         emit_progress("채널 컨셉 분석", "USP 도출 중...")
-        """채널 컨셉 분석"""
+        """채널 컨셉 분석 (콘텐츠 전략 결과 사용)"""
         channel_name = ""
         channel_description = ""
         subscriber_count = 0
@@ -887,51 +1082,42 @@ Synthesize the patterns and return JSON:
             top_videos.extend(sorted_videos[:5])
 
         if not channel_name:
-            self.report.channel_concept = "(분석 실패: 채널 정보 없음)"
-            self.report.unique_selling_point = "(분석 실패: 채널 정보 없음)"
-            self.report.brand_voice = "(분석 실패: 채널 정보 없음)"
-            return
+            return dict.fromkeys(
+                ("channel_concept", "unique_selling_point", "brand_voice"), "(분석 실패: 채널 정보 없음)"
+            )
 
-        try:
-            top_videos_text = "\n".join([
-                f"- {v.title} (Views: {v.view_count:,})"
-                for v in top_videos[:10]
-            ])
+        top_videos_text = "\n".join([
+            f"- {v.title} (Views: {v.view_count:,})"
+            for v in top_videos[:10]
+        ])
 
-            content_patterns = self.report.content_strategy.summary if self.report.content_strategy else ""
+        content_patterns = self.report.content_strategy.summary if self.report.content_strategy else ""
 
-            prompt = CHANNEL_CONCEPT_PROMPT.format(
-                channel_name=channel_name,
-                channel_description=channel_description[:500],
-                subscriber_count=subscriber_count,
-                top_videos=top_videos_text,
-                content_patterns=content_patterns
-            )
+        prompt = CHANNEL_CONCEPT_PROMPT.format(
+            channel_name=channel_name,
+            channel_description=channel_description[:500],
+            subscriber_count=subscriber_count,
+            top_videos=top_videos_text,
+            content_patterns=content_patterns
+        )
 
-            response = await llm_service.generate(prompt, temperature=0.5, max_tokens=1024)
-            concept_data = self._parse_json(response)
+        response = await llm_service.generate(prompt, temperature=0.5, max_tokens=1024)
+        concept_data = self._parse_json(response)
 
-            print(f"[DEBUG] Channel concept LLM response length: {len(response)}")
-            print(f"[DEBUG] Channel concept LLM response: [{response[:300]}...]")
-            if concept_data:
-                self.report.channel_concept = concept_data.get("channel_concept", "")
-                self.report.unique_selling_point = concept_data.get("unique_selling_point", "")
-                self.report.brand_voice = concept_data.get("brand_voice", "")
-                print(f"[DEBUG] Set channel_concept: [{self.report.channel_concept[:100]}]")
-            else:
-                self.report.channel_concept = "(분석 실패: LLM 응답 파싱 실패)"
-                self.report.unique_selling_point = "(분석 실패: LLM 응답 파싱 실패)"
-                self.report.brand_voice = "(분석 실패: LLM 응답 파싱 실패)"
-        except Exception as e:
-            error_msg = f"(분석 실패: {str(e)[:150]})"
-            print(f"Channel concept analysis failed: {e}")
-            self.report.channel_concept = error_msg
-            self.report.unique_selling_point = error_msg
-            self.report.brand_voice = error_msg
+        print(f"[DEBUG] Channel concept LLM response length: {len(response)}")
+        print(f"[DEBUG] Channel concept LLM response: [{response[:300]}...]")
+        if not concept_data:
+            raise ValueError("LLM 응답 파싱 실패")
 
-    async def _analyze_audience(self):
+        return {
+            "channel_concept": concept_data.get("channel_concept", ""),
+            "unique_selling_point": concept_data.get("unique_selling_point", ""),
+            "brand_voice": concept_data.get("brand_voice", ""),
+        }
+
+    async def _analyze_audience(self) -> Dict[str, Any]:
         emit_progress("타겟 오디언스 분석", "시청자 프로필 추론 중...")
-        """타겟 오디언스 분석"""
+        """타겟 오디언스 분석 (콘텐츠 전략 결과 사용)"""
         channel_name = ""
         video_titles = []
 
@@ -942,168 +1128,94 @@ Synthesize the patterns and return JSON:
                 video_titles.append(v.title)
 
         if not video_titles:
-            self.report.audience_profile = AudienceProfile(summary="(분석 실패: 영상 데이터 없음)")
-            return
+            return asdict(AudienceProfile(summary="(분석 실패: 영상 데이터 없음)"))
 
-        try:
-            content_pillars = ", ".join(self.report.content_strategy.content_pillars) if self.report.content_strategy else ""
-            titles_text = "\n".join([f"- {t}" for t in video_titles[:15]])
-
-            prompt = AUDIENCE_PROFILE_PROMPT.format(
-                channel_name=channel_name,
-                content_pillars=content_pillars,
-                video_titles=titles_text,
-                engagement_data="(Comment analysis not available)"
-            )
+        content_pillars = ", ".join(self.report.content_strategy.content_pillars) if self.report.content_strategy else ""
+        titles_text = "\n".join([f"- {t}" for t in video_titles[:15]])
 
-            response = await llm_service.generate(prompt, temperature=0.5, max_tokens=1024)
-            audience_data = self._parse_json(response)
+        prompt = AUDIENCE_PROFILE_PROMPT.format(
+            channel_name=channel_name,
+            content_pillars=content_pillars,
+            video_titles=titles_text,
+            engagement_data="(Comment analysis not available)"
+        )
 
-            if audience_data:
-                self.report.audience_profile = AudienceProfile(
-                    demographics=audience_data.get("demographics", ""),
-                    interests=audience_data.get("interests", []),
-                    pain_points=audience_data.get("pain_points", []),
-                    content_preferences=audience_data.get("content_preferences", ""),
-                    summary=audience_data.get("summary", ""),
-                )
-            else:
-                self.report.audience_profile = AudienceProfile(summary="(분석 실패: LLM 응답 파싱 실패)")
-        except Exception as e:
-            print(f"Audience analysis failed: {e}")
-            self.report.audience_profile = AudienceProfile(summary=f"(분석 실패: {str(e)[:150]})")
-
-    async def _generate_replication_guide(self):
-        """복제 가이드 생성 - 분리된 호출로 각 섹션 개별 생성"""
-        guide = {}
-        
-        # 공통 컨텍스트
-        channel_concept = self.report.channel_concept or ""
-        usp = self.report.unique_selling_point or ""
-        brand_voice = self.report.brand_voice or ""
-        
-        # DEBUG: Print context values
-        print(f"[DEBUG] channel_concept: [{channel_concept[:100] if channel_concept else 'EMPTY'}]")
-        print(f"[DEBUG] usp: [{usp[:100] if usp else 'EMPTY'}]")
-        print(f"[DEBUG] brand_voice: [{brand_voice[:100] if brand_voice else 'EMPTY'}]")
-        thumbnail_pattern = self.report.thumbnail_pattern.summary if self.report.thumbnail_pattern else ""
-        script_pattern = self.report.script_pattern.summary if self.report.script_pattern else ""
-        content_strategy = self.report.content_strategy.summary if self.report.content_strategy else ""
-        audience_profile = self.report.audience_profile.summary if self.report.audience_profile else ""
-        
-        # 1. 채널 셋업
-        emit_progress("복제 가이드", "채널 셋업 생성 중...")
-        try:
+        response = await llm_service.generate(prompt, temperature=0.5, max_tokens=1024)
+        audience_data = self._parse_json(response)
+        if not audience_data:
+            raise ValueError("LLM 응답 파싱 실패")
+
+        return asdict(AudienceProfile(
+            demographics=audience_data.get("demographics", ""),
+            interests=audience_data.get("interests", []),
+            pain_points=audience_data.get("pain_points", []),
+            content_preferences=audience_data.get("content_preferences", ""),
+            summary=audience_data.get("summary", ""),
+        ))
+
+    async def _generate_replication_section(self, key: str) -> Any:
+        """복제 가이드 섹션 하나 생성 - 의존 분석/섹션이 리포트에 반영된 뒤 호출됨"""
+        r = self.report
+        channel_concept = r.channel_concept or ""
+        usp = r.unique_selling_point or ""
+        brand_voice = r.brand_voice or ""
+        thumbnail_pattern = r.thumbnail_pattern.summary if r.thumbnail_pattern else ""
+        script_pattern = r.script_pattern.summary if r.script_pattern else ""
+        content_strategy = r.content_strategy.summary if r.content_strategy else ""
+        audience_profile = r.audience_profile.summary if r.audience_profile else ""
+
+        if key == "channel_setup":
+            emit_progress("복제 가이드", "채널 셋업 생성 중...")
             prompt = REPLICATION_CHANNEL_SETUP_PROMPT.format(
                 channel_concept=channel_concept,
                 usp=usp,
                 brand_voice=brand_voice
             )
-            print(f"[DEBUG] Channel setup prompt length: {len(prompt)}")
-            response = await llm_service.generate(prompt, temperature=0.7, max_tokens=1024)
-            print(f"[DEBUG] Channel setup response length: {len(response)}")
-            print(f"[DEBUG] Channel setup response: [{response[:300] if response else 'EMPTY'}...]")
-            data = self._parse_json(response)
-            if data:
-                guide["channel_setup"] = data
-            else:
-                guide["channel_setup"] = {"error": "생성 실패"}
-        except Exception as e:
-            print(f"Channel setup generation failed: {e}")
-            guide["channel_setup"] = {"error": str(e)[:150]}
-        
-        # 2. 콘텐츠 기획
-        emit_progress("복제 가이드", "콘텐츠 기획 생성 중...")
-        try:
+        elif key == "content_planning":
+            emit_progress("복제 가이드", "콘텐츠 기획 생성 중...")
             prompt = REPLICATION_CONTENT_PLANNING_PROMPT.format(
                 channel_concept=channel_concept,
                 content_strategy=content_strategy,
                 audience_profile=audience_profile
             )
-            response = await llm_service.generate(prompt, temperature=0.7, max_tokens=1024)
-            data = self._parse_json(response)
-            if data:
-                guide["content_planning"] = data
-            else:
-                guide["content_planning"] = {"error": "생성 실패"}
-        except Exception as e:
-            print(f"Content planning generation failed: {e}")
-            guide["content_planning"] = {"error": str(e)[:150]}
-        
-        # 3. 썸네일 가이드
-        emit_progress("복제 가이드", "썸네일 가이드 생성 중...")
-        try:
+        elif key == "thumbnail_guide":
+            emit_progress("복제 가이드", "썸네일 가이드 생성 중...")
             prompt = REPLICATION_THUMBNAIL_GUIDE_PROMPT.format(
                 thumbnail_pattern=thumbnail_pattern,
                 brand_voice=brand_voice
             )
-            response = await llm_service.generate(prompt, temperature=0.7, max_tokens=1024)
-            data = self._parse_json(response)
-            if data:
-                guide["thumbnail_guide"] = data
-            else:
-                guide["thumbnail_guide"] = {"error": "생성 실패"}
-        except Exception as e:
-            print(f"Thumbnail guide generation failed: {e}")
-            guide["thumbnail_guide"] = {"error": str(e)[:150]}
-        
-        # 4. 스크립트 템플릿
-        emit_progress("복제 가이드", "스크립트 템플릿 생성 중...")
-        try:
+        elif key == "script_template":
+            emit_progress("복제 가이드", "스크립트 템플릿 생성 중...")
             prompt = REPLICATION_SCRIPT_TEMPLATE_PROMPT.format(
                 script_pattern=script_pattern,
                 brand_voice=brand_voice,
                 audience_profile=audience_profile
             )
-            response = await llm_service.generate(prompt, temperature=0.7, max_tokens=1024)
-            data = self._parse_json(response)
-            if data:
-                guide["script_template"] = data
-            else:
-                guide["script_template"] = {"error": "생성 실패"}
-        except Exception as e:
-            print(f"Script template generation failed: {e}")
-            guide["script_template"] = {"error": str(e)[:150]}
-        
-        # 5. 참여 전략
-        emit_progress("복제 가이드", "참여 전략 생성 중...")
-        try:
+        elif key == "engagement_strategy":
+            emit_progress("복제 가이드", "참여 전략 생성 중...")
             prompt = REPLICATION_ENGAGEMENT_PROMPT.format(
                 content_strategy=content_strategy,
                 audience_profile=audience_profile
             )
-            response = await llm_service.generate(prompt, temperature=0.7, max_tokens=1024)
-            data = self._parse_json(response)
-            if data:
-                guide["engagement_strategy"] = data
-            else:
-                guide["engagement_strategy"] = {"error": "생성 실패"}
-        except Exception as e:
-            print(f"Engagement strategy generation failed: {e}")
-            guide["engagement_strategy"] = {"error": str(e)[:150]}
-        
-        # 6. 첫 영상 아이디어
-        emit_progress("복제 가이드", "첫 영상 아이디어 생성 중...")
-        try:
-            topic_ideas = guide.get("content_planning", {}).get("topic_ideas", [])
+        elif key == "first_10_videos":
+            emit_progress("복제 가이드", "첫 영상 아이디어 생성 중...")
+            content_planning = r.replication_guide.get("content_planning", {})
+            topic_ideas = content_planning.get("topic_ideas", []) if isinstance(content_planning, dict) else []
             prompt = REPLICATION_FIRST_VIDEOS_PROMPT.format(
                 channel_concept=channel_concept,
                 content_strategy=content_strategy,
                 topic_ideas=", ".join(topic_ideas) if topic_ideas else "일반 주제"
             )
-            response = await llm_service.generate(prompt, temperature=0.7, max_tokens=1024)
-            data = self._parse_json(response)
-            if data and "videos" in data:
-                guide["first_10_videos"] = data["videos"]
-            elif data:
-                guide["first_10_videos"] = data
-            else:
-                guide["first_10_videos"] = [{"error": "생성 실패"}]
-        except Exception as e:
-            print(f"First videos generation failed: {e}")
-            guide["first_10_videos"] = [{"error": str(e)[:150]}]
-        
-        self.report.replication_guide = guide
+        else:
+            raise ValueError(f"Unknown replication section: {key}")
+
+        response = await llm_service.generate(prompt, temperature=0.7, max_tokens=1024)
+        data = self._parse_json(response)
+        if not data:
+            raise ValueError("생성 실패")
+        if key == "first_10_videos" and "videos" in data:
+            return data["videos"]
+        return data
 
     def _parse_json(self, text: str) -> Optional[Dict[str, Any]]:
         """텍스트에서 JSON 추출"""
@@ -1295,3 +1407,35 @@ Synthesize the patterns and return JSON:
             needs_feedback=False,
             data={"report": self.report.to_dict() if self.report else None}
         )
+
+
+async def _refresh_benchmark(channel_urls: List[str]):
+    """캐시된 벤치마크를 새로 수집/분석해 저장 (사용자 세션과 별도 에이전트)"""
+    _progress_muted.set(True)
+    agent = BenchmarkerAgent()
+    agent.channel_urls = list(channel_urls)
+    try:
+        await agent._analyze_channels()
+        # 일부 스테이지가 실패한 리포트로 stale 리포트를 덮어쓰지 않음
+        await agent._generate_report(save_partial=False, refresh=True)
+        print(f"[BenchmarkerAgent] Background refresh done: {channel_urls}")
+    except Exception as e:
+        print(f"[BenchmarkerAgent] Background refresh failed ({channel_urls}): {e}")
+
+
+def schedule_benchmark_refresh(channel_urls: List[str]):
+    """stale 캐시 백그라운드 갱신 시작 - 같은 채널 조합은 한 번만 실행"""
+    key = get_cache_key(channel_urls)
+    running = _refresh_tasks.get(key)
+    if running is not None and not running.done():
+        return
+    task = asyncio.create_task(_refresh_benchmark(channel_urls))
+    _refresh_tasks[key] = task
+    task.add_done_callback(lambda t: _refresh_tasks.pop(key, None) if _refresh_tasks.get(key) is t else None)
+
+
+def cancel_benchmark_refresh(channel_urls: List[str]):
+    """사용자가 직접 다시 분석할 때 중복 갱신 취소"""
+    task = _refresh_tasks.pop(get_cache_key(channel_urls), None)
+    if task is not None and not task.done():
+        task.cancel()
@@ -1,23 +1,36 @@
-"""벤치마크 결과 캐시 서비스"""
+"""벤치마크 결과 캐시 서비스
+
+SQLite 하나에 리포트와 정규화된 채널 URL 인덱스를 함께 저장한다.
+- benchmark_reports: 채널 조합(cache_key)별 리포트
+- report_channels: 정규화 URL → 리포트 인덱스 (채널 하나로 조합 리포트 검색)
+- channel_entries: 채널별 부분 결과 (수집 데이터 등) - 여러 채널 리포트 조합에 재사용
+
+신선도는 TTL 기준이며, TTL이 지났어도 max_stale 이내면 stale 결과로 돌려준다.
+(호출 측에서 바로 보여주고 백그라운드에서 갱신하는 stale-while-revalidate용)
+"""
 
-import json
 import hashlib
+import json
 import re
-from pathlib import Path
-from typing import Optional, Dict, Any
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
 from urllib.parse import unquote
 
-CACHE_DIR = Path("/app/output/benchmark_cache")
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+from agents.config import agent_settings
 
 
 def normalize_channel_url(url: str) -> str:
-    """채널 URL 정규화 (URL 디코딩 포함)"""
-    url = url.strip().rstrip('/')
+    """채널 URL 정규화 (URL 디코딩 포함)
 
-    # URL 디코딩 (한글 처리)
-    url = unquote(url)
+    같은 채널의 다른 표기(인코딩, /videos 등 하위 경로, 쿼리, 대소문자)는 같은 키가 된다.
+    """
+    # URL 디코딩 (한글 처리), 쿼리 제거
+    url = unquote(url.strip()).split('?')[0].rstrip('/')
 
     # @handle 형식
     match = re.search(r'youtube\.com/@([^/?]+)', url)
@@ -34,6 +47,15 @@ def normalize_channel_url(url: str) -> str:
     if match:
         return f"c/{match.group(1).lower()}"
 
+    # /user/name 형식
+    match = re.search(r'youtube\.com/user/([^/?]+)', url)
+    if match:
+        return f"user/{match.group(1).lower()}"
+
+    # 이미 @로 시작하는 경우 (이미 정규화됨)
+    if url.startswith('@'):
+        return url.lower()
+
     # 그냥 채널명인 경우
     if not url.startswith('http'):
         return f"@{url.lower().replace(' ', '')}"
@@ -43,88 +65,215 @@ def normalize_channel_url(url: str) -> str:
 
 def get_cache_key(channel_urls: list) -> str:
     """채널 URL 목록에서 캐시 키 생성"""
-    normalized = sorted([normalize_channel_url(url) for url in channel_urls])
+    normalized = sorted({normalize_channel_url(url) for url in channel_urls})
     combined = "|".join(normalized)
     return hashlib.md5(combined.encode()).hexdigest()[:16]
 
 
-def get_single_channel_key(channel_url: str) -> str:
-    """단일 채널 캐시 키 (해시 기반)"""
-    normalized = normalize_channel_url(channel_url)
-    # 해시로 변환하여 파일명 문제 방지
-    return hashlib.md5(normalized.encode()).hexdigest()[:16]
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+class BenchmarkCache:
+    """벤치마크 리포트 + 채널별 부분 결과 캐시 (SQLite)"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl: float,
+        max_stale: float,
+        legacy_dir: Optional[Path] = None,
+    ):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.legacy_dir = Path(legacy_dir) if legacy_dir else None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    # === SQLite ===
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """커밋 후 닫히는 연결"""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    with closing(sqlite3.connect(self.db_path)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(
+                            """
+                            CREATE TABLE IF NOT EXISTS benchmark_reports (
+                                cache_key TEXT PRIMARY KEY,
+                                channel_urls TEXT NOT NULL,
+                                report TEXT NOT NULL,
+                                created_at REAL NOT NULL,
+                                updated_at REAL NOT NULL
+                            );
+                            CREATE TABLE IF NOT EXISTS report_channels (
+                                normalized_url TEXT NOT NULL,
+                                cache_key TEXT NOT NULL,
+                                PRIMARY KEY (normalized_url, cache_key)
+                            );
+                            CREATE TABLE IF NOT EXISTS channel_entries (
+                                normalized_url TEXT NOT NULL,
+                                kind TEXT NOT NULL,
+                                channel_url TEXT NOT NULL,
+                                data TEXT NOT NULL,
+                                collected_at REAL NOT NULL,
+                                PRIMARY KEY (normalized_url, kind)
+                            );
+                            """
+                        )
+                        empty = conn.execute("SELECT COUNT(*) FROM benchmark_reports").fetchone()[0] == 0
+                        if empty and self.legacy_dir is not None:
+                            self._import_legacy(conn)
+                        conn.commit()
+                    self._initialized = True
+        with closing(sqlite3.connect(self.db_path, timeout=10)) as conn:
+            with conn:
+                yield conn
+
+    def _import_legacy(self, conn: sqlite3.Connection):
+        """이전 JSON 파일 캐시({cache_key}.json)를 한 번 가져옴 (index_*.json은 무시)"""
+        count = 0
+        for cache_file in self.legacy_dir.glob("*.json"):
+            if cache_file.name.startswith("index_"):
+                continue
+            try:
+                data = json.loads(cache_file.read_text(encoding="utf-8"))
+                created = datetime.fromisoformat(data["created_at"]).timestamp()
+                updated = datetime.fromisoformat(data.get("updated_at") or data["created_at"]).timestamp()
+                self._write_report(conn, data["channel_urls"], data.get("report", {}), created, updated)
+                count += 1
+            except Exception as e:
+                print(f"[BenchmarkCache] Skipped legacy file {cache_file.name}: {e}")
+        if count:
+            print(f"[BenchmarkCache] Imported {count} legacy reports")
+
+    @staticmethod
+    def _write_report(
+        conn: sqlite3.Connection,
+        channel_urls: List[str],
+        report: Dict[str, Any],
+        created_at: float,
+        updated_at: float,
+    ) -> str:
+        cache_key = get_cache_key(channel_urls)
+        conn.execute(
+            """INSERT INTO benchmark_reports (cache_key, channel_urls, report, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(cache_key) DO UPDATE SET
+                   channel_urls = excluded.channel_urls,
+                   report = excluded.report,
+                   updated_at = excluded.updated_at""",
+            (cache_key, json.dumps(channel_urls, ensure_ascii=False),
+             json.dumps(report, ensure_ascii=False), created_at, updated_at),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO report_channels (normalized_url, cache_key) VALUES (?, ?)",
+            [(normalize_channel_url(url), cache_key) for url in channel_urls],
+        )
+        return cache_key
+
+    def _freshness(self, timestamp: float) -> Optional[Dict[str, Any]]:
+        """(age, fresh) - max_stale이 지났으면 None"""
+        age = max(0.0, time.time() - timestamp)
+        if age > self.max_stale:
+            return None
+        return {"age_seconds": age, "fresh": age <= self.ttl}
+
+    # === 리포트 ===
+
+    def save(self, channel_urls: List[str], report: Dict[str, Any]) -> str:
+        """리포트 저장 (같은 채널 조합이면 갱신)"""
+        now = time.time()
+        with self._connect() as conn:
+            cache_key = self._write_report(conn, list(channel_urls), report, now, now)
+        print(f"[BenchmarkCache] Saved: {cache_key} for {[normalize_channel_url(u) for u in channel_urls]}")
+        return cache_key
+
+    def find(self, channel_url: str) -> Optional[Dict[str, Any]]:
+        """채널이 포함된 가장 최근 리포트 (max_stale 이내)
+
+        반환 dict에는 fresh(TTL 이내 여부)와 age_seconds가 포함된다.
+        """
+        normalized = normalize_channel_url(channel_url)
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT r.cache_key, r.channel_urls, r.report, r.created_at, r.updated_at
+                   FROM report_channels c JOIN benchmark_reports r ON r.cache_key = c.cache_key
+                   WHERE c.normalized_url = ?
+                   ORDER BY r.updated_at DESC LIMIT 1""",
+                (normalized,),
+            ).fetchone()
+        if row is None:
+            return None
 
+        cache_key, channel_urls_json, report_json, created_at, updated_at = row
+        freshness = self._freshness(updated_at)
+        if freshness is None:
+            print(f"[BenchmarkCache] Expired: {cache_key} ({normalized})")
+            return None
 
-def save_benchmark(channel_urls: list, report_data: Dict[str, Any]) -> str:
-    """벤치마크 결과 저장"""
-    cache_key = get_cache_key(channel_urls)
-
-    cache_data = {
-        "cache_key": cache_key,
-        "channel_urls": channel_urls,
-        "normalized_urls": [normalize_channel_url(url) for url in channel_urls],
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "report": report_data
-    }
-
-    cache_file = CACHE_DIR / f"{cache_key}.json"
-    with open(cache_file, 'w', encoding='utf-8') as f:
-        json.dump(cache_data, f, ensure_ascii=False, indent=2)
-
-    # 채널별 인덱스도 저장 (빠른 검색용)
-    for url in channel_urls:
-        single_key = get_single_channel_key(url)
-        index_file = CACHE_DIR / f"index_{single_key}.json"
-        index_data = {
-            "channel_url": url,
-            "normalized_url": normalize_channel_url(url),
+        channel_urls = json.loads(channel_urls_json)
+        return {
             "cache_key": cache_key,
-            "updated_at": datetime.now().isoformat()
+            "channel_urls": channel_urls,
+            "normalized_urls": [normalize_channel_url(url) for url in channel_urls],
+            "created_at": _isoformat(created_at),
+            "updated_at": _isoformat(updated_at),
+            "report": json.loads(report_json),
+            **freshness,
         }
-        with open(index_file, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, ensure_ascii=False, indent=2)
-
-    print(f"[BenchmarkCache] Saved: {cache_key} for {[normalize_channel_url(u) for u in channel_urls]}")
-    return cache_key
-
-
-def find_benchmark(channel_url: str) -> Optional[Dict[str, Any]]:
-    """채널에 대한 기존 벤치마크 검색"""
-    normalized = normalize_channel_url(channel_url)
-    single_key = get_single_channel_key(channel_url)
-    index_file = CACHE_DIR / f"index_{single_key}.json"
-
-    print(f"[BenchmarkCache] Looking for: {normalized} -> index_{single_key}.json")
 
-    if not index_file.exists():
-        print(f"[BenchmarkCache] Index not found: {index_file}")
-        return None
-
-    try:
-        with open(index_file, 'r', encoding='utf-8') as f:
-            index_data = json.load(f)
-
-        cache_key = index_data.get("cache_key")
-        cache_file = CACHE_DIR / f"{cache_key}.json"
-
-        if not cache_file.exists():
-            print(f"[BenchmarkCache] Cache file not found: {cache_file}")
+    def delete(self, channel_url: str) -> bool:
+        """채널이 포함된 리포트와 채널별 부분 결과 삭제"""
+        normalized = normalize_channel_url(channel_url)
+        with self._connect() as conn:
+            keys = [k for (k,) in conn.execute(
+                "SELECT cache_key FROM report_channels WHERE normalized_url = ?", (normalized,)
+            )]
+            conn.executemany("DELETE FROM benchmark_reports WHERE cache_key = ?", [(k,) for k in keys])
+            conn.executemany("DELETE FROM report_channels WHERE cache_key = ?", [(k,) for k in keys])
+            entries = conn.execute(
+                "DELETE FROM channel_entries WHERE normalized_url = ?", (normalized,)
+            ).rowcount
+        return bool(keys or entries)
+
+    # === 채널별 부분 결과 ===
+
+    def put_channel_entry(self, channel_url: str, kind: str, data: Any):
+        """채널 하나의 부분 결과 저장 (kind별 최신 1개)"""
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO channel_entries
+                   (normalized_url, kind, channel_url, data, collected_at) VALUES (?, ?, ?, ?, ?)""",
+                (normalize_channel_url(channel_url), kind, channel_url,
+                 json.dumps(data, ensure_ascii=False), time.time()),
+            )
+
+    def get_channel_entry(self, channel_url: str, kind: str, fresh_only: bool = True) -> Optional[Dict[str, Any]]:
+        """채널 부분 결과 {data, collected_at, fresh, age_seconds} - 없거나 만료면 None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data, collected_at FROM channel_entries WHERE normalized_url = ? AND kind = ?",
+                (normalize_channel_url(channel_url), kind),
+            ).fetchone()
+        if row is None:
             return None
-
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            print(f"[BenchmarkCache] Found cache: {cache_key}")
-            return data
-    except Exception as e:
-        print(f"[BenchmarkCache] Error loading cache: {e}")
-        return None
+        data_json, collected_at = row
+        freshness = self._freshness(collected_at)
+        if freshness is None or (fresh_only and not freshness["fresh"]):
+            return None
+        return {"data": json.loads(data_json), "collected_at": collected_at, **freshness}
 
 
 def get_cache_summary(cache_data: Dict[str, Any]) -> str:
     """캐시된 벤치마크 요약 생성"""
     channels = cache_data.get("channel_urls", [])
-    created = cache_data.get("created_at", "알 수 없음")
+    created = cache_data.get("updated_at") or cache_data.get("created_at", "알 수 없음")
     report = cache_data.get("report", {})
 
     # 날짜 포맷팅
@@ -151,6 +300,12 @@ def get_cache_summary(cache_data: Dict[str, Any]) -> str:
 **분석 일시:** {date_str}
 """
 
+    if not cache_data.get("fresh", True):
+        if cache_data.get("refreshing"):
+            summary += "\n오래된 결과입니다. 백그라운드에서 최신 데이터로 갱신 중이며, 완료되면 다음 조회부터 반영됩니다.\n"
+        else:
+            summary += "\n오래된 결과입니다. 최신 데이터가 필요하면 '다시 분석'을 선택하세요.\n"
+
     # 리포트 요약 추가
     if report:
         concept = report.get("channel_concept", "")
@@ -162,59 +317,25 @@ def get_cache_summary(cache_data: Dict[str, Any]) -> str:
     return summary
 
 
-def delete_benchmark(channel_url: str) -> bool:
-    """벤치마크 캐시 삭제"""
-    single_key = get_single_channel_key(channel_url)
-    index_file = CACHE_DIR / f"index_{single_key}.json"
+# 싱글톤 인스턴스
+benchmark_cache = BenchmarkCache(
+    Path(agent_settings.benchmark_cache_db),
+    ttl=agent_settings.benchmark_cache_ttl_hours * 3600,
+    max_stale=agent_settings.benchmark_cache_max_stale_days * 86400,
+    legacy_dir=Path(agent_settings.benchmark_cache_db).parent,
+)
 
-    if not index_file.exists():
-        return False
 
-    try:
-        with open(index_file, 'r', encoding='utf-8') as f:
-            index_data = json.load(f)
-
-        cache_key = index_data.get("cache_key")
-        cache_file = CACHE_DIR / f"{cache_key}.json"
-
-        if cache_file.exists():
-            cache_file.unlink()
-        index_file.unlink()
-
-        return True
-    except Exception as e:
-        print(f"[BenchmarkCache] Error deleting cache: {e}")
-        return False
-
-
-def rebuild_index():
-    """모든 캐시 파일의 인덱스 재구축"""
-    count = 0
-    for cache_file in CACHE_DIR.glob("*.json"):
-        if cache_file.name.startswith("index_"):
-            continue
-
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            cache_key = data.get("cache_key")
-            channel_urls = data.get("channel_urls", [])
-
-            for url in channel_urls:
-                single_key = get_single_channel_key(url)
-                index_file = CACHE_DIR / f"index_{single_key}.json"
-                index_data = {
-                    "channel_url": url,
-                    "normalized_url": normalize_channel_url(url),
-                    "cache_key": cache_key,
-                    "updated_at": datetime.now().isoformat()
-                }
-                with open(index_file, 'w', encoding='utf-8') as f:
-                    json.dump(index_data, f, ensure_ascii=False, indent=2)
-                count += 1
-                print(f"[BenchmarkCache] Indexed: {normalize_channel_url(url)}")
-        except Exception as e:
-            print(f"[BenchmarkCache] Error indexing {cache_file}: {e}")
+def save_benchmark(channel_urls: list, report_data: Dict[str, Any]) -> str:
+    """벤치마크 결과 저장"""
+    return benchmark_cache.save(channel_urls, report_data)
+
+
+def find_benchmark(channel_url: str) -> Optional[Dict[str, Any]]:
+    """채널에 대한 기존 벤치마크 검색"""
+    return benchmark_cache.find(channel_url)
+
 
-    return count
+def delete_benchmark(channel_url: str) -> bool:
+    """벤치마크 캐시 삭제"""
+    return benchmark_cache.delete(channel_url)
@@ -0,0 +1,89 @@
+"""채널별 벤치마크 산출물
+
+채널 조합과 무관하게 채널 하나 단위로 수집 데이터(채널/영상 메타데이터, 자막)와
+썸네일 비전 분석 결과를 저장한다. 키는 정규화 URL이며 수집 시각(collected_at)을 함께 기록한다.
+{A, B} 분석 후 {A, C}를 분석하면 A는 저장된 산출물을 쓰고, 채널 간 종합 LLM 호출만 새로 실행된다.
+"""
+
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from .cache_service import BenchmarkCache, benchmark_cache
+from .schemas import ChannelMetadata, VideoMetadata
+
+# 산출물 형식이 바뀌면 올려서 이전 저장분을 무시
+ARTIFACT_VERSION = 1
+
+COLLECTION = "collection"
+VISION = "vision"
+
+
+def collection_to_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    """_analyze_single_channel 결과 → JSON"""
+    info = data.get("channel_info")
+    return {
+        "url": data["url"],
+        "channel_info": asdict(info) if info else None,
+        "videos": [asdict(v) for v in data.get("videos", [])],
+        "transcripts": data.get("transcripts", []),
+        "thumbnail_urls": data.get("thumbnail_urls", []),
+    }
+
+
+def collection_from_dict(value: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON → _analyze_single_channel 결과 형식"""
+    info = value.get("channel_info")
+    return {
+        "url": value["url"],
+        "channel_info": ChannelMetadata(**info) if info else None,
+        "videos": [VideoMetadata(**v) for v in value.get("videos", [])],
+        "transcripts": value.get("transcripts", []),
+        "thumbnail_urls": value.get("thumbnail_urls", []),
+    }
+
+
+class ChannelArtifacts:
+    """채널 단위 수집/비전 분석 결과 저장소 (BenchmarkCache의 channel_entries 사용)"""
+
+    def __init__(self, cache: BenchmarkCache):
+        self.cache = cache
+
+    def _load(self, url: str, kind: str) -> Optional[Dict[str, Any]]:
+        try:
+            entry = self.cache.get_channel_entry(url, kind)
+        except Exception as e:
+            print(f"[ChannelArtifacts] Load failed ({kind}, {url}): {e}")
+            return None
+        if entry is None or entry["data"].get("version") != ARTIFACT_VERSION:
+            return None
+        return {**entry["data"]["value"], "collected_at": entry["collected_at"]}
+
+    def _save(self, url: str, kind: str, value: Dict[str, Any]):
+        try:
+            self.cache.put_channel_entry(url, kind, {"version": ARTIFACT_VERSION, "value": value})
+        except Exception as e:
+            print(f"[ChannelArtifacts] Save failed ({kind}, {url}): {e}")
+
+    def load_collection(self, url: str) -> Optional[Dict[str, Any]]:
+        """저장된 수집 데이터 (TTL 이내) - 요청 URL로 url을 맞춰 반환"""
+        value = self._load(url, COLLECTION)
+        if value is None:
+            return None
+        data = collection_from_dict(value)
+        data["url"] = url
+        data["collected_at"] = value["collected_at"]
+        return data
+
+    def save_collection(self, data: Dict[str, Any]):
+        self._save(data["url"], COLLECTION, collection_to_dict(data))
+
+    def load_vision(self, url: str) -> Optional[Dict[str, Any]]:
+        """{channel, grid, thumbnails, collected_at} - 그리드/개별 썸네일 비전 분석 텍스트"""
+        return self._load(url, VISION)
+
+    def save_vision(self, url: str, analysis: Dict[str, Any]):
+        self._save(url, VISION, analysis)
+
+
+# 싱글톤 인스턴스
+channel_artifacts = ChannelArtifacts(benchmark_cache)
@@ -0,0 +1,81 @@
+"""벤치마크 데이터 수집 스케줄링 - 프로세스 수 제한, 호스트별 요청 간격, 작업별 진행 보고"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlparse
+
+
+T = TypeVar("T")
+
+# YouTube 도메인은 모두 같은 호스트로 취급 (같은 서버군에 대한 요청 간격 제한)
+_HOST_ALIASES = {
+    "youtu.be": "youtube.com",
+    "m.youtube.com": "youtube.com",
+    "www.youtube.com": "youtube.com",
+    "music.youtube.com": "youtube.com",
+}
+
+
+def host_of(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return _HOST_ALIASES.get(host, host) or "youtube.com"
+
+
+class HostRateLimiter:
+    """호스트별 최소 요청 간격 - 요청 시작 시각을 예약 순서대로 min_interval씩 띄움"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, host: str):
+        if self.min_interval <= 0:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class ProcessGate:
+    """외부 프로세스(yt-dlp) 동시 실행 수 + 호스트별 요청 간격 제한"""
+
+    def __init__(self, max_processes: int, min_interval: float):
+        self.max_processes = max(1, max_processes)
+        self.rate_limiter = HostRateLimiter(min_interval)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # 세마포어는 생성된 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만듦
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_processes)
+            self._loop = loop
+        return self._slots
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        async with self._semaphore():
+            await self.rate_limiter.wait(host_of(url))
+            yield
+
+
+class CollectionProgress:
+    """수집 작업 완료 시마다 진행 상황 보고 (작업 수는 수집 도중 늘어날 수 있음)"""
+
+    def __init__(self, emit: Callable[[str, str], None]):
+        self.emit = emit
+        self.total = 0
+        self.done = 0
+
+    async def track(self, label: str, job: Awaitable[T]) -> T:
+        self.total += 1
+        try:
+            return await job
+        finally:
+            self.done += 1
+            self.emit(f"데이터 수집 ({self.done}/{self.total})", label)
@@ -0,0 +1,161 @@
+"""벤치마크 리포트 분석 DAG - 의존성 순서로 스테이지 병렬 실행, 입력 해시별 결과 캐시, 스테이지 단위 재시도"""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+# 프롬프트/결과 형식이 바뀌면 올려서 이전 캐시 무효화
+STAGE_CACHE_VERSION = 1
+
+
+@dataclass
+class ReportStage:
+    """리포트 분석 스테이지
+
+    run은 JSON 직렬화 가능한 값을 반환하고, apply가 그 값을 리포트에 반영한다.
+    inputs는 의존 스테이지가 반영된 뒤 평가되며 (의존 스테이지 결과와 함께) 캐시 키가 된다.
+    모든 시도가 실패하면 fallback(에러 메시지)의 값을 반영하고 캐시하지 않는다.
+    """
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    apply: Callable[[Any], None]
+    fallback: Callable[[str], Any]
+    deps: Tuple[str, ...] = ()
+    inputs: Callable[[], Any] = lambda: None
+
+
+@dataclass
+class StageOutcome:
+    """스테이지 실행 결과 (status: done | cached | failed)"""
+    name: str
+    status: str
+    value: Any = None
+    error: str = ""
+    elapsed: float = 0.0
+
+
+class StageCache:
+    """{cache_dir}/{stage}/{input_hash}.json - 만료 시간은 파일 mtime 기준"""
+
+    def __init__(self, cache_dir: Path, ttl: float):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.cache_dir / stage / f"{key}.json"
+
+    def get(self, stage: str, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(stage, key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, stage: str, key: str, value: Any):
+        path = self._path(stage, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".part")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"value": value}, f, ensure_ascii=False)
+            tmp_path.replace(path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[ReportDAG] Failed to cache stage {stage}: {e}")
+
+
+def stage_key(name: str, inputs: Any, dep_values: List[Any]) -> str:
+    payload = json.dumps(
+        [STAGE_CACHE_VERSION, name, inputs, dep_values],
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class ReportDAG:
+    """의존성이 모두 끝난 스테이지부터 바로 시작 - 전체 지연은 스테이지 합이 아닌 최장 경로에 수렴"""
+
+    def __init__(
+        self,
+        stages: List[ReportStage],
+        cache: Optional[StageCache] = None,
+        max_attempts: int = 2,
+        on_stage_done: Optional[Callable[[StageOutcome], None]] = None,
+    ):
+        self.stages = self._topological_order(stages)
+        self.cache = cache
+        self.max_attempts = max(1, max_attempts)
+        self.on_stage_done = on_stage_done
+
+    @staticmethod
+    def _topological_order(stages: List[ReportStage]) -> List[ReportStage]:
+        by_name = {stage.name: stage for stage in stages}
+        if len(by_name) != len(stages):
+            raise ValueError("Duplicate report stage name")
+
+        ordered: List[ReportStage] = []
+        state: Dict[str, str] = {}  # visiting | done
+
+        def visit(stage: ReportStage):
+            if state.get(stage.name) == "done":
+                return
+            if state.get(stage.name) == "visiting":
+                raise ValueError(f"Report stage cycle at: {stage.name}")
+            state[stage.name] = "visiting"
+            for dep in stage.deps:
+                if dep not in by_name:
+                    raise ValueError(f"Unknown dependency '{dep}' for stage '{stage.name}'")
+                visit(by_name[dep])
+            state[stage.name] = "done"
+            ordered.append(stage)
+
+        for stage in stages:
+            visit(stage)
+        return ordered
+
+    async def run(self, refresh: bool = False) -> Dict[str, StageOutcome]:
+        """refresh=True면 캐시를 읽지 않고 모든 스테이지를 다시 실행 (결과는 캐시에 저장)"""
+        tasks: Dict[str, asyncio.Task] = {}
+        for stage in self.stages:
+            deps = [tasks[dep] for dep in stage.deps]
+            tasks[stage.name] = asyncio.create_task(self._run_stage(stage, deps, refresh))
+        await asyncio.gather(*tasks.values())
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(self, stage: ReportStage, deps: List[asyncio.Task], refresh: bool) -> StageOutcome:
+        dep_outcomes = await asyncio.gather(*deps)
+        started = time.monotonic()
+        key = stage_key(stage.name, stage.inputs(), [dep.value for dep in dep_outcomes])
+
+        cached = self.cache.get(stage.name, key) if self.cache and not refresh else None
+        if cached is not None:
+            outcome = StageOutcome(stage.name, "cached", cached["value"])
+        else:
+            outcome = await self._execute(stage, key)
+        outcome.elapsed = time.monotonic() - started
+
+        stage.apply(outcome.value)
+        if self.on_stage_done:
+            self.on_stage_done(outcome)
+        return outcome
+
+    async def _execute(self, stage: ReportStage, key: str) -> StageOutcome:
+        error = ""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                value = await stage.run()
+            except Exception as e:
+                error = str(e)[:150] or type(e).__name__
+                print(f"[ReportDAG] Stage {stage.name} failed (attempt {attempt}/{self.max_attempts}): {e}")
+                continue
+            if self.cache:
+                self.cache.put(stage.name, key, value)
+            return StageOutcome(stage.name, "done", value)
+        return StageOutcome(stage.name, "failed", stage.fallback(error), error=error)
@@ -2,11 +2,34 @@
 
 import asyncio
 import base64
+import json
 import os
 import re
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 
+from apps.api.services.browser_pool import browser_pool
+
+
+# 영상 항목 / 썸네일 요소 (채널 레이아웃별)
+_VIDEO_ITEMS = ('ytd-rich-item-renderer', 'ytd-grid-video-renderer', 'ytd-video-renderer')
+ITEM_SELECTOR = ', '.join(_VIDEO_ITEMS)
+THUMBNAIL_SELECTOR = ', '.join(f'{item} ytd-thumbnail' for item in _VIDEO_ITEMS)
+THUMBNAIL_IMG_SELECTOR = ', '.join(f'{item} ytd-thumbnail img' for item in _VIDEO_ITEMS)
+# 쿠키 동의 팝업 버튼
+CONSENT_SELECTOR = 'button:has-text("Accept all"), button:has-text("모두 동의")'
+
+# 화면 안에 보이는 썸네일 이미지들
+VISIBLE_THUMBNAILS_JS = f"""() => Array.from(document.querySelectorAll({json.dumps(THUMBNAIL_IMG_SELECTOR)}))
+    .filter(img => {{ const r = img.getBoundingClientRect(); return r.width > 0 && r.bottom > 0 && r.top < innerHeight; }})"""
+# i번째 썸네일 요소 안의 이미지
+NTH_THUMBNAIL_JS = f"""i => {{ const el = document.querySelectorAll({json.dumps(THUMBNAIL_SELECTOR)})[i];
+    return el ? Array.from(el.querySelectorAll('img')) : []; }}"""
+
+GRID_TIMEOUT_MS = 15000  # 썸네일 그리드 표시
+SCROLL_TIMEOUT_MS = 3000  # 스크롤 후 추가 항목 로드
+IMAGE_TIMEOUT_MS = 5000  # 썸네일 이미지 디코딩 완료
+
 
 @dataclass
 class ChannelScreenshot:
@@ -28,28 +51,13 @@ class ChannelScreenshot:
 class ScreenshotService:
     """Playwright를 사용한 YouTube 스크린샷 서비스"""
     
-    def __init__(self):
-        self.browser = None
-        self.playwright = None
-    
-    async def _ensure_browser(self):
-        """브라우저 초기화"""
-        if self.browser is None:
-            from playwright.async_api import async_playwright
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage']
-            )
+    def __init__(self, pool=None):
+        # 브라우저는 공유 풀에서 임대 (벤치마크마다 Chromium을 새로 띄우지 않음)
+        self.pool = pool or browser_pool
     
     async def close(self):
-        """브라우저 종료"""
-        if self.browser:
-            await self.browser.close()
-            self.browser = None
-        if self.playwright:
-            await self.playwright.stop()
-            self.playwright = None
+        """공유 브라우저 풀 종료 (앱 종료 시에만 호출)"""
+        await self.pool.close()
     
     def _normalize_channel_url(self, url: str) -> str:
         """채널 URL 정규화"""
@@ -74,80 +82,108 @@ class ScreenshotService:
         channel_url: str,
         capture_individual_thumbnails: bool = True,
         max_thumbnails: int = 6,
-        scroll_count: int = 2
+        scroll_count: int = 2,
+        capture_channel_page: bool = False
     ) -> ChannelScreenshot:
-        """채널 페이지 스크린샷 캡처"""
-        await self._ensure_browser()
-        
-        context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            locale='ko-KR',
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-        
-        page = await context.new_page()
-        
+        """채널 페이지 스크린샷 캡처
+
+        /videos 그리드와 개별 썸네일은 한 번의 페이지 이동으로 캡처하고,
+        고정 대기 대신 썸네일 그리드/이미지 로드 상태를 DOM에서 확인한다.
+        메인 채널 페이지는 capture_channel_page=True일 때만 추가로 이동해 캡처한다.
+        """
         result = ChannelScreenshot(
             channel_url=channel_url,
             channel_name=""
         )
         
+        # 예외가 pool.page까지 전달되어야 깨진 컨텍스트를 재사용하지 않고 폐기함
         try:
-            # 1. /videos 페이지 캡처 (썸네일 그리드)
-            videos_url = self._get_videos_url(channel_url)
-            await page.goto(videos_url, wait_until='networkidle', timeout=30000)
-            
-            # 쿠키 동의 팝업 처리
-            try:
-                accept_btn = page.locator('button:has-text("Accept all"), button:has-text("모두 동의")')
-                if await accept_btn.count() > 0:
-                    await accept_btn.first.click()
-                    await page.wait_for_timeout(1000)
-            except:
-                pass
-            
-            # 채널명 추출
-            try:
-                channel_name_el = page.locator('yt-formatted-string#text.ytd-channel-name')
-                if await channel_name_el.count() > 0:
-                    result.channel_name = await channel_name_el.first.text_content()
-            except:
-                pass
-            
-            # 스크롤하여 더 많은 썸네일 로드
-            for _ in range(scroll_count):
-                await page.evaluate('window.scrollBy(0, 800)')
-                await page.wait_for_timeout(1000)
-            
-            # 맨 위로 스크롤
-            await page.evaluate('window.scrollTo(0, 0)')
-            await page.wait_for_timeout(500)
-            
-            # /videos 페이지 전체 스크린샷
-            screenshot_bytes = await page.screenshot(full_page=False)
-            result.videos_page = base64.b64encode(screenshot_bytes).decode('utf-8')
-            
-            # 2. 개별 썸네일 캡처
-            if capture_individual_thumbnails:
-                result.thumbnail_screenshots = await self._capture_thumbnails(
-                    page, max_thumbnails
-                )
-            
-            # 3. 메인 채널 페이지 캡처 (선택적)
-            main_url = self._normalize_channel_url(channel_url).split('/videos')[0].split('/about')[0]
-            if main_url != videos_url.replace('/videos', ''):
-                await page.goto(main_url, wait_until='networkidle', timeout=30000)
-                await page.wait_for_timeout(1000)
+            async with self.pool.page(viewport={'width': 1920, 'height': 1080}) as page:
+                # 1. /videos 페이지 캡처 (썸네일 그리드)
+                videos_url = self._get_videos_url(channel_url)
+                await page.goto(videos_url, wait_until='domcontentloaded', timeout=30000)
+                
+                # 쿠키 동의 팝업 처리 후 그리드 대기 - 시간 초과여도 현재 화면은 캡처
+                grid_ready = await self._wait_for_grid(page)
+                
+                # 채널명 추출
+                try:
+                    channel_name_el = page.locator('yt-formatted-string#text.ytd-channel-name')
+                    if await channel_name_el.count() > 0:
+                        result.channel_name = await channel_name_el.first.text_content()
+                except:
+                    pass
+                
+                # 스크롤하여 더 많은 썸네일 로드 (항목 수가 늘어날 때까지만 대기)
+                for _ in range(scroll_count if grid_ready else 0):
+                    loaded = await page.locator(ITEM_SELECTOR).count()
+                    await page.evaluate('window.scrollBy(0, 800)')
+                    try:
+                        await page.wait_for_function(
+                            f'n => document.querySelectorAll({json.dumps(ITEM_SELECTOR)}).length > n',
+                            arg=loaded,
+                            timeout=SCROLL_TIMEOUT_MS
+                        )
+                    except Exception:
+                        break  # 더 불러올 영상 없음
+                
+                # 맨 위로 스크롤 후 화면 안 썸네일 이미지가 그려질 때까지 대기
+                await page.evaluate('window.scrollTo(0, 0)')
+                await self._wait_for_images(page, VISIBLE_THUMBNAILS_JS)
+                
+                # /videos 페이지 전체 스크린샷
                 screenshot_bytes = await page.screenshot(full_page=False)
-                result.channel_page = base64.b64encode(screenshot_bytes).decode('utf-8')
-            
+                result.videos_page = base64.b64encode(screenshot_bytes).decode('utf-8')
+                
+                # 2. 개별 썸네일 캡처 (같은 페이지에서)
+                if capture_individual_thumbnails and grid_ready:
+                    result.thumbnail_screenshots = await self._capture_thumbnails(
+                        page, max_thumbnails
+                    )
+                
+                # 3. 메인 채널 페이지 캡처 (선택적)
+                if capture_channel_page:
+                    main_url = self._normalize_channel_url(channel_url).split('/videos')[0].split('/about')[0]
+                    await page.goto(main_url, wait_until='domcontentloaded', timeout=30000)
+                    await self._wait_for_images(page, VISIBLE_THUMBNAILS_JS)
+                    screenshot_bytes = await page.screenshot(full_page=False)
+                    result.channel_page = base64.b64encode(screenshot_bytes).decode('utf-8')
+                
         except Exception as e:
             print(f"Screenshot capture failed: {e}")
-        finally:
-            await context.close()
         
         return result
     
+    async def _wait_for_grid(self, page) -> bool:
+        """쿠키 동의 팝업과 썸네일 그리드 중 먼저 나타나는 쪽을 대기
+
+        동의 팝업이면 동의 후(페이지가 다시 그려짐) 그리드를 대기한다.
+        시간 초과 시 False - 호출하는 쪽은 현재 화면을 그대로 캡처한다.
+        """
+        try:
+            await page.wait_for_selector(
+                f'{CONSENT_SELECTOR}, {THUMBNAIL_SELECTOR}', state='visible', timeout=GRID_TIMEOUT_MS
+            )
+            consent = page.locator(CONSENT_SELECTOR)
+            if await consent.count() > 0 and await consent.first.is_visible():
+                await consent.first.click()
+                await page.wait_for_selector(THUMBNAIL_SELECTOR, state='visible', timeout=GRID_TIMEOUT_MS)
+            return True
+        except Exception as e:
+            print(f"Thumbnail grid not ready, capturing current page: {e}")
+            return False
+    
+    async def _wait_for_images(self, page, images_js: str, arg: Any = None):
+        """이미지 로드 완료(complete && naturalWidth > 0)까지 대기 - 시간 초과 시 그대로 진행"""
+        try:
+            await page.wait_for_function(
+                f'arg => ({images_js})(arg).every(img => img.complete && img.naturalWidth > 0)',
+                arg=arg,
+                timeout=IMAGE_TIMEOUT_MS
+            )
+        except Exception:
+            pass
+    
     async def _capture_thumbnails(
         self, 
         page, 
@@ -157,24 +193,7 @@ class ScreenshotService:
         thumbnails = []
         
         try:
-            # 썸네일 요소 찾기 (여러 선택자 시도)
-            selectors = [
-                'ytd-rich-item-renderer ytd-thumbnail',
-                'ytd-grid-video-renderer ytd-thumbnail',
-                'ytd-video-renderer ytd-thumbnail',
-            ]
-            
-            thumbnail_elements = None
-            for selector in selectors:
-                elements = page.locator(selector)
-                count = await elements.count()
-                if count > 0:
-                    thumbnail_elements = elements
-                    break
-            
-            if thumbnail_elements is None:
-                return thumbnails
-            
+            thumbnail_elements = page.locator(THUMBNAIL_SELECTOR)
             count = min(await thumbnail_elements.count(), max_thumbnails)
             
             for i in range(count):
@@ -182,9 +201,9 @@ class ScreenshotService:
                     element = thumbnail_elements.nth(i)
                     # 요소가 보이는지 확인
                     if await element.is_visible():
-                        # 요소로 스크롤
+                        # 요소로 스크롤 후 (지연 로딩) 썸네일 이미지가 그려질 때까지 대기
                         await element.scroll_into_view_if_needed()
-                        await page.wait_for_timeout(300)
+                        await self._wait_for_images(page, NTH_THUMBNAIL_JS, i)
                         
                         # 요소 스크린샷
                         screenshot_bytes = await element.screenshot()
@@ -205,13 +224,10 @@ class ScreenshotService:
         channel_urls: List[str],
         **kwargs
     ) -> List[ChannelScreenshot]:
-        """여러 채널 스크린샷 캡처"""
-        results = []
-        for url in channel_urls:
-            result = await self.capture_channel(url, **kwargs)
-            results.append(result)
-        return results
-
+        """여러 채널 스크린샷 동시 캡처 - 채널마다 풀에서 별도 컨텍스트의 페이지를 임대"""
+        return list(await asyncio.gather(
+            *[self.capture_channel(url, **kwargs) for url in channel_urls]
+        ))
 
 # 싱글톤 인스턴스
 screenshot_service = ScreenshotService()
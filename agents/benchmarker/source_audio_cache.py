@@ -0,0 +1,156 @@
+"""원본 오디오 구간 캐시 - 영상 ID별로 내려받은 구간 WAV 보관 (크기 제한 LRU)"""
+
+import io
+import os
+import re
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from agents.config import agent_settings
+
+
+_VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{6,20}$")
+_RANGE_PATTERN = re.compile(r"^(\d+)-(\d+)\.wav$")
+
+
+@dataclass
+class CachedRange:
+    """캐시된 원본 구간 (초 단위, 영상 기준 절대 시간)"""
+    path: Path
+    start: float
+    end: float
+    size: int
+
+
+class SourceAudioCache:
+    """{cache_dir}/{video_id}/{start_ms}-{end_ms}.wav
+
+    구간 WAV는 24kHz 모노로 저장하며, 요청 구간을 완전히 포함하는 파일이 있으면 재사용한다.
+    최근 사용 시각은 파일 mtime으로 기록하므로 재시작 후에도 LRU 순서가 유지된다.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._index: Optional[Dict[str, Dict[str, CachedRange]]] = None  # video_id -> name -> range
+        self._total_bytes = 0
+
+    def _load_index(self) -> Dict[str, Dict[str, CachedRange]]:
+        if self._index is None:
+            self._index = {}
+            self._total_bytes = 0
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for path in self.cache_dir.glob("*/*.wav"):
+                match = _RANGE_PATTERN.match(path.name)
+                if not match:
+                    continue
+                try:
+                    size = path.stat().st_size
+                except OSError:
+                    continue
+                self._index.setdefault(path.parent.name, {})[path.name] = CachedRange(
+                    path=path,
+                    start=int(match.group(1)) / 1000,
+                    end=int(match.group(2)) / 1000,
+                    size=size,
+                )
+                self._total_bytes += size
+        return self._index
+
+    def find(self, video_id: str, start: float, end: float) -> Optional[CachedRange]:
+        """[start, end]를 포함하는 캐시 구간 (가장 짧은 것)"""
+        ranges = self._load_index().get(video_id, {})
+        covering = [r for r in ranges.values() if r.start <= start and r.end >= end]
+        if not covering:
+            return None
+
+        best = min(covering, key=lambda r: r.end - r.start)
+        if not best.path.exists():
+            self._drop(video_id, best.path.name)
+            return None
+        now = time.time()
+        try:
+            os.utime(best.path, (now, now))
+        except OSError:
+            pass
+        return best
+
+    def put(self, video_id: str, start: float, wav_bytes: bytes) -> CachedRange:
+        """start부터 시작하는 구간 WAV 저장 - 끝 시각은 실제 오디오 길이로 기록"""
+        if not _VIDEO_ID_PATTERN.match(video_id):
+            raise ValueError(f"Invalid video id: {video_id}")
+
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wav:
+            duration = wav.getnframes() / wav.getframerate()
+
+        start_ms = int(round(start * 1000))
+        end_ms = start_ms + int(duration * 1000)
+        name = f"{start_ms}-{end_ms}.wav"
+        index = self._load_index()
+        if name in index.get(video_id, {}):
+            self._drop(video_id, name)
+
+        path = self.cache_dir / video_id / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".part")
+        tmp_path.write_bytes(wav_bytes)
+        os.replace(tmp_path, path)
+
+        cached = CachedRange(path=path, start=start_ms / 1000, end=end_ms / 1000, size=len(wav_bytes))
+        index.setdefault(video_id, {})[name] = cached
+        self._total_bytes += cached.size
+        self._evict(keep=path)
+        return cached
+
+    def _drop(self, video_id: str, name: str):
+        ranges = self._index.get(video_id, {})
+        cached = ranges.pop(name, None)
+        if not ranges:
+            self._index.pop(video_id, None)
+        if cached is None:
+            return
+        self._total_bytes -= cached.size
+        try:
+            cached.path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self, keep: Path):
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        def last_used(cached: CachedRange) -> float:
+            try:
+                return cached.path.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        entries = [
+            (last_used(cached), video_id, name)
+            for video_id, ranges in self._index.items()
+            for name, cached in ranges.items()
+            if cached.path != keep
+        ]
+        for _, video_id, name in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._drop(video_id, name)
+
+    def stats(self) -> Dict[str, int]:
+        index = self._load_index()
+        return {
+            "videos": len(index),
+            "ranges": sum(len(ranges) for ranges in index.values()),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# 싱글톤 인스턴스
+source_audio_cache = SourceAudioCache(
+    Path(agent_settings.source_audio_cache_dir),
+    agent_settings.source_audio_cache_mb * 1024 * 1024,
+)
@@ -0,0 +1,162 @@
+"""Benchmark Cache Tests - 정규화 URL 인덱스, TTL/stale, 이전 JSON 캐시 이전"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agents.benchmarker.cache_service import BenchmarkCache, get_cache_key
+from agents.benchmarker.channel_artifacts import ChannelArtifacts
+from agents.benchmarker.schemas import ChannelMetadata, VideoMetadata
+
+
+def _age(cache: BenchmarkCache, seconds: float):
+    """저장된 리포트/부분 결과를 seconds만큼 오래된 것으로 만듦"""
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("UPDATE benchmark_reports SET updated_at = updated_at - ?", (seconds,))
+        conn.execute("UPDATE channel_entries SET collected_at = collected_at - ?", (seconds,))
+
+
+def test_index_and_freshness():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = BenchmarkCache(Path(tmpdir) / "benchmarks.db", ttl=3600, max_stale=86400)
+        urls = ["https://www.youtube.com/@Alpha/videos", "https://youtube.com/channel/UC123"]
+        key = cache.save(urls, {"channel_concept": "요리 채널"})
+        assert key == get_cache_key(["@alpha", "https://youtube.com/channel/UC123/"])
+
+        # 다른 표기의 URL로도 같은 조합 리포트 검색
+        found = cache.find("https://youtube.com/%40alpha")
+        assert found["cache_key"] == key and found["fresh"]
+        assert found["report"] == {"channel_concept": "요리 채널"}
+        assert cache.find("https://www.youtube.com/channel/UC123")["cache_key"] == key
+
+        # TTL 경과: stale로 반환, max_stale 경과: 없음
+        _age(cache, 7200)
+        stale = cache.find("@alpha")
+        assert stale is not None and not stale["fresh"] and stale["age_seconds"] >= 7200
+        _age(cache, 86400)
+        assert cache.find("@alpha") is None
+
+        # 채널별 부분 결과는 fresh_only 기본
+        cache.put_channel_entry(urls[0], "collection", {"videos": [1, 2]})
+        assert cache.get_channel_entry("@ALPHA", "collection")["data"] == {"videos": [1, 2]}
+        _age(cache, 7200)
+        assert cache.get_channel_entry("@alpha", "collection") is None
+        assert cache.get_channel_entry("@alpha", "collection", fresh_only=False)["data"]["videos"] == [1, 2]
+
+        assert cache.delete("https://youtube.com/@alpha")
+        assert cache.find(urls[1]) is None
+        assert cache.get_channel_entry("@alpha", "collection", fresh_only=False) is None
+    print("✓ Index/freshness OK")
+
+
+def test_legacy_import():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy = {
+            "cache_key": "old",
+            "channel_urls": ["https://youtube.com/@beta"],
+            "created_at": "2024-01-01T10:00:00",
+            "updated_at": "2024-01-01T10:00:00",
+            "report": {"brand_voice": "친근함"},
+        }
+        (Path(tmpdir) / "old.json").write_text(json.dumps(legacy), encoding="utf-8")
+        (Path(tmpdir) / "index_abc.json").write_text(json.dumps({"cache_key": "old"}), encoding="utf-8")
+
+        cache = BenchmarkCache(Path(tmpdir) / "benchmarks.db", ttl=3600, max_stale=10 * 365 * 86400, legacy_dir=Path(tmpdir))
+        found = cache.find("@beta")
+        assert found["report"] == {"brand_voice": "친근함"}
+        assert found["created_at"].startswith("2024-01-01") and not found["fresh"]
+        assert found["age_seconds"] > 365 * 86400  # 파일의 updated_at 기준
+    print("✓ Legacy import OK")
+
+
+def test_channel_artifacts_shared_across_reports():
+    """{A, B} 분석 때 저장한 A의 수집/비전 결과를 {A, C} 분석에서 그대로 사용"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = BenchmarkCache(Path(tmpdir) / "benchmarks.db", ttl=3600, max_stale=86400)
+        artifacts = ChannelArtifacts(cache)
+        video = VideoMetadata("v1", "제목", "", 100, 10, 1, 60, "20240101", "https://i.ytimg.com/v1.jpg")
+        artifacts.save_collection({
+            "url": "https://youtube.com/@alpha",
+            "channel_info": ChannelMetadata("UC1", "Alpha", 1000, 1, "", ""),
+            "videos": [video],
+            "transcripts": [{"video_id": "v1", "title": "제목", "transcript": "안녕하세요"}],
+            "thumbnail_urls": [video.thumbnail_url],
+        })
+        artifacts.save_vision("https://youtube.com/@alpha", {"channel": "Alpha", "grid": "밝은 색감", "thumbnails": []})
+        cache.save(["https://youtube.com/@alpha", "https://youtube.com/@beta"], {})
+
+        data = artifacts.load_collection("https://www.youtube.com/@Alpha/videos")
+        assert data["url"] == "https://www.youtube.com/@Alpha/videos"
+        assert data["channel_info"].channel_name == "Alpha" and data["videos"] == [video]
+        assert data["transcripts"][0]["transcript"] == "안녕하세요" and data["collected_at"] > 0
+        assert artifacts.load_vision("@alpha")["grid"] == "밝은 색감"
+        assert artifacts.load_collection("@gamma") is None
+    print("✓ Channel artifacts OK")
+
+
+def test_reanalysis_refetches_sibling_channels():
+    """{A, B} 리포트를 A로 찾아 다시 분석하면 B도 저장된 수집 데이터 대신 새로 수집"""
+    import asyncio
+    import agents.benchmarker.agent as agent_module
+
+    class FakeYouTube:
+        def __init__(self):
+            self.fetched = []
+
+        def is_channel_url(self, url):
+            return True
+
+        async def get_channel_overview(self, url, limit):
+            self.fetched.append(url)
+            return ChannelMetadata("UC2", "Beta", 10, 0, "", ""), []
+
+        async def get_thumbnails(self, videos, limit):
+            return []
+
+    alpha, beta = "https://youtube.com/@alpha", "https://youtube.com/@beta"
+    originals = (agent_module.channel_artifacts, agent_module.delete_benchmark, agent_module.youtube_service)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = BenchmarkCache(Path(tmpdir) / "benchmarks.db", ttl=3600, max_stale=86400)
+        artifacts = ChannelArtifacts(cache)
+        youtube = FakeYouTube()
+        agent_module.channel_artifacts = artifacts
+        agent_module.delete_benchmark = cache.delete
+        agent_module.youtube_service = youtube
+        try:
+            for url, name in ((alpha, "Alpha"), (beta, "Beta")):
+                artifacts.save_collection({
+                    "url": url, "channel_info": ChannelMetadata("UC", name, 1, 0, "", ""),
+                    "videos": [], "transcripts": [], "thumbnail_urls": [],
+                })
+                artifacts.save_vision(url, {"channel": name, "grid": "저장된 분석", "thumbnails": []})
+            cache.save([alpha, beta], {})
+
+            agent = agent_module.BenchmarkerAgent()
+            agent.use_cached = True
+            agent.pending_url = alpha
+            agent.cached_report = cache.find(alpha)
+
+            async def ask(url):
+                return url
+            agent._handle_ask_phase = ask
+
+            assert asyncio.run(agent._handle_confirm_phase("다시 분석")) == alpha
+            assert artifacts.load_vision(beta) is None
+
+            data = asyncio.run(agent._analyze_single_channel(beta))
+            assert youtube.fetched == [beta] and data["channel_info"].channel_id == "UC2"
+        finally:
+            agent_module.channel_artifacts, agent_module.delete_benchmark, agent_module.youtube_service = originals
+    print("✓ Re-analysis refetches sibling channels OK")
+
+
+if __name__ == "__main__":
+    test_index_and_freshness()
+    test_legacy_import()
+    test_channel_artifacts_shared_across_reports()
+    test_reanalysis_refetches_sibling_channels()
+    print("All tests passed!")
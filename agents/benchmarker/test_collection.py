@@ -0,0 +1,104 @@
+"""벤치마크 수집 동시성 테스트 - 지연이 있는 가짜 yt-dlp 사용"""
+import asyncio
+import json
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agents.benchmarker.collection import CollectionProgress, ProcessGate
+from agents.benchmarker.youtube_service import YouTubeService
+
+
+DELAY = 0.3
+
+# 실행 구간(시작/끝 시각)을 기록하고 DELAY 후 채널 JSON 출력
+FAKE_YTDLP = textwrap.dedent("""\
+    #!{python}
+    import json, os, sys, time
+    start = time.time()
+    time.sleep({delay})
+    args = sys.argv[1:]
+    url = args[-1]
+    if "--flat-playlist" in args:
+        for i in range(30):
+            print(json.dumps({{"id": f"vid{{i:08d}}", "title": f"영상 {{i}}", "view_count": 1000 - i}}))
+    else:
+        print(json.dumps({{"channel_id": "UC1", "channel": url.split("@")[1].split("/")[0],
+                          "channel_follower_count": 12345, "title": "첫 영상"}}))
+    with open(os.environ["FAKE_LOG"], "a") as log:
+        log.write(json.dumps([start, time.time()]) + "\\n")
+""")
+
+
+def _peak_concurrency(intervals):
+    events = sorted([(s, 1) for s, _ in intervals] + [(e, -1) for _, e in intervals])
+    peak = current = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def test_channels_collected_concurrently_under_process_limit():
+    """채널 3개 = 가장 느린 채널 수준의 시간, yt-dlp 동시 실행 수는 제한 이하"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ytdlp = os.path.join(tmpdir, "yt-dlp")
+        with open(ytdlp, "w") as f:
+            f.write(FAKE_YTDLP.format(python=sys.executable, delay=DELAY))
+        os.chmod(ytdlp, os.stat(ytdlp).st_mode | stat.S_IEXEC)
+        log = os.path.join(tmpdir, "calls.log")
+        os.environ["FAKE_LOG"] = log
+
+        service = YouTubeService()
+        service.backend = "cli"
+        service.ytdlp_path = ytdlp
+        service.gate = ProcessGate(max_processes=4, min_interval=0.01)
+
+        events = []
+        progress = CollectionProgress(lambda status, detail: events.append(status))
+        urls = [f"https://www.youtube.com/@channel{i}" for i in range(3)]
+
+        async def run():
+            return await asyncio.gather(*[
+                progress.track(url, service.get_channel_overview(url, max_videos=20)) for url in urls
+            ])
+
+        started = time.time()
+        results = asyncio.run(run())
+        elapsed = time.time() - started
+
+        for url, (info, videos) in zip(urls, results):
+            assert info.channel_name == url.split("@")[1]
+            assert info.video_count == 30 and len(videos) == 20
+
+        with open(log) as f:
+            intervals = [json.loads(line) for line in f]
+        assert len(intervals) == 6  # 채널당 2회
+        assert _peak_concurrency(intervals) <= 4
+        # 순차 실행이면 6 * DELAY 이상 - 동시 실행은 2 라운드(4개 + 2개)
+        assert elapsed < 5 * DELAY, elapsed
+        assert events[-1] == "데이터 수집 (3/3)"
+        print(f"✓ Concurrent collection OK ({elapsed:.2f}s)")
+
+        # 채널 확인(get_channel_info) 후 분석: 다른 표기의 같은 채널은 캐시에서 응답
+        async def again():
+            return await asyncio.gather(
+                service.get_channel_info("https://youtube.com/@Channel0/"),
+                service.get_channel_overview("https://www.youtube.com/@channel0/videos", max_videos=5),
+            )
+
+        info, (_, videos) = asyncio.run(again())
+        assert info.subscriber_count == 12345 and len(videos) == 5
+        with open(log) as f:
+            assert len(f.readlines()) == 6
+        print("✓ Info cache OK")
+
+
+if __name__ == "__main__":
+    test_channels_collected_concurrently_under_process_limit()
+    print("All tests passed!")
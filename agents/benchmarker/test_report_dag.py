@@ -0,0 +1,139 @@
+"""Report DAG Tests - 병렬 실행, 스테이지 캐시, 실패 스테이지만 재실행"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agents.benchmarker.report_dag import ReportDAG, ReportStage, StageCache
+
+
+DELAY = 0.2
+
+
+def _build(report: dict, calls: list, broken: set):
+    """thumbnail/script/content 독립, concept는 content 의존, guide는 전부 의존"""
+
+    def stage(name, deps=()):
+        async def run():
+            calls.append(name)
+            await asyncio.sleep(DELAY)
+            if name in broken:
+                raise RuntimeError(f"{name} down")
+            return {"from": [report[d] for d in deps], "name": name}
+
+        return ReportStage(
+            name=name,
+            run=run,
+            apply=lambda value: report.__setitem__(name, value),
+            fallback=lambda error: {"error": error},
+            deps=deps,
+            inputs=lambda: "channel-data",
+        )
+
+    return [
+        stage("guide", ("thumbnail", "script", "concept")),
+        stage("thumbnail"),
+        stage("script"),
+        stage("content"),
+        stage("concept", ("content",)),
+    ]
+
+
+def test_parallel_cache_and_retry():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = StageCache(tmpdir, ttl=3600)
+
+        async def run(broken):
+            report, calls = {}, []
+            started = time.monotonic()
+            outcomes = await ReportDAG(_build(report, calls, broken), cache=cache, max_attempts=2).run()
+            return report, calls, outcomes, time.monotonic() - started
+
+        # 최장 경로(content -> concept -> guide)는 3단계 - 5개 순차 실행보다 빠름
+        report, calls, outcomes, elapsed = asyncio.run(run(broken={"script"}))
+        assert elapsed < 4 * DELAY
+        assert calls.count("script") == 2  # 재시도 후 실패
+        assert outcomes["script"].status == "failed"
+        assert report["script"] == {"error": "script down"}
+        assert report["guide"]["from"][2]["from"][0]["name"] == "content"
+
+        # 재실행: 성공했던 스테이지는 캐시, 실패한 스테이지와 그 결과를 쓰는 스테이지만 실행
+        report, calls, outcomes, _ = asyncio.run(run(broken=set()))
+        assert sorted(calls) == ["guide", "script"]
+        assert outcomes["concept"].status == "cached"
+        assert report["guide"]["from"][1] == {"from": [], "name": "script"}
+
+        # 다시 분석: 입력이 같아도 캐시를 읽지 않고 전부 실행
+        calls = []
+        outcomes = asyncio.run(ReportDAG(_build({}, calls, set()), cache=cache).run(refresh=True))
+        assert sorted(calls) == ["concept", "content", "guide", "script", "thumbnail"]
+        assert all(outcome.status == "done" for outcome in outcomes.values())
+        print("✓ Report DAG OK")
+
+
+def test_cycle_rejected():
+    stages = _build({}, [], set())
+    stages[3].deps = ("guide",)  # content -> guide -> concept -> content
+    try:
+        ReportDAG(stages)
+    except ValueError as e:
+        assert "cycle" in str(e)
+    else:
+        raise AssertionError("cycle not detected")
+    print("✓ Cycle detection OK")
+
+
+def test_refresh_keeps_stale_report_on_failure():
+    """백그라운드 갱신은 실패한 스테이지가 있으면 저장하지 않음 (다음 조회 때 재시도)"""
+    import agents.benchmarker.agent as agent_module
+
+    saved = []
+    originals = (
+        agent_module.save_benchmark,
+        agent_module.report_stage_cache,
+        agent_module.BenchmarkerAgent._analyze_channels,
+        agent_module.BenchmarkerAgent._build_report_stages,
+    )
+    broken = {"script"}
+    calls = []
+
+    async def no_collection(self):
+        self.channels_data = []
+
+    def stages(self):
+        return _build({}, calls, broken)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        agent_module.save_benchmark = lambda urls, report: saved.append(urls) or "key"
+        agent_module.report_stage_cache = StageCache(tmpdir, ttl=3600)
+        agent_module.BenchmarkerAgent._analyze_channels = no_collection
+        agent_module.BenchmarkerAgent._build_report_stages = stages
+        try:
+            urls = ["https://www.youtube.com/@chan"]
+            asyncio.run(agent_module._refresh_benchmark(urls))
+            assert saved == []
+
+            broken.clear()
+            calls.clear()
+            asyncio.run(agent_module._refresh_benchmark(urls))
+            assert saved == [urls]
+            # 갱신은 캐시된 스테이지 결과를 재사용하지 않음
+            assert sorted(calls) == ["concept", "content", "guide", "script", "thumbnail"]
+        finally:
+            (
+                agent_module.save_benchmark,
+                agent_module.report_stage_cache,
+                agent_module.BenchmarkerAgent._analyze_channels,
+                agent_module.BenchmarkerAgent._build_report_stages,
+            ) = originals
+    print("✓ Refresh keeps stale report OK")
+
+
+if __name__ == "__main__":
+    test_parallel_cache_and_retry()
+    test_cycle_rejected()
+    test_refresh_keeps_stale_report_on_failure()
+    print("All tests passed!")
@@ -0,0 +1,181 @@
+"""ScreenshotService 캡처 테스트 - 로컬 HTML 픽스처 (playwright + chromium 필요)"""
+import asyncio
+import os
+import sys
+import time
+import unittest
+from contextlib import asynccontextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from aiohttp import web
+
+from apps.api.services import browser_pool as browser_pool_module
+from apps.api.services.browser_pool import BrowserPool
+from agents.benchmarker import screenshot_service as screenshot_module
+from agents.benchmarker.screenshot_service import ScreenshotService
+
+
+HYDRATE_MS = 400  # 그리드가 스크립트로 늦게 그려지는 상황
+IMAGE_DELAY = 0.3  # 썸네일 이미지 응답 지연
+
+# YouTube /videos 구조를 흉내낸 페이지: 지연 렌더링 + 스크롤 시 항목 추가
+FIXTURE_HTML = """<!doctype html>
+<html>
+<body style="margin:0">
+  <yt-formatted-string id="text" class="ytd-channel-name">%(name)s</yt-formatted-string>
+  <button id="consent" style="display:none">Accept all</button>
+  <div id="grid" style="display:flex;flex-wrap:wrap;width:1800px"></div>
+  <div style="height:3000px"></div>
+  <script>
+    let added = 0;
+    function addItems(n) {
+      const grid = document.getElementById('grid');
+      for (let i = 0; i < n; i++, added++) {
+        const item = document.createElement('ytd-rich-item-renderer');
+        item.innerHTML = '<ytd-thumbnail style="display:block;width:320px;height:180px">' +
+          '<img src="/thumb/' + added + '.png" width="320" height="180"></ytd-thumbnail>';
+        grid.appendChild(item);
+      }
+    }
+    const mode = '%(mode)s';
+    if (mode === 'consent') {
+      // 동의 전에는 그리드를 그리지 않음
+      const button = document.getElementById('consent');
+      button.style.display = 'block';
+      button.addEventListener('click', () => { button.remove(); setTimeout(() => addItems(8), %(hydrate)d); });
+    } else if (mode === 'grid') {
+      setTimeout(() => addItems(8), %(hydrate)d);
+    }
+    window.addEventListener('scroll', () => { if (added) addItems(4); });
+  </script>
+</body>
+</html>"""
+
+# 1x1 PNG
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d49444154789c6300010000050001a5f645400000000049454e44ae426082"
+)
+
+
+async def _start_server():
+    async def videos(request):
+        channel = request.match_info["channel"]
+        mode = "consent" if channel.startswith("consent") else "empty" if channel.startswith("empty") else "grid"
+        html = FIXTURE_HTML % {"name": channel, "hydrate": HYDRATE_MS, "mode": mode}
+        return web.Response(text=html, content_type="text/html")
+
+    async def thumb(request):
+        await asyncio.sleep(IMAGE_DELAY)
+        return web.Response(body=PIXEL_PNG, content_type="image/png")
+
+    app = web.Application()
+    app.router.add_get("/{channel}/videos", videos)
+    app.router.add_get("/thumb/{name}", thumb)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def _require_playwright():
+    if browser_pool_module.async_playwright is None:
+        raise unittest.SkipTest("playwright 미설치")
+
+
+def test_concurrent_capture_waits_on_dom():
+    """그리드/썸네일 한 번의 이동으로 캡처, 여러 채널은 동시에 (채널 1개 시간 수준)"""
+    _require_playwright()
+
+    async def run():
+        runner, base_url = await _start_server()
+        pool = BrowserPool(max_pages=4)
+        service = ScreenshotService(pool=pool)
+        try:
+            await service.capture_channel(f"{base_url}/warmup")  # 브라우저 기동 제외
+
+            started = time.monotonic()
+            single = await service.capture_channel(f"{base_url}/chan0", max_thumbnails=4)
+            single_elapsed = time.monotonic() - started
+
+            started = time.monotonic()
+            results = await service.capture_multiple_channels(
+                [f"{base_url}/chan{i}" for i in range(1, 4)], max_thumbnails=4
+            )
+            multi_elapsed = time.monotonic() - started
+        finally:
+            await pool.close()
+            await runner.cleanup()
+
+        assert single.channel_name == "chan0"
+        assert single.videos_page and len(single.thumbnail_screenshots) == 4
+        assert [r.channel_name for r in results] == ["chan1", "chan2", "chan3"]
+        assert all(r.videos_page and len(r.thumbnail_screenshots) == 4 for r in results)
+        # 고정 대기(스크롤당 1초 + 0.5초 + 썸네일당 0.3초) 없이 페이지 로드 시간 수준
+        assert single_elapsed < 3.0
+        assert multi_elapsed < 2 * single_elapsed
+
+    asyncio.run(run())
+    print("✓ Concurrent capture OK")
+
+
+def test_consent_popup_and_missing_grid():
+    """동의 팝업은 눌러서 그리드를 기다리고, 그리드가 끝내 없으면 현재 화면만 캡처"""
+    _require_playwright()
+
+    async def run():
+        runner, base_url = await _start_server()
+        pool = BrowserPool(max_pages=2)
+        service = ScreenshotService(pool=pool)
+        original_timeout = screenshot_module.GRID_TIMEOUT_MS
+        screenshot_module.GRID_TIMEOUT_MS = 1500
+        try:
+            consent = await service.capture_channel(f"{base_url}/consent0", max_thumbnails=4)
+            empty = await service.capture_channel(f"{base_url}/empty0", max_thumbnails=4)
+        finally:
+            screenshot_module.GRID_TIMEOUT_MS = original_timeout
+            await pool.close()
+            await runner.cleanup()
+
+        assert consent.videos_page and len(consent.thumbnail_screenshots) == 4
+        assert empty.channel_name == "empty0"
+        assert empty.videos_page and empty.thumbnail_screenshots == []
+
+    asyncio.run(run())
+    print("✓ Consent popup / missing grid OK")
+
+
+def test_capture_failure_reaches_pool():
+    """이동 실패는 부분 결과로 돌려주되 pool.page까지 전달되어 컨텍스트가 폐기되어야 함"""
+
+    class FailingPage:
+        async def goto(self, url, **kwargs):
+            raise TimeoutError("Navigation timeout")
+
+    class RecordingPool:
+        def __init__(self):
+            self.errors = []
+
+        @asynccontextmanager
+        async def page(self, **kwargs):
+            try:
+                yield FailingPage()
+            except BaseException as e:
+                self.errors.append(e)
+                raise
+
+    pool = RecordingPool()
+    result = asyncio.run(ScreenshotService(pool=pool).capture_channel("https://youtube.com/@chan"))
+    assert result.channel_url == "https://youtube.com/@chan" and result.videos_page is None
+    assert [type(e) for e in pool.errors] == [TimeoutError]
+    print("✓ Capture failure reaches pool OK")
+
+
+if __name__ == "__main__":
+    test_concurrent_capture_waits_on_dom()
+    test_consent_popup_and_missing_grid()
+    test_capture_failure_reaches_pool()
+    print("All tests passed!")
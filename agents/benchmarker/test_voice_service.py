@@ -0,0 +1,177 @@
+"""VoiceService 구간 추출 테스트 - 로컬 가짜 yt-dlp/ffmpeg와 WAV 미디어 사용"""
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from agents.benchmarker.source_audio_cache import SourceAudioCache
+from agents.benchmarker.voice_service import VoiceService, VoiceServiceV2
+from libs.audio import dsp
+
+
+VIDEO_URL = "https://www.youtube.com/watch?v=abcDEF12345"
+SAMPLE_RATE = 24000
+MEDIA_SECONDS = 600  # 10분 원본
+
+# 가짜 yt-dlp: -g는 로컬 미디어 경로를 "스트림 URL"로 출력, --download-sections는 구간 WAV 저장
+FAKE_YTDLP = textwrap.dedent("""\
+    #!{python}
+    import io, os, sys, wave
+    args = sys.argv[1:]
+    with open(os.environ["FAKE_LOG"], "a") as log:
+        log.write("yt-dlp " + " ".join(args) + "\\n")
+    media = os.environ["FAKE_MEDIA"]
+    if "-g" in args:
+        print(media)
+        sys.exit(0)
+    start, end = (float(x) for x in args[args.index("--download-sections") + 1].lstrip("*").split("-"))
+    out = args[args.index("-o") + 1].replace("%(ext)s", "wav")
+    with wave.open(media, "rb") as src:
+        rate = src.getframerate()
+        src.setpos(int(start * rate))
+        frames = src.readframes(int((end - start) * rate))
+        params = src.getparams()
+    with wave.open(out, "wb") as dst:
+        dst.setparams(params)
+        dst.writeframes(frames)
+""")
+
+# 가짜 ffmpeg: -ss/-i/-t 입력 seek 후 s16le를 stdout으로 출력
+FAKE_FFMPEG = textwrap.dedent("""\
+    #!{python}
+    import os, sys, wave
+    args = sys.argv[1:]
+    with open(os.environ["FAKE_LOG"], "a") as log:
+        log.write("ffmpeg " + " ".join(args) + "\\n")
+    start = float(args[args.index("-ss") + 1])
+    duration = float(args[args.index("-t") + 1])
+    with wave.open(args[args.index("-i") + 1], "rb") as src:
+        rate = src.getframerate()
+        src.setpos(min(int(start * rate), src.getnframes()))
+        sys.stdout.buffer.write(src.readframes(int(duration * rate)))
+""")
+
+
+def _write_script(path: str, body: str):
+    with open(path, "w") as f:
+        f.write(body.format(python=sys.executable))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+def _make_env(tmpdir: str, with_ffmpeg: bool, service_class=VoiceService):
+    """가짜 바이너리 + 10분 WAV (각 초의 값이 초 번호로 식별 가능한 계단 신호)"""
+    media = os.path.join(tmpdir, "media.wav")
+    seconds = np.repeat(np.arange(MEDIA_SECONDS, dtype=np.float32), SAMPLE_RATE)
+    with open(media, "wb") as f:
+        f.write(dsp.encode_wav(seconds / 1000, SAMPLE_RATE))
+
+    ytdlp = os.path.join(tmpdir, "yt-dlp")
+    _write_script(ytdlp, FAKE_YTDLP)
+    ffmpeg = os.path.join(tmpdir, "ffmpeg")
+    if with_ffmpeg:
+        _write_script(ffmpeg, FAKE_FFMPEG)
+
+    log = os.path.join(tmpdir, "calls.log")
+    os.environ["FAKE_LOG"] = log
+    os.environ["FAKE_MEDIA"] = media
+
+    service = service_class(
+        ytdlp_path=ytdlp,
+        ffmpeg_path=ffmpeg,
+        source_cache=SourceAudioCache(os.path.join(tmpdir, "cache"), 64 * 1024 * 1024),
+        range_padding=10,
+    )
+    return service, log
+
+
+def _calls(log: str):
+    if not os.path.exists(log):
+        return []
+    with open(log) as f:
+        return [line.split()[0] for line in f]
+
+
+def _second_at(audio_bytes: bytes, t: float) -> int:
+    samples, rate = dsp.decode_wav(audio_bytes)
+    return int(round(samples[int(t * rate)] * 1000))
+
+
+def test_stream_seek_range_and_cache():
+    """스트림 seek로 구간만 받고, 근처 구간 재요청은 캐시에서 처리"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        service, log = _make_env(tmpdir, with_ffmpeg=True)
+
+        async def run():
+            audio, video_id = await service.extract_audio_segment(VIDEO_URL, "5:00", "5:05")
+            assert video_id == "abcDEF12345"
+            samples, rate = dsp.decode_wav(audio)
+            assert rate == SAMPLE_RATE and len(samples) == 5 * SAMPLE_RATE
+            assert _second_at(audio, 0.5) == 300 and _second_at(audio, 4.5) == 304
+            assert _calls(log) == ["yt-dlp", "ffmpeg"]
+
+            # 여유 구간(±10초) 안의 재요청 - 외부 프로세스 호출 없음
+            audio, _ = await service.extract_audio_segment(VIDEO_URL, "298", "303")
+            assert _second_at(audio, 0.5) == 298
+            assert _calls(log) == ["yt-dlp", "ffmpeg"]
+
+            # 캐시 밖 구간 - 스트림 URL은 재사용, ffmpeg만 다시 실행
+            audio, _ = await service.extract_audio_segment(VIDEO_URL, "9:00", "9:03")
+            assert _second_at(audio, 1.5) == 541
+            assert _calls(log) == ["yt-dlp", "ffmpeg", "ffmpeg"]
+
+        asyncio.run(run())
+        print("✓ Stream seek + cache OK")
+
+
+def test_download_sections_fallback():
+    """ffmpeg seek 실패 시 yt-dlp --download-sections로 구간만 다운로드"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        service, log = _make_env(tmpdir, with_ffmpeg=False)
+
+        async def run():
+            audio, _ = await service.extract_audio_segment(VIDEO_URL, "1:00", "1:04")
+            samples, _ = dsp.decode_wav(audio)
+            assert len(samples) == 4 * SAMPLE_RATE
+            assert _second_at(audio, 0.5) == 60 and _second_at(audio, 3.5) == 63
+            assert _calls(log) == ["yt-dlp", "yt-dlp"]  # -g, --download-sections
+
+            stats = service.source_cache.stats()
+            assert stats["ranges"] == 1
+            assert stats["bytes"] < 2 * 30 * SAMPLE_RATE  # 전체(10분)가 아닌 구간만 저장
+
+        asyncio.run(run())
+        print("✓ --download-sections fallback OK")
+
+
+def test_preprocess_segment_streams_cached_range():
+    """자동 전처리는 캐시된 구간 파일을 스트리밍 분석하고 선택 구간만 다시 읽음"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        service, log = _make_env(tmpdir, with_ffmpeg=True, service_class=VoiceServiceV2)
+
+        async def run():
+            processed, video_id = await service.preprocess_segment(
+                VIDEO_URL, 300, 330, target_duration=5.0, denoise=False, normalize=False
+            )
+            assert video_id == "abcDEF12345"
+            start, end = processed.selected_range
+            assert 0 <= start < end <= 30 and abs(processed.original_duration - 30) < 1e-6
+            # 선택 구간의 값이 영상 기준 (300 + start)초와 일치
+            assert _second_at(processed.audio_bytes, 0.5) == int(300 + start + 0.5)
+            # 구간 받기(yt-dlp -g, ffmpeg seek) + 캐시 파일 분석 + 선택 구간 읽기
+            assert _calls(log) == ["yt-dlp", "ffmpeg", "ffmpeg", "ffmpeg"]
+
+        asyncio.run(run())
+        print("✓ Streaming preprocess over cached range OK")
+
+
+if __name__ == "__main__":
+    test_stream_seek_range_and_cache()
+    test_download_sections_fallback()
+    test_preprocess_segment_streams_cached_range()
+    print("All tests passed!")
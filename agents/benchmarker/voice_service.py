@@ -6,11 +6,17 @@ import base64
 import os
 import re
 import tempfile
+import time
 from dataclasses import dataclass
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
+from urllib.parse import parse_qs, urlparse
 
 import httpx
 
+from libs.audio import dsp
+from libs.transcript import transcript_store
+from .source_audio_cache import SourceAudioCache, CachedRange, source_audio_cache
+
 
 @dataclass
 class VoiceSample:
@@ -31,11 +37,16 @@ class VoiceService:
         self, 
         tts_base_url: str = agent_settings.tts_base_url,
         ytdlp_path: str = "yt-dlp",
-        ffmpeg_path: str = "ffmpeg"
+        ffmpeg_path: str = "ffmpeg",
+        source_cache: SourceAudioCache = None,
+        range_padding: int = agent_settings.source_audio_pad_sec
     ):
         self.tts_base_url = tts_base_url
         self.ytdlp_path = ytdlp_path
         self.ffmpeg_path = ffmpeg_path
+        self.source_cache = source_cache or source_audio_cache
+        self.range_padding = range_padding
+        self._stream_urls: Dict[str, Tuple[str, float]] = {}  # video_id -> (url, 만료 시각)
     
     def _parse_time(self, time_str: str) -> int:
         """시간 문자열을 초로 변환 (MM:SS, M:SS, SS, HH:MM:SS)"""
@@ -74,6 +85,101 @@ class VoiceService:
         stdout, stderr = await process.communicate()
         return stdout, stderr
     
+    STREAM_URL_TTL = 1800  # expire 파라미터가 없을 때 스트림 URL 재사용 시간 (초)
+    
+    async def _resolve_audio_stream(self, video_url: str) -> str:
+        """yt-dlp로 bestaudio 스트림 URL 조회 (다운로드 없음, 만료 전까지 재사용)"""
+        video_id = self._extract_video_id(video_url) or video_url
+        cached = self._stream_urls.get(video_id)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        
+        stdout, stderr = await self._run_command([
+            self.ytdlp_path,
+            "-g",
+            "-f", "bestaudio",
+            "--no-playlist",
+            video_url
+        ])
+        lines = stdout.decode(errors="ignore").strip().splitlines()
+        if not lines:
+            raise RuntimeError(f"Failed to resolve audio stream: {stderr.decode(errors='ignore')[:200]}")
+        
+        stream_url = lines[0]
+        expire = parse_qs(urlparse(stream_url).query).get("expire")
+        expires_at = time.time() + self.STREAM_URL_TTL
+        if expire and expire[0].isdigit():
+            expires_at = min(expires_at, int(expire[0]) - 60)
+        self._stream_urls[video_id] = (stream_url, expires_at)
+        return stream_url
+    
+    async def _seek_stream_range(self, video_url: str, start_sec: float, duration: float) -> bytes:
+        """스트림 URL에서 ffmpeg 입력 seek로 구간만 읽기 (HTTP range 요청)"""
+        stream_url = await self._resolve_audio_stream(video_url)
+        stdout, stderr = await self._run_command([
+            self.ffmpeg_path,
+            "-v", "error",
+            "-ss", str(start_sec),
+            "-i", stream_url,
+            "-t", str(duration),
+            "-ar", "24000",  # Qwen3-TTS 권장 샘플레이트
+            "-ac", "1",      # 모노
+            "-f", "s16le",
+            "pipe:1"
+        ])
+        if not stdout:
+            raise RuntimeError(f"Failed to seek stream: {stderr.decode(errors='ignore')[:200]}")
+        return dsp.pcm16_to_wav(stdout[:len(stdout) - len(stdout) % 2], 24000)
+    
+    async def _download_sections(self, video_url: str, video_id: str, start_sec: float, end_sec: float) -> bytes:
+        """yt-dlp --download-sections로 구간만 다운로드 (스트림 seek 실패 시)"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            stdout, stderr = await self._run_command([
+                self.ytdlp_path,
+                "-f", "bestaudio",
+                "--download-sections", f"*{start_sec}-{end_sec}",
+                "--force-keyframes-at-cuts",
+                "-x",
+                "--audio-format", "wav",
+                "-o", os.path.join(tmpdir, f"{video_id}.%(ext)s"),
+                "--no-playlist",
+                video_url
+            ])
+            
+            downloaded = [f for f in os.listdir(tmpdir) if f.startswith(video_id)]
+            if not downloaded:
+                raise RuntimeError(f"Failed to download audio: {stderr.decode(errors='ignore')[:200]}")
+            with open(os.path.join(tmpdir, downloaded[0]), "rb") as f:
+                audio_bytes = f.read()
+        
+        samples, _ = await dsp.decode_audio(audio_bytes, sample_rate=24000, ffmpeg_path=self.ffmpeg_path)
+        return dsp.encode_wav(samples, 24000)
+    
+    async def _fetch_source_range(
+        self,
+        video_url: str,
+        video_id: str,
+        start_sec: float,
+        end_sec: float
+    ) -> CachedRange:
+        """[start_sec, end_sec]를 포함하는 원본 구간 확보 (캐시 → 스트림 seek → 구간 다운로드)"""
+        cached = self.source_cache.find(video_id, start_sec, end_sec)
+        if cached:
+            return cached
+        
+        # 근처 구간 재요청(시간 조정, 스마트 탐색)을 캐시로 처리할 수 있도록 여유를 두고 받음
+        fetch_start = max(0, start_sec - self.range_padding)
+        fetch_end = end_sec + self.range_padding
+        
+        try:
+            wav_bytes = await self._seek_stream_range(video_url, fetch_start, fetch_end - fetch_start)
+        except Exception as e:
+            print(f"Stream seek failed ({e}), falling back to --download-sections")
+            self._stream_urls.pop(video_id, None)
+            wav_bytes = await self._download_sections(video_url, video_id, fetch_start, fetch_end)
+        
+        return self.source_cache.put(video_id, fetch_start, wav_bytes)
+    
     async def extract_audio_segment(
         self,
         video_url: str,
@@ -84,6 +190,8 @@ class VoiceService:
         """
         YouTube 영상에서 특정 구간 오디오 추출
         
+        영상 전체가 아니라 요청 구간(+앞뒤 여유)만 받아 영상 ID별로 캐시한다.
+        
         Args:
             video_url: YouTube 영상 URL
             start_time: 시작 시간 (MM:SS 또는 초)
@@ -107,61 +215,22 @@ class VoiceService:
         if duration > 60:
             raise ValueError("Maximum duration is 60 seconds for voice cloning")
         
-        # 임시 파일 경로
-        with tempfile.TemporaryDirectory() as tmpdir:
-            audio_path = os.path.join(tmpdir, f"{video_id}_full.wav")
-            segment_path = os.path.join(tmpdir, f"{video_id}_segment.{output_format}")
-            
-            # 1. yt-dlp로 오디오 다운로드
-            ytdlp_cmd = [
-                self.ytdlp_path,
-                "-x",  # 오디오만 추출
-                "--audio-format", "wav",
-                "--audio-quality", "0",  # 최고 품질
-                "-o", audio_path,
-                "--no-playlist",
-                video_url
-            ]
-            
-            stdout, stderr = await self._run_command(ytdlp_cmd)
-            
-            # yt-dlp는 확장자를 자동으로 붙일 수 있음
-            if not os.path.exists(audio_path):
-                # .wav 확장자가 추가된 경우
-                if os.path.exists(audio_path + ".wav"):
-                    audio_path = audio_path + ".wav"
-                else:
-                    # 다른 포맷으로 저장된 경우 찾기
-                    for f in os.listdir(tmpdir):
-                        if f.startswith(video_id):
-                            audio_path = os.path.join(tmpdir, f)
-                            break
-            
-            if not os.path.exists(audio_path):
-                raise RuntimeError(f"Failed to download audio: {stderr.decode()}")
-            
-            # 2. ffmpeg로 구간 추출
-            ffmpeg_cmd = [
-                self.ffmpeg_path,
-                "-i", audio_path,
-                "-ss", str(start_sec),
-                "-t", str(duration),
-                "-ar", "24000",  # Qwen3-TTS 권장 샘플레이트
-                "-ac", "1",      # 모노
-                "-y",            # 덮어쓰기
-                segment_path
-            ]
-            
-            stdout, stderr = await self._run_command(ffmpeg_cmd)
-            
-            if not os.path.exists(segment_path):
-                raise RuntimeError(f"Failed to extract segment: {stderr.decode()}")
-            
-            # 3. 파일 읽기
-            with open(segment_path, "rb") as f:
-                audio_bytes = f.read()
-            
-            return audio_bytes, video_id
+        # 1. 원본 구간 확보 (24kHz 모노 WAV)
+        source = await self._fetch_source_range(video_url, video_id, start_sec, end_sec)
+        with open(source.path, "rb") as f:
+            samples, sample_rate = dsp.decode_wav(f.read())
+        
+        # 2. 요청 구간 잘라내기 (인메모리)
+        offset = int((start_sec - source.start) * sample_rate)
+        segment = samples[offset:offset + int(duration * sample_rate)]
+        if len(segment) == 0:
+            raise RuntimeError(f"Requested range is beyond the audio ({source.end:.1f}s)")
+        audio_bytes = dsp.encode_wav(segment, sample_rate)
+        
+        if output_format != "wav":
+            audio_bytes = await dsp.ffmpeg_pipe(audio_bytes, ["-f", output_format], self.ffmpeg_path)
+        
+        return audio_bytes, video_id
     
     async def get_transcript_segment(
         self,
@@ -182,101 +251,11 @@ class VoiceService:
         Returns:
             해당 구간의 자막 텍스트
         """
-        if lang_priority is None:
-            lang_priority = ["ko", "en", "en-US", "ko-KR"]
-        
-        video_id = self._extract_video_id(video_url)
-        if not video_id:
-            return None
-        
         start_sec = self._parse_time(start_time)
         end_sec = self._parse_time(end_time)
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # 자막 다운로드
-            sub_path = os.path.join(tmpdir, "sub")
-            
-            ytdlp_cmd = [
-                self.ytdlp_path,
-                "--write-sub",
-                "--write-auto-sub",
-                "--sub-lang", ",".join(lang_priority),
-                "--skip-download",
-                "--sub-format", "vtt",
-                "-o", sub_path,
-                video_url
-            ]
-            
-            await self._run_command(ytdlp_cmd)
-            
-            # 자막 파일 찾기
-            vtt_content = None
-            for lang in lang_priority:
-                for suffix in ["", "-orig"]:
-                    vtt_path = f"{sub_path}.{lang}{suffix}.vtt"
-                    if os.path.exists(vtt_path):
-                        with open(vtt_path, "r", encoding="utf-8") as f:
-                            vtt_content = f.read()
-                        break
-                if vtt_content:
-                    break
-            
-            if not vtt_content:
-                return None
-            
-            # VTT 파싱 - 시간 범위에 해당하는 텍스트 추출
-            return self._extract_vtt_segment(vtt_content, start_sec, end_sec)
-    
-    def _extract_vtt_segment(self, vtt_content: str, start_sec: int, end_sec: int) -> str:
-        """VTT 자막에서 특정 시간 구간의 텍스트 추출"""
-        lines = []
-        current_time = 0
-        
-        for line in vtt_content.split("\n"):
-            # 타임스탬프 라인 파싱: 00:00:05.000 --> 00:00:08.000
-            time_match = re.match(r"(\d{2}):(\d{2}):(\d{2})\.(\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2})\.(\d{3})", line)
-            if time_match:
-                h1, m1, s1 = int(time_match.group(1)), int(time_match.group(2)), int(time_match.group(3))
-                h2, m2, s2 = int(time_match.group(5)), int(time_match.group(6)), int(time_match.group(7))
-                
-                line_start = h1 * 3600 + m1 * 60 + s1
-                line_end = h2 * 3600 + m2 * 60 + s2
-                
-                # 구간과 겹치는지 확인
-                if line_start < end_sec and line_end > start_sec:
-                    current_time = line_start
-                else:
-                    current_time = -1  # 범위 밖
-                continue
-            
-            # WEBVTT 헤더 등 스킵
-            if line.startswith("WEBVTT") or line.startswith("Kind:") or line.startswith("Language:"):
-                continue
-            
-            # 빈 줄 스킵
-            if not line.strip():
-                continue
-            
-            # 숫자만 있는 라인 스킵 (큐 번호)
-            if line.strip().isdigit():
-                continue
-            
-            # 현재 시간이 범위 내이면 텍스트 추가
-            if current_time >= 0:
-                # HTML 태그 제거
-                clean_line = re.sub(r"<[^>]+>", "", line)
-                if clean_line.strip():
-                    lines.append(clean_line.strip())
-        
-        # 중복 제거 (자동 자막에서 흔함)
-        seen = set()
-        unique_lines = []
-        for line in lines:
-            if line not in seen:
-                seen.add(line)
-                unique_lines.append(line)
-        
-        return " ".join(unique_lines)
+        # 영상 자막은 transcript_store에 한 번만 저장 - 구간마다 yt-dlp를 다시 실행하지 않음
+        return await transcript_store.get_window_text(video_url, start_sec, end_sec, lang_priority)
     
     async def clone_voice(
         self,
@@ -396,11 +375,82 @@ voice_service = VoiceService()
 # Auto-preprocessing integration
 # ============================================
 
-from libs.audio import audio_processor, ProcessedAudio
+from libs.audio import ProcessedAudio, StreamingAudioAnalyzer
 
 
 class VoiceServiceV2(VoiceService):
-    """음성 서비스 확장 - 자동 전처리 포함"""
+    """음성 서비스 확장 - 자동 전처리 포함 (스트리밍 분석)"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.streaming_analyzer = StreamingAudioAnalyzer(ffmpeg_path=self.ffmpeg_path)
+    
+    async def preprocess_segment(
+        self,
+        video_url: str,
+        start_sec: float,
+        end_sec: float,
+        target_duration: float = None,
+        normalize: bool = True,
+        denoise: bool = True
+    ) -> Tuple[ProcessedAudio, str]:
+        """
+        [start_sec, end_sec] 안에서 최적 레퍼런스 구간 추출
+        
+        캐시된 원본 구간 파일을 ffmpeg 파이프로 블록 단위 분석하고 선택 구간만 디코딩한다.
+        
+        Returns:
+            (ProcessedAudio, video_id) - selected_range는 start_sec 기준 상대 시간
+        """
+        video_id = self._extract_video_id(video_url)
+        if not video_id:
+            raise ValueError(f"Invalid YouTube URL: {video_url}")
+        if end_sec <= start_sec:
+            raise ValueError(f"Invalid time range: {start_sec} - {end_sec}")
+        if end_sec - start_sec > 60:
+            raise ValueError("Maximum duration is 60 seconds for voice cloning")
+        
+        source = await self._fetch_source_range(video_url, video_id, start_sec, end_sec)
+        processed = await self.streaming_analyzer.preprocess_for_cloning(
+            str(source.path),
+            target_duration=target_duration,
+            normalize=normalize,
+            denoise=denoise,
+            start=start_sec - source.start,
+            duration=end_sec - start_sec
+        )
+        return processed, video_id
+    
+    async def extract_best_reference(
+        self,
+        video_url: str,
+        target_duration: float = 5.0
+    ) -> Tuple[ProcessedAudio, str]:
+        """
+        영상 전체에서 최적 레퍼런스 구간 탐색 (스트리밍 분석)
+        
+        원본을 파일로 받지 않고 ffmpeg 파이프로 블록 단위 분석하므로
+        긴 영상에서도 메모리 사용량이 일정하다.
+        
+        Returns:
+            (ProcessedAudio, video_id) - selected_range는 영상 기준 절대 시간
+        """
+        video_id = self._extract_video_id(video_url)
+        if not video_id:
+            raise ValueError(f"Invalid YouTube URL: {video_url}")
+        
+        stream_url = await self._resolve_audio_stream(video_url)
+        
+        print(f"Streaming analysis of {video_id} (target: {target_duration}s)...")
+        processed = await self.streaming_analyzer.preprocess_for_cloning(
+            stream_url,
+            target_duration=target_duration,
+            normalize=True
+        )
+        print(f"  Analyzed {processed.original_duration:.1f}s -> "
+              f"{processed.selected_range[0]:.1f}s - {processed.selected_range[1]:.1f}s")
+        
+        return processed, video_id
     
     async def create_voice_sample_auto(
         self,
@@ -432,24 +482,24 @@ class VoiceServiceV2(VoiceService):
         start_sec = self._parse_time(start_time)
         end_sec = self._parse_time(end_time)
         
-        # 1. 오디오 추출
+        # 1. 오디오 추출 (자동 전처리 시 스트리밍 분석으로 최적 구간만 디코딩)
         print(f"Extracting audio from {video_url} ({start_time} - {end_time})...")
-        audio_bytes, video_id = await self.extract_audio_segment(
-            video_url, start_time, end_time
-        )
-        
-        # 2. 자동 전처리
         processed = None
         if auto_preprocess:
             print(f"Auto-preprocessing audio (target: {target_duration}s)...")
-            processed = await audio_processor.preprocess_for_cloning(
-                audio_bytes,
-                target_duration=target_duration,
-                normalize=True
+            processed, video_id = await self.preprocess_segment(
+                video_url,
+                start_sec,
+                end_sec,
+                target_duration=target_duration
             )
             audio_bytes = processed.audio_bytes
             print(f"  Original: {processed.original_duration:.1f}s -> Processed: {processed.duration:.1f}s")
             print(f"  Selected range: {processed.selected_range[0]:.1f}s - {processed.selected_range[1]:.1f}s")
+        else:
+            audio_bytes, video_id = await self.extract_audio_segment(
+                video_url, start_time, end_time
+            )
         
         ref_audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
         
@@ -529,18 +579,12 @@ class VoiceServiceV2(VoiceService):
         
         print(f"Smart extraction: searching around {approximate_time} (±{search_window}s)...")
         
-        # 넓은 범위 추출
-        audio_bytes, video_id = await self.extract_audio_segment(
+        # 넓은 범위를 스트리밍 분석해 최적 구간 찾기
+        processed, video_id = await self.preprocess_segment(
             video_url,
-            str(start_sec),
-            str(end_sec)
-        )
-        
-        # 자동 전처리로 최적 구간 찾기
-        processed = await audio_processor.preprocess_for_cloning(
-            audio_bytes,
-            target_duration=5.0,
-            normalize=True
+            start_sec,
+            end_sec,
+            target_duration=5.0
         )
         
         print(f"Found optimal segment: {processed.selected_range[0]:.1f}s - {processed.selected_range[1]:.1f}s")
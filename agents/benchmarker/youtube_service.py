@@ -6,17 +6,43 @@ import re
 from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import unquote
 
+from agents.config import agent_settings
+from libs.transcript import transcript_store
+from libs.ytdlp import InfoCache, ytdlp_extractor
+
+from .cache_service import normalize_channel_url
+from .collection import ProcessGate
 from .schemas import VideoMetadata, ChannelMetadata
 
 
 class YouTubeService:
-    """yt-dlp를 사용한 YouTube 데이터 수집"""
+    """yt-dlp를 사용한 YouTube 데이터 수집
+
+    기본은 yt_dlp 라이브러리를 워커 프로세스 풀에서 호출하고(libs.ytdlp),
+    yt_dlp 모듈이 없거나 ytdlp_backend=cli면 yt-dlp 명령을 실행한다.
+    """
+    
+    # 영상 수 계산용 flat 목록 최대 항목 수
+    CHANNEL_LIST_LIMIT = 100
     
     def __init__(self):
         self.ytdlp_path = "yt-dlp"
+        self.extractor = ytdlp_extractor
+        self.backend = (
+            "library"
+            if agent_settings.ytdlp_backend == "library" and self.extractor.available
+            else "cli"
+        )
+        # 채널/영상 ID별 추출 결과 캐시 (채널 확인 후 분석 시 재추출 방지)
+        self.info_cache = InfoCache(agent_settings.ytdlp_info_cache_ttl)
+        # 모든 yt-dlp 실행이 공유하는 프로세스 수/요청 간격 제한
+        self.gate = ProcessGate(
+            agent_settings.ytdlp_max_processes,
+            agent_settings.youtube_min_request_interval
+        )
     
     async def _run_ytdlp(self, args: List[str]) -> Tuple[str, str]:
-        """yt-dlp 명령 실행"""
+        """yt-dlp 명령 실행 (마지막 인자가 대상 URL)"""
         cmd = [self.ytdlp_path] + args
         process = await asyncio.create_subprocess_exec(
             *cmd,
@@ -26,6 +52,62 @@ class YouTubeService:
         stdout, stderr = await process.communicate()
         return stdout.decode("utf-8"), stderr.decode("utf-8")
     
+    async def _extract_cli(
+        self,
+        url: str,
+        flat: bool,
+        playlist_items: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """yt-dlp 명령으로 추출 - 라이브러리 결과와 같은 형태로 반환"""
+        args = ["--dump-json"]
+        if flat:
+            args.append("--flat-playlist")
+        if playlist_items:
+            args += ["--playlist-items", playlist_items]
+        else:
+            args.append("--no-playlist")
+        
+        stdout, stderr = await self._run_ytdlp(args + [url])
+        entries = self._parse_json_lines(stdout)
+        if not entries:
+            print(f"No output for: {url}, stderr: {stderr[-500:]}")
+            return None
+        return {"entries": entries} if flat else entries[0]
+    
+    async def _extract_library(
+        self,
+        url: str,
+        flat: bool,
+        playlist_items: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        info = await self.extractor.extract(url, flat=flat, playlist_items=playlist_items)
+        if not flat and playlist_items and "entries" in info:
+            # 채널 URL의 첫 영상 상세: CLI --dump-json과 같이 영상 정보만 반환
+            return info["entries"][0] if info["entries"] else None
+        return info
+    
+    async def _extract(
+        self,
+        url: str,
+        flat: bool = False,
+        playlist_items: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """메타데이터 추출 (ID별 TTL 캐시, 같은 요청 동시 실행 시 한 번만 추출)
+        
+        flat=True: 채널 영상 목록 ({"entries": [...]}, 라이브러리는 채널 메타데이터 포함)
+        playlist_items=None: 단일 영상
+        """
+        video_id = self._extract_video_id(url) if playlist_items is None else None
+        key = (video_id or normalize_channel_url(url), flat, playlist_items)
+        
+        async def fetch():
+            async with self.gate.slot(url):
+                if self.backend == "library":
+                    return await self._extract_library(url, flat, playlist_items)
+                return await self._extract_cli(url, flat, playlist_items)
+        
+        return await self.info_cache.get_or_fetch(key, fetch)
+    
     def _normalize_channel_url(self, url: str) -> str:
         """채널 URL 정규화 - /videos suffix 추가, URL 디코딩"""
         url = unquote(url)  # URL 디코딩 (%EC%9C%A0... -> 유...)
@@ -75,46 +157,89 @@ class YouTubeService:
     
     async def get_channel_info(self, channel_url: str) -> Optional[ChannelMetadata]:
         """채널 정보 가져오기"""
+        channel_info, _ = await self.get_channel_overview(channel_url, max_videos=0)
+        return channel_info
+    
+    async def get_channel_overview(
+        self,
+        channel_url: str,
+        max_videos: int = 20
+    ) -> Tuple[Optional[ChannelMetadata], List[VideoMetadata]]:
+        """채널 정보 + 최근 영상 목록
+        
+        flat 목록 하나로 영상 수와 최근 영상 목록을 함께 얻는다. 라이브러리 추출은 목록에
+        채널 메타데이터(구독자 수 등)가 포함되므로 첫 영상 상세는 구독자 수가 없을 때만 추출하고,
+        CLI는 첫 영상 상세(--dump-json, channel_follower_count 포함)를 목록과 동시에 실행한다.
+        """
         url = self._normalize_channel_url(channel_url)
-
-        # 첫 번째 영상에서 채널 정보 추출 (--flat-playlist 없이 해야 channel_follower_count 포함)
-        args = [
-            "--dump-json",
-            "--playlist-items", "1",
-            url
-        ]
-
+        list_items = f"1:{self.CHANNEL_LIST_LIMIT}"
+        
         try:
-            stdout, stderr = await self._run_ytdlp(args)
-            if not stdout.strip():
-                print(f"No output for channel: {url}, stderr: {stderr}")
-                return None
-
-            data = json.loads(stdout.strip().split("\n")[0])
-
-            # 영상 수는 별도로 가져오기 (flat-playlist로 빠르게 카운트)
-            video_count = 0
-            try:
-                count_args = ["--flat-playlist", "--dump-json", "--playlist-items", "1:100", url]
-                count_stdout, _ = await self._run_ytdlp(count_args)
-                if count_stdout.strip():
-                    video_count = len(count_stdout.strip().split("\n"))
-            except:
-                pass
-
-            # 채널 정보 추출
-            return ChannelMetadata(
-                channel_id=data.get("channel_id") or data.get("uploader_id", ""),
-                channel_name=data.get("channel") or data.get("uploader", ""),
-                subscriber_count=data.get("channel_follower_count", 0) or 0,
-                video_count=video_count,
-                description=data.get("channel_description") or f"최근 영상: {data.get('title', '')}",
-                thumbnail_url=data.get("thumbnail", ""),
-                banner_url=data.get("channel_banner_url"),
-            )
+            if self.backend == "library":
+                listing = await self._extract(url, flat=True, playlist_items=list_items)
+                first = None
+                if not listing or listing.get("channel_follower_count") is None:
+                    first = await self._extract(url, playlist_items="1")
+            else:
+                listing, first = await asyncio.gather(
+                    self._extract(url, flat=True, playlist_items=list_items),
+                    self._extract(url, playlist_items="1")
+                )
         except Exception as e:
             print(f"Failed to get channel info: {e}")
-            return None
+            return None, []
+        
+        listing = listing or {}
+        first = first or {}
+        entries = listing.get("entries", [])
+        videos = [self._video_from_entry(entry) for entry in entries[:max_videos]]
+        
+        channel_name = listing.get("channel") or first.get("channel") or first.get("uploader")
+        if not channel_name:
+            print(f"No channel metadata for: {url}")
+            return None, videos
+        
+        thumbnails = {t.get("id"): t.get("url") for t in listing.get("thumbnails", [])}
+        channel_info = ChannelMetadata(
+            channel_id=listing.get("channel_id") or first.get("channel_id") or first.get("uploader_id", ""),
+            channel_name=channel_name,
+            subscriber_count=listing.get("channel_follower_count") or first.get("channel_follower_count", 0) or 0,
+            video_count=len(entries),
+            description=(
+                listing.get("description")
+                or first.get("channel_description")
+                or f"최근 영상: {first.get('title', '')}"
+            ),
+            thumbnail_url=first.get("thumbnail") or thumbnails.get("avatar_uncropped", ""),
+            banner_url=first.get("channel_banner_url") or thumbnails.get("banner_uncropped"),
+        )
+        return channel_info, videos
+    
+    def _parse_json_lines(self, stdout: str) -> List[Dict[str, Any]]:
+        entries = []
+        for line in stdout.strip().split("\n"):
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries
+    
+    def _video_from_entry(self, data: Dict[str, Any]) -> VideoMetadata:
+        """flat-playlist 항목 → VideoMetadata"""
+        return VideoMetadata(
+            video_id=data.get("id", ""),
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+            view_count=data.get("view_count", 0) or 0,
+            like_count=data.get("like_count", 0) or 0,
+            comment_count=data.get("comment_count", 0) or 0,
+            duration=data.get("duration", 0) or 0,
+            upload_date=data.get("upload_date", ""),
+            thumbnail_url=self._get_best_thumbnail(data.get("thumbnails", [])),
+            tags=data.get("tags", []) or [],
+        )
     
     async def get_channel_videos(
         self, 
@@ -124,41 +249,9 @@ class YouTubeService:
         """채널의 최근 영상 목록 가져오기"""
         url = self._normalize_channel_url(channel_url)
         
-        args = [
-            "--dump-json",
-            "--flat-playlist",
-            "--playlist-items", f"1:{max_videos}",
-            url
-        ]
-        
         try:
-            stdout, _ = await self._run_ytdlp(args)
-            if not stdout.strip():
-                return []
-            
-            videos = []
-            for line in stdout.strip().split("\n"):
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    video = VideoMetadata(
-                        video_id=data.get("id", ""),
-                        title=data.get("title", ""),
-                        description=data.get("description", ""),
-                        view_count=data.get("view_count", 0) or 0,
-                        like_count=data.get("like_count", 0) or 0,
-                        comment_count=data.get("comment_count", 0) or 0,
-                        duration=data.get("duration", 0) or 0,
-                        upload_date=data.get("upload_date", ""),
-                        thumbnail_url=self._get_best_thumbnail(data.get("thumbnails", [])),
-                        tags=data.get("tags", []) or [],
-                    )
-                    videos.append(video)
-                except json.JSONDecodeError:
-                    continue
-            
-            return videos
+            listing = await self._extract(url, flat=True, playlist_items=f"1:{max_videos}")
+            return [self._video_from_entry(entry) for entry in (listing or {}).get("entries", [])]
         except Exception as e:
             print(f"Failed to get channel videos: {e}")
             return []
@@ -174,19 +267,11 @@ class YouTubeService:
     
     async def get_video_info(self, video_url: str) -> Optional[VideoMetadata]:
         """단일 영상 상세 정보 가져오기"""
-        args = [
-            "--dump-json",
-            "--no-playlist",
-            video_url
-        ]
-        
         try:
-            stdout, _ = await self._run_ytdlp(args)
-            if not stdout.strip():
+            data = await self._extract(video_url)
+            if not data:
                 return None
             
-            data = json.loads(stdout.strip())
-            
             return VideoMetadata(
                 video_id=data.get("id", ""),
                 title=data.get("title", ""),
@@ -208,75 +293,17 @@ class YouTubeService:
         video_url: str,
         lang_priority: List[str] = None
     ) -> Optional[str]:
-        """영상 자막/transcript 가져오기"""
-        if lang_priority is None:
-            lang_priority = ["ko", "en", "en-US", "ko-KR"]
-        
-        lang_str = ",".join(lang_priority)
-        
-        args = [
-            "--write-sub",
-            "--write-auto-sub",
-            "--sub-lang", lang_str,
-            "--skip-download",
-            "--sub-format", "vtt",
-            "-o", "/tmp/yt_sub_%(id)s",
-            video_url
-        ]
-        
+        """영상 자막/transcript 가져오기 (transcript_store - 영상당 한 번만 다운로드)"""
         try:
-            video_id = self._extract_video_id(video_url)
-            if not video_id:
-                return None
-            
-            await self._run_ytdlp(args)
-            
-            import os
-            for lang in lang_priority:
-                sub_path = f"/tmp/yt_sub_{video_id}.{lang}.vtt"
-                if os.path.exists(sub_path):
-                    with open(sub_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    os.remove(sub_path)
-                    return self._parse_vtt(content)
-            
-            for lang in lang_priority:
-                for suffix in ["", "-orig"]:
-                    sub_path = f"/tmp/yt_sub_{video_id}.{lang}{suffix}.vtt"
-                    if os.path.exists(sub_path):
-                        with open(sub_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-                        os.remove(sub_path)
-                        return self._parse_vtt(content)
-            
-            return None
+            found, transcript = transcript_store.cached(video_url, lang_priority)
+            if found:
+                return transcript.text() if transcript else None
+            async with self.gate.slot(video_url):
+                return await transcript_store.get_text(video_url, lang_priority)
         except Exception as e:
             print(f"Failed to get transcript: {e}")
             return None
     
-    def _parse_vtt(self, vtt_content: str) -> str:
-        """VTT 자막을 텍스트로 변환"""
-        lines = []
-        for line in vtt_content.split("\n"):
-            if "-->" in line:
-                continue
-            if line.startswith("WEBVTT") or line.startswith("Kind:") or line.startswith("Language:"):
-                continue
-            if not line.strip():
-                continue
-            clean_line = re.sub(r"<[^>]+>", "", line)
-            if clean_line.strip():
-                lines.append(clean_line.strip())
-        
-        seen = set()
-        unique_lines = []
-        for line in lines:
-            if line not in seen:
-                seen.add(line)
-                unique_lines.append(line)
-        
-        return " ".join(unique_lines)
-    
     async def get_thumbnails(
         self, 
         videos: List[VideoMetadata],
@@ -4,6 +4,7 @@ import sys
 import os
 import json
 import subprocess
+import shutil
 import asyncio
 from typing import Dict, Any, List, Optional
 from pathlib import Path
@@ -45,9 +46,20 @@ class SceneData:
     audio_duration: float  # 초 단위
     start_time: float  # 전체 영상에서 시작 시간
     end_time: float
+    units: Optional[List[Dict[str, Any]]] = None  # 보이스오버 합성 단위별 타임스탬프 (장면 기준)
 
 
 OUTPUT_DIR = Path("/app/output/images")
+OUTPUT_URL_PREFIX = "/output/images"
+
+# 검토용 프록시 미리보기 설정 (저해상도 HLS)
+PREVIEW_HEIGHT = 480
+PREVIEW_CRF = "30"
+PREVIEW_AUDIO_BITRATE = "96k"
+PREVIEW_SEGMENT_SECONDS = 2
+PREVIEW_PLAYLIST_TIMEOUT = 30.0  # 첫 세그먼트가 나올 때까지 최대 대기
+
+SUBTITLE_STYLE = "FontSize=24,FontName=NanumGothic,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,Outline=2,Shadow=1"
 
 
 class ComposerAgent(BaseAgent):
@@ -61,6 +73,16 @@ class ComposerAgent(BaseAgent):
         self.output_dir: Path = OUTPUT_DIR
         self.final_video_path: str = ""
         self.subtitle_path: str = ""
+        self.preview_dir: Optional[Path] = None
+        self.preview_playlist_path: str = ""
+        self._preview_process: Optional[asyncio.subprocess.Process] = None
+        self._preview_temp_files: List[str] = []
+
+    def _video_codec_args(self, preview: bool = False) -> List[str]:
+        """비디오 인코딩 옵션 (미리보기는 빠른 저화질)"""
+        if preview:
+            return ["-c:v", "libx264", "-preset", "veryfast", "-crf", PREVIEW_CRF]
+        return ["-c:v", "libx264", "-crf", "18"]
 
     def _get_audio_duration(self, audio_path: str) -> float:
         """ffprobe로 오디오 길이 측정"""
@@ -92,43 +114,45 @@ class ComposerAgent(BaseAgent):
             print(f"[Composer] Video duration error: {e}")
             return 3.4  # 기본값
 
-    def _adjust_video_duration(self, video_path: str, target_duration: float, output_path: str) -> bool:
-        """비디오 길이를 오디오에 맞게 조절"""
+    def _adjust_video_duration(
+        self,
+        video_path: str,
+        target_duration: float,
+        output_path: str,
+        preview: bool = False
+    ) -> bool:
+        """비디오 길이를 오디오에 맞게 조절 (preview=True면 저해상도로 인코딩)"""
         try:
             video_duration = self._get_video_duration(video_path)
+            filters: List[str] = []
+            trim_args: List[str] = []
 
             if abs(video_duration - target_duration) < 0.1:
-                # 차이가 0.1초 미만이면 그냥 복사
-                subprocess.run(["cp", video_path, output_path], check=True)
-                return True
-
-            if target_duration < video_duration:
+                if not preview:
+                    # 차이가 0.1초 미만이면 그냥 복사
+                    subprocess.run(["cp", video_path, output_path], check=True)
+                    return True
+            elif target_duration < video_duration:
                 # 오디오가 더 짧음: 비디오 트림
-                cmd = [
-                    "ffmpeg", "-y", "-i", video_path,
-                    "-t", str(target_duration),
-                    "-c:v", "libx264", "-crf", "18",
-                    output_path
-                ]
+                trim_args = ["-t", str(target_duration)]
             else:
                 # 오디오가 더 김: 비디오 속도 조절 (최대 20% 느리게)
                 speed_factor = video_duration / target_duration
                 if speed_factor < 0.8:
                     # 너무 많이 늘려야 하면 마지막 프레임 홀드
-                    cmd = [
-                        "ffmpeg", "-y", "-i", video_path,
-                        "-vf", f"tpad=stop_mode=clone:stop_duration={target_duration - video_duration}",
-                        "-c:v", "libx264", "-crf", "18",
-                        output_path
-                    ]
+                    filters.append(f"tpad=stop_mode=clone:stop_duration={target_duration - video_duration}")
                 else:
                     # 적당히 늘릴 수 있으면 속도 조절
-                    cmd = [
-                        "ffmpeg", "-y", "-i", video_path,
-                        "-vf", f"setpts={1/speed_factor}*PTS",
-                        "-c:v", "libx264", "-crf", "18",
-                        output_path
-                    ]
+                    filters.append(f"setpts={1/speed_factor}*PTS")
+
+            if preview:
+                filters.append(f"scale=-2:{PREVIEW_HEIGHT}")
+
+            cmd = ["ffmpeg", "-y", "-i", video_path, *trim_args]
+            if filters:
+                cmd.extend(["-vf", ",".join(filters)])
+            cmd.extend(self._video_codec_args(preview))
+            cmd.append(output_path)
 
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -139,11 +163,23 @@ class ComposerAgent(BaseAgent):
     def _generate_srt(self, scenes: List[SceneData], output_path: str) -> bool:
         """SRT 자막 파일 생성"""
         try:
+            # 보이스오버 합성 단위 타임스탬프가 있으면 단위별 자막, 없으면 장면 단위
+            cues = []
+            for scene in scenes:
+                if scene.units:
+                    for unit in scene.units:
+                        cues.append((
+                            scene.start_time + unit["start"],
+                            min(scene.start_time + unit["end"], scene.end_time),
+                            unit["text"]
+                        ))
+                else:
+                    cues.append((scene.start_time, scene.end_time, scene.script_line))
+
             lines = []
-            for i, scene in enumerate(scenes, 1):
-                start = self._format_srt_time(scene.start_time)
-                end = self._format_srt_time(scene.end_time)
-                text = scene.script_line
+            for i, (cue_start, cue_end, text) in enumerate(cues, 1):
+                start = self._format_srt_time(cue_start)
+                end = self._format_srt_time(cue_end)
 
                 lines.append(f"{i}")
                 lines.append(f"{start} --> {end}")
@@ -166,8 +202,8 @@ class ComposerAgent(BaseAgent):
         millis = int((seconds % 1) * 1000)
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
-    def _concat_videos(self, video_paths: List[str], output_path: str) -> bool:
-        """여러 비디오를 하나로 연결"""
+    def _concat_videos(self, video_paths: List[str], output_path: str, preview: bool = False) -> bool:
+        """여러 비디오를 하나로 연결 (preview=True면 재인코딩 없이 스트림 복사)"""
         try:
             # concat demuxer용 파일 리스트 생성
             list_file = output_path + ".txt"
@@ -175,10 +211,12 @@ class ComposerAgent(BaseAgent):
                 for vp in video_paths:
                     f.write(f"file '{vp}'\n")
 
+            # 미리보기 클립은 모두 같은 파라미터로 인코딩되어 있어 복사만 한다
+            codec_args = ["-c", "copy"] if preview else self._video_codec_args()
             cmd = [
                 "ffmpeg", "-y", "-f", "concat", "-safe", "0",
                 "-i", list_file,
-                "-c:v", "libx264", "-crf", "18",
+                *codec_args,
                 output_path
             ]
             subprocess.run(cmd, capture_output=True, check=True)
@@ -227,7 +265,7 @@ class ComposerAgent(BaseAgent):
                     "ffmpeg", "-y",
                     "-i", video_path,
                     "-i", audio_path,
-                    "-vf", f"subtitles={subtitle_path}:force_style='FontSize=24,FontName=NanumGothic,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,Outline=2,Shadow=1'",
+                    "-vf", f"subtitles={subtitle_path}:force_style='{SUBTITLE_STYLE}'",
                     "-c:v", "libx264", "-crf", "18",
                     "-c:a", "aac", "-b:a", "192k",
                     "-shortest",
@@ -256,6 +294,79 @@ class ComposerAgent(BaseAgent):
             print(f"[Composer] Merge error: {e}")
             return False
 
+    async def _start_preview_stream(
+        self,
+        video_path: str,
+        audio_path: str,
+        subtitle_path: str,
+        playlist_path: str
+    ) -> bool:
+        """저해상도 HLS 미리보기 인코딩을 백그라운드로 시작
+
+        event 타입 플레이리스트로 세그먼트가 생길 때마다 갱신되므로
+        프론트엔드는 인코딩이 끝나기 전에 재생을 시작할 수 있다.
+        """
+        segment_pattern = str(Path(playlist_path).parent / "preview_%03d.ts")
+        cmd = [
+            "ffmpeg", "-y",
+            "-i", video_path,
+            "-i", audio_path,
+            "-vf", f"subtitles={subtitle_path}:force_style='{SUBTITLE_STYLE}'",
+            *self._video_codec_args(preview=True),
+            "-c:a", "aac", "-b:a", PREVIEW_AUDIO_BITRATE,
+            "-shortest",
+            "-f", "hls",
+            "-hls_time", str(PREVIEW_SEGMENT_SECONDS),
+            "-hls_playlist_type", "event",
+            "-hls_segment_filename", segment_pattern,
+            playlist_path
+        ]
+        try:
+            self._preview_process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+        except Exception as e:
+            print(f"[Composer] Preview encode error: {e}")
+            return False
+
+        # 첫 세그먼트가 플레이리스트에 기록될 때까지 대기
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + PREVIEW_PLAYLIST_TIMEOUT
+        while loop.time() < deadline:
+            if os.path.exists(playlist_path):
+                return True
+            if self._preview_process.returncode is not None:
+                return os.path.exists(playlist_path)
+            await asyncio.sleep(0.2)
+
+        print("[Composer] Preview playlist not ready in time")
+        return os.path.exists(playlist_path)
+
+    async def _stop_preview(self):
+        """진행 중인 미리보기 인코딩 중단 및 임시 파일 정리"""
+        process = self._preview_process
+        if process and process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                process.kill()
+        self._preview_process = None
+
+        for path in self._preview_temp_files:
+            if os.path.exists(path):
+                os.remove(path)
+        self._preview_temp_files = []
+
+    def _preview_url(self) -> str:
+        """정적 파일 서빙 경로 기준 미리보기 URL"""
+        if not self.preview_playlist_path:
+            return ""
+        relative = Path(self.preview_playlist_path).relative_to(OUTPUT_DIR)
+        return f"{OUTPUT_URL_PREFIX}/{relative.as_posix()}"
+
     async def execute(self, input_data: Dict[str, Any]) -> AgentResult:
         """합성 시작"""
         self.status = AgentStatus.RUNNING
@@ -307,7 +418,8 @@ class ComposerAgent(BaseAgent):
                 audio_path=audio_path,
                 audio_duration=audio_duration,
                 start_time=current_time,
-                end_time=current_time + audio_duration
+                end_time=current_time + audio_duration,
+                units=audio.get("units")
             )
             self.scenes.append(scene)
             current_time += audio_duration
@@ -321,11 +433,116 @@ class ComposerAgent(BaseAgent):
                 data={"error": "No valid scenes"}
             )
 
-        # 합성 시작
-        return await self._compose_all()
+        # 검토용 미리보기 생성 (최종 렌더링은 승인 후)
+        return await self._compose_preview()
+
+    async def _compose_preview(self) -> AgentResult:
+        """저해상도 프록시 미리보기 생성 후 검토 단계로 전환"""
+        self.phase = ComposerPhase.SYNCING
+        await self._stop_preview()
+
+        self.preview_dir = self.output_dir / "preview"
+        if self.preview_dir.exists():
+            # 이전 미리보기 (HLS 세그먼트, 하위 폴더 포함) 정리
+            shutil.rmtree(self.preview_dir, ignore_errors=True)
+        self.preview_dir.mkdir(parents=True, exist_ok=True)
+
+        emit_progress("미리보기 싱크", f"총 {len(self.scenes)}개 장면 ({PREVIEW_HEIGHT}p)")
+
+        preview_videos = []
+        for scene in self.scenes:
+            emit_progress("미리보기 조절", f"장면 {scene.index}")
+            preview_path = str(self.preview_dir / f"scene_{scene.index:03d}.mp4")
+            if not self._adjust_video_duration(
+                scene.video_path,
+                scene.audio_duration,
+                preview_path,
+                preview=True
+            ):
+                return self._compose_failed("미리보기 장면 변환에 실패했습니다.", "Preview scene adjust failed")
+            preview_videos.append(preview_path)
+
+        self.subtitle_path = str(self.output_dir / "subtitles.srt")
+        self._generate_srt(self.scenes, self.subtitle_path)
+
+        self.phase = ComposerPhase.COMPOSING
+        emit_progress("미리보기 합성", "저해상도 영상 스트리밍 준비 중")
+
+        concat_video_path = str(self.preview_dir / "concat_video.mp4")
+        concat_audio_path = str(self.preview_dir / "concat_audio.wav")
+        self._preview_temp_files = preview_videos + [concat_video_path, concat_audio_path]
+
+        if not self._concat_videos(preview_videos, concat_video_path, preview=True):
+            return self._compose_failed("미리보기 비디오 연결에 실패했습니다.", "Preview concat failed")
+        self._concat_audios([s.audio_path for s in self.scenes], concat_audio_path)
+
+        self.preview_playlist_path = str(self.preview_dir / "preview.m3u8")
+        if not await self._start_preview_stream(
+            concat_video_path,
+            concat_audio_path,
+            self.subtitle_path,
+            self.preview_playlist_path
+        ):
+            await self._stop_preview()
+            return self._compose_failed("미리보기 인코딩에 실패했습니다.", "Preview encode failed")
+
+        self.phase = ComposerPhase.REVIEW
+        total_duration = sum(s.audio_duration for s in self.scenes)
+
+        result_text = f"""# 영상 미리보기
+
+**총 길이:** {total_duration:.1f}초 ({len(self.scenes)}개 장면)
+
+**미리보기:** {PREVIEW_HEIGHT}p 저화질 스트리밍 (인코딩 중에도 재생 가능)
+- 자막 파일: `{Path(self.subtitle_path).name}`
+
+**장면 구성:**
+"""
+        for scene in self.scenes:
+            result_text += f"- 장면 {scene.index}: {scene.audio_duration:.1f}초 ({scene.start_time:.1f}s ~ {scene.end_time:.1f}s)\n"
+            result_text += f"  \"{scene.script_line[:30]}...\"\n"
+
+        result_text += "\n타이밍을 확인한 뒤 확인을 입력하면 최종 고화질 렌더링을 시작합니다."
+
+        self.status = AgentStatus.WAITING_FEEDBACK
+        return AgentResult(
+            success=True,
+            step="compose_review",
+            message=result_text,
+            needs_feedback=True,
+            data={
+                "phase": "review",
+                "preview_playlist": self.preview_playlist_path,
+                "preview_url": self._preview_url(),
+                "subtitle_file": self.subtitle_path,
+                "total_duration": total_duration,
+                "scenes": self._scene_summaries()
+            }
+        )
+
+    def _compose_failed(self, message: str, error: str) -> AgentResult:
+        return AgentResult(
+            success=False,
+            step="compose",
+            message=message,
+            needs_feedback=True,
+            data={"error": error}
+        )
+
+    def _scene_summaries(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "index": s.index,
+                "script_line": s.script_line,
+                "duration": s.audio_duration,
+                "start_time": s.start_time,
+                "end_time": s.end_time
+            }
+            for s in self.scenes
+        ]
 
     async def _compose_all(self) -> AgentResult:
-        """전체 합성 프로세스"""
+        """전체 합성 프로세스 (최종 고화질 렌더링)"""
         self.phase = ComposerPhase.SYNCING
 
         # 1. 각 비디오를 오디오 길이에 맞게 조절
@@ -389,16 +606,18 @@ class ComposerAgent(BaseAgent):
             os.remove(concat_audio_path)
 
         if not success:
+            self.phase = ComposerPhase.REVIEW
             return AgentResult(
                 success=False,
-                step="compose",
-                message="최종 합성에 실패했습니다.",
+                step="compose_review",
+                message="최종 합성에 실패했습니다. 확인을 입력하면 다시 시도합니다.",
                 needs_feedback=True,
                 data={"error": "Final merge failed"}
             )
 
         # 6. 결과 정리
-        self.phase = ComposerPhase.REVIEW
+        self.phase = ComposerPhase.DONE
+        self.status = AgentStatus.COMPLETED
         total_duration = sum(s.audio_duration for s in self.scenes)
 
         result_text = f"""# 영상 합성 완료
@@ -409,36 +628,19 @@ class ComposerAgent(BaseAgent):
 - 최종 영상: `{Path(self.final_video_path).name}`
 - 자막 파일: `{Path(self.subtitle_path).name}`
 - 저장 위치: `{self.output_dir}`
-
-**장면 구성:**
 """
-        for scene in self.scenes:
-            result_text += f"- 장면 {scene.index}: {scene.audio_duration:.1f}초 ({scene.start_time:.1f}s ~ {scene.end_time:.1f}s)\n"
-            result_text += f"  \"{scene.script_line[:30]}...\"\n"
-
-        result_text += "\n확인을 입력하면 완료됩니다."
 
-        self.status = AgentStatus.WAITING_FEEDBACK
         return AgentResult(
             success=True,
-            step="compose_review",
+            step="compose_done",
             message=result_text,
-            needs_feedback=True,
+            needs_feedback=False,
             data={
-                "phase": "review",
+                "phase": "done",
                 "final_video": self.final_video_path,
                 "subtitle_file": self.subtitle_path,
                 "total_duration": total_duration,
-                "scenes": [
-                    {
-                        "index": s.index,
-                        "script_line": s.script_line,
-                        "duration": s.audio_duration,
-                        "start_time": s.start_time,
-                        "end_time": s.end_time
-                    }
-                    for s in self.scenes
-                ]
+                "scenes": self._scene_summaries()
             }
         )
 
@@ -448,25 +650,18 @@ class ComposerAgent(BaseAgent):
 
         if self.phase == ComposerPhase.REVIEW:
             if any(kw in feedback_lower for kw in ["확인", "완료", "ok", "좋아", "다음"]):
-                self.phase = ComposerPhase.DONE
-                self.status = AgentStatus.COMPLETED
-
-                return AgentResult(
-                    success=True,
-                    step="compose_done",
-                    message=f"영상 합성이 완료되었습니다!\n\n최종 파일: `{self.final_video_path}`",
-                    needs_feedback=False,
-                    data={
-                        "phase": "done",
-                        "final_video": self.final_video_path,
-                        "subtitle_file": self.subtitle_path
-                    }
-                )
+                # 승인 후에만 최종 고화질 렌더링 (미리보기 인코딩은 중단)
+                await self._stop_preview()
+                emit_progress("최종 렌더링", "고화질 영상 합성 시작")
+                return await self._compose_all()
 
         return AgentResult(
             success=True,
             step="compose_review",
-            message="확인을 입력하면 완료됩니다.",
+            message="미리보기를 확인한 뒤 확인을 입력하면 최종 렌더링을 시작합니다.",
             needs_feedback=True,
-            data={"phase": self.phase.value}
+            data={
+                "phase": self.phase.value,
+                "preview_url": self._preview_url()
+            }
         )
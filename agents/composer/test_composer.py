@@ -0,0 +1,74 @@
+"""Composer Tests - 미리보기 승인 후 최종 렌더링, 미리보기 폴더 정리"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import agents.orchestrator as orchestrator_module
+from agents.composer.agent import ComposerAgent, ComposerPhase
+from agents.orchestrator import Orchestrator, Session, WorkflowStep
+from agents.base import AgentResult
+
+
+def test_review_confirmation_renders_final_video():
+    """미리보기 단계의 "확인"은 최종 렌더링으로, 렌더링 후의 "확인"은 완료로 이어져야 함"""
+    saved = []
+    original_save = orchestrator_module.save_session
+    orchestrator_module.save_session = saved.append
+    try:
+        orchestrator = Orchestrator()
+        composer = orchestrator.composer_agent
+        composer.phase = ComposerPhase.REVIEW
+        renders = []
+
+        async def fake_compose_all():
+            renders.append(True)
+            composer.phase = ComposerPhase.DONE
+            return AgentResult(
+                success=True,
+                step="compose_done",
+                message="최종 영상 완성",
+                needs_feedback=True,
+                data={"final_video": "/tmp/final.mp4", "subtitle_file": "/tmp/final.srt"},
+            )
+
+        composer._compose_all = fake_compose_all
+        session = Session(id="compose-test", current_step=WorkflowStep.COMPOSE)
+        orchestrator.sessions[session.id] = session
+
+        asyncio.run(orchestrator.process_message(session.id, "확인"))
+        assert renders == [True]
+        assert session.current_step == WorkflowStep.COMPOSE
+        assert session.context["final_video"] == "/tmp/final.mp4"
+        assert session.context["subtitle_file"] == "/tmp/final.srt"
+
+        asyncio.run(orchestrator.process_message(session.id, "확인"))
+        assert renders == [True]
+        assert session.current_step == WorkflowStep.COMPLETED
+        assert saved
+    finally:
+        orchestrator_module.save_session = original_save
+
+
+def test_preview_dir_cleanup_handles_subdirectories():
+    """이전 미리보기에 하위 폴더가 있어도 정리되어야 함"""
+    with tempfile.TemporaryDirectory() as tmp:
+        composer = ComposerAgent()
+        composer.output_dir = Path(tmp)
+        stale = composer.output_dir / "preview" / "segments"
+        stale.mkdir(parents=True)
+        (stale / "old.ts").write_bytes(b"x")
+        (composer.output_dir / "preview" / "old.m3u8").write_text("#EXTM3U")
+
+        asyncio.run(composer._compose_preview())
+        assert not stale.exists()
+        assert not (composer.output_dir / "preview" / "old.m3u8").exists()
+
+
+if __name__ == "__main__":
+    test_review_confirmation_renders_final_video()
+    test_preview_dir_cleanup_handles_subdirectories()
+    print("All tests passed")
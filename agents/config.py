@@ -35,7 +35,77 @@ class AgentSettings(BaseSettings):
         default="http://172.17.0.1:8312",
         description="TTS VoiceDesign"
     )
+    tts_max_concurrency: int = Field(
+        default=2,
+        description="TTS 서버 동시 합성 요청 수 (GPU 용량에 맞춤)"
+    )
+    tts_max_retries: int = Field(
+        default=2,
+        description="섹션별 TTS 재시도 횟수"
+    )
+    
+    # === Source Audio (클로닝 레퍼런스 추출) ===
+    source_audio_cache_dir: str = Field(
+        default="/app/output/source_audio",
+        description="영상 ID별 원본 오디오 구간 캐시 경로"
+    )
+    source_audio_cache_mb: int = Field(
+        default=1024,
+        description="원본 오디오 캐시 최대 크기 (MB)"
+    )
+    source_audio_pad_sec: int = Field(
+        default=30,
+        description="구간 다운로드 시 앞뒤 여유 (근처 구간 재요청은 캐시에서 처리)"
+    )
     
+    # === YouTube 수집 (yt-dlp) ===
+    ytdlp_max_processes: int = Field(
+        default=4,
+        description="동시에 실행할 yt-dlp 프로세스 수"
+    )
+    youtube_min_request_interval: float = Field(
+        default=0.3,
+        description="같은 호스트에 대한 요청 시작 간격 (초)"
+    )
+    ytdlp_backend: str = Field(
+        default="library",
+        description="library: yt_dlp API를 워커 프로세스 풀에서 호출 (미설치 시 cli) / cli: yt-dlp 명령 실행"
+    )
+    ytdlp_info_cache_ttl: int = Field(
+        default=3600,
+        description="채널/영상 메타데이터 추출 결과 캐시 시간 (초)"
+    )
+    
+    # === 벤치마크 리포트 분석 ===
+    report_stage_cache_dir: str = Field(
+        default="/app/output/benchmark_stages",
+        description="리포트 분석 스테이지별 결과 캐시 경로 (입력 해시 기준)"
+    )
+    report_stage_cache_ttl_hours: int = Field(
+        default=168,
+        description="스테이지 결과 캐시 유효 시간"
+    )
+    report_stage_max_attempts: int = Field(
+        default=2,
+        description="스테이지별 최대 시도 횟수 (실패한 스테이지만 재시도)"
+    )
+    benchmark_cache_db: str = Field(
+        default="/app/output/benchmark_cache/benchmarks.db",
+        description="벤치마크 리포트/채널별 결과 캐시 DB (이전 JSON 캐시는 같은 폴더에서 자동 이전)"
+    )
+    benchmark_cache_ttl_hours: int = Field(
+        default=168,
+        description="캐시된 벤치마크를 최신으로 보는 시간"
+    )
+    benchmark_cache_max_stale_days: int = Field(
+        default=30,
+        description="TTL이 지난 벤치마크를 보여줄 수 있는 최대 기간 (이후에는 캐시 없음으로 처리)"
+    )
+    benchmark_cache_mode: str = Field(
+        default="swr",
+        description="swr: 오래된 결과를 바로 보여주고 백그라운드 갱신 / strict: TTL이 지나면 새로 분석"
+    )
+
     # === Vision Service ===
     vision_api_url: str = Field(
         default="http://172.17.0.1:8016/v1",
@@ -17,7 +17,7 @@ from agents.benchmarker.agent import BenchmarkerAgent
 from agents.voiceover.agent import VoiceoverAgent
 from agents.image_prompter.agent import ImagePrompterAgent
 from agents.image_generator.agent import ImageGeneratorAgent
-from agents.composer.agent import ComposerAgent
+from agents.composer.agent import ComposerAgent, ComposerPhase
 from apps.api.services.vision import vision_service
 from apps.api.services.llm import llm_service
 from agents.image_utils import optimize_image
@@ -1718,12 +1718,17 @@ class Orchestrator:
                 return self._format_response(session, result)
 
         # ========== 확정 처리 (BENCHMARKING, CHANNEL_NAME 제외) ==========
+        # COMPOSE는 최종 렌더링이 끝나기 전까지 승인을 합성 에이전트가 처리 (미리보기 → 최종 렌더링)
+        compose_pending = (
+            current_step == WorkflowStep.COMPOSE
+            and self.composer_agent.phase != ComposerPhase.DONE
+        )
         if current_step not in [
             WorkflowStep.BENCHMARKING,
             WorkflowStep.CHANNEL_NAME,
             WorkflowStep.TTS_SETTINGS,
             WorkflowStep.LOGO,
-        ] and self._is_confirmation(message):
+        ] and not compose_pending and self._is_confirmation(message):
             result = await self._handle_next_step(session)
             self._save(session)
             return self._format_response(session, result)
@@ -1831,6 +1836,14 @@ class Orchestrator:
                 if result.data.get("sections"):
                     session.context["voice_sections"] = result.data["sections"]
 
+        # COMPOSE 승인 후 최종 렌더링 결과 저장
+        if current_step == WorkflowStep.COMPOSE:
+            if result.data:
+                if result.data.get("final_video"):
+                    session.context["final_video"] = result.data["final_video"]
+                if result.data.get("subtitle_file"):
+                    session.context["subtitle_file"] = result.data["subtitle_file"]
+
         self._save(session)
         return self._format_response(session, result)
 
@@ -1909,6 +1922,8 @@ class Orchestrator:
                 session.context["final_video"] = result.data["final_video"]
             if "subtitle_file" in result.data:
                 session.context["subtitle_file"] = result.data["subtitle_file"]
+            if "preview_url" in result.data:
+                session.context["compose_preview_url"] = result.data["preview_url"]
 
         return result
 
@@ -1934,10 +1949,10 @@ class Orchestrator:
             msg += f"\n**최종 영상:** `{Path(final_video).name}`"
             msg += f"\n**저장 위치:** `{Path(final_video).parent}`"
 
-        _tmp_result_1031 = AgentResult(
+        # 호출하는 쪽에서 _format_response로 응답을 만든다
+        return AgentResult(
             success=True, step="completed", message=msg, data=session.context
         )
-        return self._format_response(session, _tmp_result_1031)
 
     def _format_response(self, session: Session, result: AgentResult) -> Dict[str, Any]:
         # Save assistant response to history (optimized images)
@@ -14,6 +14,9 @@ from enum import Enum
 sys.path.append("/app")
 
 from agents.base import BaseAgent, AgentResult, AgentStatus
+from agents.voiceover.synthesis import SynthesisJob, SynthesisOutcome, SynthesisScheduler
+from agents.voiceover.chunking import split_sentences, assemble_wav
+from apps.api.services.voice_registry import voice_registry
 
 
 def emit_progress(status: str, detail: str = ""):
@@ -362,33 +365,73 @@ class VoiceoverAgent(BaseAgent):
         
         emit_progress("보이스오버 생성", f"총 {len(sections)}개 섹션 처리 시작...")
         
-        results = []
         total = len(sections)
         
-        for i, (section_name, text) in enumerate(sections):
-            emit_progress("보이스오버 생성", f"[{i+1}/{total}] {section_name} 생성 중...")
+        # 섹션을 문장 단위로 분할해 파이프라인 합성 (긴 섹션 타임아웃 방지)
+        jobs = []
+        for section_idx, (section_name, text) in enumerate(sections):
+            for unit_idx, unit_text in enumerate(split_sentences(text)):
+                jobs.append(SynthesisJob(
+                    index=len(jobs),
+                    name=section_name,
+                    text=unit_text,
+                    section=section_idx,
+                    unit=unit_idx
+                ))
+        use_clone = self.voice_option in ["youtube", "sample"] and ref_audio_b64
+        
+        async def synthesize(session: aiohttp.ClientSession, job: SynthesisJob) -> Optional[str]:
+            if use_clone:
+                return await self._generate_clone(job.text, ref_audio_b64, ref_text, session=session)
+            return await self._generate_default(job.text, session=session)
+        
+        remaining = {i: 0 for i in range(total)}
+        for job in jobs:
+            remaining[job.section] += 1
+        
+        def on_complete(outcome: SynthesisOutcome, done: int, total_jobs: int):
+            remaining[outcome.job.section] -= 1
+            if not outcome.success:
+                emit_progress("보이스오버 생성", f"[{done}/{total_jobs}] {outcome.job.name} 문장 {outcome.job.unit+1} 실패")
+            elif remaining[outcome.job.section] == 0:
+                emit_progress("보이스오버 생성", f"[{done}/{total_jobs}] {outcome.job.name} 완료")
+            else:
+                emit_progress("보이스오버 생성", f"[{done}/{total_jobs}] {outcome.job.name} 문장 {outcome.job.unit+1}")
+        
+        scheduler = SynthesisScheduler(
+            max_concurrency=agent_settings.tts_max_concurrency,
+            max_retries=agent_settings.tts_max_retries
+        )
+        outcomes = await scheduler.run(jobs, synthesize, on_complete)
+        
+        # 섹션 순서대로 문장 WAV를 조립해 저장
+        results = []
+        for section_idx, (section_name, _) in enumerate(sections):
+            units = [o for o in outcomes if o.job.section == section_idx]
+            failed = next((o for o in units if not o.success), None)
+            if failed:
+                results.append({"section": section_name, "error": failed.error or "생성 실패"})
+                continue
             
             try:
-                if self.voice_option in ["youtube", "sample"] and ref_audio_b64:
-                    audio_data = await self._generate_clone(text, ref_audio_b64, ref_text)
-                else:
-                    audio_data = await self._generate_default(text)
+                wav_bytes, timings = assemble_wav(
+                    [base64.b64decode(o.audio_base64) for o in units],
+                    [o.job.text for o in units]
+                )
+                filename = f"{session_id}_{section_idx+1}_{section_name}.wav"
+                filepath = self.OUTPUT_DIR / filename
                 
-                if audio_data:
-                    filename = f"{session_id}_{i+1}_{section_name}.wav"
-                    filepath = self.OUTPUT_DIR / filename
-                    
-                    with open(filepath, "wb") as f:
-                        f.write(base64.b64decode(audio_data))
-                    
-                    results.append({
-                        "section": section_name,
-                        "filename": filename,
-                        "filepath": str(filepath),
-                        "success": True
-                    })
-                else:
-                    results.append({"section": section_name, "error": "생성 실패"})
+                with open(filepath, "wb") as f:
+                    f.write(wav_bytes)
+                
+                results.append({
+                    "section": section_name,
+                    "filename": filename,
+                    "filepath": str(filepath),
+                    "duration": timings[-1].end if timings else 0.0,
+                    "units": [t.to_dict() for t in timings],  # 합성 단위별 타임스탬프 (자막 큐)
+                    "success": True
+                })
             except Exception as e:
                 results.append({"section": section_name, "error": str(e)[:50]})
         
@@ -398,7 +441,7 @@ class VoiceoverAgent(BaseAgent):
         self.status = AgentStatus.WAITING_FEEDBACK
         
         audio_list = "\n".join([
-            f"  - {r[section]}: {성공 if r.get(success) else r.get(error, 실패)}"
+            f"  - {r['section']}: {'성공' if r.get('success') else r.get('error', '실패')}"
             for r in results
         ])
         
@@ -455,54 +498,74 @@ class VoiceoverAgent(BaseAgent):
         
         return sections
     
-    async def _generate_default(self, text: str) -> Optional[str]:
-        """기본 보이스(Sohee) 생성"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "text": text,
-                    "language": self.DEFAULT_LANGUAGE,
-                    "speaker": self.DEFAULT_SPEAKER,
-                    "instruct": ""
-                }
-                
-                async with session.post(
-                    f"{self.TTS_CUSTOM_URL}/tts",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=120)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("audio_base64")
-                    return None
-        except Exception as e:
-            print(f"Default TTS failed: {e}")
-            return None
+    async def _generate_default(self, text: str, session: aiohttp.ClientSession = None) -> str:
+        """기본 보이스(Sohee) 생성 (session을 주면 공유 커넥션 사용)
+
+        Raises:
+            RuntimeError: 서버 오류 또는 빈 응답 (메시지는 섹션 실패 사유로 표시)
+        """
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                return await self._generate_default(text, session=own_session)
+        
+        payload = {
+            "text": text,
+            "language": self.DEFAULT_LANGUAGE,
+            "speaker": self.DEFAULT_SPEAKER,
+            "instruct": ""
+        }
+        
+        async with session.post(
+            f"{self.TTS_CUSTOM_URL}/tts",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=120)
+        ) as response:
+            if response.status != 200:
+                detail = (await response.text())[:200]
+                print(f"Default TTS error: {response.status} {detail}")
+                raise RuntimeError(f"TTS 서버 오류 ({response.status}): {detail}")
+            data = await response.json()
+        
+        audio = data.get("audio_base64")
+        if not audio:
+            raise RuntimeError(f"TTS 응답에 오디오 없음: {str(data)[:200]}")
+        return audio
     
-    async def _generate_clone(self, text: str, ref_audio_b64: str, ref_text: str = None) -> Optional[str]:
-        """클로닝 보이스 생성"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "text": text,
-                    "language": self.DEFAULT_LANGUAGE,
-                    "ref_audio_base64": ref_audio_b64,
-                    "ref_text": ref_text or "",
-                    "x_vector_only_mode": not bool(ref_text)
-                }
-                
-                async with session.post(
-                    f"{self.TTS_BASE_URL}/clone",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=180)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("audio_base64")
-                    else:
-                        error = await response.text()
-                        print(f"Clone TTS error: {error}")
-                    return None
-        except Exception as e:
-            print(f"Clone TTS failed: {e}")
-            return None
+    async def _generate_clone(
+        self,
+        text: str,
+        ref_audio_b64: str,
+        ref_text: str = None,
+        session: aiohttp.ClientSession = None
+    ) -> str:
+        """클로닝 보이스 생성 (session을 주면 공유 커넥션 사용)
+
+        Raises:
+            RuntimeError: 서버 오류 또는 빈 응답 (메시지는 섹션 실패 사유로 표시)
+        """
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                return await self._generate_clone(text, ref_audio_b64, ref_text, session=own_session)
+        
+        # 참조 음성은 한 번만 등록하고 이후에는 voice_id만 전송
+        payload = await voice_registry.clone_payload(
+            session,
+            self.TTS_BASE_URL,
+            text=text,
+            language=self.DEFAULT_LANGUAGE,
+            ref_audio_base64=ref_audio_b64,
+            ref_text=ref_text or "",
+            x_vector_only_mode=not bool(ref_text)
+        )
+        
+        status, data = await voice_registry.post_clone(
+            session, self.TTS_BASE_URL, payload, ref_audio_b64, ref_text or "", timeout=180
+        )
+        if status != 200:
+            print(f"Clone TTS error: {data}")
+            raise RuntimeError(f"클로닝 서버 오류 ({status}): {str(data)[:200]}")
+        
+        audio = data.get("audio_base64")
+        if not audio:
+            raise RuntimeError(f"클로닝 응답에 오디오 없음: {str(data)[:200]}")
+        return audio
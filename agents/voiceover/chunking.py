@@ -0,0 +1,127 @@
+"""문장 단위 TTS 분할 및 WAV 조립
+
+섹션 텍스트를 한국어 문장 경계에서 TTS 모델에 맞는 크기의 합성 단위로 나누고,
+합성된 단위 WAV들을 PCM 그대로 이어 붙여 섹션 WAV를 만든다.
+
+합성 단위는 문장과 1:1이 아니다 - 짧은 문장은 앞 문장과 합쳐지고 긴 문장은 절/어절로 나뉜다.
+타임스탬프(자막 큐)도 합성 단위 기준이다.
+"""
+
+import io
+import re
+import wave
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+MAX_UNIT_CHARS = 120  # 합성 단위 최대 길이 (TTS 모델 입력 길이 기준)
+MIN_UNIT_CHARS = 15   # 이보다 짧은 문장은 앞 문장과 합침
+SILENCE_MS = 250      # 단위 사이 무음 길이
+EMPTY_FORMAT = (1, 2, 24000)  # 조각이 없을 때 쓰는 WAV 포맷 (모노, 16bit, 24kHz)
+
+# 마침표/물음표/느낌표/말줄임표 뒤 공백 또는 줄바꿈에서 분리
+_SENTENCE_END = re.compile(r"(?<=[.!?。…~])\s+|\n+")
+# 긴 문장은 쉼표/접속 어미 뒤 공백에서 추가 분리
+_CLAUSE_END = re.compile(r"(?<=[,，;:])\s+|(?<=(?:고|며|서|만|니|데|면))\s+")
+
+
+@dataclass
+class UnitTiming:
+    """섹션 내 합성 단위 위치 (초 단위) - 여러 문장이 합쳐졌거나 문장 일부일 수 있음"""
+    text: str
+    start: float
+    end: float
+
+    def to_dict(self) -> Dict:
+        return {"text": self.text, "start": round(self.start, 3), "end": round(self.end, 3)}
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """max_chars를 넘는 문장을 절 단위, 그래도 길면 어절 단위로 분리"""
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces: List[str] = []
+    current = ""
+    for clause in _CLAUSE_END.split(sentence):
+        for word in clause.split() if len(clause) > max_chars else [clause]:
+            candidate = f"{current} {word}".strip()
+            if current and len(candidate) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sentences(text: str, max_chars: int = MAX_UNIT_CHARS, min_chars: int = MIN_UNIT_CHARS) -> List[str]:
+    """텍스트를 합성 단위로 분리 (min_chars보다 짧은 문장은 앞 단위에 합침)"""
+    units: List[str] = []
+    for raw in _SENTENCE_END.split(text.strip()):
+        sentence = raw.strip()
+        if not sentence:
+            continue
+        for piece in _split_long(sentence, max_chars):
+            # 너무 짧은 조각은 앞 단위에 붙여 호출 수와 어색한 끊김을 줄임
+            if units and len(piece) < min_chars and len(units[-1]) + len(piece) + 1 <= max_chars:
+                units[-1] = f"{units[-1]} {piece}"
+            else:
+                units.append(piece)
+    return units
+
+
+def assemble_wav(
+    chunks: List[bytes],
+    texts: List[str],
+    silence_ms: int = SILENCE_MS
+) -> Tuple[bytes, List[UnitTiming]]:
+    """단위 WAV들을 무음 간격으로 이어 붙이고 단위별 타임스탬프 반환
+
+    WAV 헤더만 읽고 PCM 샘플을 그대로 연결하므로 재디코딩이 없다.
+    모든 조각은 같은 포맷(채널/샘플폭/샘플레이트)이어야 한다.
+    조각이 없으면(빈 섹션) 길이 0의 WAV와 빈 타임스탬프를 반환한다.
+    """
+    params = None
+    arrays: List[np.ndarray] = []
+    for chunk in chunks:
+        with wave.open(io.BytesIO(chunk), "rb") as wav:
+            chunk_params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+            if params is None:
+                params = chunk_params
+            elif chunk_params != params:
+                raise ValueError(f"WAV format mismatch: {chunk_params} != {params}")
+            frames = wav.readframes(wav.getnframes())
+        arrays.append(np.frombuffer(frames, dtype=np.uint8))
+
+    channels, sampwidth, sample_rate = params or EMPTY_FORMAT
+    frame_bytes = channels * sampwidth
+    silence = np.zeros(int(sample_rate * silence_ms / 1000) * frame_bytes, dtype=np.uint8)
+
+    parts: List[np.ndarray] = []
+    timings: List[UnitTiming] = []
+    cursor = 0  # 프레임 단위
+    for i, (pcm, text) in enumerate(zip(arrays, texts)):
+        if i > 0:
+            parts.append(silence)
+            cursor += len(silence) // frame_bytes
+        n_frames = len(pcm) // frame_bytes
+        timings.append(UnitTiming(
+            text=text,
+            start=cursor / sample_rate,
+            end=(cursor + n_frames) / sample_rate
+        ))
+        parts.append(pcm[:n_frames * frame_bytes])
+        cursor += n_frames
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(channels)
+        out.setsampwidth(sampwidth)
+        out.setframerate(sample_rate)
+        out.writeframes(np.concatenate(parts).tobytes() if parts else b"")
+
+    return buffer.getvalue(), timings
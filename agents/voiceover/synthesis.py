@@ -0,0 +1,109 @@
+"""TTS 합성 스케줄러 - 공유 세션, 동시성 제한, 섹션별 재시도"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+import aiohttp
+
+
+@dataclass
+class SynthesisJob:
+    """합성 단위 (대본 섹션 또는 섹션 내 문장 하나)"""
+    index: int
+    name: str
+    text: str
+    section: int = 0  # 소속 섹션 번호
+    unit: int = 0     # 섹션 내 문장 순서
+
+
+@dataclass
+class SynthesisOutcome:
+    """합성 결과"""
+    job: SynthesisJob
+    audio_base64: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+    @property
+    def success(self) -> bool:
+        return bool(self.audio_base64)
+
+
+# (공유 세션, 작업) -> audio_base64 (실패 시 예외 - 메시지가 실패 사유로 기록됨)
+SynthesizeFn = Callable[[aiohttp.ClientSession, SynthesisJob], Awaitable[Optional[str]]]
+# (결과, 완료 개수, 전체 개수)
+ProgressFn = Callable[[SynthesisOutcome, int, int], None]
+
+
+class SynthesisScheduler:
+    """여러 섹션을 TTS 서버 용량에 맞춰 병렬 합성
+
+    - 하나의 aiohttp 세션(커넥션 풀)을 모든 요청이 공유
+    - 동시 요청 수는 max_concurrency로 제한 (재시도 대기 중에는 슬롯을 반납)
+    - 실패한 섹션만 지수 백오프로 재시도
+    - 진행 상황은 완료되는 순서대로 보고, 결과는 입력 순서대로 반환
+    """
+
+    def __init__(self, max_concurrency: int = 2, max_retries: int = 2, retry_delay: float = 1.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.retry_delay = retry_delay
+
+    async def run(
+        self,
+        jobs: List[SynthesisJob],
+        synthesize: SynthesizeFn,
+        on_complete: Optional[ProgressFn] = None
+    ) -> List[SynthesisOutcome]:
+        """모든 작업 실행 후 입력 순서대로 결과 반환"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [
+                asyncio.create_task(self._run_with_retry(session, semaphore, job, synthesize))
+                for job in jobs
+            ]
+            outcomes = {}
+            try:
+                for done, future in enumerate(asyncio.as_completed(tasks), 1):
+                    outcome = await future
+                    outcomes[outcome.job.index] = outcome
+                    if on_complete:
+                        on_complete(outcome, done, len(jobs))
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return [outcomes[job.index] for job in jobs]
+
+    async def _run_with_retry(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        job: SynthesisJob,
+        synthesize: SynthesizeFn
+    ) -> SynthesisOutcome:
+        outcome = SynthesisOutcome(job=job)
+
+        for attempt in range(self.max_retries + 1):
+            outcome.attempts = attempt + 1
+            try:
+                # 슬롯은 요청 동안만 점유 - 백오프 대기 중에는 다른 작업이 사용
+                async with semaphore:
+                    audio = await synthesize(session, job)
+                if audio:
+                    outcome.audio_base64 = audio
+                    outcome.error = None
+                    return outcome
+                outcome.error = "빈 오디오 응답"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                outcome.error = str(e)[:200] or type(e).__name__
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_delay * (2 ** attempt))
+
+        return outcome
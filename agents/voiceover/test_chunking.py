@@ -0,0 +1,94 @@
+"""Chunking Tests - 합성 단위 분리, WAV 조립과 단위별 타임스탬프"""
+import io
+import os
+import sys
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from agents.voiceover.chunking import EMPTY_FORMAT, assemble_wav, split_sentences
+
+
+def _wav(seconds: float, value: int, sample_rate: int = 24000, channels: int = 1) -> bytes:
+    frames = np.full(int(seconds * sample_rate) * channels, value, dtype=np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(channels)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate)
+        out.writeframes(frames.tobytes())
+    return buffer.getvalue()
+
+
+def test_split_sentences():
+    """문장 경계 분리, 짧은 문장 병합, 긴 문장은 절/어절 단위 분리"""
+    text = "오늘은 집에서 간단한 요리를 해 보겠습니다. 네!  재료는 마트에서 쉽게 구할 수 있습니다?\n\n먼저 냄비에 물을 넉넉히 끓여 주세요…"
+    assert split_sentences(text) == [
+        "오늘은 집에서 간단한 요리를 해 보겠습니다. 네!",
+        "재료는 마트에서 쉽게 구할 수 있습니다?",
+        "먼저 냄비에 물을 넉넉히 끓여 주세요…",
+    ]
+
+    # 첫 단위는 짧아도 합칠 앞 단위가 없음
+    assert split_sentences("네. 오늘은 요리를 해 보겠습니다.") == ["네.", "오늘은 요리를 해 보겠습니다."]
+
+    long_sentence = "물을 끓이고, 면을 넣으며, 소스를 만들고 마지막으로 접시에 담아 마무리합니다."
+    units = split_sentences(long_sentence, max_chars=20, min_chars=5)
+    assert all(len(unit) <= 20 for unit in units)
+    assert " ".join(units) == long_sentence
+    assert units[:2] == ["물을 끓이고, 면을 넣으며,", "소스를 만들고"]
+
+    # 구분자가 없는 긴 문장은 어절 단위
+    words = "가나다라마 " * 10
+    units = split_sentences(words, max_chars=12, min_chars=1)
+    assert all(len(unit) <= 12 for unit in units) and len(units) == 5
+
+    assert split_sentences("") == []
+    assert split_sentences("  \n\n ") == []
+    print("✓ split_sentences OK")
+
+
+def test_assemble_wav():
+    """PCM 연결 + 단위 사이 무음, 단위별 시작/끝 시각"""
+    chunks = [_wav(1.0, 100), _wav(0.5, 200), _wav(2.0, 300)]
+    wav_bytes, timings = assemble_wav(chunks, ["첫째", "둘째", "셋째"], silence_ms=250)
+
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wav:
+        assert (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == (1, 2, 24000)
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    assert len(samples) == int(4.0 * 24000)
+
+    assert [t.to_dict() for t in timings] == [
+        {"text": "첫째", "start": 0.0, "end": 1.0},
+        {"text": "둘째", "start": 1.25, "end": 1.75},
+        {"text": "셋째", "start": 2.0, "end": 4.0},
+    ]
+    assert samples[int(1.1 * 24000)] == 0  # 무음 간격
+    assert samples[int(1.5 * 24000)] == 200
+
+    try:
+        assemble_wav([_wav(1.0, 1), _wav(1.0, 1, sample_rate=16000)], ["a", "b"])
+    except ValueError as e:
+        assert "mismatch" in str(e)
+    else:
+        raise AssertionError("format mismatch not detected")
+    print("✓ assemble_wav OK")
+
+
+def test_assemble_empty_section():
+    """빈 섹션은 예외 대신 길이 0의 WAV"""
+    wav_bytes, timings = assemble_wav([], [])
+    assert timings == []
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wav:
+        assert (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == EMPTY_FORMAT
+        assert wav.getnframes() == 0
+    print("✓ Empty section OK")
+
+
+if __name__ == "__main__":
+    test_split_sentences()
+    test_assemble_wav()
+    test_assemble_empty_section()
+    print("All tests passed!")
@@ -0,0 +1,71 @@
+"""Synthesis Scheduler Tests - 동시성 제한, 재시도, 백오프 중 슬롯 반납"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agents.voiceover.synthesis import SynthesisJob, SynthesisScheduler
+
+
+def _jobs(count: int):
+    return [SynthesisJob(index=i, name=f"section{i}", text=f"문장 {i}") for i in range(count)]
+
+
+def test_concurrency_cap():
+    """동시 요청 수는 max_concurrency 이하, 결과는 입력 순서"""
+    in_flight = 0
+    peak = 0
+
+    async def synthesize(session, job):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05 if job.index % 2 else 0.02)
+        in_flight -= 1
+        return f"audio-{job.index}"
+
+    progress = []
+    scheduler = SynthesisScheduler(max_concurrency=2, max_retries=0)
+    outcomes = asyncio.run(scheduler.run(
+        _jobs(6), synthesize, lambda outcome, done, total: progress.append((done, total))
+    ))
+
+    assert peak == 2
+    assert [o.audio_base64 for o in outcomes] == [f"audio-{i}" for i in range(6)]
+    assert progress == [(i, 6) for i in range(1, 7)]
+    print("✓ Concurrency cap OK")
+
+
+def test_retry_keeps_error_and_releases_slot():
+    """재시도 후 성공/실패 사유 보존, 백오프 대기 중에는 다른 작업이 슬롯 사용"""
+    calls = {0: 0, 1: 0, 2: 0}
+    finished = []
+
+    async def synthesize(session, job):
+        calls[job.index] += 1
+        if job.index == 0 and calls[0] < 3:
+            raise RuntimeError("TTS 서버 오류 (503): overloaded")
+        if job.index == 1:
+            raise RuntimeError("클로닝 서버 오류 (400): invalid ref_text")
+        await asyncio.sleep(0.01)
+        return f"audio-{job.index}"
+
+    scheduler = SynthesisScheduler(max_concurrency=1, max_retries=2, retry_delay=0.1)
+    outcomes = asyncio.run(scheduler.run(
+        _jobs(3), synthesize, lambda outcome, done, total: finished.append(outcome.job.index)
+    ))
+
+    assert outcomes[0].success and outcomes[0].attempts == 3 and outcomes[0].error is None
+    assert not outcomes[1].success and outcomes[1].attempts == 3
+    assert outcomes[1].error == "클로닝 서버 오류 (400): invalid ref_text"
+    assert outcomes[2].success and outcomes[2].attempts == 1
+    # 슬롯이 하나여도 0번의 백오프 동안 2번이 먼저 끝남
+    assert finished[0] == 2
+    print("✓ Retry path OK")
+
+
+if __name__ == "__main__":
+    test_concurrency_cap()
+    test_retry_keeps_error_and_releases_slot()
+    print("All tests passed!")
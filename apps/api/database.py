@@ -3,7 +3,7 @@ SQLite Database Configuration and Initialization
 """
 import os
 from pathlib import Path
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, select, update
 from sqlalchemy.orm import sessionmaker, declarative_base
 from contextlib import contextmanager
 
@@ -61,6 +61,8 @@ def init_db():
     """Initialize database and create all tables"""
     import models  # Import models to register them
     Base.metadata.create_all(bind=engine)
+    migrate_summary_columns()
+    create_missing_indexes()
     print(f"[Database] Initialized at {DB_PATH}")
 
 
@@ -73,6 +75,72 @@ def reset_db():
 
 
 # Migration helper
+# create_all은 기존 테이블에 컬럼을 추가하지 않으므로 목록용 요약 컬럼은 직접 추가
+SUMMARY_COLUMNS = {
+    "projects": {
+        "script_word_count": "INTEGER",
+        "script_preview": "TEXT",
+        "has_benchmark": "BOOLEAN DEFAULT 0",
+        "thumbnail_path": "TEXT",
+    },
+    "characters": {
+        "image_size": "INTEGER",
+    },
+}
+
+
+def migrate_summary_columns(bind=None, batch_size: int = 100):
+    """요약 컬럼이 없는 기존 DB에 컬럼 추가 후 한 번 채움"""
+    from models import Project, summarize_context
+
+    bind = bind or engine
+    added = {}
+    with bind.begin() as conn:
+        for table, columns in SUMMARY_COLUMNS.items():
+            existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+            missing = [name for name in columns if name not in existing]
+            for name in missing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {columns[name]}")
+            added[table] = missing
+
+        if added["characters"]:
+            conn.exec_driver_sql("UPDATE characters SET image_size = length(image_base64) WHERE image_base64 IS NOT NULL")
+
+    if added["projects"]:
+        # context_json은 배치 단위로만 읽음, updated_at은 그대로 유지 (onupdate 방지)
+        projects = Project.__table__
+        last_id = ""
+        while True:
+            with bind.begin() as conn:
+                rows = conn.execute(
+                    select(projects.c.id, projects.c.context_json)
+                    .where(projects.c.id > last_id)
+                    .order_by(projects.c.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                for project_id, context in rows:
+                    conn.execute(
+                        update(projects)
+                        .where(projects.c.id == project_id)
+                        .values(updated_at=projects.c.updated_at, **summarize_context(context))
+                    )
+                last_id = rows[-1][0]
+
+    for table, missing in added.items():
+        if missing:
+            print(f"[Migration] Added {table} columns: {', '.join(missing)}")
+
+
+def create_missing_indexes(bind=None):
+    """기존 테이블에 나중에 추가된 인덱스 생성 (create_all은 이미 있는 테이블의 인덱스를 만들지 않음)"""
+    bind = bind or engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
 def migrate_users_from_json():
     """Migrate existing users.json to database"""
     import json
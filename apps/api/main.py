@@ -18,6 +18,7 @@ from routes.studio import router as studio_router
 from routes.tts import router as tts_router
 from database import init_db
 from config.settings import settings
+from apps.api.services.browser_pool import browser_pool
 
 
 @asynccontextmanager
@@ -25,8 +26,8 @@ async def lifespan(app: FastAPI):
     # Startup: Initialize database
     init_db()
     yield
-    # Shutdown: cleanup if needed
-    pass
+    # Shutdown: 공유 Chromium 종료 (스크린샷/스크래핑 에이전트가 띄운 브라우저)
+    await browser_pool.close()
 
 
 app = FastAPI(
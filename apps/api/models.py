@@ -2,14 +2,44 @@
 SQLAlchemy Models for Routine Studio
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 from sqlalchemy import (
     Column, String, Integer, Text, Boolean, DateTime,
     ForeignKey, JSON, Index
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, validates
 from database import Base
 
+# 목록 화면용 스크립트 미리보기 길이
+SCRIPT_PREVIEW_CHARS = 500
+
+
+def summarize_context(context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """세션 context → Project 요약 컬럼 값 (목록 조회 시 context_json을 읽지 않기 위함)"""
+    context = context or {}
+    summary = {
+        "script_word_count": None,
+        "script_preview": None,
+        "has_benchmark": bool(context.get("benchmark_report")),
+        "thumbnail_path": None,
+    }
+
+    script = context.get("script")
+    if script:
+        content = script.get("full_script", "") if isinstance(script, dict) else str(script)
+        summary["script_word_count"] = len(content.split())
+        summary["script_preview"] = (
+            content[:SCRIPT_PREVIEW_CHARS] + "..." if len(content) > SCRIPT_PREVIEW_CHARS else content
+        )
+
+    # 대표 썸네일: 처음으로 생성에 성공한 장면 이미지
+    for image in context.get("generated_images") or []:
+        if isinstance(image, dict) and image.get("success") and image.get("image_path"):
+            summary["thumbnail_path"] = image["image_path"]
+            break
+
+    return summary
+
 
 class User(Base):
     """사용자 테이블 (기존 users.json 대체)"""
@@ -26,6 +56,11 @@ class User(Base):
     # Relationships
     projects = relationship("Project", back_populates="user", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 멤버 목록 keyset 페이지네이션 (created_at, id)
+        Index("idx_users_created_id", "created_at", "id"),
+    )
+
 
 class Project(Base):
     """프로젝트/세션 테이블"""
@@ -37,7 +72,12 @@ class Project(Base):
     user_request = Column(Text)
     current_step = Column(String(50), default="channel_name")
     status = Column(String(20), default="in_progress")  # in_progress, completed, archived
-    context_json = Column(JSON, default=dict)  # Store full context for backward compat
+    # 전체 context는 상세 조회에서만 필요하므로 지연 로딩 (목록은 아래 요약 컬럼 사용)
+    context_json = deferred(Column(JSON, default=dict))  # Store full context for backward compat
+    script_word_count = Column(Integer)  # 스크립트가 없으면 NULL
+    script_preview = Column(Text)
+    has_benchmark = Column(Boolean, default=False)
+    thumbnail_path = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -48,6 +88,20 @@ class Project(Base):
     content_ideas = relationship("ContentIdea", back_populates="project", cascade="all, delete-orphan")
     generated_assets = relationship("GeneratedAsset", back_populates="project", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 목록 keyset 페이지네이션 (updated_at, id) + 자주 쓰는 필터별 복합 인덱스
+        Index("idx_projects_updated_id", "updated_at", "id"),
+        Index("idx_projects_status_updated_id", "status", "updated_at", "id"),
+        Index("idx_projects_user_updated_id", "user_id", "updated_at", "id"),
+    )
+
+    @validates("context_json")
+    def _update_context_summary(self, key, context):
+        """context_json을 저장할 때 요약 컬럼도 함께 갱신"""
+        for column, value in summarize_context(context).items():
+            setattr(self, column, value)
+        return context
+
 
 class Benchmark(Base):
     """벤치마킹 결과 테이블 (캐시 + 영구 저장)"""
@@ -74,6 +128,7 @@ class Benchmark(Base):
 
     __table_args__ = (
         Index("idx_benchmark_channel_url", "channel_url"),
+        Index("idx_benchmark_analyzed_id", "analyzed_at", "id"),
     )
 
 
@@ -90,12 +145,24 @@ class Character(Base):
     art_style = Column(String(100))
     personality = Column(String(200))
     image_path = Column(Text)  # Path to stored character image
-    image_base64 = Column(Text)  # Or base64 encoded image
+    image_base64 = deferred(Column(Text))  # Or base64 encoded image (상세 조회에서만 로드)
+    image_size = Column(Integer)  # len(image_base64), 이미지가 없으면 NULL
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     project = relationship("Project", back_populates="characters")
 
+    __table_args__ = (
+        # 캐릭터는 수정 시각이 없으므로 (created_at, id)로 페이지네이션
+        Index("idx_characters_created_id", "created_at", "id"),
+        Index("idx_characters_project_created_id", "project_id", "created_at", "id"),
+    )
+
+    @validates("image_base64")
+    def _update_image_size(self, key, image):
+        self.image_size = len(image) if image is not None else None
+        return image
+
 
 class ContentIdea(Base):
     """콘텐츠 아이디어 테이블"""
@@ -0,0 +1,112 @@
+"""
+Keyset (cursor) Pagination Helpers
+
+목록 API는 (정렬 시각, id) 내림차순으로 정렬하고 마지막 행의 값을 cursor로 돌려준다.
+다음 페이지는 OFFSET 대신 "(정렬 시각, id) < cursor" 조건으로 조회하므로
+(정렬 시각, id) 복합 인덱스를 타고 깊은 페이지도 첫 페이지와 같은 비용이 든다.
+정렬 시각이 NULL인 행은 다음 페이지 조건에서 빠지므로 정렬 컬럼에는 기본값이 있어야 한다.
+"""
+import base64
+import json
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def encode_cursor(sort_value: Any, item_id: Any) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, item_id], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """cursor → (정렬 값, id), 형식이 잘못되면 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, item_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return sort_value, item_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, sort_column, id_column, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """쿼리 결과 한 페이지와 다음 페이지 cursor (마지막 페이지면 None)
+
+    행은 sort_column/id_column 이름의 속성을 가져야 한다 (엔티티 또는 해당 컬럼을 포함한 projection).
+    """
+    limit = clamp_limit(limit)
+    if cursor:
+        sort_value, item_id = decode_cursor(cursor)
+        if sort_value is not None and isinstance(sort_column.type, DateTime):
+            try:
+                sort_value = datetime.fromisoformat(sort_value)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, item_id))
+
+    # 한 행 더 읽어서 다음 페이지 존재 여부 확인
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+class RecordIndex:
+    """JSON 레코드 목록을 (정렬 값, id) 순으로 정렬해 둔 인덱스 - DB 이전 전 JSON 파일 목록용
+
+    cursor 위치는 이진 탐색으로 찾으므로 깊은 페이지도 앞 페이지와 같은 비용이 든다.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], sort_key: str):
+        self.sort_key = sort_key
+        self.records = sorted(records, key=self._key)
+        self.keys = [self._key(record) for record in self.records]
+        self._by_id = {record.get("id"): record for record in self.records}
+
+    def _key(self, record: Dict[str, Any]) -> Tuple[str, str]:
+        return str(record.get(self.sort_key) or ""), str(record.get("id") or "")
+
+    def get(self, record_id: Any) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(record_id)
+
+    def page(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        build: Callable[[Dict[str, Any]], List[Dict[str, Any]]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """최신순 한 페이지 (build가 레코드별 결과 항목을 만들고, 빈 목록이면 필터에서 제외)
+
+        레코드 하나가 여러 항목을 만들어도 페이지 사이에 나뉘지 않는다.
+        """
+        limit = clamp_limit(limit)
+        position = len(self.records)
+        if cursor:
+            sort_value, item_id = decode_cursor(cursor)
+            position = bisect_left(self.keys, (str(sort_value or ""), str(item_id or "")))
+
+        items: List[Dict[str, Any]] = []
+        last_key = None
+        for index in range(position - 1, -1, -1):
+            built = build(self.records[index])
+            if not built:
+                continue
+            if len(items) >= limit:
+                # 조건에 맞는 레코드가 더 있음 → 다음 페이지
+                return items, encode_cursor(*last_key)
+            items.extend(built)
+            last_key = self.keys[index]
+        return items, None
@@ -2,8 +2,10 @@
 Admin Routes - Using SQLite Database
 """
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer
 from typing import Optional
+from collections import Counter
 import json
 import os
 from datetime import datetime, timedelta
@@ -12,6 +14,7 @@ import random
 from .auth import get_current_user, require_role, Role
 from database import get_db
 from models import User
+from pagination import DEFAULT_PAGE_SIZE, RecordIndex, keyset_page
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -38,20 +41,43 @@ def load_projects() -> list:
     return data if isinstance(data, list) else list(data.values()) if data else []
 
 
+# (파일 경로, 정렬 키) → (mtime, RecordIndex) - 파일이 바뀔 때만 다시 읽고 정렬
+_record_indexes: dict = {}
+
+
+def load_record_index(filepath: str, sort_key: str) -> RecordIndex:
+    """JSON 목록 파일을 cursor 페이지네이션용으로 정렬해 둔 인덱스 (파일 변경 시에만 재구성)"""
+    mtime = os.path.getmtime(filepath) if os.path.exists(filepath) else None
+    cached = _record_indexes.get((filepath, sort_key))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    data = load_json(filepath)
+    records = data if isinstance(data, list) else list(data.values()) if data else []
+    index = RecordIndex(records, sort_key)
+    _record_indexes[(filepath, sort_key)] = (mtime, index)
+    return index
+
+
 # ============ Members ============
 @router.get("/members")
 async def get_members(
+    role: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    users = db.query(User).all()
+    query = db.query(User)
+    if role:
+        query = query.filter(User.role == role)
+    users, next_cursor = keyset_page(query, User.created_at, User.id, cursor, limit)
     members = []
-    channels = load_channels()
-    projects = load_projects()
+    # 유저마다 전체 목록을 훑지 않도록 소유자별 개수를 미리 집계
+    channel_counts = Counter(c.get("owner_id") for c in load_channels())
+    project_counts = Counter(p.get("owner_id") for p in load_projects())
 
     for user in users:
-        user_channels = [c for c in channels if c.get("owner_id") == user.id]
-        user_projects = [p for p in projects if p.get("owner_id") == user.id]
         members.append({
             "id": user.id,
             "username": user.username,
@@ -62,10 +88,10 @@ async def get_members(
             "is_approved": user.is_approved or False,
             "created_at": user.created_at.isoformat() if user.created_at else None,
             "last_login_at": user.created_at.isoformat() if user.created_at else None,
-            "channel_count": len(user_channels),
-            "project_count": len(user_projects)
+            "channel_count": channel_counts[user.id],
+            "project_count": project_counts[user.id]
         })
-    return {"members": members}
+    return {"members": members, "next_cursor": next_cursor}
 
 
 @router.put("/members/{member_id}/approve")
@@ -201,13 +227,29 @@ async def get_activity_logs(
 
 
 # ============ Channels ============
+def owners_by_id(db: Session, owner_ids) -> dict:
+    """페이지에 나온 소유자만 한 번에 조회"""
+    owner_ids = {owner_id for owner_id in owner_ids if owner_id}
+    if not owner_ids:
+        return {}
+    return {u.id: u for u in db.query(User).filter(User.id.in_(owner_ids))}
+
+
 @router.get("/channels")
 async def get_channels(
+    owner_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    channels = load_channels()
-    users = {u.id: u for u in db.query(User).all()}
+    def build(ch):
+        if owner_id and ch.get("owner_id") != owner_id:
+            return []
+        return [ch]
+
+    channels, next_cursor = load_record_index(CHANNELS_FILE, "created_at").page(cursor, limit, build)
+    users = owners_by_id(db, (ch.get("owner_id") for ch in channels))
 
     result = []
     for ch in channels:
@@ -226,12 +268,16 @@ async def get_channels(
             "created_at": ch.get("created_at"),
             "last_sync_at": ch.get("last_sync_at")
         })
-    return {"channels": result}
+    return {"channels": result, "next_cursor": next_cursor}
 
 
 @router.get("/channel-settings")
-async def get_channel_settings(current_user: User = Depends(get_current_user)):
-    channels = load_channels()
+async def get_channel_settings(
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    current_user: User = Depends(get_current_user)
+):
+    channels, next_cursor = load_record_index(CHANNELS_FILE, "created_at").page(cursor, limit, lambda ch: [ch])
     settings = []
     for ch in channels:
         settings.append({
@@ -248,7 +294,7 @@ async def get_channel_settings(current_user: User = Depends(get_current_user)):
             "created_at": ch.get("created_at"),
             "updated_at": ch.get("updated_at", ch.get("created_at"))
         })
-    return {"settings": settings}
+    return {"settings": settings, "next_cursor": next_cursor}
 
 
 @router.put("/channel-settings/{setting_id}")
@@ -262,58 +308,72 @@ async def update_channel_setting(
 
 @router.get("/characters")
 async def get_characters(
+    owner_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    channels = load_channels()
-    users = {u.id: u for u in db.query(User).all()}
+    def build(ch):
+        if not ch.get("character") or (owner_id and ch.get("owner_id") != owner_id):
+            return []
+        return [ch]
+
+    channels, next_cursor = load_record_index(CHANNELS_FILE, "created_at").page(cursor, limit, build)
+    users = owners_by_id(db, (ch.get("owner_id") for ch in channels))
     characters = []
 
     for ch in channels:
-        if ch.get("character"):
-            char = ch["character"]
-            owner = users.get(ch.get("owner_id", ""))
-            characters.append({
-                "id": char.get("id", f"char_{ch.get('id', '')}"),
-                "name": char.get("name", "AI Character"),
-                "description": char.get("description"),
-                "voice_id": char.get("voice_id"),
-                "voice_name": char.get("voice_name"),
-                "avatar_url": char.get("avatar_url"),
-                "channel_id": ch.get("id"),
-                "channel_name": ch.get("name"),
-                "owner_id": ch.get("owner_id"),
-                "owner_email": owner.username if owner else "",
-                "is_active": True,
-                "video_count": ch.get("video_count", 0),
-                "created_at": char.get("created_at", ch.get("created_at")),
-                "updated_at": char.get("updated_at", ch.get("created_at"))
-            })
-    return {"characters": characters}
+        char = ch["character"]
+        owner = users.get(ch.get("owner_id", ""))
+        characters.append({
+            "id": char.get("id", f"char_{ch.get('id', '')}"),
+            "name": char.get("name", "AI Character"),
+            "description": char.get("description"),
+            "voice_id": char.get("voice_id"),
+            "voice_name": char.get("voice_name"),
+            "avatar_url": char.get("avatar_url"),
+            "channel_id": ch.get("id"),
+            "channel_name": ch.get("name"),
+            "owner_id": ch.get("owner_id"),
+            "owner_email": owner.username if owner else "",
+            "is_active": True,
+            "video_count": ch.get("video_count", 0),
+            "created_at": char.get("created_at", ch.get("created_at")),
+            "updated_at": char.get("updated_at", ch.get("created_at"))
+        })
+    return {"characters": characters, "next_cursor": next_cursor}
 
 
 # ============ Videos/Projects ============
 @router.get("/projects")
 async def get_projects(
-    limit: int = 100,
+    limit: int = DEFAULT_PAGE_SIZE,
     status: Optional[str] = None,
+    channel_id: Optional[str] = None,
+    owner_id: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    projects = load_projects()
-    channels = load_channels()
-    users = {u.id: u for u in db.query(User).all()}
+    def build(proj):
+        if status and proj.get("status") != status:
+            return []
+        if channel_id and proj.get("channel_id") != channel_id:
+            return []
+        if owner_id and proj.get("owner_id") != owner_id:
+            return []
+        return [proj]
 
-    channel_map = {ch.get("id"): ch for ch in channels}
+    projects, next_cursor = load_record_index(PROJECTS_FILE, "updated_at").page(cursor, limit, build)
+    channel_index = load_record_index(CHANNELS_FILE, "created_at")
+    users = owners_by_id(db, (proj.get("owner_id") for proj in projects))
 
     result = []
     for proj in projects:
-        ch = channel_map.get(proj.get("channel_id"), {})
+        ch = channel_index.get(proj.get("channel_id")) or {}
         owner = users.get(proj.get("owner_id", ""))
 
-        if status and proj.get("status") != status:
-            continue
-
         result.append({
             "id": proj.get("id"),
             "title": proj.get("title", "Untitled"),
@@ -331,57 +391,56 @@ async def get_projects(
             "published_at": proj.get("published_at")
         })
 
-    return {"projects": result[:limit]}
+    return {"projects": result, "next_cursor": next_cursor}
 
 
 @router.get("/scripts")
 async def get_scripts(
-    limit: int = 100,
+    limit: int = DEFAULT_PAGE_SIZE,
+    channel_id: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
-    projects = load_projects()
-    channels = load_channels()
-
-    channel_map = {ch.get("id"): ch for ch in channels}
-
-    scripts = []
-    for proj in projects:
-        if proj.get("script"):
-            ch = channel_map.get(proj.get("channel_id"), {})
-            script = proj["script"]
-            content = script if isinstance(script, str) else script.get("content", "")
-            word_count = len(content.split())
-
-            scripts.append({
-                "id": f"script_{proj.get('id', '')}",
-                "project_id": proj.get("id"),
-                "project_title": proj.get("title", "Untitled"),
-                "channel_id": proj.get("channel_id"),
-                "channel_name": ch.get("name", "Unknown"),
-                "owner_email": "",
-                "content": content,
-                "word_count": word_count,
-                "estimated_duration_seconds": word_count * 0.5,
-                "language": "ko",
-                "created_at": proj.get("created_at"),
-                "updated_at": proj.get("updated_at")
-            })
+    channel_index = load_record_index(CHANNELS_FILE, "created_at")
+
+    def build(proj):
+        if not proj.get("script") or (channel_id and proj.get("channel_id") != channel_id):
+            return []
+        ch = channel_index.get(proj.get("channel_id")) or {}
+        script = proj["script"]
+        content = script if isinstance(script, str) else script.get("content", "")
+        word_count = len(content.split())
+
+        return [{
+            "id": f"script_{proj.get('id', '')}",
+            "project_id": proj.get("id"),
+            "project_title": proj.get("title", "Untitled"),
+            "channel_id": proj.get("channel_id"),
+            "channel_name": ch.get("name", "Unknown"),
+            "owner_email": "",
+            "content": content,
+            "word_count": word_count,
+            "estimated_duration_seconds": word_count * 0.5,
+            "language": "ko",
+            "created_at": proj.get("created_at"),
+            "updated_at": proj.get("updated_at")
+        }]
 
-    return {"scripts": scripts[:limit]}
+    scripts, next_cursor = load_record_index(PROJECTS_FILE, "updated_at").page(cursor, limit, build)
+    return {"scripts": scripts, "next_cursor": next_cursor}
 
 
 @router.get("/media")
 async def get_media(
-    limit: int = 100,
+    limit: int = DEFAULT_PAGE_SIZE,
     type: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
-    projects = load_projects()
-
-    assets = []
-    for proj in projects:
+    def build(proj):
         proj_id = proj.get('id', '')
-        if proj.get("thumbnail_url"):
+        assets = []
+        if proj.get("thumbnail_url") and type in (None, "thumbnail"):
             assets.append({
                 "id": f"thumb_{proj_id}",
                 "project_id": proj_id,
@@ -398,7 +457,7 @@ async def get_media(
                 "created_at": proj.get("created_at")
             })
 
-        if proj.get("video_url"):
+        if proj.get("video_url") and type in (None, "video"):
             assets.append({
                 "id": f"video_{proj_id}",
                 "project_id": proj_id,
@@ -414,11 +473,11 @@ async def get_media(
                 "owner_email": "",
                 "created_at": proj.get("created_at")
             })
+        return assets
 
-    if type:
-        assets = [a for a in assets if a["type"] == type]
-
-    return {"assets": assets[:limit]}
+    # 프로젝트 하나의 에셋(썸네일/영상)은 같은 페이지에 포함
+    assets, next_cursor = load_record_index(PROJECTS_FILE, "created_at").page(cursor, limit, build)
+    return {"assets": assets, "next_cursor": next_cursor}
 
 
 # ============ Analytics ============
@@ -516,36 +575,57 @@ from models import Project, Character, Benchmark
 
 @router.get("/studio/sessions")
 async def get_studio_sessions(
-    limit: int = 100,
+    limit: int = DEFAULT_PAGE_SIZE,
     status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """DB에서 Studio 세션(프로젝트) 목록 조회"""
-    query = db.query(Project)
+    """DB에서 Studio 세션(프로젝트) 목록 조회 (updated_at, id 최신순 cursor 페이지)"""
+    # 관련 캐릭터 수는 페이지의 행마다 상관 서브쿼리로 함께 조회 (project_id 인덱스 사용)
+    char_count = (
+        db.query(func.count(Character.id))
+        .filter(Character.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+        .label("char_count")
+    )
+    query = (
+        db.query(
+            Project.id,
+            Project.channel_name,
+            Project.user_request,
+            Project.current_step,
+            Project.status,
+            Project.has_benchmark,
+            Project.created_at,
+            Project.updated_at,
+            char_count,
+        )
+    )
     
     if status:
         query = query.filter(Project.status == status)
+    if user_id:
+        query = query.filter(Project.user_id == user_id)
     
-    projects = query.order_by(Project.updated_at.desc()).limit(limit).all()
+    rows, next_cursor = keyset_page(query, Project.updated_at, Project.id, cursor, limit)
     
     result = []
-    for p in projects:
-        # 관련 캐릭터 수 조회
-        char_count = db.query(Character).filter(Character.project_id == p.id).count()
-        
+    for p in rows:
         result.append({
             "id": p.id,
             "channel_name": p.channel_name,
             "user_request": p.user_request,
             "current_step": p.current_step,
             "status": p.status,
-            "character_count": char_count,
-            "has_benchmark": bool(p.context_json.get("benchmark_report")) if p.context_json else False,
+            "character_count": p.char_count,
+            "has_benchmark": bool(p.has_benchmark),
             "created_at": p.created_at.isoformat() if p.created_at else None,
             "updated_at": p.updated_at.isoformat() if p.updated_at else None
         })
     
-    return {"sessions": result, "total": len(result)}
+    return {"sessions": result, "total": len(result), "next_cursor": next_cursor}
 
 
 @router.get("/studio/sessions/{session_id}")
@@ -554,7 +634,7 @@ async def get_studio_session_detail(
     db: Session = Depends(get_db)
 ):
     """Studio 세션 상세 조회"""
-    project = db.query(Project).filter(Project.id == session_id).first()
+    project = db.query(Project).options(undefer(Project.context_json)).filter(Project.id == session_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -577,7 +657,7 @@ async def get_studio_session_detail(
                 "expression": c.expression,
                 "art_style": c.art_style,
                 "personality": c.personality,
-                "has_image": bool(c.image_base64)
+                "has_image": bool(c.image_size)
             }
             for c in characters
         ],
@@ -603,11 +683,25 @@ async def delete_studio_session(
 
 @router.get("/studio/benchmarks")
 async def get_studio_benchmarks(
-    limit: int = 100,
+    limit: int = DEFAULT_PAGE_SIZE,
+    channel_url: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """DB에서 벤치마크 결과 목록 조회"""
-    benchmarks = db.query(Benchmark).order_by(Benchmark.analyzed_at.desc()).limit(limit).all()
+    """DB에서 벤치마크 결과 목록 조회 (analyzed_at, id 최신순 cursor 페이지)"""
+    query = db.query(
+        Benchmark.id,
+        Benchmark.project_id,
+        Benchmark.channel_url,
+        Benchmark.channel_name,
+        Benchmark.subscriber_count,
+        Benchmark.video_count,
+        Benchmark.channel_concept,
+        Benchmark.analyzed_at,
+    )
+    if channel_url:
+        query = query.filter(Benchmark.channel_url == channel_url)
+    benchmarks, next_cursor = keyset_page(query, Benchmark.analyzed_at, Benchmark.id, cursor, limit)
     
     result = []
     for b in benchmarks:
@@ -622,7 +716,7 @@ async def get_studio_benchmarks(
             "analyzed_at": b.analyzed_at.isoformat() if b.analyzed_at else None
         })
     
-    return {"benchmarks": result, "total": len(result)}
+    return {"benchmarks": result, "total": len(result), "next_cursor": next_cursor}
 
 
 @router.get("/studio/benchmarks/{benchmark_id}")
@@ -671,32 +765,49 @@ async def delete_studio_benchmark(
 
 @router.get("/studio/characters")
 async def get_studio_characters(
-    limit: int = 100,
+    limit: int = DEFAULT_PAGE_SIZE,
+    project_id: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """DB에서 캐릭터 목록 조회"""
-    characters = db.query(Character).order_by(Character.created_at.desc()).limit(limit).all()
+    """DB에서 캐릭터 목록 조회 (created_at, id 최신순 cursor 페이지)"""
+    query = (
+        db.query(
+            Character.id,
+            Character.project_id,
+            Character.character_type,
+            Character.gender,
+            Character.clothing,
+            Character.expression,
+            Character.art_style,
+            Character.personality,
+            Character.image_size,
+            Character.created_at,
+            Project.channel_name,
+        )
+        .outerjoin(Project, Project.id == Character.project_id)
+    )
+    if project_id:
+        query = query.filter(Character.project_id == project_id)
+    characters, next_cursor = keyset_page(query, Character.created_at, Character.id, cursor, limit)
     
     result = []
     for c in characters:
-        # 관련 프로젝트 정보 조회
-        project = db.query(Project).filter(Project.id == c.project_id).first()
-        
         result.append({
             "id": c.id,
             "project_id": c.project_id,
-            "channel_name": project.channel_name if project else None,
+            "channel_name": c.channel_name,
             "character_type": c.character_type,
             "gender": c.gender,
             "clothing": c.clothing,
             "expression": c.expression,
             "art_style": c.art_style,
             "personality": c.personality,
-            "has_image": bool(c.image_base64),
+            "has_image": bool(c.image_size),
             "created_at": c.created_at.isoformat() if c.created_at else None
         })
     
-    return {"characters": result, "total": len(result)}
+    return {"characters": result, "total": len(result), "next_cursor": next_cursor}
 
 
 @router.get("/studio/characters/{character_id}")
@@ -705,7 +816,7 @@ async def get_studio_character_detail(
     db: Session = Depends(get_db)
 ):
     """캐릭터 상세 조회 (이미지 포함)"""
-    character = db.query(Character).filter(Character.id == character_id).first()
+    character = db.query(Character).options(undefer(Character.image_base64)).filter(Character.id == character_id).first()
     if not character:
         raise HTTPException(status_code=404, detail="Character not found")
     
@@ -731,21 +842,21 @@ async def get_studio_overview(
     db: Session = Depends(get_db)
 ):
     """Studio 대시보드 통계"""
-    total_sessions = db.query(Project).count()
-    active_sessions = db.query(Project).filter(Project.status == "in_progress").count()
-    completed_sessions = db.query(Project).filter(Project.status == "completed").count()
-    total_benchmarks = db.query(Benchmark).count()
-    total_characters = db.query(Character).count()
+    # count()는 전체 컬럼을 감싼 서브쿼리가 되므로 id만 집계
+    total_sessions = db.query(func.count(Project.id)).scalar()
+    active_sessions = db.query(func.count(Project.id)).filter(Project.status == "in_progress").scalar()
+    completed_sessions = db.query(func.count(Project.id)).filter(Project.status == "completed").scalar()
+    total_benchmarks = db.query(func.count(Benchmark.id)).scalar()
+    total_characters = db.query(func.count(Character.id)).scalar()
     
     # 최근 세션 5개
     recent_sessions = db.query(Project).order_by(Project.updated_at.desc()).limit(5).all()
     
-    # 단계별 통계
+    # 단계별 통계 (DB에서 집계)
     step_counts = {}
-    all_projects = db.query(Project).all()
-    for p in all_projects:
-        step = p.current_step or "unknown"
-        step_counts[step] = step_counts.get(step, 0) + 1
+    for step, count in db.query(Project.current_step, func.count(Project.id)).group_by(Project.current_step):
+        step = step or "unknown"
+        step_counts[step] = step_counts.get(step, 0) + count
     
     return {
         "total_sessions": total_sessions,
@@ -3,25 +3,73 @@ Studio Routes - 어드민 대시보드용 공개 API
 인증 없이 접근 가능 (내부 네트워크 전용)
 """
 from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
 
 from database import get_db
 from models import User, Project, Character, Benchmark
+from pagination import DEFAULT_PAGE_SIZE, keyset_page
 
 router = APIRouter(prefix="/api/studio", tags=["studio"])
 
+# 목록 조회용 프로젝트 컬럼 (context_json 같은 큰 컬럼은 읽지 않음)
+PROJECT_LIST_COLUMNS = (
+    Project.id,
+    Project.user_id,
+    Project.channel_name,
+    Project.user_request,
+    Project.current_step,
+    Project.status,
+    Project.thumbnail_path,
+    Project.created_at,
+    Project.updated_at,
+)
+
+
+def query_project_rows(db: Session, *extra_columns):
+    """프로젝트 목록 행 + 소유자 owner_username/owner_name (조인 한 번)"""
+    return (
+        db.query(
+            *PROJECT_LIST_COLUMNS,
+            User.username.label("owner_username"),
+            User.name.label("owner_name"),
+            *extra_columns,
+        )
+        .outerjoin(User, User.id == Project.user_id)
+    )
+
 
 # ============ Members ============
 @router.get("/admin/members")
-async def get_members(db: Session = Depends(get_db)):
-    """멤버 목록 조회"""
-    users = db.query(User).all()
+async def get_members(
+    role: Optional[str] = None,
+    is_approved: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    """멤버 목록 조회 (created_at, id 최신순 cursor 페이지)"""
+    # 유저별 프로젝트 수는 페이지의 행마다 상관 서브쿼리로 (user_id 인덱스 사용, 별도 쿼리 없음)
+    project_count = (
+        db.query(func.count(Project.id))
+        .filter(Project.user_id == User.id)
+        .correlate(User)
+        .scalar_subquery()
+        .label("project_count")
+    )
+    query = db.query(
+        User.id, User.username, User.name, User.role, User.is_approved, User.created_at, project_count
+    )
+    if role:
+        query = query.filter(User.role == role)
+    if is_approved is not None:
+        query = query.filter(User.is_approved == is_approved)
+    users, next_cursor = keyset_page(query, User.created_at, User.id, cursor, limit)
     members = []
     
     for user in users:
-        project_count = db.query(Project).filter(Project.user_id == user.id).count()
         members.append({
             "id": user.id,
             "email": user.username,
@@ -33,25 +81,32 @@ async def get_members(db: Session = Depends(get_db)):
             "created_at": user.created_at.isoformat() if user.created_at else None,
             "last_login_at": user.created_at.isoformat() if user.created_at else None,
             "channel_count": 0,
-            "project_count": project_count
+            "project_count": user.project_count
         })
-    return {"members": members}
+    return {"members": members, "next_cursor": next_cursor}
 
 
 # ============ Sessions ============
 @router.get("/admin/sessions")
-async def get_sessions(db: Session = Depends(get_db)):
-    """활성 세션 목록"""
-    projects = db.query(Project).filter(Project.status == "in_progress").limit(20).all()
+async def get_sessions(
+    member_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    db: Session = Depends(get_db)
+):
+    """활성 세션 목록 (updated_at, id 최신순 cursor 페이지)"""
+    query = query_project_rows(db).filter(Project.status == "in_progress")
+    if member_id:
+        query = query.filter(Project.user_id == member_id)
+    projects, next_cursor = keyset_page(query, Project.updated_at, Project.id, cursor, limit)
     sessions = []
     
     for p in projects:
-        user = db.query(User).filter(User.id == p.user_id).first()
         sessions.append({
             "id": p.id[:8],
             "member_id": p.user_id,
-            "member_email": user.username if user else "unknown",
-            "member_name": user.name if user else None,
+            "member_email": p.owner_username or "unknown",
+            "member_name": p.owner_name,
             "device_type": "desktop",
             "browser": "Chrome",
             "os": "Unknown",
@@ -60,23 +115,31 @@ async def get_sessions(db: Session = Depends(get_db)):
             "created_at": p.created_at.isoformat() if p.created_at else None,
             "last_activity_at": p.updated_at.isoformat() if p.updated_at else None
         })
-    return {"sessions": sessions}
+    return {"sessions": sessions, "next_cursor": next_cursor}
 
 
 # ============ Activity Logs ============
 @router.get("/admin/activity-logs")
-async def get_activity_logs(limit: int = 100, db: Session = Depends(get_db)):
-    """활동 로그"""
-    projects = db.query(Project).order_by(Project.updated_at.desc()).limit(limit).all()
+async def get_activity_logs(
+    member_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    """활동 로그 (세션 updated_at, id 최신순 cursor 페이지)"""
+    query = query_project_rows(db)
+    if member_id:
+        query = query.filter(Project.user_id == member_id)
+    projects, next_cursor = keyset_page(query, Project.updated_at, Project.id, cursor, limit)
     logs = []
     
-    for i, p in enumerate(projects):
-        user = db.query(User).filter(User.id == p.user_id).first()
+    for p in projects:
         logs.append({
-            "id": f"log_{i}",
+            # 페이지가 나뉘어도 겹치지 않도록 세션 id 기반
+            "id": f"log_{p.id}",
             "member_id": p.user_id,
-            "member_email": user.username if user else "unknown",
-            "member_name": user.name if user else None,
+            "member_email": p.owner_username or "unknown",
+            "member_name": p.owner_name,
             "action": "session_update",
             "resource_type": "session",
             "resource_id": p.id,
@@ -84,18 +147,25 @@ async def get_activity_logs(limit: int = 100, db: Session = Depends(get_db)):
             "ip_address": "internal",
             "created_at": p.updated_at.isoformat() if p.updated_at else None
         })
-    return {"logs": logs}
+    return {"logs": logs, "next_cursor": next_cursor}
 
 
 # ============ Channels ============
 @router.get("/admin/channels")
-async def get_channels(db: Session = Depends(get_db)):
-    """채널 목록 (프로젝트 기반)"""
-    projects = db.query(Project).filter(Project.channel_name != None).all()
+async def get_channels(
+    owner_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    """채널 목록 (프로젝트 기반, updated_at, id 최신순 cursor 페이지)"""
+    query = query_project_rows(db).filter(Project.channel_name != None)
+    if owner_id:
+        query = query.filter(Project.user_id == owner_id)
+    projects, next_cursor = keyset_page(query, Project.updated_at, Project.id, cursor, limit)
     channels = []
     
     for p in projects:
-        user = db.query(User).filter(User.id == p.user_id).first()
         channels.append({
             "id": p.id,
             "youtube_channel_id": None,
@@ -105,18 +175,26 @@ async def get_channels(db: Session = Depends(get_db)):
             "video_count": 0,
             "is_connected": False,
             "owner_id": p.user_id,
-            "owner_email": user.username if user else None,
-            "owner_name": user.name if user else None,
+            "owner_email": p.owner_username,
+            "owner_name": p.owner_name,
             "created_at": p.created_at.isoformat() if p.created_at else None,
             "last_sync_at": None
         })
-    return {"channels": channels}
+    return {"channels": channels, "next_cursor": next_cursor}
 
 
 @router.get("/admin/channel-settings")
-async def get_channel_settings(db: Session = Depends(get_db)):
-    """채널 설정"""
-    projects = db.query(Project).filter(Project.channel_name != None).all()
+async def get_channel_settings(
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    """채널 설정 (updated_at, id 최신순 cursor 페이지)"""
+    query = (
+        db.query(Project.id, Project.channel_name, Project.created_at, Project.updated_at)
+        .filter(Project.channel_name != None)
+    )
+    projects, next_cursor = keyset_page(query, Project.updated_at, Project.id, cursor, limit)
     settings = []
     
     for p in projects:
@@ -134,20 +212,43 @@ async def get_channel_settings(db: Session = Depends(get_db)):
             "created_at": p.created_at.isoformat() if p.created_at else None,
             "updated_at": p.updated_at.isoformat() if p.updated_at else None
         })
-    return {"settings": settings}
+    return {"settings": settings, "next_cursor": next_cursor}
 
 
 # ============ Characters ============
 @router.get("/admin/characters")
-async def get_characters(db: Session = Depends(get_db)):
-    """캐릭터 목록"""
-    characters = db.query(Character).all()
+async def get_characters(
+    channel_id: Optional[str] = None,
+    owner_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    """캐릭터 목록 (created_at, id 최신순 cursor 페이지)"""
+    query = (
+        db.query(
+            Character.id,
+            Character.project_id,
+            Character.character_type,
+            Character.gender,
+            Character.art_style,
+            Character.personality,
+            Character.created_at,
+            Project.channel_name,
+            Project.user_id.label("owner_id"),
+            User.username.label("owner_username"),
+        )
+        .outerjoin(Project, Project.id == Character.project_id)
+        .outerjoin(User, User.id == Project.user_id)
+    )
+    if channel_id:
+        query = query.filter(Character.project_id == channel_id)
+    if owner_id:
+        query = query.filter(Project.user_id == owner_id)
+    characters, next_cursor = keyset_page(query, Character.created_at, Character.id, cursor, limit)
     result = []
     
     for c in characters:
-        project = db.query(Project).filter(Project.id == c.project_id).first()
-        user = db.query(User).filter(User.id == project.user_id).first() if project else None
-        
         result.append({
             "id": c.id,
             "name": c.personality or "AI Character",
@@ -156,29 +257,36 @@ async def get_characters(db: Session = Depends(get_db)):
             "voice_name": None,
             "avatar_url": None,
             "channel_id": c.project_id,
-            "channel_name": project.channel_name if project else None,
-            "owner_id": project.user_id if project else None,
-            "owner_email": user.username if user else None,
+            "channel_name": c.channel_name,
+            "owner_id": c.owner_id,
+            "owner_email": c.owner_username,
             "is_active": True,
             "video_count": 0,
             "created_at": c.created_at.isoformat() if c.created_at else None,
             "updated_at": c.created_at.isoformat() if c.created_at else None
         })
-    return {"characters": result}
+    return {"characters": result, "next_cursor": next_cursor}
 
 
 # ============ Projects ============
 @router.get("/admin/projects")
-async def get_projects(limit: int = 100, status: Optional[str] = None, db: Session = Depends(get_db)):
-    """프로젝트 목록"""
-    query = db.query(Project)
+async def get_projects(
+    limit: int = DEFAULT_PAGE_SIZE,
+    status: Optional[str] = None,
+    owner_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """프로젝트 목록 (updated_at, id 최신순 cursor 페이지)"""
+    query = query_project_rows(db)
     if status:
         query = query.filter(Project.status == status)
-    projects = query.order_by(Project.updated_at.desc()).limit(limit).all()
+    if owner_id:
+        query = query.filter(Project.user_id == owner_id)
+    projects, next_cursor = keyset_page(query, Project.updated_at, Project.id, cursor, limit)
     
     result = []
     for p in projects:
-        user = db.query(User).filter(User.id == p.user_id).first()
         result.append({
             "id": p.id,
             "title": p.channel_name or p.user_request or "Untitled",
@@ -187,65 +295,94 @@ async def get_projects(limit: int = 100, status: Optional[str] = None, db: Sessi
             "channel_id": p.id,
             "channel_name": p.channel_name,
             "owner_id": p.user_id,
-            "owner_email": user.username if user else None,
+            "owner_email": p.owner_username,
             "video_url": None,
-            "thumbnail_url": None,
+            "thumbnail_url": p.thumbnail_path,
             "duration_seconds": None,
             "created_at": p.created_at.isoformat() if p.created_at else None,
             "updated_at": p.updated_at.isoformat() if p.updated_at else None,
             "published_at": None
         })
-    return {"projects": result}
+    return {"projects": result, "next_cursor": next_cursor}
 
 
 # ============ Scripts ============
 @router.get("/admin/scripts")
-async def get_scripts(limit: int = 100, db: Session = Depends(get_db)):
-    """스크립트 목록"""
-    projects = db.query(Project).filter(Project.context_json.isnot(None)).limit(limit).all()
+async def get_scripts(
+    limit: int = DEFAULT_PAGE_SIZE,
+    channel_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """스크립트 목록 (updated_at, id 최신순 cursor 페이지)"""
+    # 스크립트 본문 대신 저장 시 계산해 둔 요약 컬럼만 조회
+    query = (
+        db.query(
+            Project.id,
+            Project.channel_name,
+            Project.script_word_count,
+            Project.script_preview,
+            Project.created_at,
+            Project.updated_at,
+        )
+        .filter(Project.script_word_count != None)
+    )
+    if channel_id:
+        query = query.filter(Project.id == channel_id)
+    projects, next_cursor = keyset_page(query, Project.updated_at, Project.id, cursor, limit)
     scripts = []
     
     for p in projects:
-        context = p.context_json or {}
-        script = context.get("script")
-        if script:
-            content = script.get("full_script", "") if isinstance(script, dict) else str(script)
-            word_count = len(content.split())
-            
-            scripts.append({
-                "id": f"script_{p.id[:8]}",
-                "project_id": p.id,
-                "project_title": p.channel_name or "Untitled",
-                "channel_id": p.id,
-                "channel_name": p.channel_name,
-                "owner_email": None,
-                "content": content[:500] + "..." if len(content) > 500 else content,
-                "word_count": word_count,
-                "estimated_duration_seconds": word_count * 0.5,
-                "language": "ko",
-                "created_at": p.created_at.isoformat() if p.created_at else None,
-                "updated_at": p.updated_at.isoformat() if p.updated_at else None
-            })
-    return {"scripts": scripts}
+        scripts.append({
+            "id": f"script_{p.id[:8]}",
+            "project_id": p.id,
+            "project_title": p.channel_name or "Untitled",
+            "channel_id": p.id,
+            "channel_name": p.channel_name,
+            "owner_email": None,
+            "content": p.script_preview or "",
+            "word_count": p.script_word_count,
+            "estimated_duration_seconds": p.script_word_count * 0.5,
+            "language": "ko",
+            "created_at": p.created_at.isoformat() if p.created_at else None,
+            "updated_at": p.updated_at.isoformat() if p.updated_at else None
+        })
+    return {"scripts": scripts, "next_cursor": next_cursor}
 
 
 # ============ Media ============
 @router.get("/admin/media")
-async def get_media(limit: int = 100, type: Optional[str] = None, db: Session = Depends(get_db)):
-    """미디어 에셋 목록"""
-    characters = db.query(Character).filter(Character.image_base64 != None).limit(limit).all()
+async def get_media(
+    limit: int = DEFAULT_PAGE_SIZE,
+    type: Optional[str] = None,
+    project_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """미디어 에셋 목록 (캐릭터 이미지, created_at, id 최신순 cursor 페이지)"""
+    # 지금은 캐릭터 이미지만 에셋으로 노출하므로 다른 타입은 조회할 필요 없음
+    if type and type != "image":
+        return {"assets": [], "next_cursor": None}
+
+    query = (
+        db.query(Character.id, Character.project_id, Character.image_size, Character.created_at, Project.channel_name)
+        .outerjoin(Project, Project.id == Character.project_id)
+        .filter(Character.image_size != None)
+    )
+    if project_id:
+        query = query.filter(Character.project_id == project_id)
+    characters, next_cursor = keyset_page(query, Character.created_at, Character.id, cursor, limit)
     assets = []
     
     for c in characters:
-        project = db.query(Project).filter(Project.id == c.project_id).first()
         assets.append({
             "id": f"char_img_{c.id}",
             "project_id": c.project_id,
-            "project_title": project.channel_name if project else "Unknown",
+            "project_title": c.channel_name or "Unknown",
             "type": "image",
             "filename": f"character_{c.id}.png",
             "url": None,
-            "size_bytes": len(c.image_base64) if c.image_base64 else 0,
+            "size_bytes": c.image_size or 0,
             "mime_type": "image/png",
             "width": 512,
             "height": 512,
@@ -254,10 +391,7 @@ async def get_media(limit: int = 100, type: Optional[str] = None, db: Session =
             "created_at": c.created_at.isoformat() if c.created_at else None
         })
     
-    if type:
-        assets = [a for a in assets if a["type"] == type]
-    
-    return {"assets": assets}
+    return {"assets": assets, "next_cursor": next_cursor}
 
 
 # ============ Analytics ============
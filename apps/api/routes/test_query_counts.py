@@ -0,0 +1,295 @@
+"""Admin/Studio 목록 API 쿼리 테스트 - 행 수와 무관한 SQL 문 수 (N+1 방지), blob 컬럼 제외, cursor 페이지네이션"""
+import asyncio
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import Base, migrate_summary_columns
+from models import User, Project, Character, Benchmark
+from pagination import RecordIndex
+from routes import admin, studio
+
+
+def make_session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine, autoflush=False)
+
+
+def seed(Session, users: int, projects_per_user: int):
+    """유저마다 프로젝트 n개, 프로젝트마다 캐릭터(이미지 포함) 1개"""
+    now = datetime.utcnow()
+    db = Session()
+    for u in range(users):
+        user = User(id=str(uuid.uuid4()), username=f"user{u}", password_hash="x", name=f"User {u}")
+        db.add(user)
+        for i in range(projects_per_user):
+            project = Project(
+                id=str(uuid.uuid4()),
+                user_id=user.id,
+                channel_name=f"채널 {u}-{i}",
+                user_request="요청",
+                status="in_progress",
+                context_json={
+                    "script": {"full_script": "첫 줄 둘째 줄"},
+                    "benchmark_report": {"a": 1},
+                    "generated_images": [{"success": False}, {"success": True, "image_path": f"/app/output/{u}_{i}.png"}],
+                },
+                updated_at=now - timedelta(minutes=u * projects_per_user + i),
+            )
+            db.add(project)
+            db.add(Character(project_id=project.id, character_type="human", image_base64="aGVsbG8="))
+        db.add(Benchmark(channel_url=f"https://www.youtube.com/@ch{u}", channel_name=f"ch{u}"))
+    db.commit()
+    db.close()
+
+
+@contextmanager
+def count_queries(engine):
+    """블록 안에서 실행된 SQL 문 목록"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+ENDPOINTS = {
+    "studio.get_members": lambda db: studio.get_members(db=db),
+    "studio.get_sessions": lambda db: studio.get_sessions(db=db),
+    "studio.get_activity_logs": lambda db: studio.get_activity_logs(db=db),
+    "studio.get_channels": lambda db: studio.get_channels(db=db),
+    "studio.get_channel_settings": lambda db: studio.get_channel_settings(db=db),
+    "studio.get_characters": lambda db: studio.get_characters(db=db),
+    "studio.get_projects": lambda db: studio.get_projects(db=db),
+    "studio.get_scripts": lambda db: studio.get_scripts(db=db),
+    "studio.get_media": lambda db: studio.get_media(db=db),
+    "admin.get_studio_sessions": lambda db: admin.get_studio_sessions(db=db),
+    "admin.get_studio_characters": lambda db: admin.get_studio_characters(db=db),
+    "admin.get_studio_benchmarks": lambda db: admin.get_studio_benchmarks(db=db),
+    "admin.get_studio_overview": lambda db: admin.get_studio_overview(db=db),
+}
+
+
+def measure(users: int, projects_per_user: int) -> dict:
+    """엔드포인트별 (SQL 문 수, 응답)"""
+    engine, Session = make_session_factory()
+    seed(Session, users, projects_per_user)
+    results = {}
+    for name, call in ENDPOINTS.items():
+        # 세션 identity map에 남은 객체로 쿼리가 가려지지 않도록 호출마다 새 세션
+        db = Session()
+        try:
+            with count_queries(engine) as statements:
+                response = asyncio.run(call(db))
+            results[name] = (statements, response)
+        finally:
+            db.close()
+    engine.dispose()
+    return results
+
+
+def test_query_count_constant():
+    """행이 늘어나도 엔드포인트별 SQL 문 수는 그대로"""
+    small = measure(users=2, projects_per_user=1)
+    large = measure(users=6, projects_per_user=4)
+
+    for name in ENDPOINTS:
+        small_count = len(small[name][0])
+        large_count = len(large[name][0])
+        assert small_count == large_count, f"{name}: {small_count} → {large_count} statements"
+
+    # 목록 API는 한 번의 SELECT로 끝남 (overview는 집계 쿼리 고정 개수)
+    for name, (statements, _) in large.items():
+        if name != "admin.get_studio_overview":
+            assert len(statements) == 1, f"{name}: {len(statements)} statements"
+    print("✓ Query counts constant")
+
+
+def test_list_queries_skip_blobs():
+    """목록 조회는 context_json/image_base64 컬럼을 읽지 않음"""
+    for name, (statements, _) in measure(users=2, projects_per_user=2).items():
+        for statement in statements:
+            assert "context_json" not in statement and "image_base64" not in statement, name
+    print("✓ Blob columns skipped")
+
+
+def test_joined_fields():
+    """조인/집계로 채운 필드가 기존과 같은 값"""
+    results = measure(users=3, projects_per_user=2)
+
+    members = results["studio.get_members"][1]["members"]
+    assert sorted(m["project_count"] for m in members) == [2, 2, 2]
+
+    projects = results["studio.get_projects"][1]["projects"]
+    assert len(projects) == 6 and all(p["owner_email"].startswith("user") for p in projects)
+    assert all(p["thumbnail_url"].endswith(".png") for p in projects)
+
+    scripts = results["studio.get_scripts"][1]["scripts"]
+    assert len(scripts) == 6 and all(s["word_count"] == 4 and s["content"] == "첫 줄 둘째 줄" for s in scripts)
+
+    media = results["studio.get_media"][1]["assets"]
+    assert len(media) == 6 and all(m["size_bytes"] == 8 for m in media)
+
+    characters = results["studio.get_characters"][1]["characters"]
+    assert all(c["channel_name"] and c["owner_email"] for c in characters)
+
+    sessions = results["admin.get_studio_sessions"][1]["sessions"]
+    assert all(s["character_count"] == 1 and s["has_benchmark"] for s in sessions)
+
+    overview = results["admin.get_studio_overview"][1]
+    assert overview["step_distribution"] == {"channel_name": 6}
+    print("✓ Joined fields OK")
+
+
+def test_summary_columns_on_write_and_migration():
+    """context_json/image_base64 저장 시 요약 컬럼 갱신, 기존 DB는 컬럼 추가 후 채움"""
+    engine, Session = make_session_factory()
+    seed(Session, users=1, projects_per_user=3)
+
+    db = Session()
+    project = db.query(Project).first()
+    project.context_json = {"script": "한 두 세"}
+    db.commit()
+    assert (project.script_word_count, project.has_benchmark, project.thumbnail_path) == (3, False, None)
+    db.close()
+
+    # 요약 컬럼이 없던 시절의 DB: 컬럼을 지우고 마이그레이션
+    with engine.begin() as conn:
+        for column in ("script_word_count", "script_preview", "has_benchmark", "thumbnail_path"):
+            conn.execute(text(f"ALTER TABLE projects DROP COLUMN {column}"))
+        conn.execute(text("ALTER TABLE characters DROP COLUMN image_size"))
+        before = conn.execute(text("SELECT id, updated_at FROM projects ORDER BY id")).all()
+
+    migrate_summary_columns(bind=engine, batch_size=2)
+    migrate_summary_columns(bind=engine)  # 두 번째는 아무것도 하지 않음
+
+    with engine.connect() as conn:
+        after = conn.execute(text("SELECT id, updated_at FROM projects ORDER BY id")).all()
+        counts = sorted(r[0] for r in conn.execute(text("SELECT script_word_count FROM projects")))
+        sizes = {r[0] for r in conn.execute(text("SELECT image_size FROM characters"))}
+    assert after == before
+    assert counts == [3, 4, 4] and sizes == {8}
+    engine.dispose()
+    print("✓ Summary columns OK")
+
+
+def collect_pages(Session, engine, call, key: str, limit: int):
+    """cursor를 따라 모든 페이지를 읽고 (항목 목록, 페이지별 SQL 문 수)"""
+    items, counts, cursor = [], [], None
+    while True:
+        db = Session()
+        try:
+            with count_queries(engine) as statements:
+                response = asyncio.run(call(db, cursor, limit))
+        finally:
+            db.close()
+        items.extend(response[key])
+        counts.append(len(statements))
+        cursor = response["next_cursor"]
+        if cursor is None:
+            return items, counts
+
+
+def test_keyset_pagination():
+    """cursor 페이지를 이어 붙이면 전체 목록과 같고, 깊은 페이지도 SQL 한 번 + 복합 인덱스 사용"""
+    engine, Session = make_session_factory()
+    seed(Session, users=5, projects_per_user=5)
+    # 같은 시각의 행이 페이지 경계에 걸려도 id로 이어지는지 확인
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE projects SET updated_at = '2026-01-01 00:00:00.000000' WHERE user_id IN (SELECT id FROM users WHERE username IN ('user1', 'user2'))"))
+
+    projects, counts = collect_pages(
+        Session, engine, lambda db, cursor, limit: studio.get_projects(limit=limit, cursor=cursor, db=db), "projects", 4
+    )
+    assert counts == [1] * 7
+    db = Session()
+    expected = [p.id for p in db.query(Project).order_by(Project.updated_at.desc(), Project.id.desc())]
+    db.close()
+    assert [p["id"] for p in projects] == expected
+
+    characters, counts = collect_pages(
+        Session, engine, lambda db, cursor, limit: admin.get_studio_characters(limit=limit, cursor=cursor, db=db), "characters", 10
+    )
+    assert len({c["id"] for c in characters}) == 25 and counts == [1, 1, 1]
+
+    db = Session()
+    owner = asyncio.run(studio.get_members(db=db))["members"][0]
+    db.close()
+    owned, _ = collect_pages(
+        Session,
+        engine,
+        lambda db, cursor, limit: studio.get_channels(owner_id=owner["id"], limit=limit, cursor=cursor, db=db),
+        "channels",
+        2,
+    )
+    assert len(owned) == 5 and {c["owner_id"] for c in owned} == {owner["id"]}
+
+    # 깊은 페이지 조회도 (updated_at, id) 인덱스 범위 검색
+    db = Session()
+    cursor = asyncio.run(studio.get_projects(limit=20, db=db))["next_cursor"]
+    executed = []
+    capture = lambda conn, cursor_, statement, parameters, context, executemany: executed.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", capture)
+    asyncio.run(studio.get_projects(limit=20, cursor=cursor, db=db))
+    event.remove(engine, "before_cursor_execute", capture)
+    db.close()
+    statement, parameters = executed[0]
+    with engine.connect() as conn:
+        plan = " ".join(str(row[-1]) for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+    assert "idx_projects_updated_id" in plan, plan
+    engine.dispose()
+    print("✓ Keyset pagination OK")
+
+
+def test_record_index_pages():
+    """JSON 목록 페이지네이션 - 레코드별 여러 항목은 한 페이지에, 필터는 조회 중 적용"""
+    records = [
+        {"id": f"p{i:02d}", "updated_at": f"2026-01-{i % 5 + 1:02d}", "video": i % 2 == 0}
+        for i in range(20)
+    ]
+    index = RecordIndex(records, "updated_at")
+    build = lambda r: [{"id": r["id"], "kind": "thumb"}] + ([{"id": r["id"], "kind": "video"}] if r["video"] else [])
+
+    pages, cursor = [], None
+    while True:
+        items, cursor = index.page(cursor, 5, build)
+        pages.append(items)
+        if cursor is None:
+            break
+    ids = [item["id"] for page in pages for item in page]
+    expected = [r["id"] for r in sorted(records, key=lambda r: (r["updated_at"], r["id"]), reverse=True)]
+    assert list(dict.fromkeys(ids)) == expected and len(ids) == 30
+    assert all(len(page) <= 6 for page in pages)
+
+    videos, cursor = index.page(None, 3, lambda r: [r] if r["video"] else [])
+    assert [r["id"] for r in videos] == ["p14", "p04", "p18"] and cursor
+    print("✓ RecordIndex pages OK")
+
+
+if __name__ == "__main__":
+    test_query_count_constant()
+    test_list_queries_skip_blobs()
+    test_joined_fields()
+    test_summary_columns_on_write_and_migration()
+    test_keyset_pagination()
+    test_record_index_pages()
+    print("All tests passed!")
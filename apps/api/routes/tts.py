@@ -2,7 +2,7 @@
 TTS Preview Routes - 음성 미리듣기 API
 채널 생성 과정에서 TTS 설정용
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel
 from typing import Optional
 
@@ -30,13 +30,15 @@ class TTSPreviewResponse(BaseModel):
     duration: float
     voice_name: str
     text: str
+    cache_key: str = ""  # /api/tts/audio/{cache_key}로 WAV 직접 재생 가능
+    cached: bool = False
 
 
 class YouTubeExtractRequest(BaseModel):
     """YouTube 오디오 추출 요청"""
     url: str
-    start_time: str  # "00:00:00" 또는 "MM:SS" 또는 초(seconds)
-    end_time: str
+    start_time: Optional[str] = None  # "00:00:00" 또는 "MM:SS" 또는 초(seconds), 생략 시 영상 전체에서 탐색
+    end_time: Optional[str] = None
     session_id: Optional[str] = None
 
 
@@ -112,8 +114,26 @@ async def generate_tts_preview(request: TTSPreviewRequest):
     TTS 미리듣기 생성
     
     기본 보이스(Sohee)로 텍스트를 음성으로 변환합니다.
-    Rate limit: 10초당 3회
+    Rate limit: 10초당 3회 (캐시된 미리듣기는 제외)
     """
+    # 캐시된 미리듣기는 합성 없이 바로 응답 - rate limit 횟수에 포함하지 않음
+    cached = tts_preview_service.cached_preview(
+        text=request.text,
+        speaker=request.speaker,
+        instruct=request.instruct,
+        speed=request.speed,
+        pitch=request.pitch
+    )
+    if cached:
+        return TTSPreviewResponse(
+            audio_base64=cached.audio_base64,
+            duration=cached.duration,
+            voice_name=cached.voice_name,
+            text=cached.text,
+            cache_key=cached.cache_key,
+            cached=True
+        )
+
     # Rate limit 체크
     session_id = request.session_id or "anonymous"
     if not tts_preview_service.check_rate_limit(session_id):
@@ -149,7 +169,9 @@ async def generate_tts_preview(request: TTSPreviewRequest):
             audio_base64=result.audio_base64,
             duration=result.duration,
             voice_name=result.voice_name,
-            text=result.text
+            text=result.text,
+            cache_key=result.cache_key,
+            cached=result.cached
         )
     except TTSError as e:
         raise HTTPException(status_code=500, detail=e.user_message)
@@ -161,6 +183,7 @@ async def extract_youtube_audio(request: YouTubeExtractRequest):
     YouTube에서 오디오 추출
     
     지정된 YouTube URL에서 특정 구간의 오디오를 추출합니다.
+    구간을 생략하면 영상 전체를 스트리밍 분석해 최적 구간을 찾습니다.
     추출된 오디오는 보이스 클로닝에 사용할 수 있습니다.
     Rate limit: 10초당 3회
     """
@@ -226,12 +249,31 @@ async def clone_voice_preview(request: ClonePreviewRequest):
             audio_base64=result.audio_base64,
             duration=result.duration,
             voice_name=result.voice_name,
-            text=result.text
+            text=result.text,
+            cache_key=result.cache_key,
+            cached=result.cached
         )
     except TTSError as e:
         raise HTTPException(status_code=500, detail=e.user_message)
 
 
+@router.get("/audio/{cache_key}")
+async def get_cached_audio(cache_key: str):
+    """
+    캐시된 미리듣기 오디오 (WAV 바이트)
+    
+    /preview, /clone-preview 응답의 cache_key로 같은 음성을 재합성 없이 재생합니다.
+    """
+    audio_bytes = tts_preview_service.get_cached_audio(cache_key)
+    if not audio_bytes:
+        raise HTTPException(status_code=404, detail="캐시된 오디오가 없습니다.")
+    return Response(
+        content=audio_bytes,
+        media_type="audio/wav",
+        headers={"Cache-Control": "private, max-age=86400, immutable"}
+    )
+
+
 @router.get("/test-text")
 async def get_test_text(channel_name: str = Query("채널", description="채널 이름")):
     """
@@ -268,5 +310,6 @@ async def tts_health():
         "status": "ok",
         "custom_voice_url": tts_preview_service.TTS_CUSTOM_URL,
         "clone_url": tts_preview_service.TTS_BASE_URL,
-        "samples_available": len(tts_preview_service._load_samples())
+        "samples_available": len(tts_preview_service._load_samples()),
+        "audio_cache": tts_preview_service.audio_cache.stats()
     }
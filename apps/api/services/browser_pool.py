@@ -0,0 +1,188 @@
+"""
+공유 Playwright 브라우저 풀
+- Chromium은 한 번만 띄우고 컨텍스트를 재사용 (매 캡처마다 브라우저 기동 비용 제거)
+- 페이지 임대 수 제한, 컨텍스트는 N회 사용 후 또는 크래시 시 교체
+- 캡처에 필요 없는 무거운 리소스(동영상, 폰트, 광고/트래커) 차단
+"""
+import asyncio
+import json
+import os
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# 차단할 리소스 타입 (이미지는 썸네일 캡처에 필요하므로 허용)
+BLOCKED_RESOURCE_TYPES: FrozenSet[str] = frozenset({"media", "font"})
+
+# 광고/트래킹 요청
+BLOCKED_URL_PATTERN = re.compile(
+    r"(doubleclick\.net|googlesyndication\.com|googleadservices\.com|google-analytics\.com"
+    r"|googletagmanager\.com|/pagead/|/ptracking|/api/stats/(ads|qoe|atr|watchtime))"
+)
+
+
+class _PooledContext:
+    """재사용 중인 브라우저 컨텍스트와 사용 횟수"""
+
+    def __init__(self, context, options_key: str):
+        self.context = context
+        self.options_key = options_key
+        self.uses = 0
+        self.crashed = False
+
+
+class BrowserPool:
+    """Chromium 한 개 + 옵션별 웜 컨텍스트 풀"""
+
+    def __init__(
+        self,
+        max_pages: int = None,
+        max_context_uses: int = None,
+        blocked_resource_types: FrozenSet[str] = BLOCKED_RESOURCE_TYPES,
+        launch_args: Optional[List[str]] = None,
+    ):
+        self.max_pages = max(1, max_pages or int(os.environ.get("BROWSER_POOL_MAX_PAGES", "4")))
+        self.max_context_uses = max(1, max_context_uses or int(os.environ.get("BROWSER_CONTEXT_MAX_USES", "20")))
+        self.blocked_resource_types = blocked_resource_types
+        self.launch_args = launch_args or ["--no-sandbox", "--disable-dev-shm-usage"]
+
+        self._playwright = None
+        self._browser = None
+        self._idle: List[_PooledContext] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self._loop = None
+        self.stats = {"launches": 0, "contexts": 0, "leases": 0, "blocked": 0}
+
+    def _bind_loop(self):
+        # Playwright 객체와 동기화 primitive는 생성한 이벤트 루프에 묶임
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._has_resources():
+                # 이전 루프의 브라우저는 그 루프에서만 닫을 수 있음 - 참조만 버리면 Chromium 프로세스가 남음
+                raise RuntimeError("BrowserPool is still open on another event loop; call close() on that loop first")
+            self._playwright = None
+            self._browser = None
+            self._idle = []
+            self._slots = asyncio.Semaphore(self.max_pages)
+            self._launch_lock = asyncio.Lock()
+            self._loop = loop
+
+    def _has_resources(self) -> bool:
+        return self._browser is not None or self._playwright is not None or bool(self._idle)
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if async_playwright is None:
+                raise RuntimeError("playwright not installed. Run: pip install playwright && playwright install chromium")
+
+            # 브라우저가 죽었으면 남은 컨텍스트도 모두 무효
+            self._idle = []
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True, args=self.launch_args)
+            self.stats["launches"] += 1
+            return self._browser
+
+    async def _route(self, route):
+        request = route.request
+        if request.resource_type in self.blocked_resource_types or BLOCKED_URL_PATTERN.search(request.url):
+            self.stats["blocked"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire_context(self, options: Dict[str, Any]) -> _PooledContext:
+        options_key = json.dumps(options, sort_keys=True)
+        for i, pooled in enumerate(self._idle):
+            if pooled.options_key == options_key:
+                return self._idle.pop(i)
+
+        browser = await self._ensure_browser()
+        context = await browser.new_context(**options)
+        await context.route("**/*", self._route)
+        self.stats["contexts"] += 1
+        return _PooledContext(context, options_key)
+
+    async def _release_context(self, pooled: _PooledContext):
+        pooled.uses += 1
+        browser_alive = self._browser is not None and self._browser.is_connected()
+        if pooled.crashed or pooled.uses >= self.max_context_uses or not browser_alive:
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
+            return
+        self._idle.append(pooled)
+
+    @asynccontextmanager
+    async def page(
+        self,
+        viewport: Optional[Dict[str, int]] = None,
+        locale: str = "ko-KR",
+        user_agent: str = DEFAULT_USER_AGENT,
+    ) -> AsyncIterator[Any]:
+        """페이지 임대 - 블록을 벗어나면 페이지를 닫고 컨텍스트는 풀로 반환
+
+        블록 안에서 예외가 나면 컨텍스트 상태를 신뢰할 수 없으므로 교체한다.
+        """
+        self._bind_loop()
+        options = {"viewport": viewport or {"width": 1920, "height": 1080}, "locale": locale, "user_agent": user_agent}
+
+        async with self._slots:
+            pooled = await self._acquire_context(options)
+            self.stats["leases"] += 1
+            page = None
+            try:
+                page = await pooled.context.new_page()
+                page.on("crash", lambda _: setattr(pooled, "crashed", True))
+                yield page
+            except BaseException:
+                pooled.crashed = True
+                raise
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pooled.crashed = True
+                await self._release_context(pooled)
+
+    async def close(self):
+        """모든 컨텍스트와 브라우저 종료 (앱 종료 시) - 브라우저를 띄운 이벤트 루프에서 호출"""
+        if self._loop is not asyncio.get_running_loop():
+            if self._has_resources():
+                raise RuntimeError("BrowserPool must be closed on the event loop that opened it")
+            return
+        for pooled in self._idle:
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
+        self._idle = []
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+# 싱글톤 인스턴스
+browser_pool = BrowserPool()
@@ -0,0 +1,197 @@
+"""
+채널 스코어링 (열 단위 일괄 계산)
+
+크롤링한 채널/영상 데이터를 numpy 배열 테이블(ChannelBatch)로 바꾸고
+구독자/활동성/참여도/성장 점수를 모든 채널에 대해 한 번에 계산한다.
+조회수·구독자·업로드 시점 문자열은 고유 문자열 단위로 한 번만 파싱한다.
+수천 개 채널(대량 키워드 탐색 결과)도 오프라인으로 일괄 채점할 수 있다.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+# 채점에 쓰는 영상 수 (활동성/참여도는 최근 5개, 성장은 최근 3개 vs 그 이전 3개)
+RECENT_VIDEOS = 5
+GROWTH_WINDOW = 3
+SCORED_VIDEOS = 2 * GROWTH_WINDOW
+
+# 구독자/조회수 단위 (앞에 있는 단위 우선)
+COUNT_MULTIPLIERS: Tuple[Tuple[str, int], ...] = (('만', 10000), ('천', 1000), ('K', 1000), ('M', 1000000))
+
+# "N단위 전" → 일 수 (앞에 있는 패턴 우선, 분/시간 전은 0일)
+DAYS_AGO_PATTERNS: Tuple[Tuple[re.Pattern, int], ...] = (
+    (re.compile(r'(\d+)\s*분\s*전'), 0),
+    (re.compile(r'(\d+)\s*시간\s*전'), 0),
+    (re.compile(r'(\d+)\s*일\s*전'), 1),
+    (re.compile(r'(\d+)\s*주\s*전'), 7),
+    (re.compile(r'(\d+)\s*개월\s*전'), 30),
+    (re.compile(r'(\d+)\s*년\s*전'), 365),
+)
+
+_DECIMAL = re.compile(r'[\d.]+')
+_INTEGER = re.compile(r'\d+')
+
+# (하한, 점수) - 위에서부터 처음 만족하는 구간, 모두 아니면 마지막 기본값
+SUBSCRIBER_TIERS = ((1000000, 30), (500000, 27), (100000, 24), (50000, 20), (10000, 15))
+SUBSCRIBER_DEFAULT = 10
+ENGAGEMENT_TIERS = ((0.3, 25), (0.1, 20), (0.05, 15))
+ENGAGEMENT_DEFAULT = 10
+GROWTH_TIERS = ((0.5, 20), (0.2, 15), (0.0, 10))
+GROWTH_DEFAULT = 5
+# 활동성은 평균 업로드 경과일이 작을수록 높음 (상한, 점수)
+ACTIVITY_TIERS = ((7, 25), (14, 20), (30, 15))
+ACTIVITY_DEFAULT = 10
+
+
+def _texts(values: Iterable) -> np.ndarray:
+    return np.array(['' if v is None else str(v) for v in values], dtype=str)
+
+
+def _parse_count_text(text: str) -> int:
+    """"12.5만" → 125000, "1,234회" → 1234"""
+    cleaned = text.replace(',', '').replace(' ', '')
+    for suffix, multiplier in COUNT_MULTIPLIERS:
+        if suffix in cleaned:
+            match = _DECIMAL.search(cleaned)
+            if match:
+                try:
+                    return int(float(match.group()) * multiplier)
+                except ValueError:
+                    return 0
+    match = _INTEGER.search(cleaned)
+    return int(match.group()) if match else 0
+
+
+def _parse_days_text(text: str) -> float:
+    for pattern, days in DAYS_AGO_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return float(int(match.group(1)) * days)
+    return np.nan
+
+
+def parse_counts(values: Iterable) -> np.ndarray:
+    """구독자/조회수 문자열 배열 → int64 배열 (고유 문자열만 파싱, 파싱 불가는 0)"""
+    texts = _texts(values)
+    if texts.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    unique, inverse = np.unique(texts, return_inverse=True)
+    parsed = np.fromiter((_parse_count_text(t) for t in unique), dtype=np.int64, count=unique.size)
+    return parsed[inverse.reshape(-1)]
+
+
+def parse_days_ago(values: Iterable) -> np.ndarray:
+    """"3일 전" 같은 문자열 배열 → 경과일 float 배열 (인식 불가는 NaN)"""
+    texts = _texts(values)
+    if texts.size == 0:
+        return np.zeros(0, dtype=np.float64)
+    unique, inverse = np.unique(texts, return_inverse=True)
+    parsed = np.fromiter((_parse_days_text(t) for t in unique), dtype=np.float64, count=unique.size)
+    return parsed[inverse.reshape(-1)]
+
+
+def _tiers_at_least(values: np.ndarray, tiers, default: int) -> np.ndarray:
+    return np.select([values >= bound for bound, _ in tiers], [score for _, score in tiers], default)
+
+
+@dataclass
+class ChannelBatch:
+    """채널 n개의 채점용 열 데이터
+
+    views/dates는 (n, SCORED_VIDEOS) 행렬이며 영상이 없는 칸은 has_video=False다.
+    """
+    subscribers: np.ndarray  # (n,) int64
+    views: np.ndarray  # (n, SCORED_VIDEOS) int64, 없는 칸은 0
+    days: np.ndarray  # (n, SCORED_VIDEOS) float64, 없거나 인식 불가면 NaN
+    has_video: np.ndarray  # (n, SCORED_VIDEOS) bool
+    video_counts: np.ndarray  # (n,) int64 - 전체 영상 수
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
+
+    @classmethod
+    def from_channels(cls, channels: List[Dict]) -> "ChannelBatch":
+        """크롤링 결과 dict 목록(subscribers, videos[].views/date) → 열 데이터"""
+        n = len(channels)
+        video_counts = np.fromiter((len(ch.get('videos') or []) for ch in channels), dtype=np.int64, count=n)
+
+        # 채점에 쓰는 영상들을 한 줄로 펼쳐서 한 번에 파싱한 뒤 (채널, 순번) 칸에 배치
+        rows, cols, view_texts, date_texts = [], [], [], []
+        for i, ch in enumerate(channels):
+            for j, video in enumerate((ch.get('videos') or [])[:SCORED_VIDEOS]):
+                rows.append(i)
+                cols.append(j)
+                view_texts.append(video.get('views', ''))
+                date_texts.append(video.get('date', ''))
+
+        views = np.zeros((n, SCORED_VIDEOS), dtype=np.int64)
+        days = np.full((n, SCORED_VIDEOS), np.nan)
+        has_video = np.zeros((n, SCORED_VIDEOS), dtype=bool)
+        views[rows, cols] = parse_counts(view_texts)
+        days[rows, cols] = parse_days_ago(date_texts)
+        has_video[rows, cols] = True
+
+        return cls(
+            subscribers=parse_counts(ch.get('subscribers', '') for ch in channels),
+            views=views,
+            days=days,
+            has_video=has_video,
+            video_counts=video_counts,
+        )
+
+    def scores(self) -> Dict[str, np.ndarray]:
+        """채널별 점수 열 {subscriber, activity, engagement, growth, total} (각 (n,) int64)"""
+        subs = self.subscribers
+        recent_days = self.days[:, :RECENT_VIDEOS]
+        recent_views = self.views[:, :RECENT_VIDEOS]
+
+        # 구독자 (30점)
+        subscriber = _tiers_at_least(subs, SUBSCRIBER_TIERS, SUBSCRIBER_DEFAULT)
+
+        # 활동성 (25점) - 최근 영상 평균 업로드 경과일, 날짜를 하나도 못 읽으면 0점
+        known_days = ~np.isnan(recent_days)
+        day_counts = known_days.sum(axis=1)
+        avg_days = np.where(known_days, recent_days, 0).sum(axis=1) / np.maximum(day_counts, 1)
+        activity = np.select(
+            [avg_days <= bound for bound, _ in ACTIVITY_TIERS], [score for _, score in ACTIVITY_TIERS], ACTIVITY_DEFAULT
+        )
+        activity = np.where(day_counts > 0, activity, 0)
+
+        # 참여도 (25점) - 조회수가 있는 최근 영상 평균 조회수 / 구독자
+        counted = recent_views > 0
+        view_counts = counted.sum(axis=1)
+        avg_views = np.where(counted, recent_views, 0).sum(axis=1) / np.maximum(view_counts, 1)
+        ratio = avg_views / np.maximum(subs, 1)
+        engagement = _tiers_at_least(ratio, ENGAGEMENT_TIERS, ENGAGEMENT_DEFAULT)
+        engagement = np.where((view_counts > 0) & (subs > 0), engagement, 0)
+
+        # 성장 (20점) - 최근 3개 평균 조회수 vs 그 이전 3개 (영상 6개 이상일 때)
+        recent_avg = self.views[:, :GROWTH_WINDOW].mean(axis=1)
+        older_avg = self.views[:, GROWTH_WINDOW:SCORED_VIDEOS].mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth_rate = (recent_avg - older_avg) / older_avg
+        growth = _tiers_at_least(growth_rate, GROWTH_TIERS, GROWTH_DEFAULT)
+        growth = np.where((self.video_counts >= SCORED_VIDEOS) & (older_avg > 0), growth, 0)
+
+        columns = {
+            'subscriber': subscriber,
+            'activity': activity,
+            'engagement': engagement,
+            'growth': growth,
+        }
+        columns = {name: values.astype(np.int64) for name, values in columns.items()}
+        columns['total'] = sum(columns.values())
+        return columns
+
+
+def score_channels(channels: List[Dict]) -> List[Dict[str, int]]:
+    """채널 dict 목록 → 채널별 점수 dict 목록 (입력 순서)"""
+    if not channels:
+        return []
+    columns = ChannelBatch.from_channels(channels).scores()
+    names = list(columns)
+    table = np.column_stack([columns[name] for name in names]).tolist()
+    return [dict(zip(names, row)) for row in table]
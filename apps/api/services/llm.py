@@ -1,3 +1,4 @@
+import json
 import os
 import httpx
 from typing import List, Dict, Any, Optional
@@ -5,6 +6,15 @@ from typing import List, Dict, Any, Optional
 USE_PROVIDER_ROUTER = os.getenv("USE_PROVIDER_ROUTER", "true").lower() == "true"
 
 
+def parse_llm_json(content: str) -> Dict:
+    """LLM 응답에서 JSON 추출 (코드 블록 허용)"""
+    if '```json' in content:
+        content = content.split('```json')[1].split('```')[0]
+    elif '```' in content:
+        content = content.split('```')[1].split('```')[0]
+    return json.loads(content.strip())
+
+
 class LLMService:
     def __init__(self, base_url: str = "http://localhost:8017/v1"):
         self.base_url = base_url
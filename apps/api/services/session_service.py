@@ -7,6 +7,8 @@ from datetime import datetime
 
 sys.path.insert(0, "/app/apps/api")
 
+from sqlalchemy.orm import undefer
+
 from database import get_db_context
 from models import Project, Character
 
@@ -76,7 +78,7 @@ def load_session_from_db(session_id: str) -> Optional[Dict[str, Any]]:
     """DB에서 세션 로드"""
     try:
         with get_db_context() as db:
-            project = db.query(Project).filter(Project.id == session_id).first()
+            project = db.query(Project).options(undefer(Project.context_json)).filter(Project.id == session_id).first()
             
             if not project:
                 print(f"[SessionService] Session {session_id} not found in DB")
@@ -132,7 +134,16 @@ def list_sessions_from_db(user_id: str = None, limit: int = 50) -> list:
     """DB에서 세션 목록 조회"""
     try:
         with get_db_context() as db:
-            query = db.query(Project)
+            # 목록에 필요한 컬럼만 조회 (context_json 제외)
+            query = db.query(
+                Project.id,
+                Project.channel_name,
+                Project.user_request,
+                Project.current_step,
+                Project.status,
+                Project.created_at,
+                Project.updated_at,
+            )
             if user_id:
                 query = query.filter(Project.user_id == user_id)
             projects = query.order_by(Project.updated_at.desc()).limit(limit).all()
@@ -0,0 +1,197 @@
+"""Browser Pool Tests - 로컬 HTML 픽스처 서버 사용 (playwright + chromium 필요)"""
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from aiohttp import web
+
+from apps.api.services import browser_pool as browser_pool_module
+from apps.api.services.browser_pool import BrowserPool
+
+
+# 폰트/동영상/광고 스크립트와 썸네일 이미지를 함께 요청하는 페이지
+FIXTURE_HTML = """<!doctype html>
+<html>
+<head>
+  <style>
+    @font-face { font-family: Heavy; src: url(/static/heavy.woff2); }
+    body { font-family: Heavy, sans-serif; }
+  </style>
+  <script src="/pagead/ads.js"></script>
+</head>
+<body>
+  <h1 id="channel-name">Fixture Channel</h1>
+  <img id="thumb" src="/static/thumb.png" width="160" height="90">
+  <video src="/static/clip.mp4" autoplay muted></video>
+</body>
+</html>"""
+
+# 1x1 PNG
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d49444154789c6300010000050001a5f645400000000049454e44ae426082"
+)
+
+
+class FixtureServer:
+    def __init__(self):
+        self.requested = []
+        self.runner = None
+        self.base_url = ""
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/channel", self._page)
+        app.router.add_get("/{path:.*}", self._asset)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def _page(self, request):
+        self.requested.append(request.path)
+        return web.Response(text=FIXTURE_HTML, content_type="text/html")
+
+    async def _asset(self, request):
+        self.requested.append(request.path)
+        if request.path.endswith(".png"):
+            return web.Response(body=PIXEL_PNG, content_type="image/png")
+        return web.Response(body=b"\x00" * 1024)
+
+
+def _require_playwright():
+    if browser_pool_module.async_playwright is None:
+        raise unittest.SkipTest("playwright 미설치")
+
+
+def test_blocks_heavy_resources():
+    """폰트/동영상/광고 요청은 서버까지 가지 않고, 썸네일 이미지는 로드"""
+    _require_playwright()
+
+    async def run():
+        server = FixtureServer()
+        await server.start()
+        pool = BrowserPool(max_pages=2)
+        try:
+            async with pool.page() as page:
+                await page.goto(f"{server.base_url}/channel", wait_until="load")
+                await page.wait_for_function("document.querySelector('#thumb').complete")
+                assert await page.locator("#channel-name").text_content() == "Fixture Channel"
+        finally:
+            await pool.close()
+            await server.stop()
+
+        assert "/static/thumb.png" in server.requested
+        assert not {"/static/heavy.woff2", "/static/clip.mp4", "/pagead/ads.js"} & set(server.requested)
+        assert pool.stats["blocked"] >= 2
+
+    asyncio.run(run())
+    print("✓ Resource blocking OK")
+
+
+def test_reuse_cap_and_recycle():
+    """브라우저 1회 기동, 동시 페이지 수 제한, N회 사용/예외 시 컨텍스트 교체"""
+    _require_playwright()
+
+    async def run():
+        server = FixtureServer()
+        await server.start()
+        pool = BrowserPool(max_pages=2, max_context_uses=3)
+        active = peak = 0
+
+        async def visit():
+            nonlocal active, peak
+            async with pool.page() as page:
+                active += 1
+                peak = max(peak, active)
+                await page.goto(f"{server.base_url}/channel")
+                await asyncio.sleep(0.05)
+                active -= 1
+
+        try:
+            # 순차 6회 = 컨텍스트 2개 x 3회 사용, 3회째 반환 시 닫힘
+            for _ in range(6):
+                await visit()
+            assert pool.stats["contexts"] == 2 and not pool._idle
+
+            await asyncio.gather(*[visit() for _ in range(5)])
+            assert peak == 2
+            assert pool.stats["launches"] == 1
+
+            crashed = None
+            try:
+                async with pool.page() as page:
+                    crashed = page.context
+                    raise RuntimeError("page crashed")
+            except RuntimeError:
+                pass
+            # 예외로 끝난 임대의 컨텍스트는 풀로 돌아가지 않고 닫힘
+            assert crashed is not None
+            assert all(p.context is not crashed for p in pool._idle)
+        finally:
+            await pool.close()
+            await server.stop()
+
+    asyncio.run(run())
+    print("✓ Pool reuse/recycle OK")
+
+
+def test_loop_change_requires_close():
+    """다른 이벤트 루프에서 열린 브라우저를 조용히 버리지 않고, 연 루프에서 닫은 뒤에만 재사용"""
+
+    class FakeBrowser:
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    class FakePlaywright:
+        stopped = False
+
+        async def stop(self):
+            self.stopped = True
+
+    pool = BrowserPool(max_pages=1)
+    browser, playwright = FakeBrowser(), FakePlaywright()
+
+    async def open_pool():
+        pool._bind_loop()
+        pool._browser, pool._playwright = browser, playwright
+
+    async def bind():
+        pool._bind_loop()
+
+    first_loop = asyncio.new_event_loop()
+    try:
+        first_loop.run_until_complete(open_pool())
+        for call in (bind, pool.close):
+            try:
+                asyncio.run(call())
+            except RuntimeError as e:
+                assert "event loop" in str(e)
+            else:
+                raise AssertionError("loop change with an open browser must fail")
+        assert not browser.closed
+
+        first_loop.run_until_complete(pool.close())
+        assert browser.closed and playwright.stopped
+    finally:
+        first_loop.close()
+
+    asyncio.run(bind())  # 닫힌 뒤에는 새 루프에 바인딩
+    print("✓ Loop change guard OK")
+
+
+if __name__ == "__main__":
+    test_blocks_heavy_resources()
+    test_reuse_cap_and_recycle()
+    test_loop_change_requires_close()
+    print("All tests passed!")
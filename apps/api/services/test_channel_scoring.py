@@ -0,0 +1,109 @@
+"""Channel Scoring Tests - 기존 채널별 계산과 결과 일치, 대량 일괄 채점"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from apps.api.services.channel_scoring import parse_counts, parse_days_ago, score_channels
+
+
+def _reference_score(channel):
+    """채널 하나씩 문자열을 파싱하던 기존 calculate_score (비교 기준)"""
+
+    def parse_count(text):
+        if not text:
+            return 0
+        text = text.replace(',', '').replace(' ', '')
+        for suffix, mult in {'만': 10000, '천': 1000, 'K': 1000, 'M': 1000000}.items():
+            if suffix in text:
+                num = re.findall(r'[\d.]+', text)
+                if num:
+                    return int(float(num[0]) * mult)
+        nums = re.findall(r'\d+', text)
+        return int(nums[0]) if nums else 0
+
+    def parse_days(text):
+        for pattern, factor in [(r'(\d+)\s*분\s*전', 0), (r'(\d+)\s*시간\s*전', 0), (r'(\d+)\s*일\s*전', 1),
+                                (r'(\d+)\s*주\s*전', 7), (r'(\d+)\s*개월\s*전', 30), (r'(\d+)\s*년\s*전', 365)]:
+            match = re.search(pattern, text or '')
+            if match:
+                return int(match.group(1)) * factor
+        return None
+
+    scores = {'subscriber': 0, 'activity': 0, 'engagement': 0, 'growth': 0}
+    subs = parse_count(channel.get('subscribers', ''))
+    scores['subscriber'] = 30 if subs >= 1000000 else 27 if subs >= 500000 else 24 if subs >= 100000 \
+        else 20 if subs >= 50000 else 15 if subs >= 10000 else 10
+    videos = channel.get('videos', [])
+    days = [d for d in (parse_days(v.get('date', '')) for v in videos[:5]) if d is not None]
+    if days:
+        avg = sum(days) / len(days)
+        scores['activity'] = 25 if avg <= 7 else 20 if avg <= 14 else 15 if avg <= 30 else 10
+    if videos and subs > 0:
+        views = [v for v in (parse_count(v.get('views', '')) for v in videos[:5]) if v > 0]
+        if views:
+            ratio = (sum(views) / len(views)) / subs
+            scores['engagement'] = 25 if ratio >= 0.3 else 20 if ratio >= 0.1 else 15 if ratio >= 0.05 else 10
+    if len(videos) >= 6:
+        recent = [parse_count(v.get('views', '')) for v in videos[:3]]
+        older = [parse_count(v.get('views', '')) for v in videos[3:6]]
+        r_avg, o_avg = sum(recent) / 3, sum(older) / 3
+        if o_avg > 0:
+            growth = (r_avg - o_avg) / o_avg
+            scores['growth'] = 20 if growth >= 0.5 else 15 if growth >= 0.2 else 10 if growth >= 0 else 5
+    scores['total'] = sum(scores.values())
+    return scores
+
+
+def _random_channels(n, seed=7):
+    rng = random.Random(seed)
+    counts = ['', '구독자 1.2만명', '구독자 35.1만명', '구독자 120만명', '구독자 8,900명', '1.5M subscribers',
+              '구독자 없음', '조회수 3.4천회', '조회수 1,234회', '조회수 없음', '12K views']
+    dates = ['', '3분 전', '5시간 전', '2일 전', '3주 전', '4개월 전', '1년 전', '스트리밍 시간: 6일 전', '최근']
+    channels = []
+    for _ in range(n):
+        videos = [
+            {'title': 't', 'views': rng.choice(counts) if rng.random() < 0.3 else f'조회수 {rng.randint(0, 900)}만회',
+             'date': rng.choice(dates)}
+            for _ in range(rng.randint(0, 10))
+        ]
+        channels.append({'subscribers': rng.choice(counts), 'videos': videos})
+    return channels
+
+
+def test_parsers():
+    assert parse_counts(['구독자 12.5만명', '조회수 1,234회', '', None, '1.5M', '없음']).tolist() == \
+        [125000, 1234, 0, 0, 1500000, 0]
+    days = parse_days_ago(['3일 전', '2주 전', '5시간 전', '최근'])
+    assert days[:3].tolist() == [3, 14, 0] and days[3] != days[3]
+    print("✓ Parsers OK")
+
+
+def test_matches_reference_scores():
+    channels = _random_channels(2000)
+    assert score_channels(channels) == [_reference_score(ch) for ch in channels]
+    assert score_channels([]) == []
+    assert score_channels([{'subscribers': '', 'videos': []}]) == [
+        {'subscriber': 10, 'activity': 0, 'engagement': 0, 'growth': 0, 'total': 10}
+    ]
+    print("✓ Batch scores match per-channel scores")
+
+
+def test_large_sweep():
+    channels = _random_channels(20000, seed=11)
+    started = time.monotonic()
+    scores = score_channels(channels)
+    elapsed = time.monotonic() - started
+    assert len(scores) == 20000
+    assert elapsed < 2.0, elapsed
+    print(f"✓ 20000 channels scored in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    test_parsers()
+    test_matches_reference_scores()
+    test_large_sweep()
+    print("All tests passed!")
@@ -0,0 +1,107 @@
+"""TTS Audio Cache Tests - 캐시 키, 크기 기준 LRU 제거, 미리듣기 rate limit 전 캐시 조회"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from fastapi import HTTPException
+
+from apps.api.services.tts_cache import TTSAudioCache
+
+
+def test_cache_key():
+    """text/voice/prosody가 다르면 다른 키, 기본값과 같은 효과는 같은 키"""
+    make = TTSAudioCache.make_key
+    base = make("안녕하세요", "speaker:Sohee", "차분하게", 1.2, 3, "Korean")
+    assert base == make("안녕하세요", "speaker:Sohee", "차분하게", 1.2, 3, "Korean")
+    assert len(base) == 32
+
+    variants = [
+        make("안녕하세요!", "speaker:Sohee", "차분하게", 1.2, 3, "Korean"),
+        make("안녕하세요", "speaker:Minho", "차분하게", 1.2, 3, "Korean"),
+        make("안녕하세요", "speaker:Sohee", "신나게", 1.2, 3, "Korean"),
+        make("안녕하세요", "speaker:Sohee", "차분하게", 1.3, 3, "Korean"),
+        make("안녕하세요", "speaker:Sohee", "차분하게", 1.2, -3, "Korean"),
+        make("안녕하세요", "speaker:Sohee", "차분하게", 1.2, 3, "English"),
+    ]
+    assert len(set(variants + [base])) == len(variants) + 1
+
+    # 속도 1.0/피치 0/빈 지시는 지정하지 않은 것과 같음
+    assert make("문장", "speaker:Sohee") == make("문장", "speaker:Sohee", "", 1.0, 0)
+    assert make("문장", "speaker:Sohee", speed=1.2004) == make("문장", "speaker:Sohee", speed=1.2)
+    print("✓ Cache key OK")
+
+
+def test_lru_eviction_by_size():
+    """용량 초과 시 가장 오래 사용하지 않은 항목부터 제거 (재시작 후에도 순서 유지)"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = TTSAudioCache(tmpdir, max_bytes=300)
+        keys = {name: TTSAudioCache.make_key(name, "speaker:Sohee") for name in "abcdef"}
+
+        for name in "abc":
+            cache.put(keys[name], name.encode() * 100)
+            time.sleep(0.01)
+        assert cache.get(keys["a"]) == b"a" * 100  # a를 최근 사용으로 갱신
+        time.sleep(0.01)
+
+        cache.put(keys["d"], b"d" * 100)
+        assert cache.get(keys["b"]) is None
+        assert cache.stats() == {"entries": 3, "bytes": 300, "max_bytes": 300}
+        time.sleep(0.01)
+
+        # 너무 큰 항목은 저장하지 않음
+        cache.put(keys["f"], b"f" * 301)
+        assert cache.get(keys["f"]) is None
+
+        # 재시작: 파일 mtime으로 LRU 순서 복원 - c가 가장 오래됨
+        restarted = TTSAudioCache(tmpdir, max_bytes=300)
+        restarted.put(keys["e"], b"e" * 100)
+        assert restarted.get(keys["c"]) is None
+        assert all(restarted.get(keys[name]) for name in "ade")
+        assert restarted.stats()["bytes"] == 300
+        assert not os.path.exists(os.path.join(tmpdir, f"{keys['c']}.wav"))
+    print("✓ LRU eviction OK")
+
+
+def test_preview_cache_before_rate_limit():
+    """캐시된 미리듣기는 rate limit에 걸린 세션에도 응답"""
+    from routes.tts import TTSPreviewRequest, generate_tts_preview, tts_preview_service
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        original_cache = tts_preview_service.audio_cache
+        tts_preview_service.audio_cache = TTSAudioCache(tmpdir, max_bytes=1024 * 1024)
+        try:
+            key = tts_preview_service._preview_key("캐시된 문장", "Sohee", "", 1.2, None)
+            tts_preview_service.audio_cache.put(key, b"RIFF" + b"\x00" * 48000)
+
+            session_id = "rate-limited"
+            while tts_preview_service.check_rate_limit(session_id):
+                pass
+
+            response = asyncio.run(generate_tts_preview(
+                TTSPreviewRequest(text="캐시된 문장", session_id=session_id, speed=1.2)
+            ))
+            assert response.cached and response.cache_key == key
+
+            try:
+                asyncio.run(generate_tts_preview(
+                    TTSPreviewRequest(text="새 문장", session_id=session_id)
+                ))
+            except HTTPException as e:
+                assert e.status_code == 429
+            else:
+                raise AssertionError("uncached preview should be rate limited")
+        finally:
+            tts_preview_service.audio_cache = original_cache
+    print("✓ Preview cache before rate limit OK")
+
+
+if __name__ == "__main__":
+    test_cache_key()
+    test_lru_eviction_by_size()
+    test_preview_cache_before_rate_limit()
+    print("All tests passed!")
@@ -0,0 +1,106 @@
+"""Vision Service Tests - 로컬 스텁 chat/completions 서버 사용"""
+import asyncio
+import base64
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from aiohttp import web
+from PIL import Image
+
+from apps.api.services.vision import VisionService, prepare_image
+
+
+def _screenshot_b64(width: int = 1920, height: int = 1080) -> str:
+    """Full-HD PNG 스크린샷 (압축이 잘 안 되도록 노이즈 포함)"""
+    image = Image.effect_noise((width, height), 64).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _decode(data_url: str) -> Image.Image:
+    return Image.open(io.BytesIO(base64.b64decode(data_url.split(",", 1)[1])))
+
+
+class StubVisionServer:
+    """요청마다 받은 이미지 크기를 답하고 동시 요청 수를 기록"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.sizes = []
+        self.runner = None
+        self.base_url = ""
+
+    async def start(self):
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/v1/chat/completions", self._chat)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def _chat(self, request):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            body = await request.json()
+            content = body["messages"][0]["content"]
+            image = _decode(content[0]["image_url"]["url"])
+            self.sizes.append(image.size)
+            await asyncio.sleep(0.1)
+            answer = f"{content[1]['text']}:{image.size[0]}x{image.size[1]}"
+            return web.json_response({"choices": [{"message": {"content": answer}}]})
+        finally:
+            self.active -= 1
+
+
+def test_prepare_image():
+    """모델 해상도로 축소 + JPEG 재인코딩, 작은 이미지는 그대로"""
+    original = _screenshot_b64()
+    prepared = prepare_image(original, max_pixels=1280 * 28 * 28)
+    assert prepared.startswith("data:image/jpeg;base64,")
+    width, height = _decode(prepared).size
+    assert width * height <= 1280 * 28 * 28 and abs(width / height - 1920 / 1080) < 0.01
+    assert len(prepared) < len(original) / 2
+
+    small = _screenshot_b64(64, 36)
+    assert prepare_image(small) == f"data:image/png;base64,{small}"
+    print("✓ prepare_image OK")
+
+
+def test_analyze_images_batch():
+    """입력 순서대로 결과 반환, 동시 요청 수 제한, 서버에는 축소된 이미지만 도착"""
+
+    async def run():
+        server = StubVisionServer()
+        await server.start()
+        try:
+            service = VisionService(base_url=server.base_url)
+            service.max_concurrency = 3
+            images = [_screenshot_b64()] * 6
+            results = await service.analyze_images(images, [f"p{i}" for i in range(6)])
+            await service.close()
+        finally:
+            await server.stop()
+
+        assert [r.split(":")[0] for r in results] == [f"p{i}" for i in range(6)]
+        assert server.peak == 3
+        assert all(w * h <= 1280 * 28 * 28 for w, h in server.sizes)
+
+    asyncio.run(run())
+    print("✓ analyze_images OK")
+
+
+if __name__ == "__main__":
+    test_prepare_image()
+    test_analyze_images_batch()
+    print("All tests passed!")
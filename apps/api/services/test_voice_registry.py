@@ -0,0 +1,136 @@
+"""Voice Registry Tests - 로컬 스텁 TTS 서버 사용"""
+import asyncio
+import base64
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+import aiohttp
+from aiohttp import web
+
+from apps.api.services.voice_registry import VoiceRegistry
+
+
+REF_AUDIO = base64.b64encode(b"RIFF" + b"\x00" * 4096).decode("ascii")
+
+
+class StubTTSServer:
+    """voice 등록/클로닝 API를 흉내내는 스텁 서버"""
+
+    def __init__(self, supports_registration: bool = True):
+        self.supports_registration = supports_registration
+        self.voices = {}
+        self.register_calls = 0
+        self.clone_payloads = []
+        self.runner = None
+        self.base_url = ""
+
+    async def start(self):
+        app = web.Application()
+        if self.supports_registration:
+            app.router.add_get("/voices/{voice_id}", self._get_voice)
+            app.router.add_post("/voices", self._register)
+        app.router.add_post("/clone", self._clone)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def _get_voice(self, request):
+        if request.match_info["voice_id"] in self.voices:
+            return web.json_response({"voice_id": request.match_info["voice_id"]})
+        return web.json_response({"error": "not found"}, status=404)
+
+    async def _register(self, request):
+        data = await request.json()
+        self.register_calls += 1
+        self.voices[data["voice_id"]] = data["ref_audio_base64"]
+        return web.json_response({"voice_id": data["voice_id"]})
+
+    async def _clone(self, request):
+        data = await request.json()
+        self.clone_payloads.append(data)
+        if "voice_id" in data and data["voice_id"] not in self.voices:
+            return web.json_response({"error": "unknown voice"}, status=404)
+        return web.json_response({"audio_base64": base64.b64encode(b"wav").decode()})
+
+
+async def _clone_twice(server: StubTTSServer, registry: VoiceRegistry):
+    async with aiohttp.ClientSession() as session:
+        for text in ["첫 번째 문장", "두 번째 문장"]:
+            payload = await registry.clone_payload(
+                session, server.base_url, text, "Korean", REF_AUDIO, "참조", False
+            )
+            status, data = await registry.post_clone(
+                session, server.base_url, payload, REF_AUDIO, "참조"
+            )
+            assert status == 200
+            assert data["audio_base64"]
+
+
+def test_voice_id_is_stable():
+    """같은 참조 음성은 같은 voice_id"""
+    a = VoiceRegistry.voice_id_for(REF_AUDIO, "참조", False)
+    assert a == VoiceRegistry.voice_id_for(REF_AUDIO, "참조", False)
+    assert a != VoiceRegistry.voice_id_for(REF_AUDIO, "참조", True)
+    assert a != VoiceRegistry.voice_id_for(REF_AUDIO, "다른 텍스트", False)
+
+
+def test_registers_once_and_sends_voice_id():
+    """참조 음성은 한 번만 업로드되고 이후 요청은 voice_id만 전송"""
+    async def run():
+        server = StubTTSServer()
+        await server.start()
+        try:
+            await _clone_twice(server, VoiceRegistry())
+            assert server.register_calls == 1
+            for payload in server.clone_payloads:
+                assert "voice_id" in payload
+                assert "ref_audio_base64" not in payload
+
+            # 새 프로세스(새 레지스트리)도 서버에 있으면 재업로드하지 않음
+            await _clone_twice(server, VoiceRegistry())
+            assert server.register_calls == 1
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
+
+
+def test_falls_back_to_inline_reference():
+    """등록 API가 없는 서버는 기존 인라인 방식 사용"""
+    async def run():
+        server = StubTTSServer(supports_registration=False)
+        await server.start()
+        try:
+            await _clone_twice(server, VoiceRegistry())
+            for payload in server.clone_payloads:
+                assert payload["ref_audio_base64"] == REF_AUDIO
+                assert "voice_id" not in payload
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
+
+
+def test_reregisters_after_server_restart():
+    """서버가 voice_id를 잃어버리면 인라인으로 재시도 후 다시 등록"""
+    async def run():
+        server = StubTTSServer()
+        await server.start()
+        registry = VoiceRegistry()
+        try:
+            await _clone_twice(server, registry)
+            server.voices.clear()
+            await _clone_twice(server, registry)
+            assert server.register_calls == 2
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
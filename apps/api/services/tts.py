@@ -13,6 +13,9 @@ from typing import Dict, List, Optional, Any
 
 import aiohttp
 
+from .tts_cache import TTSAudioCache
+from .voice_registry import voice_registry
+
 
 # === Error Classes ===
 
@@ -85,6 +88,8 @@ class TTSResult:
     duration: float
     voice_name: str
     text: str
+    cache_key: str = ""
+    cached: bool = False
 
 
 class TTSPreviewService:
@@ -103,6 +108,10 @@ class TTSPreviewService:
         "/data/volumes/routine/youtube-studio/voices/samples_cut_prompts.json"
     )
 
+    # 합성 결과 디스크 캐시 (같은 문장/보이스/효과 반복 미리듣기)
+    CACHE_DIR = Path(os.environ.get("TTS_CACHE_DIR", "/app/output/tts_cache"))
+    CACHE_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024
+
     # 기본 설정
     DEFAULT_SPEAKER = "Sohee"
     DEFAULT_LANGUAGE = "Korean"
@@ -111,6 +120,7 @@ class TTSPreviewService:
     def __init__(self):
         self.rate_limiter = RateLimiter(max_requests=3, time_window=10)
         self._samples_cache: Optional[List[Dict]] = None
+        self.audio_cache = TTSAudioCache(self.CACHE_DIR, self.CACHE_MAX_BYTES)
 
     def check_rate_limit(self, session_id: str) -> bool:
         """Rate limit 체크"""
@@ -232,6 +242,64 @@ class TTSPreviewService:
                 }
         return None
 
+    # === Audio Cache ===
+
+    def get_cached_audio(self, cache_key: str) -> Optional[bytes]:
+        """캐시된 미리듣기 WAV 바이트 반환"""
+        return self.audio_cache.get(cache_key)
+
+    def _preview_key(
+        self, text: str, speaker: str, instruct: str, speed: float, pitch: int
+    ) -> str:
+        return self.audio_cache.make_key(
+            text,
+            f"speaker:{speaker}",
+            instruct=instruct,
+            speed=speed,
+            pitch=pitch,
+            language=self.DEFAULT_LANGUAGE,
+        )
+
+    def cached_preview(
+        self,
+        text: str,
+        speaker: str = None,
+        instruct: str = None,
+        speed: float = None,
+        pitch: int = None,
+    ) -> Optional[TTSResult]:
+        """합성 없이 캐시된 미리듣기만 조회 (없으면 None) - rate limit 대상이 아님"""
+        speaker = speaker or self.DEFAULT_SPEAKER
+        cache_key = self._preview_key(text, speaker, instruct or "", speed, pitch)
+        cached_audio = self.audio_cache.get(cache_key)
+        if not cached_audio:
+            return None
+        return self._result_from_bytes(
+            cached_audio, speaker, text, cache_key, cached=True, speed=speed
+        )
+
+    def _result_from_bytes(
+        self,
+        audio_bytes: bytes,
+        voice_name: str,
+        text: str,
+        cache_key: str,
+        cached: bool,
+        speed: float = None,
+    ) -> TTSResult:
+        duration = len(audio_bytes) / 48000
+        # Adjust duration estimate for speed
+        if speed is not None and speed > 0:
+            duration = duration / speed
+        return TTSResult(
+            audio_base64=base64.b64encode(audio_bytes).decode("utf-8"),
+            duration=round(duration, 2),
+            voice_name=voice_name,
+            text=text,
+            cache_key=cache_key,
+            cached=cached,
+        )
+
     # === TTS Generation Methods ===
 
     async def generate_preview(
@@ -256,6 +324,13 @@ class TTSPreviewService:
         speaker = speaker or self.DEFAULT_SPEAKER
         instruct = instruct or ""
 
+        cache_key = self._preview_key(text, speaker, instruct, speed, pitch)
+        cached_audio = self.audio_cache.get(cache_key)
+        if cached_audio:
+            return self._result_from_bytes(
+                cached_audio, speaker, text, cache_key, cached=True, speed=speed
+            )
+
         try:
             async with aiohttp.ClientSession() as session:
                 payload = {
@@ -280,21 +355,13 @@ class TTSPreviewService:
                                 audio_base64, speed=speed, pitch=pitch
                             )
 
-                        # Duration calculation
                         audio_bytes = (
-                            len(base64.b64decode(audio_base64)) if audio_base64 else 0
+                            base64.b64decode(audio_base64) if audio_base64 else b""
                         )
-                        duration = audio_bytes / 48000
+                        self.audio_cache.put(cache_key, audio_bytes)
 
-                        # Adjust duration estimate for speed
-                        if speed is not None and speed > 0:
-                            duration = duration / speed
-
-                        return TTSResult(
-                            audio_base64=audio_base64,
-                            duration=round(duration, 2),
-                            voice_name=speaker,
-                            text=text,
+                        return self._result_from_bytes(
+                            audio_bytes, speaker, text, cache_key, cached=False, speed=speed
                         )
                     else:
                         error_text = await response.text()
@@ -311,45 +378,27 @@ class TTSPreviewService:
     async def _apply_audio_effects(
         self, audio_base64: str, speed: float = None, pitch: int = None
     ) -> str:
-        """오디오에 속도/피치 효과 적용 (pydub 사용)"""
+        """오디오에 속도/피치 효과 적용 (numpy 인메모리 리샘플링)"""
         try:
-            from pydub import AudioSegment
-            import io
+            from libs.audio import dsp
 
-            # Base64 -> AudioSegment
             audio_bytes = base64.b64decode(audio_base64)
-            audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format="wav")
+            samples, sample_rate = dsp.decode_wav(audio_bytes)
 
-            # Apply speed change
+            # Apply speed change (clamp 0.5 ~ 2.0)
             if speed is not None and speed != 1.0:
-                # Clamp speed between 0.5 and 2.0
                 speed = max(0.5, min(2.0, speed))
-                # Change speed without changing pitch
-                sound_with_altered_frame_rate = audio._spawn(
-                    audio.raw_data,
-                    overrides={"frame_rate": int(audio.frame_rate * speed)},
-                )
-                audio = sound_with_altered_frame_rate.set_frame_rate(audio.frame_rate)
+                samples = dsp.change_playback_rate(samples, sample_rate, speed)
 
-            # Apply pitch change (semitones)
+            # Apply pitch change (semitones, clamp -20 ~ +20)
             if pitch is not None and pitch != 0:
-                # Clamp pitch between -20 and +20
                 pitch = max(-20, min(20, pitch))
-                # Pitch shift using frame rate manipulation
-                new_sample_rate = int(audio.frame_rate * (2 ** (pitch / 12.0)))
-                audio = audio._spawn(
-                    audio.raw_data, overrides={"frame_rate": new_sample_rate}
-                ).set_frame_rate(audio.frame_rate)
-
-            # AudioSegment -> Base64
-            buffer = io.BytesIO()
-            audio.export(buffer, format="wav")
-            return base64.b64encode(buffer.getvalue()).decode("utf-8")
-
-        except ImportError:
-            # pydub not installed, return original
-            print("[TTS] pydub not installed, skipping audio effects")
-            return audio_base64
+                samples = dsp.change_playback_rate(
+                    samples, sample_rate, dsp.pitch_factor(pitch)
+                )
+
+            return base64.b64encode(dsp.encode_wav(samples, sample_rate)).decode("utf-8")
+
         except Exception as e:
             print(f"[TTS] Audio effect error: {e}")
             return audio_base64
@@ -361,43 +410,56 @@ class TTSPreviewService:
         ref_text: str = None,
         session_id: str = None,
     ) -> TTSResult:
-        """보이스 클로닝으로 TTS 미리듣기 생성"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "text": text,
-                    "language": self.DEFAULT_LANGUAGE,
-                    "ref_audio_base64": ref_audio_base64,
-                    "ref_text": ref_text or "",
-                    "x_vector_only_mode": True,
-                }
+        """보이스 클로닝으로 TTS 미리듣기 생성
 
-                async with session.post(
-                    f"{self.TTS_BASE_URL}/clone",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=120),
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        audio_base64 = data.get("audio_base64", "")
+        참조 음성은 voice_registry로 서버에 한 번만 등록하고 voice_id로 재사용한다.
+        """
+        cache_key = self.audio_cache.make_key(
+            text,
+            "clone:" + voice_registry.voice_id_for(ref_audio_base64, ref_text or "", True),
+            language=self.DEFAULT_LANGUAGE,
+        )
+        cached_audio = self.audio_cache.get(cache_key)
+        if cached_audio:
+            return self._result_from_bytes(
+                cached_audio, "클로닝 보이스", text, cache_key, cached=True
+            )
 
-                        audio_bytes = (
-                            len(base64.b64decode(audio_base64)) if audio_base64 else 0
-                        )
-                        duration = audio_bytes / 48000
+        try:
+            async with aiohttp.ClientSession() as session:
+                payload = await voice_registry.clone_payload(
+                    session,
+                    self.TTS_BASE_URL,
+                    text=text,
+                    language=self.DEFAULT_LANGUAGE,
+                    ref_audio_base64=ref_audio_base64,
+                    ref_text=ref_text or "",
+                    x_vector_only_mode=True,
+                )
 
-                        return TTSResult(
-                            audio_base64=audio_base64,
-                            duration=round(duration, 2),
-                            voice_name="클로닝 보이스",
-                            text=text,
-                        )
-                    else:
-                        error_text = await response.text()
-                        raise TTSError(
-                            f"클로닝 서버 오류: {error_text}",
-                            "보이스 클로닝에 실패했습니다. 기본 보이스를 사용해보시겠어요?",
-                        )
+                status, data = await voice_registry.post_clone(
+                    session,
+                    self.TTS_BASE_URL,
+                    payload,
+                    ref_audio_base64,
+                    ref_text or "",
+                    timeout=120,
+                )
+                if status == 200:
+                    audio_base64 = data.get("audio_base64", "")
+                    audio_bytes = (
+                        base64.b64decode(audio_base64) if audio_base64 else b""
+                    )
+                    self.audio_cache.put(cache_key, audio_bytes)
+
+                    return self._result_from_bytes(
+                        audio_bytes, "클로닝 보이스", text, cache_key, cached=False
+                    )
+                else:
+                    raise TTSError(
+                        f"클로닝 서버 오류: {data}",
+                        "보이스 클로닝에 실패했습니다. 기본 보이스를 사용해보시겠어요?",
+                    )
         except aiohttp.ClientError as e:
             raise TTSError(
                 f"클로닝 서버 연결 실패: {str(e)}",
@@ -407,32 +469,33 @@ class TTSPreviewService:
     # === YouTube Extraction ===
 
     async def extract_youtube_audio(
-        self, url: str, start_time: str, end_time: str, session_id: str = None
+        self, url: str, start_time: str = None, end_time: str = None, session_id: str = None
     ) -> Dict[str, Any]:
-        """YouTube에서 오디오 추출"""
+        """YouTube에서 오디오 추출 (구간을 생략하면 영상 전체에서 최적 구간 탐색)"""
         try:
-            # VoiceServiceV2 사용
-            from agents.benchmarker.voice_service import voice_service
-
-            audio_bytes, video_id = await voice_service.extract_audio_segment(
-                url, start_time, end_time
-            )
-
-            # 오디오 전처리 (최적 구간 추출)
-            from libs.audio.processor import audio_processor
-
-            processed = await audio_processor.preprocess_for_cloning(
-                audio_bytes, normalize=True, denoise=True
-            )
+            from agents.benchmarker.voice_service import voice_service_v2
+
+            # 최적 구간 추출 - ffmpeg 파이프 스트리밍 분석 (선택 구간만 디코딩)
+            if start_time and end_time:
+                start_sec = voice_service_v2._parse_time(start_time)
+                end_sec = voice_service_v2._parse_time(end_time)
+                processed, video_id = await voice_service_v2.preprocess_segment(
+                    url, start_sec, end_sec, normalize=True, denoise=True
+                )
+            else:
+                start_sec = 0
+                processed, video_id = await voice_service_v2.extract_best_reference(url)
 
             audio_base64 = base64.b64encode(processed.audio_bytes).decode("utf-8")
 
-            # 자막 추출 시도
+            # 자막 추출 시도 (선택된 구간 기준)
             ref_text = ""
             try:
-                ref_text = await voice_service.get_transcript_segment(
-                    url, start_time, end_time
-                )
+                ref_text = await voice_service_v2.get_transcript_segment(
+                    url,
+                    str(int(start_sec + processed.selected_range[0])),
+                    str(int(start_sec + processed.selected_range[1]) + 1),
+                ) or ""
             except Exception:
                 pass
 
@@ -0,0 +1,127 @@
+"""TTS Audio Cache - 합성 결과 디스크 캐시 (크기 제한 LRU)"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class TTSAudioCache:
+    """(text, voice, instruct, speed, pitch, language) 해시 → WAV 파일
+
+    최근 사용 시각은 파일 mtime으로 기록하므로 프로세스 재시작 후에도 LRU 순서가 유지된다.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None  # key -> (size, last_used)
+        self._total_bytes = 0
+
+    @staticmethod
+    def make_key(
+        text: str,
+        voice: str,
+        instruct: str = "",
+        speed: float = None,
+        pitch: int = None,
+        language: str = "",
+    ) -> str:
+        """캐시 키 생성 (기본값과 동일한 효과는 같은 키로 취급)"""
+        params = {
+            "text": text,
+            "voice": voice,
+            "instruct": instruct or "",
+            "speed": round(speed, 3) if speed not in (None, 1.0) else None,
+            "pitch": pitch or None,
+            "language": language,
+        }
+        raw = json.dumps(params, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.wav"
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        if self._index is None:
+            self._index = {}
+            self._total_bytes = 0
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for path in self.cache_dir.glob("*.wav"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                self._index[path.stem] = (stat.st_size, stat.st_mtime)
+                self._total_bytes += stat.st_size
+        return self._index
+
+    def get(self, key: str) -> Optional[bytes]:
+        """캐시된 WAV 바이트 반환 (없으면 None)"""
+        if not _KEY_PATTERN.match(key):
+            return None
+        index = self._load_index()
+        if key not in index:
+            return None
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self._drop(key)
+            return None
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        index[key] = (len(data), now)
+        return data
+
+    def put(self, key: str, audio_bytes: bytes):
+        """WAV 저장 후 용량 초과분을 오래된 순서로 삭제"""
+        if not audio_bytes or len(audio_bytes) > self.max_bytes:
+            return
+        index = self._load_index()
+        if key in index:
+            self._drop(key)
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(audio_bytes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[TTSCache] Write error: {e}")
+            return
+
+        index[key] = (len(audio_bytes), time.time())
+        self._total_bytes += len(audio_bytes)
+        self._evict()
+
+    def _drop(self, key: str):
+        size, _ = self._index.pop(key, (0, 0))
+        self._total_bytes -= size
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._drop(key)
+
+    def stats(self) -> Dict[str, int]:
+        index = self._load_index()
+        return {"entries": len(index), "bytes": self._total_bytes, "max_bytes": self.max_bytes}
@@ -1,8 +1,60 @@
+import asyncio
 import httpx
 import base64
+import io
 import json
+import os
 import re
-from typing import Optional, Dict, Any, Callable, AsyncGenerator
+from typing import Optional, Dict, Any, Callable, AsyncGenerator, List, Union
+
+from PIL import Image
+
+# 모델 입력 해상도 상한 (Qwen-VL 계열 max_pixels 기본 권장값 1280*28*28)
+# - 이보다 큰 스크린샷은 서버에서 어차피 축소되므로 보내기 전에 줄여 payload를 절약
+VISION_MAX_PIXELS = int(os.environ.get("VISION_MAX_PIXELS", str(1280 * 28 * 28)))
+VISION_JPEG_QUALITY = int(os.environ.get("VISION_JPEG_QUALITY", "85"))
+VISION_MAX_CONCURRENCY = int(os.environ.get("VISION_MAX_CONCURRENCY", "4"))
+# 이 크기 이하의 PNG는 재인코딩 없이 그대로 전송
+PNG_PASSTHROUGH_BYTES = 256 * 1024
+
+
+def prepare_image(image_data: str, max_pixels: int = VISION_MAX_PIXELS, quality: int = VISION_JPEG_QUALITY) -> str:
+    """base64 이미지(data URL 허용)를 모델 해상도로 축소/재인코딩해 data URL로 반환"""
+    if image_data.startswith("data:"):
+        header, encoded = image_data.split(",", 1)
+        mime = header[5:].split(";", 1)[0] or "image/png"
+    else:
+        encoded, mime = image_data, "image/png"
+
+    try:
+        raw = base64.b64decode(encoded)
+        image = Image.open(io.BytesIO(raw))
+        width, height = image.size
+    except Exception:
+        return f"data:{mime};base64,{encoded}"
+
+    oversized = width * height > max_pixels
+    if not oversized and (mime != "image/png" or len(raw) <= PNG_PASSTHROUGH_BYTES):
+        return f"data:{mime};base64,{encoded}"
+
+    if oversized:
+        scale = (max_pixels / (width * height)) ** 0.5
+        image = image.resize(
+            (max(1, int(width * scale)), max(1, int(height * scale))),
+            Image.Resampling.LANCZOS,
+        )
+
+    if image.mode in ("RGBA", "LA", "P"):
+        rgba = image.convert("RGBA")
+        image = Image.new("RGB", rgba.size, (255, 255, 255))
+        image.paste(rgba, mask=rgba.split()[3])
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("utf-8")
+
 
 class VisionService:
     """Qwen3-VL 비전 모델 서비스 (Instruct 모델)"""
@@ -18,9 +70,52 @@ class VisionService:
 
     def __init__(self, base_url: str = None):
         # Docker 컨테이너에서 호스트 접근: 172.17.0.1 또는 host.docker.internal
-        import os
         self.base_url = base_url or os.environ.get("VISION_API_URL", "http://172.17.0.1:8016/v1")
         self.model = os.environ.get("VISION_MODEL", "qwen3-vl-30b")  # Match actual model name
+        self.max_concurrency = max(1, VISION_MAX_CONCURRENCY)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+    def _pool(self):
+        """이벤트 루프별 공유 HTTP 클라이언트(커넥션 재사용)와 동시 요청 세마포어"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=120.0,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client, self._slots
+
+    async def _image_url(self, image_data: str) -> str:
+        # 디코딩/리사이즈는 CPU 작업이므로 스레드에서 실행
+        return await asyncio.to_thread(prepare_image, image_data)
+
+    async def _chat(self, messages: list, max_tokens: int, temperature: float) -> str:
+        client, slots = self._pool()
+        async with slots:
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                json={
+                    "model": self.model,
+                    "messages": messages,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature
+                }
+            )
+        response.raise_for_status()
+        data = response.json()
+        return data["choices"][0]["message"]["content"]
+
+    async def close(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
 
     def _extract_json(self, content: str) -> Optional[dict]:
         """응답에서 JSON 추출"""
@@ -61,10 +156,7 @@ class VisionService:
         on_answer: Optional[Callable[[str], None]] = None
     ) -> Dict[str, str]:
         """이미지 분석 (스트리밍) - Instruct 모델용"""
-        if image_data.startswith("data:"):
-            image_url = image_data
-        else:
-            image_url = f"data:image/png;base64,{image_data}"
+        image_url = await self._image_url(image_data)
 
         messages = [{
             "role": "user",
@@ -76,7 +168,8 @@ class VisionService:
 
         full_content = ""
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        client, slots = self._pool()
+        async with slots:
             async with client.stream(
                 "POST",
                 f"{self.base_url}/chat/completions",
@@ -123,10 +216,7 @@ class VisionService:
         max_tokens: int = 1024
     ) -> str:
         """이미지 분석"""
-        if image_data.startswith("data:"):
-            image_url = image_data
-        else:
-            image_url = f"data:image/png;base64,{image_data}"
+        image_url = await self._image_url(image_data)
 
         messages = [{
             "role": "user",
@@ -136,19 +226,27 @@ class VisionService:
             ]
         }]
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.7
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        return await self._chat(messages, max_tokens, temperature=0.7)
+
+    async def analyze_images(
+        self,
+        images: List[str],
+        prompt: Union[str, List[str]] = "Describe this image in detail for image generation.",
+        max_tokens: int = 1024,
+        return_exceptions: bool = False
+    ) -> List[Union[str, BaseException]]:
+        """여러 이미지 일괄 분석 - 공유 클라이언트로 동시 요청 (결과는 입력 순서)
+
+        prompt가 리스트면 이미지별 프롬프트로 사용한다.
+        return_exceptions=True면 실패한 이미지 자리에 예외를 넣고 나머지 결과는 유지한다.
+        """
+        prompts = prompt if isinstance(prompt, list) else [prompt] * len(images)
+        if len(prompts) != len(images):
+            raise ValueError("prompt list must match images")
+        return await asyncio.gather(
+            *[self.analyze_image(image, p, max_tokens) for image, p in zip(images, prompts)],
+            return_exceptions=return_exceptions
+        )
 
     async def analyze_image_with_thinking(
         self,
@@ -331,18 +429,12 @@ Important guidelines:
         content = []
         content.append({"type": "text", "text": "REFERENCE (original character):"})
 
-        if reference_image.startswith("data:"):
-            ref_url = reference_image
-        else:
-            ref_url = f"data:image/png;base64,{reference_image}"
+        ref_url = await self._image_url(reference_image)
         content.append({"type": "image_url", "image_url": {"url": ref_url}})
 
         for i, frame in enumerate(frame_images[:3]):
             content.append({"type": "text", "text": f"FRAME {i+1}:"})
-            if frame.startswith("data:"):
-                frame_url = frame
-            else:
-                frame_url = f"data:image/png;base64,{frame}"
+            frame_url = await self._image_url(frame)
             content.append({"type": "image_url", "image_url": {"url": frame_url}})
 
         if strict:
@@ -372,32 +464,20 @@ Be harsh. Most AI videos FAIL. Output JSON:
 Check if video frames show the same character as reference.
 Output JSON: {"score": <1-10>, "verdict": "<PASS or FAIL>"}"""})
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                json={
-                    "model": self.model,
-                    "messages": [{"role": "user", "content": content}],
-                    "max_tokens": 200,
-                    "temperature": 0.1
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            text = data["choices"][0]["message"]["content"]
+        text = await self._chat([{"role": "user", "content": content}], max_tokens=200, temperature=0.1)
 
-            result = self._extract_json(text)
-            if result:
-                return {
-                    "success": True,
-                    "score": result.get("score"),
-                    "verdict": result.get("verdict"),
-                    "raw": text
-                }
+        result = self._extract_json(text)
+        if result:
             return {
-                "success": False,
-                "error": "JSON parse failed",
+                "success": True,
+                "score": result.get("score"),
+                "verdict": result.get("verdict"),
                 "raw": text
             }
+        return {
+            "success": False,
+            "error": "JSON parse failed",
+            "raw": text
+        }
 
 vision_service = VisionService()
@@ -0,0 +1,167 @@
+"""Voice Registry - 클로닝 참조 음성 등록 및 voice_id 재사용
+
+참조 오디오를 TTS 서버에 한 번만 업로드해 화자 프롬프트를 미리 인코딩하고,
+이후 합성 요청은 콘텐츠 해시 기반 voice_id만 전송한다.
+서버가 등록 API를 지원하지 않으면 기존처럼 base64를 인라인으로 보낸다.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+import aiohttp
+
+
+class VoiceRegistry:
+    """참조 음성 → voice_id 매핑 관리
+
+    TTS 서버 API:
+    - GET  {base_url}/voices/{voice_id}  등록 여부 확인 (200 / 404)
+    - POST {base_url}/voices             참조 음성 등록 → {"voice_id": ...}
+    - POST {base_url}/clone              voice_id 또는 ref_audio_base64로 합성
+    """
+
+    REGISTER_TIMEOUT = 60
+
+    def __init__(self):
+        self._registered: Set[str] = set()  # "{base_url}|{voice_id}"
+        self._unsupported: Set[str] = set()  # 등록 API가 없는 서버
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def voice_id_for(ref_audio_base64: str, ref_text: str = "", x_vector_only_mode: bool = False) -> str:
+        """참조 오디오 내용 + 프롬프트 설정으로 고정 voice_id 생성"""
+        digest = hashlib.sha256()
+        digest.update(ref_audio_base64.encode("ascii"))
+        digest.update(b"\0")
+        digest.update((ref_text or "").encode("utf-8"))
+        digest.update(b"\0x" if x_vector_only_mode else b"\0f")
+        return f"v_{digest.hexdigest()[:32]}"
+
+    async def ensure_registered(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        ref_audio_base64: str,
+        ref_text: str = "",
+        x_vector_only_mode: bool = False
+    ) -> Optional[str]:
+        """참조 음성을 서버에 등록하고 voice_id 반환 (미지원 서버면 None)"""
+        if base_url in self._unsupported:
+            return None
+
+        voice_id = self.voice_id_for(ref_audio_base64, ref_text, x_vector_only_mode)
+        key = f"{base_url}|{voice_id}"
+        if key in self._registered:
+            return voice_id
+
+        # 동시 섹션 합성 시에도 업로드는 한 번만
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key in self._registered:
+                return voice_id
+            if base_url in self._unsupported:
+                return None
+
+            try:
+                # 이전 프로세스에서 이미 등록했다면 업로드 생략
+                async with session.get(
+                    f"{base_url}/voices/{voice_id}",
+                    timeout=aiohttp.ClientTimeout(total=self.REGISTER_TIMEOUT)
+                ) as response:
+                    if response.status == 200:
+                        self._registered.add(key)
+                        return voice_id
+
+                payload = {
+                    "voice_id": voice_id,
+                    "ref_audio_base64": ref_audio_base64,
+                    "ref_text": ref_text or "",
+                    "x_vector_only_mode": x_vector_only_mode
+                }
+                async with session.post(
+                    f"{base_url}/voices",
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=self.REGISTER_TIMEOUT)
+                ) as response:
+                    if response.status in (404, 405, 501):
+                        print(f"[VoiceRegistry] Registration not supported by {base_url}")
+                        self._unsupported.add(base_url)
+                        return None
+                    if response.status != 200:
+                        print(f"[VoiceRegistry] Registration failed: {await response.text()}")
+                        return None
+                    data = await response.json()
+            except aiohttp.ClientError as e:
+                print(f"[VoiceRegistry] Registration error: {e}")
+                return None
+
+            registered_id = data.get("voice_id") or voice_id
+            self._registered.add(f"{base_url}|{registered_id}")
+            return registered_id
+
+    def forget(self, base_url: str, voice_id: str):
+        """서버가 voice_id를 잃어버린 경우(재시작 등) 등록 상태 초기화"""
+        self._registered.discard(f"{base_url}|{voice_id}")
+
+    async def clone_payload(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        text: str,
+        language: str,
+        ref_audio_base64: str,
+        ref_text: str = "",
+        x_vector_only_mode: bool = False
+    ) -> Dict[str, Any]:
+        """/clone 요청 본문 생성 - 가능하면 voice_id, 아니면 인라인 참조 음성"""
+        payload: Dict[str, Any] = {
+            "text": text,
+            "language": language,
+            "x_vector_only_mode": x_vector_only_mode
+        }
+        voice_id = await self.ensure_registered(
+            session, base_url, ref_audio_base64, ref_text, x_vector_only_mode
+        )
+        if voice_id:
+            payload["voice_id"] = voice_id
+        else:
+            payload["ref_audio_base64"] = ref_audio_base64
+            payload["ref_text"] = ref_text or ""
+        return payload
+
+    async def post_clone(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        payload: Dict[str, Any],
+        ref_audio_base64: str,
+        ref_text: str = "",
+        timeout: float = 180
+    ) -> Tuple[int, Union[Dict[str, Any], str]]:
+        """/clone 호출 → (status, json 또는 에러 텍스트)
+
+        서버가 voice_id를 모른다고 응답(404)하면 등록 상태를 지우고
+        참조 음성을 인라인으로 보내 한 번 더 시도한다.
+        """
+        async with session.post(
+            f"{base_url}/clone",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            if response.status == 200:
+                return 200, await response.json()
+            status, error = response.status, await response.text()
+
+        if status == 404 and "voice_id" in payload:
+            self.forget(base_url, payload["voice_id"])
+            fallback = {k: v for k, v in payload.items() if k != "voice_id"}
+            fallback["ref_audio_base64"] = ref_audio_base64
+            fallback["ref_text"] = ref_text or ""
+            return await self.post_clone(session, base_url, fallback, ref_audio_base64, ref_text, timeout)
+
+        return status, error
+
+
+# 싱글톤 인스턴스
+voice_registry = VoiceRegistry()
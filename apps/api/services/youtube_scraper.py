@@ -8,13 +8,9 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict
 
-# Playwright는 async로 동작
-try:
-    from playwright.async_api import async_playwright, Browser, Page
-except ImportError:
-    print("Warning: playwright not installed. Run: pip install playwright && playwright install chromium")
+from .browser_pool import browser_pool
 
 SCREENSHOT_DIR = Path("/app/screenshots/youtube")
 
@@ -23,16 +19,8 @@ class YouTubeScraperService:
     """YouTube 채널 스크린샷 서비스"""
     
     def __init__(self):
-        self.browser: Optional[Browser] = None
         SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)
     
-    async def _ensure_browser(self):
-        """브라우저 인스턴스 확인"""
-        if self.browser is None:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(headless=True)
-        return self.browser
-    
     async def search_channels(self, keyword: str, max_channels: int = 5) -> List[Dict]:
         """
         키워드로 YouTube 채널 검색
@@ -44,10 +32,7 @@ class YouTubeScraperService:
         Returns:
             채널 정보 리스트
         """
-        browser = await self._ensure_browser()
-        page = await browser.new_page()
-        
-        try:
+        async with browser_pool.page() as page:
             # YouTube 검색 (채널 필터)
             search_url = f"https://www.youtube.com/results?search_query={keyword}&sp=EgIQAg%253D%253D"
             await page.goto(search_url, wait_until="networkidle", timeout=30000)
@@ -86,8 +71,6 @@ class YouTubeScraperService:
             
             return channels
             
-        finally:
-            await page.close()
     
     async def capture_channel_videos(
         self, 
@@ -106,10 +89,7 @@ class YouTubeScraperService:
         Returns:
             스크린샷 정보
         """
-        browser = await self._ensure_browser()
-        page = await browser.new_page(viewport={'width': 1920, 'height': 1080})
-        
-        try:
+        async with browser_pool.page(viewport={'width': 1920, 'height': 1080}) as page:
             # 채널 동영상 탭으로 이동
             videos_url = channel_url.rstrip('/') + '/videos'
             await page.goto(videos_url, wait_until="networkidle", timeout=30000)
@@ -155,8 +135,6 @@ class YouTubeScraperService:
                 'captured_at': timestamp
             }
             
-        finally:
-            await page.close()
     
     async def search_and_capture(
         self,
@@ -210,10 +188,8 @@ class YouTubeScraperService:
         }
     
     async def close(self):
-        """브라우저 종료"""
-        if self.browser:
-            await self.browser.close()
-            self.browser = None
+        """공유 브라우저 풀 종료 (CLI/앱 종료 시)"""
+        await browser_pool.close()
 
 
 # 싱글톤 인스턴스
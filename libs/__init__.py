@@ -1,5 +1,5 @@
 """Routine Studio v2 Libraries"""
 
-from . import audio
+from . import audio, transcript, ytdlp
 
-__all__ = ["audio"]
+__all__ = ["audio", "transcript", "ytdlp"]
@@ -5,7 +5,10 @@ Audio Processing Library
 
 Components:
 - processor: 음성 전처리 (노이즈 제거, 최적 구간 추출)
-- diarization: 화자 분리 (pyannote 기반) - torch 필요
+- dsp: 인메모리 DSP (리샘플링, 스펙트럴 게이팅 노이즈 제거, 속도/피치)
+- features: 벡터화 프레임 분석 (배치 rFFT, 구조화 배열 결과)
+- streaming: ffmpeg 파이프 블록 분석 (장시간 소스, 일정한 메모리)
+- diarization: 화자 분리 (pyannote 기반) - torch 필요, 모델은 첫 사용 시 로드
 """
 
 from .processor import (
@@ -14,6 +17,21 @@ from .processor import (
     ProcessedAudio,
     AudioSegment,
 )
+from . import dsp
+from .features import FRAME_DTYPE, analyze_frames
+from .diarization import (
+    speaker_diarizer,
+    SpeakerDiarizer,
+    SpeakerSegment,
+    DiarizationResult,
+    DiarizationCancelled,
+)
+from .streaming import (
+    streaming_audio_analyzer,
+    StreamingAudioAnalyzer,
+    StreamAnalysis,
+    VoiceRegionTracker,
+)
 
 __all__ = [
     # Processor
@@ -21,21 +39,20 @@ __all__ = [
     "AudioProcessor",
     "ProcessedAudio",
     "AudioSegment",
+    # DSP
+    "dsp",
+    # Features
+    "FRAME_DTYPE",
+    "analyze_frames",
+    # Streaming
+    "streaming_audio_analyzer",
+    "StreamingAudioAnalyzer",
+    "StreamAnalysis",
+    "VoiceRegionTracker",
+    # Diarization (torch/pyannote는 첫 diarize 호출 시 로드)
+    "speaker_diarizer",
+    "SpeakerDiarizer",
+    "SpeakerSegment",
+    "DiarizationResult",
+    "DiarizationCancelled",
 ]
-
-# Diarization은 torch가 있을 때만 import
-try:
-    from .diarization import (
-        speaker_diarizer,
-        SpeakerDiarizer,
-        SpeakerSegment,
-        DiarizationResult,
-    )
-    __all__.extend([
-        "speaker_diarizer",
-        "SpeakerDiarizer",
-        "SpeakerSegment",
-        "DiarizationResult",
-    ])
-except ImportError:
-    pass
@@ -1,17 +1,25 @@
-"""Speaker Diarization 서비스 v3 - pyannote 4.0 API"""
+"""Speaker Diarization 서비스 v4 - pyannote 4.0 API
+
+모델은 첫 diarize 호출 시 로드되며(import 시점 비용 없음), 제한된 워커 풀에서
+파이프라인 인스턴스를 재사용한다. 결과는 오디오 내용 해시 + max_speakers로 캐시한다.
+"""
 
 import asyncio
+import hashlib
+import importlib.util
 import os
-import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# torch는 실제 모델 로드 시점에 import (존재 여부만 확인)
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
 
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    torch = None
-    TORCH_AVAILABLE = False
+
+class DiarizationCancelled(Exception):
+    """진행 중인 화자 분리가 취소됨"""
 
 
 @dataclass
@@ -31,38 +39,164 @@ class DiarizationResult:
 
 
 class SpeakerDiarizer:
-    def __init__(self, hf_token: str = None):
-        if not TORCH_AVAILABLE:
-            raise ImportError("torch is required for SpeakerDiarizer")
+    """화자 분리 서비스
+
+    - 파이프라인은 워커 수만큼 필요할 때 로드해 풀에서 재사용 (warm pool)
+    - 동시 실행 수는 max_workers로 제한 (CPU 추론 기준으로 산정)
+    - 호출 측 태스크가 취소되면 pyannote hook에서 실행을 중단
+    - (내용 해시, max_speakers) 결과 LRU 캐시, 같은 키의 동시 요청은 한 번만 실행
+    """
+
+    MODEL_NAME = "pyannote/speaker-diarization-3.1"
+    CACHE_SIZE = 64
+    HASH_CHUNK = 1 << 20
+
+    def __init__(self, hf_token: str = None, max_workers: int = None, cache_size: int = None):
         self.hf_token = hf_token or os.environ.get("HF_TOKEN")
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self._pipeline = None
+        self.max_workers = max(1, max_workers or int(
+            os.environ.get("DIARIZATION_WORKERS", 0)
+        ) or self._default_workers())
+        self.cache_size = cache_size or self.CACHE_SIZE
+        self.device: Optional[str] = None
 
-    def _load_pipeline(self):
-        if self._pipeline is not None:
-            return self._pipeline
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._idle_pipelines: List = []
+        self._pipelines_lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, Optional[int]], DiarizationResult]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Optional[int]], asyncio.Future] = {}
 
+    @staticmethod
+    def _default_workers() -> int:
+        # pyannote 추론은 torch 내부 스레드를 사용하므로 CPU에서는 소수 워커가 처리량이 가장 높음
+        return max(1, min(2, (os.cpu_count() or 1) // 4))
+
+    @property
+    def available(self) -> bool:
+        return TORCH_AVAILABLE
+
+    def _create_pipeline(self):
+        """pyannote 파이프라인 생성 (워커 스레드에서 호출)"""
+        if not TORCH_AVAILABLE:
+            raise ImportError("torch is required for SpeakerDiarizer")
+        import torch
         from pyannote.audio import Pipeline
-        print(f"Loading pyannote/speaker-diarization-3.1 on {self.device}...")
 
-        self._pipeline = Pipeline.from_pretrained(
-            "pyannote/speaker-diarization-3.1",
-            token=self.hf_token
-        )
-        self._pipeline.to(torch.device(self.device))
+        if self.device is None:
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            if self.device == "cpu":
+                torch.set_num_threads(max(1, (os.cpu_count() or 1) // self.max_workers))
+        print(f"Loading {self.MODEL_NAME} on {self.device}...")
+
+        pipeline = Pipeline.from_pretrained(self.MODEL_NAME, token=self.hf_token)
+        pipeline.to(torch.device(self.device))
         print("Pipeline loaded!")
-        return self._pipeline
+        return pipeline
+
+    def _checkout_pipeline(self):
+        with self._pipelines_lock:
+            if self._idle_pipelines:
+                return self._idle_pipelines.pop()
+        return self._create_pipeline()
+
+    def _checkin_pipeline(self, pipeline):
+        with self._pipelines_lock:
+            self._idle_pipelines.append(pipeline)
+
+    def _ensure_pool(self) -> ThreadPoolExecutor:
+        # 풀 크기가 동시 실행 수 상한 - 초과 요청은 풀 대기열에서 기다림
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="diarization"
+            )
+        return self._executor
+
+    def _run_pipeline(self, audio_path: str, params: dict, cancel: threading.Event):
+        """워커 스레드에서 파이프라인 실행 - cancel이 설정되면 다음 단계에서 중단"""
+        if cancel.is_set():
+            raise DiarizationCancelled(audio_path)
+
+        def hook(*args, **kwargs):
+            if cancel.is_set():
+                raise DiarizationCancelled(audio_path)
+
+        pipeline = self._checkout_pipeline()
+        try:
+            return pipeline(audio_path, hook=hook, **params)
+        finally:
+            self._checkin_pipeline(pipeline)
+
+    def _hash_file(self, audio_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(audio_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
 
     async def diarize(self, audio_path: str, max_speakers: int = None) -> DiarizationResult:
-        pipeline = self._load_pipeline()
+        """화자 분리 (캐시 → 진행 중인 같은 요청 공유 → 워커 풀 실행)"""
+        loop = asyncio.get_running_loop()
+        content_hash = await loop.run_in_executor(None, self._hash_file, audio_path)
+        key = (content_hash, max_speakers or None)
+
+        while True:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
 
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # 먼저 요청한 쪽이 취소됨 - 직접 실행
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._diarize_uncached(audio_path, max_speakers)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없어도 미확인 예외 경고가 남지 않도록
+            raise
+        else:
+            self._store(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _diarize_uncached(self, audio_path: str, max_speakers: int = None) -> DiarizationResult:
         params = {}
         if max_speakers:
             params["max_speakers"] = max_speakers
 
-        loop = asyncio.get_event_loop()
-        output = await loop.run_in_executor(None, lambda: pipeline(audio_path, **params))
+        cancel = threading.Event()
+        loop = asyncio.get_running_loop()
+        try:
+            output = await loop.run_in_executor(
+                self._ensure_pool(), self._run_pipeline, audio_path, params, cancel
+            )
+        except asyncio.CancelledError:
+            # 대기 중인 작업은 풀에서 제거되고, 실행 중인 작업은 다음 hook 호출에서 중단
+            cancel.set()
+            raise
+
+        return self._to_result(output)
+
+    def _store(self, key: Tuple[str, Optional[int]], result: DiarizationResult):
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
 
+    def _to_result(self, output) -> DiarizationResult:
         # pyannote 4.0: output.speaker_diarization
         diarization = output.speaker_diarization
 
@@ -89,6 +223,17 @@ class SpeakerDiarizer:
             total_duration=total_duration
         )
 
+    def clear_cache(self):
+        self._cache.clear()
+
+    def shutdown(self):
+        """워커 풀과 로드된 파이프라인 해제"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        with self._pipelines_lock:
+            self._idle_pipelines.clear()
+
     def get_main_speaker(self, result: DiarizationResult) -> str:
         if not result.speaker_durations:
             return None
@@ -113,12 +258,5 @@ class SpeakerDiarizer:
                               end=longest.start + max_dur, duration=max_dur)
 
 
-# 싱글톤은 torch가 있을 때만 생성
-speaker_diarizer = None
-if TORCH_AVAILABLE:
-    try:
-        speaker_diarizer = SpeakerDiarizer(
-            hf_token=os.environ.get("HF_TOKEN")
-        )
-    except Exception:
-        pass
+# 싱글톤 인스턴스 (생성 비용 없음 - 모델은 첫 diarize 호출 시 로드)
+speaker_diarizer = SpeakerDiarizer()
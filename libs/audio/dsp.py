@@ -0,0 +1,243 @@
+"""
+인메모리 오디오 DSP
+
+WAV 디코딩/인코딩, 리샘플링, 스펙트럴 게이팅 노이즈 제거, 속도/피치 변경을
+numpy 버퍼에서 직접 처리한다. WAV가 아닌 입력(mp3, webm 등)을 디코딩할 때만
+ffmpeg를 stdin/stdout 파이프로 실행하며 임시 파일은 만들지 않는다.
+
+샘플 배열은 float32, 범위 [-1, 1]이며 모노는 (n,), 다채널은 (n, channels) 형태다.
+"""
+
+import asyncio
+import io
+import wave
+from typing import List, Tuple
+
+import numpy as np
+
+
+# 노이즈 제거 STFT 설정
+STFT_WINDOW_SEC = 0.032  # 약 32ms 창 (2의 거듭제곱으로 올림)
+STFT_OVERLAP = 4         # hop = n_fft / 4
+NOISE_PERCENTILE = 10    # 주파수 bin별 노이즈 바닥 추정 (적응형)
+GATE_THRESHOLD_DB = 12.0  # 노이즈 바닥보다 이만큼 커야 신호로 취급
+
+
+def is_wav(data: bytes) -> bool:
+    """RIFF/WAVE 헤더 여부"""
+    return len(data) >= 12 and data[:4] == b"RIFF" and data[8:12] == b"WAVE"
+
+
+def decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """PCM WAV 바이트 → (float32 샘플, 샘플레이트)
+
+    Raises:
+        wave.Error: PCM이 아니거나 지원하지 않는 WAV (ffmpeg 디코딩으로 폴백)
+    """
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        sample_rate = wav.getframerate()
+        n_channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        raw = wav.readframes(wav.getnframes())
+
+    if sample_width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 3:
+        # 24bit little-endian → int32 상위 3바이트에 배치
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        widened = np.zeros((len(packed), 4), dtype=np.uint8)
+        widened[:, 1:] = packed
+        samples = (widened.view("<i4").ravel() >> 8).astype(np.float32) / 8388607
+    elif sample_width in (2, 4):
+        dtype = np.int16 if sample_width == 2 else np.int32
+        samples = np.frombuffer(raw, dtype=dtype).astype(np.float32) / np.iinfo(dtype).max
+    else:
+        raise wave.Error(f"Unsupported sample width: {sample_width}")
+
+    if n_channels > 1:
+        samples = samples[: len(samples) - len(samples) % n_channels].reshape(-1, n_channels)
+    return samples, sample_rate
+
+
+def to_mono(samples: np.ndarray) -> np.ndarray:
+    """다채널 → 모노 (채널 평균)"""
+    return samples.mean(axis=1) if samples.ndim == 2 else samples
+
+
+def pcm16_to_wav(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """16bit PCM 바이트에 WAV 헤더 추가"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """float32 샘플 → 16bit PCM WAV 바이트"""
+    channels = samples.shape[1] if samples.ndim == 2 else 1
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    return pcm16_to_wav(pcm.tobytes(), sample_rate, channels)
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """FFT 기반 대역 제한 리샘플링 (axis 0)
+
+    스펙트럼을 잘라내거나 0으로 채우므로 다운샘플링 시 별도 안티앨리어싱 필터가 필요 없다.
+    """
+    if src_rate == dst_rate or len(samples) == 0:
+        return samples
+    n_in = len(samples)
+    n_out = max(1, int(round(n_in * dst_rate / src_rate)))
+
+    spectrum = np.fft.rfft(samples, axis=0)
+    n_bins = n_out // 2 + 1
+    if n_bins <= spectrum.shape[0]:
+        spectrum = spectrum[:n_bins]
+    else:
+        pad = [(0, n_bins - spectrum.shape[0])] + [(0, 0)] * (samples.ndim - 1)
+        spectrum = np.pad(spectrum, pad)
+
+    out = np.fft.irfft(spectrum, n=n_out, axis=0) * (n_out / n_in)
+    return out.astype(np.float32)
+
+
+def change_playback_rate(samples: np.ndarray, sample_rate: int, factor: float) -> np.ndarray:
+    """재생 속도를 factor배로 변경 (테이프 방식 - 길이와 음높이가 함께 변함)
+
+    샘플레이트를 sample_rate * factor로 간주한 뒤 원래 레이트로 리샘플링한다.
+    """
+    if factor == 1.0:
+        return samples
+    return resample(samples, int(sample_rate * factor), sample_rate)
+
+
+def pitch_factor(semitones: float) -> float:
+    """반음 → 주파수 배율"""
+    return 2 ** (semitones / 12.0)
+
+
+def _frame_spectrum(audio: np.ndarray, n_fft: int, hop: int, window: np.ndarray) -> np.ndarray:
+    n_frames = (len(audio) - n_fft) // hop + 1
+    stride = audio.strides[0]
+    frames = np.lib.stride_tricks.as_strided(
+        audio, shape=(n_frames, n_fft), strides=(stride * hop, stride), writeable=False
+    )
+    return np.fft.rfft(frames * window, axis=1).astype(np.complex64)
+
+
+def _overlap_add(frames: np.ndarray, hop: int, overlap: int) -> np.ndarray:
+    """(n_frames, n_fft) 프레임을 hop 간격으로 겹쳐 더함 - overlap번의 배열 덧셈"""
+    n_frames = len(frames)
+    hops = frames.reshape(n_frames, overlap, hop)
+    out = np.zeros((n_frames + overlap - 1, hop), dtype=np.float64)
+    for j in range(overlap):
+        out[j:j + n_frames] += hops[:, j]
+    return out.ravel()
+
+
+def _box_smooth(mask: np.ndarray, time_frames: int, freq_bins: int) -> np.ndarray:
+    """2-D 이동 평균 (누적합, 가장자리는 유효 구간 평균)"""
+    for axis, width in ((0, time_frames), (1, freq_bins)):
+        if width <= 1 or mask.shape[axis] == 0:
+            continue
+        half = width // 2
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (half + 1, half)
+        csum = np.cumsum(np.pad(mask, pad), axis=axis)
+        ones = np.cumsum(np.pad(np.ones(mask.shape[axis]), pad[axis]))
+        n = mask.shape[axis]
+        upper = np.take(csum, np.arange(width, width + n), axis=axis)
+        lower = np.take(csum, np.arange(0, n), axis=axis)
+        count = ones[width:width + n] - ones[:n]
+        shape = [1, 1]
+        shape[axis] = n
+        mask = (upper - lower) / count.reshape(shape)
+    return mask
+
+
+def spectral_gate(samples: np.ndarray, sample_rate: int, strength: float = 0.5) -> np.ndarray:
+    """스펙트럴 게이팅 노이즈 제거 (모노)
+
+    주파수 bin별 노이즈 바닥을 하위 백분위수로 추정하고, 바닥 + GATE_THRESHOLD_DB보다
+    약한 성분을 감쇠한다. 감쇠량은 이전 ffmpeg afftdn 설정과 같은 5~25dB.
+
+    Args:
+        strength: 노이즈 제거 강도 (0.0~1.0, 높을수록 강함)
+    """
+    audio = np.asarray(samples, dtype=np.float32)
+    n_fft = 1 << int(np.ceil(np.log2(max(sample_rate * STFT_WINDOW_SEC, 16))))
+    hop = n_fft // STFT_OVERLAP
+    if len(audio) < n_fft:
+        return audio
+
+    # 양끝 반사 패딩 + hop 배수 맞춤
+    half = n_fft // 2
+    padded = np.pad(audio, (half, half), mode="reflect")
+    padded = np.pad(padded, (0, (-(len(padded) - n_fft)) % hop))
+
+    window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+    spectrum = _frame_spectrum(padded, n_fft, hop, window)
+    magnitude = np.abs(spectrum)
+
+    noise_floor = np.percentile(magnitude, NOISE_PERCENTILE, axis=0)
+    threshold = noise_floor * (10 ** (GATE_THRESHOLD_DB / 20))
+
+    reduction_db = 5 + float(np.clip(strength, 0.0, 1.0)) * 20
+    floor_gain = 10 ** (-reduction_db / 20)
+    mask = np.where(magnitude > threshold, 1.0, floor_gain)
+    # 음악적 잡음(musical noise) 완화를 위해 시간/주파수 방향으로 마스크 평활화
+    mask = _box_smooth(mask, time_frames=3, freq_bins=5)
+
+    frames = np.fft.irfft(spectrum * mask.astype(np.float32), n=n_fft, axis=1) * window
+    out = _overlap_add(frames, hop, STFT_OVERLAP)
+    norm = _overlap_add(np.broadcast_to(window ** 2, frames.shape), hop, STFT_OVERLAP)
+    out = out / np.maximum(norm, 1e-8)
+
+    return out[half:half + len(audio)].astype(np.float32)
+
+
+async def ffmpeg_pipe(data: bytes, output_args: List[str], ffmpeg_path: str = "ffmpeg") -> bytes:
+    """stdin으로 입력을 넘기고 stdout으로 결과를 받는 ffmpeg 실행 (임시 파일 없음)"""
+    process = await asyncio.create_subprocess_exec(
+        ffmpeg_path, "-v", "error", "-i", "pipe:0", *output_args, "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate(data)
+    if process.returncode != 0 or not stdout:
+        raise RuntimeError(f"ffmpeg pipe failed: {stderr.decode(errors='ignore')[:200]}")
+    return stdout
+
+
+async def decode_audio(
+    data: bytes,
+    sample_rate: int = None,
+    ffmpeg_path: str = "ffmpeg",
+    fallback_rate: int = 24000
+) -> Tuple[np.ndarray, int]:
+    """임의 포맷 오디오 → 모노 float32 샘플
+
+    PCM WAV는 프로세스 안에서 디코딩하고, 그 외 포맷만 ffmpeg 파이프로 s16le 디코딩한다.
+
+    Args:
+        sample_rate: 목표 샘플레이트 (None이면 WAV는 원본 유지, 그 외는 fallback_rate)
+    """
+    if is_wav(data):
+        try:
+            samples, rate = decode_wav(data)
+            samples = to_mono(samples)
+            if sample_rate and sample_rate != rate:
+                samples, rate = resample(samples, rate, sample_rate), sample_rate
+            return samples, rate
+        except (wave.Error, EOFError):
+            pass  # WAVE_FORMAT_EXTENSIBLE 등 - ffmpeg로 디코딩
+
+    rate = sample_rate or fallback_rate
+    pcm = await ffmpeg_pipe(data, ["-f", "s16le", "-ac", "1", "-ar", str(rate)], ffmpeg_path)
+    usable = len(pcm) - (len(pcm) % 2)
+    samples = np.frombuffer(pcm[:usable], dtype=np.int16).astype(np.float32) / np.iinfo(np.int16).max
+    return samples, rate
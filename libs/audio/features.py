@@ -0,0 +1,194 @@
+"""
+벡터화 프레임 분석 엔진
+
+신호를 stride 기반 2-D 프레임 뷰로 나누고, 블록 단위 배치 rFFT 한 번으로
+모든 스펙트럼 특징과 음성 점수를 배열 연산으로 계산한다.
+결과는 프레임당 한 행의 구조화 numpy 배열(FRAME_DTYPE)로 반환된다.
+"""
+
+import numpy as np
+
+
+FRAME_DTYPE = np.dtype([
+    ("start_sec", np.float64),
+    ("end_sec", np.float64),
+    ("energy", np.float64),
+    ("zcr", np.float64),
+    ("spectral_centroid", np.float64),
+    ("voice_band_ratio", np.float64),
+    ("spectral_flatness", np.float64),
+    ("voice_score", np.float64),
+    ("is_voice", np.bool_),
+])
+
+# 배치 rFFT 블록 크기 (프레임 수) - 긴 오디오에서도 스펙트럼 메모리 상한 유지
+BLOCK_FRAMES = 4096
+
+
+def frame_view(audio: np.ndarray, frame_size: int, drop_last: bool = True) -> np.ndarray:
+    """겹치지 않는 프레임의 (n_frames, frame_size) 뷰 (복사 없음)
+
+    AudioProcessor의 기존 루프와 같이 마지막 불완전 프레임은 항상 버리고,
+    drop_last=True면 정확히 끝에 맞는 마지막 프레임도 제외한다.
+    스트리밍 블록 분석에서는 drop_last=False로 모든 완전한 프레임을 사용한다.
+    """
+    if not drop_last:
+        n_frames = len(audio) // frame_size
+    elif len(audio) > frame_size:
+        n_frames = (len(audio) - frame_size - 1) // frame_size + 1
+    else:
+        n_frames = 0
+    if n_frames <= 0:
+        return np.empty((0, frame_size), dtype=audio.dtype)
+    audio = np.ascontiguousarray(audio)
+    stride = audio.strides[0]
+    return np.lib.stride_tricks.as_strided(
+        audio,
+        shape=(n_frames, frame_size),
+        strides=(stride * frame_size, stride),
+        writeable=False,
+    )
+
+
+def voice_scores(
+    energy: np.ndarray,
+    zcr: np.ndarray,
+    spectral_centroid: np.ndarray,
+    voice_band_ratio: np.ndarray,
+    spectral_flatness: np.ndarray,
+    energy_threshold: float,
+) -> np.ndarray:
+    """AudioProcessor._calculate_voice_score의 배열 버전"""
+    energy_score = np.select(
+        [energy < energy_threshold, energy < 0.08, energy < 0.25],
+        [0.0, np.minimum(1.0, energy / 0.04), 1.0],
+        default=np.maximum(0.2, 1.0 - (energy - 0.25) / 0.5),
+    )
+
+    zcr_score = np.select(
+        [(zcr >= 0.02) & (zcr <= 0.15), zcr < 0.02],
+        [1.0, zcr / 0.02],
+        default=np.maximum(0.0, 1.0 - (zcr - 0.15) / 0.3),
+    )
+
+    centroid_score = np.select(
+        [
+            (spectral_centroid >= 200) & (spectral_centroid <= 2500),
+            spectral_centroid < 200,
+            spectral_centroid <= 5000,
+        ],
+        [
+            1.0,
+            spectral_centroid / 200,
+            np.maximum(0.1, 1.0 - (spectral_centroid - 2500) / 5000),
+        ],
+        default=0.05,
+    )
+
+    voice_ratio_score = np.minimum(1.0, voice_band_ratio * 1.3)
+
+    flatness_score = np.select(
+        [spectral_flatness < 0.1, spectral_flatness < 0.3],
+        [1.0, 1.0 - (spectral_flatness - 0.1) / 0.4],
+        default=np.maximum(0.1, 0.5 - spectral_flatness),
+    )
+
+    return (
+        energy_score * 0.15
+        + zcr_score * 0.15
+        + centroid_score * 0.25
+        + voice_ratio_score * 0.25
+        + flatness_score * 0.20
+    )
+
+
+def _spectral_features(
+    frames: np.ndarray,
+    freqs: np.ndarray,
+    voice_mask: np.ndarray,
+):
+    """프레임 블록의 (centroid, voice band ratio, flatness) - rFFT 1회"""
+    magnitude = np.abs(np.fft.rfft(frames, axis=1))
+
+    # Spectral centroid
+    mag_sum = magnitude.sum(axis=1)
+    safe_sum = np.where(mag_sum < 1e-10, 1.0, mag_sum)
+    centroid = np.where(mag_sum < 1e-10, 0.0, (magnitude * freqs).sum(axis=1) / safe_sum)
+
+    # Voice band ratio
+    power = magnitude ** 2
+    total_power = power.sum(axis=1)
+    safe_total = np.where(total_power < 1e-10, 1.0, total_power)
+    band_ratio = np.where(
+        total_power < 1e-10, 0.0, power[:, voice_mask].sum(axis=1) / safe_total
+    )
+
+    # Spectral flatness (1e-10 이하 bin 제외한 기하/산술 평균 비)
+    valid = magnitude > 1e-10
+    count = valid.sum(axis=1)
+    safe_count = np.maximum(count, 1)
+    log_mean = np.where(valid, np.log(np.where(valid, magnitude, 1.0)), 0.0).sum(axis=1) / safe_count
+    arith_mean = np.where(valid, magnitude, 0.0).sum(axis=1) / safe_count
+    safe_arith = np.where(arith_mean < 1e-10, 1.0, arith_mean)
+    flatness = np.where(
+        (count == 0) | (arith_mean < 1e-10), 1.0, np.exp(log_mean) / safe_arith
+    )
+
+    return centroid, band_ratio, flatness
+
+
+def analyze_frames(
+    audio: np.ndarray,
+    sample_rate: int,
+    frame_duration: float,
+    voice_freq_low: float,
+    voice_freq_high: float,
+    energy_threshold: float,
+    voice_score_threshold: float,
+    block_frames: int = BLOCK_FRAMES,
+    sample_offset: int = 0,
+    drop_last: bool = True,
+) -> np.ndarray:
+    """프레임별 특징 + 음성 점수를 FRAME_DTYPE 구조화 배열로 계산
+
+    Args:
+        sample_offset: audio 첫 샘플의 원본 내 위치 (스트리밍 블록 분석용)
+        drop_last: 정확히 끝에 맞는 마지막 프레임 제외 여부 (frame_view 참고)
+    """
+    frame_size = int(sample_rate * frame_duration)
+    frames = frame_view(audio, frame_size, drop_last)
+    n_frames = len(frames)
+
+    result = np.empty(n_frames, dtype=FRAME_DTYPE)
+    if n_frames == 0:
+        return result
+
+    starts = sample_offset + np.arange(n_frames, dtype=np.float64) * frame_size
+    result["start_sec"] = starts / sample_rate
+    result["end_sec"] = (starts + frame_size) / sample_rate
+
+    # 시간 영역 특징
+    result["energy"] = np.sqrt(np.mean(frames ** 2, axis=1))
+    negative = frames < 0
+    result["zcr"] = np.count_nonzero(negative[:, 1:] != negative[:, :-1], axis=1) / frame_size
+
+    # 주파수 영역 특징 (블록 단위 배치 rFFT)
+    freqs = np.fft.rfftfreq(frame_size, 1 / sample_rate)
+    voice_mask = (freqs >= voice_freq_low) & (freqs <= voice_freq_high)
+    for begin in range(0, n_frames, block_frames):
+        end = min(begin + block_frames, n_frames)
+        centroid, band_ratio, flatness = _spectral_features(frames[begin:end], freqs, voice_mask)
+        result["spectral_centroid"][begin:end] = centroid
+        result["voice_band_ratio"][begin:end] = band_ratio
+        result["spectral_flatness"][begin:end] = flatness
+
+    result["voice_score"] = voice_scores(
+        result["energy"],
+        result["zcr"],
+        result["spectral_centroid"],
+        result["voice_band_ratio"],
+        result["spectral_flatness"],
+        energy_threshold,
+    )
+    result["is_voice"] = result["voice_score"] >= voice_score_threshold
+    return result
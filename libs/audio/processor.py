@@ -10,15 +10,14 @@ Qwen3-TTS 권장사항:
 """
 
 import asyncio
-import io
-import os
-import tempfile
-import wave
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
 
 import numpy as np
 
+from . import dsp
+from .features import analyze_frames
+
 
 @dataclass
 class AudioSegment:
@@ -53,7 +52,7 @@ class AudioProcessor:
 
     기능:
     1. 음성/음악/노이즈 구분 (spectral 분석)
-    2. ffmpeg afftdn 노이즈 제거 (선택적)
+    2. 스펙트럴 게이팅 노이즈 제거 (선택적, 인메모리)
     3. 깔끔한 음성 구간만 3-7초로 추출
     """
 
@@ -74,6 +73,9 @@ class AudioProcessor:
     VOICE_FREQ_LOW = 85
     VOICE_FREQ_HIGH = 3400
 
+    # 이보다 큰 입력은 전체를 디코딩하지 않고 스트리밍 분석 (24kHz 16bit 모노 WAV 기준 약 6분)
+    STREAMING_MIN_BYTES = 16 * 1024 * 1024
+
     def __init__(self, ffmpeg_path: str = "ffmpeg"):
         self.ffmpeg_path = ffmpeg_path
 
@@ -88,90 +90,37 @@ class AudioProcessor:
         return await process.communicate()
 
     def _read_wav(self, audio_bytes: bytes) -> Tuple[np.ndarray, int]:
-        """WAV 바이트를 numpy 배열로 변환"""
-        with io.BytesIO(audio_bytes) as f:
-            with wave.open(f, 'rb') as wav:
-                sample_rate = wav.getframerate()
-                n_channels = wav.getnchannels()
-                sample_width = wav.getsampwidth()
-                n_frames = wav.getnframes()
-
-                raw_data = wav.readframes(n_frames)
-
-                if sample_width == 1:
-                    dtype = np.uint8
-                elif sample_width == 2:
-                    dtype = np.int16
-                elif sample_width == 4:
-                    dtype = np.int32
-                else:
-                    dtype = np.int16
-
-                audio = np.frombuffer(raw_data, dtype=dtype)
-
-                if n_channels == 2:
-                    audio = audio.reshape(-1, 2).mean(axis=1)
-
-                audio = audio.astype(np.float32)
-                if dtype == np.uint8:
-                    audio = (audio - 128) / 128
-                else:
-                    audio = audio / np.iinfo(dtype).max
-
-                return audio, sample_rate
+        """WAV 바이트를 모노 numpy 배열로 변환"""
+        audio, sample_rate = dsp.decode_wav(audio_bytes)
+        return dsp.to_mono(audio), sample_rate
 
     def _write_wav(self, audio: np.ndarray, sample_rate: int) -> bytes:
         """numpy 배열을 WAV 바이트로 변환"""
-        audio_int16 = (audio * 32767).astype(np.int16)
-
-        buffer = io.BytesIO()
-        with wave.open(buffer, 'wb') as wav:
-            wav.setnchannels(1)
-            wav.setsampwidth(2)
-            wav.setframerate(sample_rate)
-            wav.writeframes(audio_int16.tobytes())
+        return dsp.encode_wav(audio, sample_rate)
 
-        return buffer.getvalue()
+    async def _denoise(self, audio: np.ndarray, sample_rate: int, strength: float) -> np.ndarray:
+        """스펙트럴 게이팅 노이즈 제거 (이벤트 루프를 막지 않도록 스레드에서 실행)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: dsp.spectral_gate(audio, sample_rate, strength)
+        )
 
     async def reduce_noise(self, audio_bytes: bytes, strength: float = 0.5) -> bytes:
         """
-        ffmpeg afftdn 필터로 노이즈 제거
+        스펙트럴 게이팅으로 노이즈 제거 (인메모리)
+
+        WAV는 프로세스 안에서 처리하고, 그 외 포맷만 ffmpeg 파이프로 디코딩한다.
 
         Args:
-            audio_bytes: WAV 오디오
+            audio_bytes: 입력 오디오
             strength: 노이즈 제거 강도 (0.0~1.0, 높을수록 강함)
 
         Returns:
             노이즈 제거된 WAV
         """
-        # 노이즈 제거 강도를 dB로 변환 (5~25dB)
-        noise_floor = int(5 + strength * 20)
-
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_in:
-            tmp_in.write(audio_bytes)
-            input_path = tmp_in.name
-
-        output_path = input_path.replace(".wav", "_denoised.wav")
-
-        try:
-            # afftdn: Adaptive FFT Denoiser
-            await self._run_ffmpeg([
-                "-i", input_path,
-                "-af", f"afftdn=nf=-{noise_floor}:nr={noise_floor}:tn=1",
-                "-y",
-                output_path
-            ])
-
-            if os.path.exists(output_path):
-                with open(output_path, "rb") as f:
-                    return f.read()
-            return audio_bytes
-
-        finally:
-            if os.path.exists(input_path):
-                os.remove(input_path)
-            if os.path.exists(output_path):
-                os.remove(output_path)
+        audio, sample_rate = await dsp.decode_audio(audio_bytes, ffmpeg_path=self.ffmpeg_path)
+        denoised = await self._denoise(audio, sample_rate, strength)
+        return self._write_wav(denoised, sample_rate)
 
     def _calculate_zcr(self, frame: np.ndarray) -> float:
         """Zero-crossing rate"""
@@ -291,87 +240,100 @@ class AudioProcessor:
 
         return sum(scores)
 
-    def _analyze_frames(self, audio: np.ndarray, sample_rate: int) -> List[AudioSegment]:
-        """프레임별 분석"""
-        frame_size = int(sample_rate * self.FRAME_DURATION)
-        segments = []
-
-        for i in range(0, len(audio) - frame_size, frame_size):
-            frame = audio[i:i + frame_size]
-
-            energy = np.sqrt(np.mean(frame ** 2))
-            zcr = self._calculate_zcr(frame)
-            spectral_centroid = self._calculate_spectral_centroid(frame, sample_rate)
-            voice_band_ratio = self._calculate_voice_band_ratio(frame, sample_rate)
-            spectral_flatness = self._calculate_spectral_flatness(frame)
-
-            voice_score = self._calculate_voice_score(
-                energy, zcr, spectral_centroid, voice_band_ratio, spectral_flatness
-            )
-
-            start_sec = i / sample_rate
-            end_sec = (i + frame_size) / sample_rate
-            is_voice = voice_score >= self.VOICE_SCORE_THRESHOLD
-
-            segments.append(AudioSegment(
-                start_sec=start_sec,
-                end_sec=end_sec,
-                duration=self.FRAME_DURATION,
-                energy=energy,
-                zcr=zcr,
-                spectral_centroid=spectral_centroid,
-                voice_band_ratio=voice_band_ratio,
-                voice_score=voice_score,
-                is_voice=is_voice
-            ))
-
-        return segments
+    def _analyze_frames(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """프레임별 분석 (벡터화) - FRAME_DTYPE 구조화 배열 반환"""
+        return analyze_frames(
+            audio,
+            sample_rate,
+            frame_duration=self.FRAME_DURATION,
+            voice_freq_low=self.VOICE_FREQ_LOW,
+            voice_freq_high=self.VOICE_FREQ_HIGH,
+            energy_threshold=self.ENERGY_THRESHOLD,
+            voice_score_threshold=self.VOICE_SCORE_THRESHOLD,
+        )
 
     def _find_voice_regions(
         self,
-        segments: List[AudioSegment],
+        frames: np.ndarray,
         min_duration: float = 0.3,
         max_gap: float = 0.4  # 말 사이 쉬는 구간 허용
     ) -> List[Tuple[float, float, float]]:
-        """연속된 음성 구간 찾기"""
-        if not segments:
+        """연속된 음성 구간 찾기 (frames: _analyze_frames 결과)"""
+        if len(frames) == 0:
+            return []
+
+        voice_idx = np.flatnonzero(frames["is_voice"])
+        if len(voice_idx) == 0:
             return []
 
-        regions = []
-        current_start = None
-        current_scores = []
-        gap_count = 0
         max_gap_frames = int(max_gap / self.FRAME_DURATION)
 
-        for seg in segments:
-            if seg.is_voice:
-                if current_start is None:
-                    current_start = seg.start_sec
-                current_scores.append(seg.voice_score)
-                gap_count = 0
+        # 음성 프레임 사이 비음성 프레임 수가 허용치를 넘는 곳에서 구간 분리
+        gaps = np.diff(voice_idx) - 1
+        breaks = np.flatnonzero(gaps > max_gap_frames)
+        group_starts = np.concatenate(([0], breaks + 1))
+        group_ends = np.concatenate((breaks, [len(voice_idx) - 1]))
+
+        regions = []
+        last_frame = len(frames) - 1
+        for g_start, g_end in zip(group_starts, group_ends):
+            first, last = voice_idx[g_start], voice_idx[g_end]
+            start_sec = frames["start_sec"][first]
+            if last_frame - last > max_gap_frames:
+                # 간격 초과로 닫힌 구간은 마지막 음성 프레임 시작 시각에서 끝남
+                end_sec = frames["start_sec"][last]
             else:
-                if current_start is not None:
-                    gap_count += 1
-                    if gap_count > max_gap_frames:
-                        end_sec = seg.start_sec - (gap_count * self.FRAME_DURATION)
-                        duration = end_sec - current_start
-                        if duration >= min_duration:
-                            avg_score = np.mean(current_scores)
-                            regions.append((current_start, end_sec, avg_score))
-                        current_start = None
-                        current_scores = []
-                        gap_count = 0
-
-        # 마지막 구간
-        if current_start is not None and segments:
-            end_sec = segments[-1].end_sec
-            duration = end_sec - current_start
-            if duration >= min_duration:
-                avg_score = np.mean(current_scores)
-                regions.append((current_start, end_sec, avg_score))
+                # 끝까지 허용 간격 이내면 마지막 프레임까지 포함
+                end_sec = frames["end_sec"][last_frame]
+
+            if end_sec - start_sec >= min_duration:
+                avg_score = float(np.mean(frames["voice_score"][voice_idx[g_start:g_end + 1]]))
+                regions.append((float(start_sec), float(end_sec), avg_score))
 
         return regions
 
+    def _region_candidate(
+        self,
+        start: float,
+        end: float,
+        score: float,
+        min_duration: float = 3.0,
+        max_duration: float = 7.0
+    ) -> Optional[Tuple[Tuple[float, float], float, float]]:
+        """음성 구간 → 후보 ((start, end), quality, duration), 너무 짧으면 None"""
+        duration = end - start
+
+        if duration >= min_duration:
+            if duration <= max_duration:
+                # 이상적 길이 - 길수록 약간 보너스
+                length_factor = 0.9 + 0.1 * (duration / max_duration)
+                quality = score * length_factor
+                return ((start, end), quality, duration)
+            # 너무 김 - max_duration만큼 자르기
+            quality = score * 0.85
+            return ((start, start + max_duration), quality, max_duration)
+
+        if duration >= 2.0:
+            # 약간 짧지만 품질 좋으면 사용
+            quality = score * 0.6 * (duration / min_duration)
+            return ((start, end), quality, duration)
+
+        return None
+
+    def _rank_candidate(self, candidate: Tuple[Tuple[float, float], float, float]) -> float:
+        """품질 + 길이 보너스 랭킹 점수"""
+        (s, e), quality, dur = candidate
+        # 5-7초가 이상적
+        if 5.0 <= dur <= 7.0:
+            bonus = 0.15
+        elif 4.0 <= dur < 5.0:
+            bonus = 0.10
+        elif 3.0 <= dur < 4.0:
+            bonus = 0.05
+        else:
+            bonus = 0
+        return quality + bonus
+
     def _select_best_voice_segment(
         self,
         regions: List[Tuple[float, float, float]],
@@ -385,25 +347,10 @@ class AudioProcessor:
             return ((0, end), 0.1)
 
         candidates = []
-
         for start, end, score in regions:
-            duration = end - start
-
-            if duration >= min_duration:
-                if duration <= max_duration:
-                    # 이상적 길이 - 길수록 약간 보너스
-                    length_factor = 0.9 + 0.1 * (duration / max_duration)
-                    quality = score * length_factor
-                    candidates.append(((start, end), quality, duration))
-                else:
-                    # 너무 김 - max_duration만큼 자르기
-                    quality = score * 0.85
-                    candidates.append(((start, start + max_duration), quality, max_duration))
-
-            elif duration >= 2.0:
-                # 약간 짧지만 품질 좋으면 사용
-                quality = score * 0.6 * (duration / min_duration)
-                candidates.append(((start, end), quality, duration))
+            candidate = self._region_candidate(start, end, score, min_duration, max_duration)
+            if candidate:
+                candidates.append(candidate)
 
         if not candidates:
             best = max(regions, key=lambda r: (r[1] - r[0]) * r[2])
@@ -411,21 +358,7 @@ class AudioProcessor:
             duration = min(end - start, max_duration)
             return ((start, start + duration), score * 0.4)
 
-        # 품질 + 길이 보너스로 랭킹
-        def rank(c):
-            (s, e), quality, dur = c
-            # 5-7초가 이상적
-            if 5.0 <= dur <= 7.0:
-                bonus = 0.15
-            elif 4.0 <= dur < 5.0:
-                bonus = 0.10
-            elif 3.0 <= dur < 4.0:
-                bonus = 0.05
-            else:
-                bonus = 0
-            return quality + bonus
-
-        best = max(candidates, key=rank)
+        best = max(candidates, key=self._rank_candidate)
         return (best[0], best[1])
 
     def _normalize_audio(self, audio: np.ndarray, target_db: float = -3.0) -> np.ndarray:
@@ -462,20 +395,26 @@ class AudioProcessor:
         Returns:
             ProcessedAudio
         """
+        if len(audio_bytes) > self.STREAMING_MIN_BYTES:
+            return await self._preprocess_streaming(
+                audio_bytes, target_duration, normalize, denoise, denoise_strength
+            )
+
         noise_reduced = False
 
-        # 노이즈 제거
+        min_dur = self.MIN_DURATION
+        max_dur = self.OPTIMAL_MAX if target_duration is None else min(target_duration, self.ABSOLUTE_MAX)
+
+        audio, sample_rate = await dsp.decode_audio(audio_bytes, ffmpeg_path=self.ffmpeg_path)
+
+        # 노이즈 제거 (디코딩된 배열에 직접 적용)
         if denoise:
             try:
-                audio_bytes = await self.reduce_noise(audio_bytes, denoise_strength)
+                audio = await self._denoise(audio, sample_rate, denoise_strength)
                 noise_reduced = True
             except Exception:
                 pass  # 실패해도 계속 진행
 
-        min_dur = self.MIN_DURATION
-        max_dur = self.OPTIMAL_MAX if target_duration is None else min(target_duration, self.ABSOLUTE_MAX)
-
-        audio, sample_rate = self._read_wav(audio_bytes)
         original_duration = len(audio) / sample_rate
 
         # 짧은 오디오는 그대로
@@ -529,6 +468,25 @@ class AudioProcessor:
             noise_reduced=noise_reduced
         )
 
+    async def _preprocess_streaming(
+        self,
+        audio_bytes: bytes,
+        target_duration: Optional[float],
+        normalize: bool,
+        denoise: bool,
+        denoise_strength: float
+    ) -> ProcessedAudio:
+        """긴 입력은 ffmpeg stdin 파이프로 블록 단위 분석 (임시 파일 없음, 선택 구간만 디코딩)"""
+        from .streaming import StreamingAudioAnalyzer  # streaming 모듈이 이 모듈을 import
+
+        return await StreamingAudioAnalyzer(self, self.ffmpeg_path).preprocess_for_cloning(
+            audio_bytes,
+            target_duration=target_duration,
+            normalize=normalize,
+            denoise=denoise,
+            denoise_strength=denoise_strength
+        )
+
     async def auto_trim(
         self,
         audio_bytes: bytes,
@@ -544,29 +502,9 @@ class AudioProcessor:
         )
 
     async def convert_to_wav_24k(self, audio_bytes: bytes) -> bytes:
-        """24kHz WAV로 변환 (Qwen3-TTS 권장)"""
-        with tempfile.NamedTemporaryFile(suffix=".input", delete=False) as tmp_in:
-            tmp_in.write(audio_bytes)
-            input_path = tmp_in.name
-
-        output_path = input_path + ".wav"
-
-        try:
-            await self._run_ffmpeg([
-                "-i", input_path,
-                "-ar", "24000",
-                "-ac", "1",
-                "-y",
-                output_path
-            ])
-
-            with open(output_path, "rb") as f:
-                return f.read()
-        finally:
-            if os.path.exists(input_path):
-                os.remove(input_path)
-            if os.path.exists(output_path):
-                os.remove(output_path)
+        """24kHz 모노 WAV로 변환 (Qwen3-TTS 권장)"""
+        audio, _ = await dsp.decode_audio(audio_bytes, sample_rate=24000, ffmpeg_path=self.ffmpeg_path)
+        return self._write_wav(audio, 24000)
 
 
 # 싱글톤 인스턴스
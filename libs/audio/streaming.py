@@ -0,0 +1,343 @@
+"""
+스트리밍 음성 구간 분석
+
+ffmpeg 파이프에서 PCM을 고정 크기 블록으로 읽으며 분석하므로,
+원본 길이와 무관하게 메모리 사용량이 일정하다.
+이미 메모리에 있는 인코딩된 오디오(bytes)는 ffmpeg stdin으로 흘려 넣는다 (임시 파일 없음).
+
+- 블록 경계를 넘는 음성 구간 상태(시작, 점수 합, 간격)를 이어서 유지
+- 상위 K개 후보 구간만 보관
+- 최종 선택 구간만 ffmpeg로 다시 잘라 읽음
+"""
+
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .features import analyze_frames
+from .processor import AudioProcessor, ProcessedAudio
+
+
+@dataclass
+class StreamAnalysis:
+    """스트리밍 분석 결과"""
+    duration: float
+    frames_analyzed: int
+    regions_found: int
+    candidates: List[Tuple[Tuple[float, float], float, float]] = field(default_factory=list)  # rank 내림차순
+    best_range: Tuple[float, float] = (0.0, 0.0)
+    quality_score: float = 0.0
+
+
+class VoiceRegionTracker:
+    """블록 단위로 PCM을 받아 음성 구간 상위 K개를 추적
+
+    AudioProcessor._find_voice_regions / _select_best_voice_segment와 같은 규칙을
+    점진적으로 적용한다. 보관하는 상태는 미완성 프레임 샘플과 K개 후보뿐이다.
+    """
+
+    def __init__(
+        self,
+        processor: AudioProcessor,
+        sample_rate: int,
+        top_k: int = 5,
+        min_duration: float = 3.0,
+        max_duration: float = 7.0,
+        min_region: float = 0.3,
+        max_gap: float = 0.4
+    ):
+        self.processor = processor
+        self.sample_rate = sample_rate
+        self.top_k = top_k
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.min_region = min_region
+        self.max_gap_frames = int(max_gap / processor.FRAME_DURATION)
+        self.frame_size = int(sample_rate * processor.FRAME_DURATION)
+
+        self._pending = np.zeros(0, dtype=np.float32)  # 프레임에 못 미친 잔여 샘플
+        self._samples_consumed = 0
+        self.frames_analyzed = 0
+        self.regions_found = 0
+
+        # 현재 열린 음성 구간
+        self._current_start: Optional[float] = None
+        self._last_voice_start = 0.0
+        self._score_sum = 0.0
+        self._score_count = 0
+        self._gap = 0
+        self._last_end = 0.0
+
+        self._heap: List[Tuple[float, int, Tuple[Tuple[float, float], float, float]]] = []
+        self._counter = itertools.count()
+        self._fallback: Optional[Tuple[float, float, float]] = None  # 후보가 없을 때 사용
+
+    def feed(self, samples: np.ndarray):
+        """float32 PCM 블록 추가"""
+        if len(self._pending):
+            samples = np.concatenate((self._pending, samples))
+        n_complete = len(samples) // self.frame_size
+        usable = n_complete * self.frame_size
+
+        if n_complete:
+            frames = analyze_frames(
+                samples[:usable],
+                self.sample_rate,
+                frame_duration=self.processor.FRAME_DURATION,
+                voice_freq_low=self.processor.VOICE_FREQ_LOW,
+                voice_freq_high=self.processor.VOICE_FREQ_HIGH,
+                energy_threshold=self.processor.ENERGY_THRESHOLD,
+                voice_score_threshold=self.processor.VOICE_SCORE_THRESHOLD,
+                sample_offset=self._samples_consumed,
+                drop_last=False,
+            )
+            self._consume(frames)
+            self.frames_analyzed += len(frames)
+            self._samples_consumed += usable
+
+        self._pending = samples[usable:].copy()
+
+    def _consume(self, frames: np.ndarray):
+        starts = frames["start_sec"].tolist()
+        scores = frames["voice_score"].tolist()
+        voiced = frames["is_voice"].tolist()
+
+        for start, score, is_voice in zip(starts, scores, voiced):
+            if is_voice:
+                if self._current_start is None:
+                    self._current_start = start
+                self._last_voice_start = start
+                self._score_sum += score
+                self._score_count += 1
+                self._gap = 0
+            elif self._current_start is not None:
+                self._gap += 1
+                if self._gap > self.max_gap_frames:
+                    self._close_region(self._last_voice_start)
+
+        self._last_end = float(frames["end_sec"][-1])
+
+    def _close_region(self, end_sec: float):
+        start = self._current_start
+        avg_score = self._score_sum / max(self._score_count, 1)
+        self._current_start = None
+        self._score_sum = 0.0
+        self._score_count = 0
+        self._gap = 0
+
+        if end_sec - start < self.min_region:
+            return
+        self.regions_found += 1
+
+        candidate = self.processor._region_candidate(
+            start, end_sec, avg_score, self.min_duration, self.max_duration
+        )
+        if candidate is None:
+            if self._fallback is None or (end_sec - start) * avg_score > (
+                (self._fallback[1] - self._fallback[0]) * self._fallback[2]
+            ):
+                self._fallback = (start, end_sec, avg_score)
+            return
+
+        entry = (self.processor._rank_candidate(candidate), next(self._counter), candidate)
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heappushpop(self._heap, entry)
+
+    def finish(self) -> StreamAnalysis:
+        """스트림 종료 - 열린 구간을 닫고 최적 구간 선택"""
+        if self._current_start is not None:
+            self._close_region(self._last_end)
+
+        duration = (self._samples_consumed + len(self._pending)) / self.sample_rate
+        candidates = [c for _, _, c in sorted(self._heap, reverse=True)]
+
+        if candidates:
+            best_range, quality = candidates[0][0], candidates[0][1]
+        elif self._fallback:
+            start, end, score = self._fallback
+            best_range = (start, start + min(end - start, self.max_duration))
+            quality = score * 0.4
+        else:
+            best_range = (0.0, min(self.min_duration, duration))
+            quality = 0.1
+
+        return StreamAnalysis(
+            duration=duration,
+            frames_analyzed=self.frames_analyzed,
+            regions_found=self.regions_found,
+            candidates=candidates,
+            best_range=best_range,
+            quality_score=quality,
+        )
+
+
+class StreamingAudioAnalyzer:
+    """ffmpeg 파이프 기반 장시간 오디오 분석기"""
+
+    BLOCK_SECONDS = 10.0
+    SAMPLE_RATE = 24000  # Qwen3-TTS 권장
+    STDIN_CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, processor: AudioProcessor = None, ffmpeg_path: str = "ffmpeg"):
+        self.processor = processor or AudioProcessor(ffmpeg_path)
+        self.ffmpeg_path = ffmpeg_path
+
+    def _pcm_command(self, source: Union[str, bytes], start: float = None, duration: float = None) -> List[str]:
+        cmd = [self.ffmpeg_path, "-v", "error"]
+        seek = ["-ss", f"{start:.3f}"] if start is not None else []
+        if isinstance(source, bytes):
+            # 파이프 입력은 탐색할 수 없으므로 -ss를 출력 옵션으로 (디코딩하며 건너뜀)
+            cmd += ["-i", "pipe:0", *seek]
+        else:
+            cmd += ["-nostdin", *seek, "-i", source]
+        if duration is not None:
+            cmd += ["-t", f"{duration:.3f}"]
+        cmd += ["-f", "s16le", "-ac", "1", "-ar", str(self.SAMPLE_RATE), "-"]
+        return cmd
+
+    async def _spawn(self, source: Union[str, bytes], start: float = None, duration: float = None):
+        """PCM 디코딩 ffmpeg 실행 - bytes 입력이면 stdin 파이프를 연다"""
+        return await asyncio.create_subprocess_exec(
+            *self._pcm_command(source, start=start, duration=duration),
+            stdin=asyncio.subprocess.PIPE if isinstance(source, bytes) else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+    async def _feed_stdin(self, process, data: bytes):
+        """입력을 조각 단위로 stdin에 쓰기 (stdout 블록 읽기와 동시에 실행)"""
+        view = memoryview(data)
+        try:
+            for offset in range(0, len(view), self.STDIN_CHUNK_BYTES):
+                process.stdin.write(view[offset:offset + self.STDIN_CHUNK_BYTES])
+                await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg가 먼저 종료됨 - 종료 코드/출력으로 판단
+
+    async def analyze(
+        self,
+        source: Union[str, bytes],
+        min_duration: float = AudioProcessor.MIN_DURATION,
+        max_duration: float = AudioProcessor.OPTIMAL_MAX,
+        top_k: int = 5,
+        start: float = None,
+        duration: float = None
+    ) -> StreamAnalysis:
+        """source(파일 경로, 스트림 URL 또는 메모리의 오디오 bytes)를 블록 단위로 읽으며 분석
+
+        start/duration을 주면 그 구간만 읽으며, 결과 시간은 start 기준 상대 시간이다.
+        """
+        tracker = VoiceRegionTracker(
+            self.processor,
+            self.SAMPLE_RATE,
+            top_k=top_k,
+            min_duration=min_duration,
+            max_duration=max_duration,
+        )
+        block_bytes = int(self.BLOCK_SECONDS * self.SAMPLE_RATE) * 2
+
+        process = await self._spawn(source, start=start, duration=duration)
+        feeder = asyncio.create_task(self._feed_stdin(process, source)) if process.stdin else None
+        try:
+            remainder = b""
+            while True:
+                try:
+                    chunk = await process.stdout.readexactly(block_bytes)
+                except asyncio.IncompleteReadError as e:
+                    chunk = e.partial
+                chunk = remainder + chunk
+                if not chunk:
+                    break
+                # int16 경계에 맞춤
+                usable = len(chunk) - (len(chunk) % 2)
+                remainder = chunk[usable:]
+                if usable:
+                    pcm = np.frombuffer(chunk[:usable], dtype=np.int16)
+                    tracker.feed(pcm.astype(np.float32) / np.iinfo(np.int16).max)
+                if usable < block_bytes:
+                    break
+        finally:
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            stderr = await process.stderr.read()
+            await process.wait()
+            if feeder is not None:
+                feeder.cancel()
+                await asyncio.gather(feeder, return_exceptions=True)
+
+        if tracker.frames_analyzed == 0:
+            raise RuntimeError(f"No audio decoded from source: {stderr.decode(errors='ignore')[:200]}")
+
+        return tracker.finish()
+
+    async def read_range(self, source: Union[str, bytes], start: float, end: float) -> np.ndarray:
+        """선택된 구간만 디코딩 (float32 모노)"""
+        process = await self._spawn(source, start=start, duration=end - start)
+        stdout, stderr = await process.communicate(source if process.stdin else None)
+        if not stdout:
+            raise RuntimeError(f"Failed to read range: {stderr.decode(errors='ignore')[:200]}")
+        usable = len(stdout) - (len(stdout) % 2)
+        pcm = np.frombuffer(stdout[:usable], dtype=np.int16)
+        return pcm.astype(np.float32) / np.iinfo(np.int16).max
+
+    async def preprocess_for_cloning(
+        self,
+        source: Union[str, bytes],
+        target_duration: float = None,
+        normalize: bool = True,
+        denoise: bool = True,
+        denoise_strength: float = 0.4,
+        top_k: int = 5,
+        start: float = None,
+        duration: float = None
+    ) -> ProcessedAudio:
+        """AudioProcessor.preprocess_for_cloning의 스트리밍 버전
+
+        전체 오디오를 메모리에 올리지 않고 최적 구간을 찾은 뒤 그 구간만 읽는다.
+        노이즈 제거는 선택된 짧은 구간에만 적용한다.
+        start/duration을 주면 그 구간 안에서만 찾으며, selected_range는 start 기준 상대 시간이다.
+        """
+        processor = self.processor
+        max_dur = processor.OPTIMAL_MAX if target_duration is None else min(target_duration, processor.ABSOLUTE_MAX)
+
+        analysis = await self.analyze(source, processor.MIN_DURATION, max_dur, top_k, start, duration)
+        start_sec, end_sec = analysis.best_range
+
+        offset = start or 0.0
+        extracted = await self.read_range(source, offset + start_sec, offset + end_sec)
+
+        noise_reduced = False
+        if denoise:
+            try:
+                extracted = await processor._denoise(extracted, self.SAMPLE_RATE, denoise_strength)
+                noise_reduced = True
+            except Exception:
+                pass  # 실패해도 계속 진행
+
+        if normalize:
+            extracted = processor._normalize_audio(extracted)
+
+        return ProcessedAudio(
+            audio_bytes=processor._write_wav(extracted, self.SAMPLE_RATE),
+            sample_rate=self.SAMPLE_RATE,
+            duration=len(extracted) / self.SAMPLE_RATE,
+            original_duration=analysis.duration,
+            segments_analyzed=analysis.frames_analyzed,
+            selected_range=(start_sec, end_sec),
+            quality_score=analysis.quality_score,
+            noise_reduced=noise_reduced
+        )
+
+
+# 싱글톤 인스턴스
+streaming_audio_analyzer = StreamingAudioAnalyzer()
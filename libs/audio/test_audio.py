@@ -53,6 +53,294 @@ def test_audio_processor():
     asyncio.run(run())
 
 
+def _synthetic_speech(seconds: float, sr: int = 24000, seed: int = 0):
+    """음성 유사 구간(배음 + AM) / 무음 / 노이즈가 섞인 합성 신호"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr)) / sr
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    voiced = sum(np.sin(2 * np.pi * k * f0 * t) / k for k in range(1, 6))
+    voiced *= 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+    gate = (np.sin(2 * np.pi * 0.2 * t) > -0.3).astype(float)
+    noise = rng.normal(0, 0.02, len(t))
+    return (0.15 * voiced * gate + noise).astype(np.float32), sr
+
+
+def _reference_frames(processor, audio, sr):
+    """기존 프레임 루프 방식 (per-frame rFFT) 결과"""
+    import numpy as np
+
+    frame_size = int(sr * processor.FRAME_DURATION)
+    rows = []
+    for i in range(0, len(audio) - frame_size, frame_size):
+        frame = audio[i:i + frame_size]
+        energy = np.sqrt(np.mean(frame ** 2))
+        zcr = processor._calculate_zcr(frame)
+        centroid = processor._calculate_spectral_centroid(frame, sr)
+        band = processor._calculate_voice_band_ratio(frame, sr)
+        flatness = processor._calculate_spectral_flatness(frame)
+        score = processor._calculate_voice_score(energy, zcr, centroid, band, flatness)
+        rows.append((i / sr, energy, zcr, centroid, band, flatness, score))
+    return np.array(rows)
+
+
+def test_vectorized_frames_match_reference():
+    """벡터화 프레임 분석이 기존 프레임 루프와 수치적으로 동일한지"""
+    import numpy as np
+    from libs.audio import AudioProcessor
+
+    processor = AudioProcessor()
+    audio, sr = _synthetic_speech(20.0)
+    # 무음 프레임(0 스펙트럼) 경계 케이스 포함
+    audio[sr:sr * 2] = 0
+
+    frames = processor._analyze_frames(audio, sr)
+    ref = _reference_frames(processor, audio, sr)
+
+    assert len(frames) == len(ref)
+    np.testing.assert_allclose(frames["start_sec"], ref[:, 0], atol=1e-9)
+    for col, name in enumerate(
+        ["energy", "zcr", "spectral_centroid", "voice_band_ratio", "spectral_flatness", "voice_score"], 1
+    ):
+        np.testing.assert_allclose(frames[name], ref[:, col], rtol=1e-4, atol=1e-5, err_msg=name)
+
+    # 임계값 바로 근처가 아니면 음성 판별도 동일
+    clear = np.abs(ref[:, 6] - processor.VOICE_SCORE_THRESHOLD) > 1e-4
+    assert np.array_equal(frames["is_voice"][clear], ref[clear, 6] >= processor.VOICE_SCORE_THRESHOLD)
+    print(f"✓ Vectorized frames OK ({len(frames)} frames)")
+
+
+def test_voice_regions_from_frames():
+    """구조화 배열 기반 음성 구간 탐색"""
+    import numpy as np
+    from libs.audio import AudioProcessor, FRAME_DTYPE
+
+    processor = AudioProcessor()
+    frames = np.zeros(100, dtype=FRAME_DTYPE)
+    frames["start_sec"] = np.arange(100) * processor.FRAME_DURATION
+    frames["end_sec"] = frames["start_sec"] + processor.FRAME_DURATION
+    frames["voice_score"] = 0.8
+    frames["is_voice"][10:40] = True   # 0.9초 구간
+    frames["is_voice"][45:50] = True   # 짧은 간격(0.15초) 뒤 이어짐
+    frames["is_voice"][80:95] = True   # 긴 간격 뒤 새 구간, 끝까지 간격 이내
+
+    regions = processor._find_voice_regions(frames)
+
+    assert len(regions) == 2
+    assert abs(regions[0][0] - 0.3) < 1e-9 and abs(regions[0][1] - 1.47) < 1e-9
+    assert abs(regions[1][0] - 2.4) < 1e-9 and abs(regions[1][1] - 3.0) < 1e-9
+    print("✓ Voice regions OK")
+
+
+def test_streaming_tracker_matches_batch():
+    """블록 단위 스트리밍 분석이 전체 분석과 같은 구간을 선택하는지"""
+    import numpy as np
+    from libs.audio import AudioProcessor, VoiceRegionTracker
+
+    processor = AudioProcessor()
+    audio, sr = _synthetic_speech(90.0, seed=1)
+
+    frames = processor._analyze_frames(audio, sr)
+    regions = processor._find_voice_regions(frames)
+    batch_range, batch_quality = processor._select_best_voice_segment(
+        regions, len(audio) / sr, min_duration=3.0, max_duration=7.0
+    )
+
+    tracker = VoiceRegionTracker(processor, sr, top_k=3)
+    block = 12345  # 프레임 경계와 맞지 않는 블록 크기
+    for i in range(0, len(audio), block):
+        tracker.feed(audio[i:i + block])
+    result = tracker.finish()
+
+    assert result.regions_found == len(regions)
+    assert len(result.candidates) == 3
+    np.testing.assert_allclose(result.best_range, batch_range, atol=1e-6)
+    assert abs(result.quality_score - batch_quality) < 1e-6
+    print(f"✓ Streaming tracker OK (best: {result.best_range})")
+
+
+# 가짜 ffmpeg: WAV 입력(파일 또는 pipe:0)을 -ss/-t(선택)로 잘라 s16le를 stdout으로 출력
+FAKE_FFMPEG = """#!{python}
+import io, sys, wave
+args = sys.argv[1:]
+start = float(args[args.index("-ss") + 1]) if "-ss" in args else 0.0
+source = args[args.index("-i") + 1]
+if source == "pipe:0":
+    source = io.BytesIO(sys.stdin.buffer.read())
+with wave.open(source, "rb") as src:
+    rate = src.getframerate()
+    src.setpos(min(int(start * rate), src.getnframes()))
+    count = int(float(args[args.index("-t") + 1]) * rate) if "-t" in args else src.getnframes()
+    sys.stdout.buffer.write(src.readframes(count))
+"""
+
+
+def test_streaming_analyzer_ffmpeg_pipe():
+    """ffmpeg 파이프 블록 분석/구간 읽기가 전체 분석과 같은 결과인지 (가짜 ffmpeg 사용)"""
+    import stat
+    import tempfile
+    import numpy as np
+    from libs.audio import AudioProcessor, StreamingAudioAnalyzer, dsp
+
+    audio, sr = _synthetic_speech(90.0, seed=1)
+    wav_bytes = dsp.encode_wav(audio, sr)
+    # 스트리밍 분석기와 같은 int16 → float 변환
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    reference = pcm.astype(np.float32) / np.iinfo(np.int16).max
+
+    def batch_best(samples):
+        processor = AudioProcessor()
+        regions = processor._find_voice_regions(processor._analyze_frames(samples, sr))
+        return processor._select_best_voice_segment(regions, len(samples) / sr, 3.0, 7.0)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ffmpeg = os.path.join(tmpdir, "ffmpeg")
+        with open(ffmpeg, "w") as f:
+            f.write(FAKE_FFMPEG.format(python=sys.executable))
+        os.chmod(ffmpeg, os.stat(ffmpeg).st_mode | stat.S_IEXEC)
+        media = os.path.join(tmpdir, "media.wav")
+        with open(media, "wb") as f:
+            f.write(wav_bytes)
+
+        analyzer = StreamingAudioAnalyzer(ffmpeg_path=ffmpeg)
+
+        async def run():
+            # 전체 스트림 분석
+            result = await analyzer.analyze(media, 3.0, 7.0, top_k=3)
+            best_range, quality = batch_best(reference)
+            assert abs(result.duration - 90.0) < 1e-6
+            np.testing.assert_allclose(result.best_range, best_range, atol=1e-6)
+            assert abs(result.quality_score - quality) < 1e-6
+
+            # 구간 분석 - 결과 시간은 구간 시작 기준
+            window = await analyzer.analyze(media, 3.0, 7.0, start=30.0, duration=40.0)
+            window_range, _ = batch_best(reference[30 * sr:70 * sr])
+            assert abs(window.duration - 40.0) < 1e-6
+            np.testing.assert_allclose(window.best_range, window_range, atol=1e-6)
+
+            # 선택 구간만 다시 읽기
+            part = await analyzer.read_range(media, 12.5, 14.0)
+            np.testing.assert_array_equal(part, reference[int(12.5 * sr):int(12.5 * sr) + int(1.5 * sr)])
+
+            processed = await analyzer.preprocess_for_cloning(
+                media, denoise=False, normalize=False, start=30.0, duration=40.0
+            )
+            assert processed.selected_range == window.best_range
+            start, end = window.best_range
+            extracted, _ = dsp.decode_wav(processed.audio_bytes)
+            assert abs(len(extracted) - (end - start) * sr) <= 2
+
+            # 메모리의 bytes도 stdin 파이프로 같은 결과
+            piped = await analyzer.analyze(wav_bytes, 3.0, 7.0, top_k=3)
+            np.testing.assert_allclose(piped.best_range, best_range, atol=1e-6)
+            piped_part = await analyzer.read_range(wav_bytes, 12.5, 14.0)
+            np.testing.assert_array_equal(piped_part, part)
+
+            # 큰 입력은 AudioProcessor도 스트리밍 분석으로 처리 (임시 파일 없이)
+            processor = AudioProcessor(ffmpeg_path=ffmpeg)
+            processor.STREAMING_MIN_BYTES = len(wav_bytes) - 1
+            processed = await processor.preprocess_for_cloning(wav_bytes, target_duration=7.0, denoise=False)
+            np.testing.assert_allclose(processed.selected_range, best_range, atol=1e-6)
+            assert abs(processed.original_duration - 90.0) < 1e-6
+
+        asyncio.run(run())
+    print("✓ Streaming analyzer (ffmpeg pipe) OK")
+
+
+def test_dsp_in_memory():
+    """인메모리 노이즈 제거/리샘플링/속도 변경 (ffmpeg 불필요)"""
+    import numpy as np
+    from libs.audio import audio_processor, dsp
+
+    sr = 24000
+    t = np.arange(sr * 4) / sr
+    clean = (0.5 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 0.5 * t) > 0)).astype(np.float32)
+    noise = 0.02 * np.random.default_rng(0).standard_normal(len(t)).astype(np.float32)
+    silent = clean == 0
+
+    denoised = dsp.spectral_gate(clean + noise, sr, strength=0.5)
+    assert len(denoised) == len(clean)
+    assert np.sqrt(np.mean(denoised[silent] ** 2)) < 0.5 * np.sqrt(np.mean(noise[silent] ** 2))
+
+    # 44.1kHz 스테레오 WAV → 24kHz 모노
+    tone = np.sin(2 * np.pi * 440 * np.arange(44100) / 44100).astype(np.float32) * 0.5
+    stereo = dsp.encode_wav(np.stack([tone, tone], axis=1), 44100)
+    converted = asyncio.run(audio_processor.convert_to_wav_24k(stereo))
+    audio, rate = dsp.decode_wav(converted)
+    assert rate == 24000 and audio.ndim == 1 and len(audio) == 24000
+    expected = np.sin(2 * np.pi * 440 * np.arange(24000) / 24000) * 0.5
+    assert np.abs(audio[100:-100] - expected[100:-100]).max() < 1e-3
+
+    faster = dsp.change_playback_rate(clean, sr, 1.25)
+    assert len(faster) == int(round(len(clean) / 1.25))
+    print("✓ DSP in-memory OK")
+
+
+def test_diarizer_pool_cache_and_cancel():
+    """화자 분리 서비스: 지연 로드, 내용 해시 캐시, 취소 (가짜 파이프라인)"""
+    import tempfile
+    import threading
+    import time
+    from types import SimpleNamespace
+    from libs.audio import SpeakerDiarizer
+
+    class FakeTrack:
+        def __init__(self, start, end):
+            self.start, self.end = start, end
+
+    class FakePipeline:
+        calls = 0
+
+        def __call__(self, path, hook=None, **params):
+            FakePipeline.calls += 1
+            for _ in range(50):
+                hook("segmentation", None)
+                time.sleep(0.002)
+            tracks = [(FakeTrack(0.0, 4.0), None, "A"), (FakeTrack(4.0, 5.0), None, "B")]
+            return SimpleNamespace(
+                speaker_diarization=SimpleNamespace(itertracks=lambda yield_label: iter(tracks))
+            )
+
+    created = []
+
+    class FakeDiarizer(SpeakerDiarizer):
+        def _create_pipeline(self):
+            created.append(threading.get_ident())
+            return FakePipeline()
+
+    diarizer = FakeDiarizer(max_workers=2)
+    assert not created  # 생성 시점에는 모델 로드 없음
+
+    with tempfile.NamedTemporaryFile(suffix=".wav") as a, tempfile.NamedTemporaryFile(suffix=".wav") as b:
+        a.write(b"audio-a"); a.flush()
+        b.write(b"audio-a"); b.flush()  # 같은 내용, 다른 경로
+
+        async def run():
+            first, second = await asyncio.gather(diarizer.diarize(a.name), diarizer.diarize(b.name))
+            assert first is second and FakePipeline.calls == 1
+            assert diarizer.get_main_speaker(first) == "A"
+
+            await diarizer.diarize(a.name, max_speakers=2)
+            assert FakePipeline.calls == 2
+
+            diarizer.clear_cache()
+            task = asyncio.create_task(diarizer.diarize(a.name))
+            await asyncio.sleep(0.02)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            assert not diarizer._cache
+
+        asyncio.run(run())
+
+    assert len(created) <= 2
+    diarizer.shutdown()
+    print("✓ Diarizer pool/cache OK")
+
+
 def test_speaker_diarizer_init():
     """SpeakerDiarizer 초기화 테스트"""
     from libs.audio import SpeakerDiarizer
@@ -69,6 +357,12 @@ if __name__ == "__main__":
     
     test_import()
     test_audio_processor()
+    test_vectorized_frames_match_reference()
+    test_voice_regions_from_frames()
+    test_streaming_tracker_matches_batch()
+    test_streaming_analyzer_ffmpeg_pipe()
+    test_dsp_in_memory()
+    test_diarizer_pool_cache_and_cancel()
     test_speaker_diarizer_init()
     
     print()
@@ -0,0 +1,23 @@
+"""
+Transcript Library
+
+영상 자막을 한 번만 받아 SQLite에 저장하고 시간 구간 질의에 응답
+"""
+
+from .store import (
+    transcript_store,
+    TranscriptStore,
+    Transcript,
+    Cue,
+    parse_vtt,
+    extract_video_id,
+)
+
+__all__ = [
+    "transcript_store",
+    "TranscriptStore",
+    "Transcript",
+    "Cue",
+    "parse_vtt",
+    "extract_video_id",
+]
@@ -0,0 +1,389 @@
+"""
+자막(Transcript) 저장소
+
+영상별 VTT 자막을 yt-dlp로 한 번만 받아 큐 배열로 파싱하고 SQLite에 저장한다.
+이후 전체 텍스트/시간 구간 질의는 메모리(LRU) 또는 SQLite에서 바로 응답하며,
+구간 질의는 큐 시작 시각에 대한 이진 탐색으로 처리한다.
+"""
+
+import asyncio
+import bisect
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_LANGS = ["ko", "en", "en-US", "ko-KR"]
+
+_TIMESTAMP = r"(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})"
+_CUE_TIMING = re.compile(_TIMESTAMP + r"\s*-->\s*" + _TIMESTAMP)
+_TAG = re.compile(r"<[^>]+>")
+_VIDEO_ID_PATTERNS = [
+    re.compile(r"youtube\.com/watch\?(?:.*&)?v=([^&]+)"),
+    re.compile(r"youtu\.be/([^?/]+)"),
+    re.compile(r"youtube\.com/shorts/([^?/]+)"),
+]
+
+
+@dataclass
+class Cue:
+    """자막 큐 (초 단위)"""
+    start: float
+    end: float
+    text: str
+
+
+def _seconds(h: Optional[str], m: str, s: str, ms: str) -> float:
+    return int(h or 0) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def parse_vtt(content: str) -> List[Cue]:
+    """WebVTT → 시작 시각 순 큐 목록 (태그 제거, 빈 큐 제외)"""
+    cues: List[Cue] = []
+    timing: Optional[Tuple[float, float]] = None
+    lines: List[str] = []
+
+    def flush():
+        if timing and lines:
+            cues.append(Cue(start=timing[0], end=timing[1], text="\n".join(lines)))
+
+    for raw in content.splitlines():
+        match = _CUE_TIMING.search(raw)
+        if match:
+            flush()
+            g = match.groups()
+            timing = (_seconds(*g[:4]), _seconds(*g[4:]))
+            lines = []
+            continue
+        if not raw.strip():
+            flush()
+            timing, lines = None, []
+            continue
+        if timing is None:
+            continue  # 헤더(WEBVTT, Kind:, Language:), 큐 번호, NOTE/STYLE 블록
+        text = _TAG.sub("", raw).strip()
+        if text:
+            lines.append(text)
+    flush()
+
+    cues.sort(key=lambda c: c.start)
+    return cues
+
+
+def extract_video_id(video: str) -> Optional[str]:
+    """URL 또는 영상 ID → 영상 ID"""
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(video)
+        if match:
+            return match.group(1)
+    if re.fullmatch(r"[A-Za-z0-9_-]{6,20}", video):
+        return video
+    return None
+
+
+class Transcript:
+    """한 영상의 큐 배열 - 구간 질의는 이진 탐색"""
+
+    def __init__(self, video_id: str, lang: str, cues: List[Cue]):
+        self.video_id = video_id
+        self.lang = lang
+        self.cues = cues
+        self._starts = [c.start for c in cues]
+        # 끝 시각의 누적 최댓값 - 겹치는 자동 자막에서도 단조 증가하므로 이진 탐색 가능
+        self._max_ends = list(accumulate((c.end for c in cues), max))
+
+    def window(self, start: float, end: float) -> List[Cue]:
+        """[start, end)와 겹치는 큐"""
+        lo = bisect.bisect_right(self._max_ends, start)
+        hi = bisect.bisect_left(self._starts, end)
+        return [c for c in self.cues[lo:hi] if c.end > start]
+
+    @staticmethod
+    def _join(cues: List[Cue], max_chars: int = None) -> str:
+        # 자동 자막은 이전 줄을 반복하므로 줄 단위 중복 제거
+        seen = set()
+        unique_lines = []
+        for cue in cues:
+            for line in cue.text.split("\n"):
+                if line not in seen:
+                    seen.add(line)
+                    unique_lines.append(line)
+        text = " ".join(unique_lines)
+        return text[:max_chars] if max_chars else text
+
+    def text(self, max_chars: int = None) -> str:
+        return self._join(self.cues, max_chars)
+
+    def window_text(self, start: float, end: float) -> str:
+        return self._join(self.window(start, end))
+
+
+def _langs_key(langs: List[str]) -> str:
+    return ",".join(langs)
+
+
+class TranscriptStore:
+    """(영상 ID, 언어 우선순위)별 자막 저장소 (메모리 LRU → SQLite → yt-dlp 순)
+
+    언어 우선순위가 다르면 고르는 자막도 달라지므로 따로 저장한다.
+    자막이 없는 영상도 기록해 두고 MISSING_TTL 동안 다시 받지 않는다
+    (yt-dlp가 실패 코드로 끝난 경우는 일시적 실패일 수 있어 기록하지 않음).
+    """
+
+    MEMORY_SIZE = 128
+    MISSING_TTL = 6 * 3600
+    FETCH_TIMEOUT = 60
+
+    def __init__(self, db_path: Path, ytdlp_path: str = "yt-dlp", langs: List[str] = None):
+        self.db_path = Path(db_path)
+        self.ytdlp_path = ytdlp_path
+        self.langs = langs or DEFAULT_LANGS
+        self._memory: "OrderedDict[Tuple[str, str], Transcript]" = OrderedDict()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._fetch_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._async_fetches: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    # === SQLite ===
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """커밋 후 닫히는 연결 (스레드/이벤트 루프 어디서든 사용 가능)"""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    with closing(sqlite3.connect(self.db_path)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        columns = [row[1] for row in conn.execute("PRAGMA table_info(transcripts)")]
+                        if columns and "langs" not in columns:
+                            # 영상 ID만으로 저장하던 이전 캐시 - 기본키가 바뀌므로 비우고 다시 받음
+                            conn.execute("DROP TABLE transcripts")
+                        conn.execute(
+                            """CREATE TABLE IF NOT EXISTS transcripts (
+                                video_id TEXT NOT NULL,
+                                langs TEXT NOT NULL,
+                                lang TEXT,
+                                cues TEXT,
+                                fetched_at REAL NOT NULL,
+                                PRIMARY KEY (video_id, langs)
+                            )"""
+                        )
+                        conn.commit()
+                    self._initialized = True
+        with closing(sqlite3.connect(self.db_path, timeout=10)) as conn:
+            with conn:
+                yield conn
+
+    def _load(self, video_id: str, langs: List[str]) -> Tuple[bool, Optional[Transcript]]:
+        """(저장 여부, Transcript) - 자막 없음 기록이 유효하면 (True, None)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT lang, cues, fetched_at FROM transcripts WHERE video_id = ? AND langs = ?",
+                (video_id, _langs_key(langs)),
+            ).fetchone()
+        if row is None:
+            return False, None
+        lang, cues_json, fetched_at = row
+        if cues_json is None:
+            return time.time() - fetched_at < self.MISSING_TTL, None
+        cues = [Cue(start, end, text) for start, end, text in json.loads(cues_json)]
+        return True, Transcript(video_id, lang, cues)
+
+    def _save(self, video_id: str, langs: List[str], transcript: Optional[Transcript]):
+        cues_json = None
+        lang = None
+        if transcript is not None:
+            lang = transcript.lang
+            cues_json = json.dumps(
+                [[c.start, c.end, c.text] for c in transcript.cues], ensure_ascii=False
+            )
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts (video_id, langs, lang, cues, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (video_id, _langs_key(langs), lang, cues_json, time.time()),
+            )
+
+    def _remember(self, langs: List[str], transcript: Transcript):
+        key = (transcript.video_id, _langs_key(langs))
+        self._memory[key] = transcript
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.MEMORY_SIZE:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, video_id: str, langs: List[str]) -> Tuple[bool, Optional[Transcript]]:
+        key = (video_id, _langs_key(langs))
+        transcript = self._memory.get(key)
+        if transcript is not None:
+            self._memory.move_to_end(key)
+            return True, transcript
+        found, transcript = self._load(video_id, langs)
+        if transcript is not None:
+            self._remember(langs, transcript)
+        return found, transcript
+
+    # === yt-dlp ===
+
+    def _command(self, video_id: str, langs: List[str], output: str) -> List[str]:
+        return [
+            self.ytdlp_path,
+            "--write-sub",
+            "--write-auto-sub",
+            "--sub-lang", ",".join(langs),
+            "--skip-download",
+            "--sub-format", "vtt",
+            "--no-playlist",
+            "-o", output,
+            f"https://www.youtube.com/watch?v={video_id}",
+        ]
+
+    def _pick(self, video_id: str, tmpdir: str, langs: List[str]) -> Optional[Transcript]:
+        """받은 VTT 중 언어 우선순위가 가장 높은 것"""
+        for lang in langs:
+            for suffix in ["", "-orig"]:
+                path = Path(tmpdir) / f"sub.{lang}{suffix}.vtt"
+                if path.exists():
+                    cues = parse_vtt(path.read_text(encoding="utf-8"))
+                    if cues:
+                        return Transcript(video_id, lang, cues)
+        for path in sorted(Path(tmpdir).glob("sub.*.vtt")):
+            cues = parse_vtt(path.read_text(encoding="utf-8"))
+            if cues:
+                return Transcript(video_id, path.suffixes[0].lstrip("."), cues)
+        return None
+
+    def _store_fetched(
+        self, video_id: str, langs: List[str], tmpdir: str, returncode: int, stderr: bytes
+    ) -> Optional[Transcript]:
+        transcript = self._pick(video_id, tmpdir, langs)
+        if transcript is None and returncode != 0:
+            # 네트워크/차단 등 일시적 실패일 수 있으므로 "자막 없음"으로 기록하지 않음
+            message = stderr.decode("utf-8", errors="replace").strip()[-300:]
+            print(f"[Transcript] yt-dlp exited {returncode} for {video_id}: {message}")
+            return None
+        self._save(video_id, langs, transcript)
+        if transcript is not None:
+            self._remember(langs, transcript)
+        return transcript
+
+    def _fetch_sync(self, video_id: str, langs: List[str]) -> Optional[Transcript]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                completed = subprocess.run(
+                    self._command(video_id, langs, os.path.join(tmpdir, "sub")),
+                    capture_output=True, timeout=self.FETCH_TIMEOUT,
+                )
+            except (subprocess.TimeoutExpired, OSError) as e:
+                print(f"[Transcript] yt-dlp failed for {video_id}: {e}")
+                return None  # 일시적 실패는 기록하지 않음
+            return self._store_fetched(
+                video_id, langs, tmpdir, completed.returncode, completed.stderr or b""
+            )
+
+    async def _fetch_async(self, video_id: str, langs: List[str]) -> Optional[Transcript]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self._command(video_id, langs, os.path.join(tmpdir, "sub")),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except OSError as e:
+                print(f"[Transcript] yt-dlp failed for {video_id}: {e}")
+                return None
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=self.FETCH_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"[Transcript] yt-dlp timed out for {video_id}")
+                process.kill()
+                await process.wait()
+                return None
+            return self._store_fetched(video_id, langs, tmpdir, process.returncode, stderr or b"")
+
+    # === Public API ===
+
+    def get_sync(self, video: str, langs: List[str] = None) -> Optional[Transcript]:
+        """동기 버전 (subprocess 기반 리서처용)"""
+        video_id = extract_video_id(video)
+        if not video_id:
+            return None
+        langs = langs or self.langs
+        found, transcript = self._lookup(video_id, langs)
+        if found:
+            return transcript
+
+        lock = self._fetch_locks.setdefault((video_id, _langs_key(langs)), threading.Lock())
+        with lock:
+            found, transcript = self._lookup(video_id, langs)
+            if found:
+                return transcript
+            return self._fetch_sync(video_id, langs)
+
+    async def get(self, video: str, langs: List[str] = None) -> Optional[Transcript]:
+        """영상 자막 (저장된 것이 없을 때만 yt-dlp 실행, 같은 영상 동시 요청은 한 번만 실행)"""
+        video_id = extract_video_id(video)
+        if not video_id:
+            return None
+        langs = langs or self.langs
+        found, transcript = self._lookup(video_id, langs)
+        if found:
+            return transcript
+
+        key = (video_id, _langs_key(langs))
+        pending = self._async_fetches.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.ensure_future(self._fetch_async(video_id, langs))
+        self._async_fetches[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._async_fetches.pop(key, None)
+            else:
+                future.add_done_callback(lambda _: self._async_fetches.pop(key, None))
+
+    def cached(self, video: str, langs: List[str] = None) -> Tuple[bool, Optional[Transcript]]:
+        """다운로드 없이 저장된 자막만 조회 - (저장 여부, Transcript)"""
+        video_id = extract_video_id(video)
+        if not video_id:
+            return True, None
+        return self._lookup(video_id, langs or self.langs)
+
+    async def get_text(self, video: str, langs: List[str] = None, max_chars: int = None) -> Optional[str]:
+        transcript = await self.get(video, langs)
+        return transcript.text(max_chars) if transcript else None
+
+    async def get_window_text(
+        self, video: str, start: float, end: float, langs: List[str] = None
+    ) -> Optional[str]:
+        transcript = await self.get(video, langs)
+        if transcript is None:
+            return None
+        return transcript.window_text(start, end) or None
+
+    def forget(self, video: str):
+        """저장된 자막 삭제 - 모든 언어 우선순위 (다음 요청 시 다시 받음)"""
+        video_id = extract_video_id(video) or video
+        for key in [key for key in self._memory if key[0] == video_id]:
+            self._memory.pop(key, None)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM transcripts WHERE video_id = ?", (video_id,))
+
+
+# 싱글톤 인스턴스
+transcript_store = TranscriptStore(
+    Path(os.environ.get("TRANSCRIPT_DB_PATH", "/app/data/transcripts.db"))
+)
@@ -0,0 +1,161 @@
+"""Transcript Store Tests - 로컬 가짜 yt-dlp 사용"""
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from libs.transcript import TranscriptStore, parse_vtt
+
+
+# 자동 자막처럼 이전 줄이 반복되는 VTT
+SAMPLE_VTT = textwrap.dedent("""\
+    WEBVTT
+    Kind: captions
+    Language: ko
+
+    00:00:01.000 --> 00:00:04.000
+    안녕하세요<00:00:02.000><c> 여러분</c>
+
+    00:00:04.000 --> 00:00:07.500
+    안녕하세요 여러분
+    오늘은 요리를 합니다
+
+    1:02:03.000 --> 1:02:05.000
+    마지막 인사
+""")
+
+FAKE_YTDLP = textwrap.dedent("""\
+    #!{python}
+    import os, sys
+    args = sys.argv[1:]
+    with open(os.environ["FAKE_LOG"], "a") as log:
+        log.write(" ".join(args) + "\\n")
+    video_id = args[-1].split("v=")[-1]
+    lang = args[args.index("--sub-lang") + 1].split(",")[0]
+    if video_id == "hangs123456":
+        import time
+        time.sleep(30)
+    marker = os.environ["FAKE_LOG"] + "." + video_id
+    if video_id == "flaky123456" and not os.path.exists(marker):
+        # 첫 호출은 일시적 실패 (자막 파일 없이 실패 코드)
+        open(marker, "w").close()
+        sys.stderr.write("ERROR: HTTP Error 429: Too Many Requests\\n")
+        sys.exit(1)
+    if video_id != "noSubs12345":
+        with open(args[args.index("-o") + 1] + "." + lang + ".vtt", "w", encoding="utf-8") as f:
+            f.write(os.environ["FAKE_VTT"])
+""")
+
+
+def _make_store(tmpdir: str) -> TranscriptStore:
+    ytdlp = os.path.join(tmpdir, "yt-dlp")
+    with open(ytdlp, "w") as f:
+        f.write(FAKE_YTDLP.format(python=sys.executable))
+    os.chmod(ytdlp, os.stat(ytdlp).st_mode | stat.S_IEXEC)
+    os.environ["FAKE_LOG"] = os.path.join(tmpdir, "calls.log")
+    os.environ["FAKE_VTT"] = SAMPLE_VTT
+    return TranscriptStore(os.path.join(tmpdir, "transcripts.db"), ytdlp_path=ytdlp)
+
+
+def _call_count() -> int:
+    path = os.environ["FAKE_LOG"]
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return len(f.readlines())
+
+
+def test_parse_vtt():
+    """타임스탬프(시 생략 포함), 태그 제거, 헤더 무시"""
+    cues = parse_vtt(SAMPLE_VTT)
+    assert [(c.start, c.end) for c in cues] == [(1.0, 4.0), (4.0, 7.5), (3723.0, 3725.0)]
+    assert cues[0].text == "안녕하세요 여러분"
+    print("✓ parse_vtt OK")
+
+
+def test_single_download_and_windows():
+    """영상당 yt-dlp 한 번 - 이후 전체/구간 질의와 새 인스턴스(SQLite)에서 재사용"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = _make_store(tmpdir)
+        url = "https://www.youtube.com/watch?v=abcDEF12345"
+
+        async def run():
+            texts = await asyncio.gather(*[store.get_text(url) for _ in range(3)])
+            assert texts[0] == "안녕하세요 여러분 오늘은 요리를 합니다 마지막 인사"
+            assert await store.get_window_text(url, 5, 10) == "안녕하세요 여러분 오늘은 요리를 합니다"
+            assert await store.get_window_text(url, 3700, 3724) == "마지막 인사"
+            assert await store.get_window_text(url, 10, 20) is None
+
+            # 자막 없는 영상도 기록해 재시도하지 않음
+            assert await store.get_text("noSubs12345") is None
+            assert await store.get_text("noSubs12345") is None
+
+        asyncio.run(run())
+        assert _call_count() == 2
+
+        # 재시작 후(새 인스턴스)에도 SQLite에서 응답
+        restarted = _make_store(tmpdir)
+        transcript = restarted.get_sync("https://youtu.be/abcDEF12345")
+        assert transcript.lang == "ko" and len(transcript.cues) == 3
+        assert _call_count() == 2
+        print("✓ Transcript store OK")
+
+
+def test_failed_fetch_is_retried():
+    """yt-dlp 실패 코드/시간 초과는 "자막 없음"으로 기록하지 않고 다음 요청에서 다시 받음"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = _make_store(tmpdir)
+
+        async def run():
+            assert await store.get_text("flaky123456") is None
+            assert store.cached("flaky123456") == (False, None)
+            assert await store.get_text("flaky123456") == "안녕하세요 여러분 오늘은 요리를 합니다 마지막 인사"
+            assert _call_count() == 2
+
+            store.FETCH_TIMEOUT = 0.5
+            assert await store.get_text("hangs123456") is None
+            assert store.cached("hangs123456") == (False, None)
+
+        asyncio.run(run())
+        assert _call_count() == 3
+
+        # 동기 버전도 실패 후 다시 받음
+        restarted = _make_store(tmpdir)
+        os.remove(os.environ["FAKE_LOG"] + ".flaky123456")
+        restarted.forget("flaky123456")
+        assert restarted.get_sync("flaky123456") is None
+        assert restarted.get_sync("flaky123456").lang == "ko"
+        print("✓ Failed fetch retry OK")
+
+
+def test_language_preference_is_part_of_key():
+    """다른 언어 우선순위 요청은 기존 자막을 재사용하지 않고 해당 언어로 받음"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = _make_store(tmpdir)
+
+        async def run():
+            korean = await store.get("abcDEF12345")
+            english = await store.get("abcDEF12345", ["en"])
+            assert (korean.lang, english.lang) == ("ko", "en")
+            assert (await store.get("abcDEF12345", ["en"])) is english
+            assert store.cached("abcDEF12345", ["ja"]) == (False, None)
+
+        asyncio.run(run())
+        assert _call_count() == 2
+
+        store.forget("abcDEF12345")
+        assert store.cached("abcDEF12345") == (False, None)
+        assert store.cached("abcDEF12345", ["en"]) == (False, None)
+        print("✓ Language keyed cache OK")
+
+
+if __name__ == "__main__":
+    test_parse_vtt()
+    test_single_download_and_windows()
+    test_failed_fetch_is_retried()
+    test_language_preference_is_part_of_key()
+    print("All tests passed!")
@@ -0,0 +1,19 @@
+"""
+yt-dlp Library
+
+yt_dlp Python API를 워커 프로세스 풀에서 호출하는 메타데이터 추출기와 결과 TTL 캐시
+"""
+
+from .extractor import (
+    ytdlp_extractor,
+    YtDlpExtractor,
+    InfoCache,
+    trim_info,
+)
+
+__all__ = [
+    "ytdlp_extractor",
+    "YtDlpExtractor",
+    "InfoCache",
+    "trim_info",
+]
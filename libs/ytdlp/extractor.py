@@ -0,0 +1,183 @@
+"""
+yt-dlp 메타데이터 추출기 (라이브러리 호출)
+
+yt-dlp CLI를 매번 띄우는 대신 워커 프로세스 풀에서 yt_dlp Python API를 호출한다.
+워커마다 YoutubeDL 인스턴스를 옵션별로 한 번만 만들어 재사용하고,
+결과는 필요한 필드만 남겨 부모 프로세스로 돌려준다 (피클링 비용 절감).
+추출 결과는 InfoCache로 ID별 TTL 캐시한다.
+"""
+
+import asyncio
+import importlib.util
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+# 벤치마커가 쓰는 필드만 유지 (영상/채널 메타데이터)
+INFO_FIELDS = frozenset({
+    "id", "title", "description", "view_count", "like_count", "comment_count",
+    "duration", "upload_date", "thumbnail", "tags",
+    "channel", "channel_id", "uploader", "uploader_id",
+    "channel_follower_count", "channel_description", "channel_banner_url",
+})
+THUMBNAIL_FIELDS = ("id", "url", "width", "height")
+
+_BASE_OPTIONS = {
+    "quiet": True,
+    "no_warnings": True,
+    "noprogress": True,
+    "skip_download": True,
+    "ignoreerrors": False,
+    # 포맷 목록은 쓰지 않으므로 DASH/HLS 매니페스트 요청 생략
+    "extractor_args": {"youtube": {"skip": ["dash", "hls", "translated_subs"]}},
+}
+FLAT_OPTIONS = {**_BASE_OPTIONS, "extract_flat": "in_playlist"}
+FULL_OPTIONS = dict(_BASE_OPTIONS)
+
+
+def trim_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """추출 결과에서 필요한 필드만 남김 (재생목록이면 entries도 같은 방식으로)"""
+    trimmed = {key: info[key] for key in INFO_FIELDS if info.get(key) is not None}
+    if info.get("thumbnails"):
+        trimmed["thumbnails"] = [
+            {key: thumb[key] for key in THUMBNAIL_FIELDS if thumb.get(key) is not None}
+            for thumb in info["thumbnails"]
+        ]
+    if info.get("entries") is not None:
+        trimmed["entries"] = [trim_info(entry) for entry in info["entries"] if entry]
+    return trimmed
+
+
+# === 워커 프로세스 ===
+
+_worker_instances: Dict[bool, Any] = {}
+
+
+def _worker_extract(url: str, flat: bool, playlist_items: Optional[str]) -> Dict[str, Any]:
+    """워커에서 실행 - flat 여부별 YoutubeDL 인스턴스를 재사용"""
+    ydl = _worker_instances.get(flat)
+    if ydl is None:
+        import yt_dlp
+
+        ydl = yt_dlp.YoutubeDL(dict(FLAT_OPTIONS if flat else FULL_OPTIONS))
+        _worker_instances[flat] = ydl
+
+    # 워커는 한 번에 한 작업만 처리하므로 호출별 옵션을 인스턴스에 직접 설정
+    ydl.params["playlist_items"] = playlist_items
+    ydl.params["noplaylist"] = playlist_items is None
+    try:
+        info = ydl.extract_info(url, download=False)
+    except Exception as e:
+        # yt-dlp 예외는 피클링이 안 될 수 있으므로 메시지만 전달
+        raise RuntimeError(f"yt-dlp extraction failed: {e}") from None
+    if info is None:
+        raise RuntimeError(f"yt-dlp returned nothing: {url}")
+    return trim_info(info)
+
+
+# === 부모 프로세스 ===
+
+class YtDlpExtractor:
+    """yt_dlp 라이브러리 추출기 (spawn 워커 풀)"""
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max(1, max_workers or int(os.environ.get("YTDLP_MAX_WORKERS", "4")))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def available(self) -> bool:
+        return importlib.util.find_spec("yt_dlp") is not None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # 이벤트 루프/스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def extract(self, url: str, flat: bool = False, playlist_items: Optional[str] = None) -> Dict[str, Any]:
+        """URL 메타데이터 추출
+
+        flat=True면 재생목록 항목을 펼치지 않고 목록만 (채널 영상 목록),
+        playlist_items가 None이면 단일 영상으로 취급한다.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor(), _worker_extract, url, flat, playlist_items)
+        except BrokenProcessPool:
+            # 워커가 죽으면 풀을 새로 만들고 이번 요청만 실패 처리
+            self.close()
+            raise
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class InfoCache:
+    """추출 결과 TTL 캐시 - 같은 키의 동시 요청은 한 번만 실행"""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        if len(self._entries) >= self.max_entries:
+            now = time.monotonic()
+            self._entries = {k: e for k, e in self._entries.items() if e[0] >= now}
+            while len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시 값 또는 fetch 결과 (None은 캐시하지 않음)"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+            if value is not None:
+                self.put(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # 대기자가 없으면 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+# 싱글톤 인스턴스
+ytdlp_extractor = YtDlpExtractor()
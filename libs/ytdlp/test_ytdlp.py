@@ -0,0 +1,84 @@
+"""yt-dlp Extractor Tests - 필드 축소, 결과 캐시 (라이브러리 추출은 yt_dlp 설치 시에만)"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from libs.ytdlp import InfoCache, YtDlpExtractor, trim_info
+
+
+def test_trim_info():
+    """포맷/자막 등 큰 필드는 버리고 재생목록 항목도 같은 방식으로 축소"""
+    info = {
+        "id": "UC1",
+        "channel": "채널",
+        "channel_follower_count": 1000,
+        "formats": [{"url": "x"}] * 50,
+        "automatic_captions": {"ko": []},
+        "thumbnails": [{"id": "avatar_uncropped", "url": "a.jpg", "preference": 1}],
+        "entries": [{"id": "v1", "title": "영상", "view_count": 5, "formats": [], "description": None}, None],
+    }
+    assert trim_info(info) == {
+        "id": "UC1",
+        "channel": "채널",
+        "channel_follower_count": 1000,
+        "thumbnails": [{"id": "avatar_uncropped", "url": "a.jpg"}],
+        "entries": [{"id": "v1", "title": "영상", "view_count": 5}],
+    }
+    print("✓ trim_info OK")
+
+
+def test_info_cache():
+    """동시 요청은 한 번만 추출, TTL 후 재추출, None은 캐시하지 않음"""
+    calls = []
+
+    async def fetch():
+        calls.append(time.monotonic())
+        await asyncio.sleep(0.05)
+        return {"id": "v1"}
+
+    async def run():
+        cache = InfoCache(ttl=0.2)
+        results = await asyncio.gather(*[cache.get_or_fetch("v1", fetch) for _ in range(5)])
+        assert results == [{"id": "v1"}] * 5 and len(calls) == 1
+        await cache.get_or_fetch("v1", fetch)
+        assert len(calls) == 1
+        await asyncio.sleep(0.25)
+        await cache.get_or_fetch("v1", fetch)
+        assert len(calls) == 2
+
+        async def missing():
+            calls.append(time.monotonic())
+            return None
+
+        await cache.get_or_fetch("gone", missing)
+        await cache.get_or_fetch("gone", missing)
+        assert len(calls) == 4
+
+    asyncio.run(run())
+    print("✓ InfoCache OK")
+
+
+def test_extractor_unavailable_without_module():
+    extractor = YtDlpExtractor(max_workers=1)
+    if extractor.available:
+        print("- yt_dlp 설치됨: 실제 추출은 네트워크가 필요해 생략")
+        return
+    try:
+        asyncio.run(extractor.extract("https://www.youtube.com/watch?v=x"))
+    except Exception as e:
+        assert "yt_dlp" in str(e)
+    else:
+        raise AssertionError("extraction without yt_dlp should fail")
+    finally:
+        extractor.close()
+    print("✓ Missing yt_dlp reported")
+
+
+if __name__ == "__main__":
+    test_trim_info()
+    test_info_cache()
+    test_extractor_unavailable_without_module()
+    print("All tests passed!")
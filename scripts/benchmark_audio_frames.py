@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+오디오 프레임 분석 벤치마크
+
+기존 프레임 루프(프레임마다 rFFT 3회)와 벡터화 엔진(libs/audio/features.py)을
+수 분 길이의 합성 신호로 비교한다.
+
+    python scripts/benchmark_audio_frames.py --minutes 1 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from libs.audio import AudioProcessor
+
+
+def synthetic_signal(minutes: float, sr: int = 24000) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(minutes * 60 * sr)) / sr
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    voiced = sum(np.sin(2 * np.pi * k * f0 * t) / k for k in range(1, 6))
+    gate = (np.sin(2 * np.pi * 0.2 * t) > -0.3).astype(np.float32)
+    return (0.15 * voiced * gate + rng.normal(0, 0.02, len(t))).astype(np.float32)
+
+
+def loop_analysis(processor: AudioProcessor, audio: np.ndarray, sr: int) -> int:
+    """기존 방식: 프레임 단위 Python 루프"""
+    frame_size = int(sr * processor.FRAME_DURATION)
+    count = 0
+    for i in range(0, len(audio) - frame_size, frame_size):
+        frame = audio[i:i + frame_size]
+        energy = np.sqrt(np.mean(frame ** 2))
+        zcr = processor._calculate_zcr(frame)
+        centroid = processor._calculate_spectral_centroid(frame, sr)
+        band = processor._calculate_voice_band_ratio(frame, sr)
+        flatness = processor._calculate_spectral_flatness(frame)
+        processor._calculate_voice_score(energy, zcr, centroid, band, flatness)
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 5])
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    args = parser.parse_args()
+
+    processor = AudioProcessor()
+    sr = args.sample_rate
+
+    print(f"{'길이':>8} {'프레임':>8} {'루프(s)':>10} {'벡터화(s)':>10} {'배속':>8}")
+    for minutes in args.minutes:
+        audio = synthetic_signal(minutes, sr)
+
+        start = time.perf_counter()
+        n_loop = loop_analysis(processor, audio, sr)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        frames = processor._analyze_frames(audio, sr)
+        vec_time = time.perf_counter() - start
+
+        assert n_loop == len(frames)
+        print(f"{minutes:>7.1f}m {len(frames):>8} {loop_time:>10.2f} {vec_time:>10.3f} {loop_time / vec_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
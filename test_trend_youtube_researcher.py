@@ -0,0 +1,65 @@
+"""Trend YouTube Researcher Tests - 같은 채널의 다른 URL 표기는 상세 수집 한 번"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import trend_youtube_researcher as researcher_module
+from agents.benchmarker.cache_service import normalize_channel_url
+from trend_youtube_researcher import TrendYouTubeResearcher
+
+
+def test_normalize_channel_url_variants():
+    """인코딩, 하위 경로, 쿼리, 대소문자가 달라도 같은 키"""
+    handle = [
+        "https://www.youtube.com/@%EC%9A%94%EB%A6%AC%EC%B1%84%EB%84%90",
+        "https://www.youtube.com/@요리채널/videos",
+        "https://www.youtube.com/@요리채널?si=abc",
+        "https://youtube.com/@요리채널/",
+    ]
+    assert {normalize_channel_url(url) for url in handle} == {"@요리채널"}
+
+    assert normalize_channel_url("https://www.youtube.com/@CookLab/videos") == "@cooklab"
+    assert normalize_channel_url("https://www.youtube.com/user/CookLab/featured") == "user/cooklab"
+    # 채널 ID는 대소문자 구분
+    assert normalize_channel_url("https://www.youtube.com/channel/UCabcDEF/videos?view=0") == "UCabcDEF"
+    print("✓ normalize_channel_url OK")
+
+
+def test_duplicate_urls_fetch_details_once():
+    """키워드 검색 결과에 같은 채널이 다른 표기로 나와도 채널 페이지는 한 번만 방문"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        original_dir = researcher_module.SCREENSHOT_DIR
+        researcher_module.SCREENSHOT_DIR = Path(tmpdir)
+        try:
+            researcher = TrendYouTubeResearcher()
+        finally:
+            researcher_module.SCREENSHOT_DIR = original_dir
+
+    visited = []
+
+    async def fake_get_channel_with_videos(url):
+        visited.append(url)
+        return {'url': url, 'videos': []}
+
+    researcher.get_channel_with_videos = fake_get_channel_with_videos
+    candidates = [
+        {'url': "https://www.youtube.com/@CookLab", 'name': "CookLab", 'subscribers': "", 'keyword': "요리"},
+        {'url': "https://www.youtube.com/@cooklab/videos", 'name': "CookLab", 'subscribers': "", 'keyword': "레시피"},
+        {'url': "https://www.youtube.com/@%EC%9A%94%EB%A6%AC%EC%B1%84%EB%84%90", 'name': "요리채널", 'subscribers': "", 'keyword': "요리"},
+        {'url': "https://www.youtube.com/@요리채널?si=abc", 'name': "요리채널", 'subscribers': "", 'keyword': "집밥"},
+    ]
+
+    channels = asyncio.run(researcher._fetch_unique_channels(candidates))
+    assert visited == [candidates[0]['url'], candidates[2]['url']]
+    assert [ch['keyword'] for ch in channels] == ["요리", "요리"]
+    print("✓ Duplicate URLs fetched once OK")
+
+
+if __name__ == "__main__":
+    test_normalize_channel_url_variants()
+    test_duplicate_urls_fetch_details_once()
+    print("All tests passed!")
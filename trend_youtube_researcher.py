@@ -4,35 +4,31 @@
 """
 import asyncio
 import json
-import re
-import requests
-import subprocess
 from datetime import datetime
 from typing import List, Dict, Optional
 from pathlib import Path
 
-try:
-    from playwright.async_api import async_playwright
-except ImportError:
-    pass
+from libs.transcript import transcript_store
+from agents.benchmarker.cache_service import normalize_channel_url
+from apps.api.services.browser_pool import browser_pool
+from apps.api.services.channel_scoring import score_channels
+from apps.api.services.llm import llm_service, parse_llm_json
 
 SCREENSHOT_DIR = Path("/data/routine/routine-studio-v2/screenshots/youtube")
-LLM_URL = "http://localhost:8017/v1/chat/completions"
+
+# 고정 대기 대신 DOM에 결과가 그려졌는지 확인
+SEARCH_RESULT_SELECTOR = 'ytd-channel-renderer'
+VIDEO_ITEM_SELECTOR = 'ytd-rich-item-renderer'
+PAGE_TIMEOUT_MS = 30000
+RESULTS_TIMEOUT_MS = 15000
 
 
 class TrendYouTubeResearcher:
     def __init__(self):
-        self.browser = None
         SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)
 
-    async def _ensure_browser(self):
-        if self.browser is None:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(headless=True)
-        return self.browser
-
-    def generate_trending_keywords(self, channel_name: str, field: str, count: int = 5) -> List[str]:
-        """채널명과 분야 기반 트렌드 키워드 생성"""
+    async def generate_trending_keywords(self, channel_name: str, field: str, count: int = 5) -> List[str]:
+        """채널명과 분야 기반 트렌드 키워드 생성 (llm_service - 프로바이더 라우터 경유)"""
         prompt = f"""'{channel_name}' 채널의 '{field}' 분야에서 현재 트렌드인 YouTube 검색 키워드 {count}개를 생성해줘.
 
 요구사항:
@@ -45,106 +41,29 @@ JSON 형식으로만 응답:
 {{"keywords": ["키워드1", "키워드2", ...]}}"""
 
         try:
-            resp = requests.post(LLM_URL, json={
-                'model': 'gpt-oss-120b-longctx',
-                'messages': [{'role': 'user', 'content': prompt}],
-                'max_tokens': 512,
-                'temperature': 0.7
-            }, timeout=60)
-
-            if resp.status_code == 200:
-                content = resp.json()['choices'][0]['message']['content']
-                if '```json' in content:
-                    content = content.split('```json')[1].split('```')[0]
-                elif '```' in content:
-                    content = content.split('```')[1].split('```')[0]
-                result = json.loads(content.strip())
-                return result.get('keywords', [field])
-            return [field]
+            content = await llm_service.generate(prompt, max_tokens=512, temperature=0.7)
+            return parse_llm_json(content).get('keywords', [field])
         except Exception as e:
             print(f"Keyword generation error: {e}")
             return [field]
 
-    def _parse_count(self, text: str) -> int:
-        if not text:
-            return 0
-        text = text.replace(',', '').replace(' ', '')
-        multipliers = {'만': 10000, '천': 1000, 'K': 1000, 'M': 1000000}
-        for suffix, mult in multipliers.items():
-            if suffix in text:
-                num = re.findall(r'[\d.]+', text)
-                if num:
-                    return int(float(num[0]) * mult)
-        nums = re.findall(r'\d+', text)
-        return int(nums[0]) if nums else 0
-
-    def _parse_days_ago(self, text: str) -> Optional[int]:
-        if not text:
-            return None
-        patterns = [
-            (r'(\d+)\s*분\s*전', lambda x: 0),
-            (r'(\d+)\s*시간\s*전', lambda x: 0),
-            (r'(\d+)\s*일\s*전', lambda x: int(x)),
-            (r'(\d+)\s*주\s*전', lambda x: int(x) * 7),
-            (r'(\d+)\s*개월\s*전', lambda x: int(x) * 30),
-            (r'(\d+)\s*년\s*전', lambda x: int(x) * 365),
-        ]
-        for pattern, converter in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return converter(match.group(1))
-        return None
-
-    def download_transcript(self, video_url: str) -> Optional[str]:
-        """yt-dlp로 자막 다운로드"""
+    async def download_transcript(self, video_url: str) -> Optional[str]:
+        """자막 텍스트 (transcript_store - 영상당 한 번만 yt-dlp 실행, 이벤트 루프 비차단)"""
         try:
-            video_id = None
-            if 'v=' in video_url:
-                video_id = video_url.split('v=')[1].split('&')[0]
-            elif 'youtu.be/' in video_url:
-                video_id = video_url.split('youtu.be/')[1].split('?')[0]
-
-            if not video_id:
-                return None
-
-            output_path = SCREENSHOT_DIR / f"transcript_{video_id}"
-
-            cmd = [
-                'yt-dlp',
-                '--skip-download',
-                '--write-auto-sub',
-                '--sub-lang', 'ko,en',
-                '--sub-format', 'vtt',
-                '-o', str(output_path),
-                f'https://www.youtube.com/watch?v={video_id}'
-            ]
-
-            subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-            for ext in ['.ko.vtt', '.en.vtt', '.vtt']:
-                vtt_path = Path(str(output_path) + ext)
-                if vtt_path.exists():
-                    content = vtt_path.read_text(encoding='utf-8')
-                    lines = []
-                    for line in content.split('\n'):
-                        if not re.match(r'^\d{2}:\d{2}', line) and not line.startswith('WEBVTT') and line.strip():
-                            lines.append(line.strip())
-                    return ' '.join(lines)[:5000]
-
-            return None
+            return await transcript_store.get_text(video_url, max_chars=5000)  # 최대 5000자
         except Exception as e:
             print(f"Transcript error: {e}")
             return None
 
     async def get_channel_with_videos(self, channel_url: str) -> Dict:
         """채널 정보 + 최근 영상 수집"""
-        browser = await self._ensure_browser()
-        page = await browser.new_page()
-
-        try:
+        async with browser_pool.page() as page:
             videos_url = channel_url.rstrip('/') + '/videos'
-            await page.goto(videos_url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(2)
+            await page.goto(videos_url, wait_until='domcontentloaded', timeout=PAGE_TIMEOUT_MS)
+            try:
+                await page.wait_for_selector(VIDEO_ITEM_SELECTOR, timeout=RESULTS_TIMEOUT_MS)
+            except Exception:
+                pass  # 영상이 없는 채널 - 채널명/구독자만 수집
 
             data = await page.evaluate('''
                 () => {
@@ -182,75 +101,24 @@ JSON 형식으로만 응답:
             ''')
 
             return {**data, 'url': channel_url}
-        finally:
-            await page.close()
 
     def calculate_score(self, channel: Dict) -> Dict:
-        """채널 스코어 계산"""
-        scores = {'subscriber': 0, 'activity': 0, 'engagement': 0, 'growth': 0, 'total': 0}
-
-        subs = self._parse_count(channel.get('subscribers', ''))
-
-        # 구독자 점수 (30점)
-        if subs >= 1000000: scores['subscriber'] = 30
-        elif subs >= 500000: scores['subscriber'] = 27
-        elif subs >= 100000: scores['subscriber'] = 24
-        elif subs >= 50000: scores['subscriber'] = 20
-        elif subs >= 10000: scores['subscriber'] = 15
-        else: scores['subscriber'] = 10
-
-        # 활동성 점수 (25점)
-        videos = channel.get('videos', [])
-        if videos:
-            days = [self._parse_days_ago(v.get('date', '')) for v in videos[:5]]
-            days = [d for d in days if d is not None]
-            if days:
-                avg = sum(days) / len(days)
-                if avg <= 7: scores['activity'] = 25
-                elif avg <= 14: scores['activity'] = 20
-                elif avg <= 30: scores['activity'] = 15
-                else: scores['activity'] = 10
-
-        # 참여도 점수 (25점)
-        if videos and subs > 0:
-            views = [self._parse_count(v.get('views', '')) for v in videos[:5]]
-            views = [v for v in views if v > 0]
-            if views:
-                ratio = (sum(views) / len(views)) / subs
-                if ratio >= 0.3: scores['engagement'] = 25
-                elif ratio >= 0.1: scores['engagement'] = 20
-                elif ratio >= 0.05: scores['engagement'] = 15
-                else: scores['engagement'] = 10
-
-        # 성장 점수 (20점)
-        if len(videos) >= 6:
-            recent = [self._parse_count(v.get('views', '')) for v in videos[:3]]
-            older = [self._parse_count(v.get('views', '')) for v in videos[3:6]]
-            r_avg = sum(recent) / len(recent) if recent else 0
-            o_avg = sum(older) / len(older) if older else 1
-            if o_avg > 0:
-                growth = (r_avg - o_avg) / o_avg
-                if growth >= 0.5: scores['growth'] = 20
-                elif growth >= 0.2: scores['growth'] = 15
-                elif growth >= 0: scores['growth'] = 10
-                else: scores['growth'] = 5
-
-        scores['total'] = scores['subscriber'] + scores['activity'] + scores['engagement'] + scores['growth']
-        return scores
-
-    async def search_channels(self, keyword: str, max_channels: int = 8) -> List[Dict]:
-        """키워드로 채널 검색 및 스코어링"""
-        browser = await self._ensure_browser()
-        page = await browser.new_page()
+        """채널 스코어 계산 (여러 채널은 score_channels로 한 번에 계산)"""
+        return score_channels([channel])[0]
 
-        try:
+    async def _search_channel_list(self, keyword: str, max_channels: int) -> List[Dict]:
+        """채널 검색 결과 목록만 수집 (상세 페이지 방문 없음)"""
+        async with browser_pool.page() as page:
             url = f'https://www.youtube.com/results?search_query={keyword}&sp=EgIQAg%253D%253D'
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(3)
+            await page.goto(url, wait_until='domcontentloaded', timeout=PAGE_TIMEOUT_MS)
+            try:
+                await page.wait_for_selector(SEARCH_RESULT_SELECTOR, timeout=RESULTS_TIMEOUT_MS)
+            except Exception:
+                return []  # 검색 결과 없음
 
             channels = await page.evaluate(f'''
                 () => {{
-                    const items = document.querySelectorAll('ytd-channel-renderer');
+                    const items = document.querySelectorAll('{SEARCH_RESULT_SELECTOR}');
                     return Array.from(items).slice(0, {max_channels}).map(item => {{
                         const nameEl = item.querySelector('#text-container yt-formatted-string');
                         const linkEl = item.querySelector('#main-link');
@@ -263,28 +131,47 @@ JSON 형식으로만 응답:
                     }}).filter(c => c.url);
                 }}
             ''')
-            await page.close()
-
-            results = []
-            for ch in channels:
-                try:
-                    details = await self.get_channel_with_videos(ch['url'])
-                    details['name'] = ch['name'] or details.get('name', '')
-                    details['subscribers'] = ch['subscribers'] or details.get('subscribers', '')
-                    details['scores'] = self.calculate_score(details)
-                    details['keyword'] = keyword
-                    results.append(details)
-                except Exception as e:
-                    ch['error'] = str(e)
-                    ch['scores'] = {'total': 0}
-                    ch['keyword'] = keyword
-                    results.append(ch)
-
-            return results
+
+        return [{**ch, 'keyword': keyword} for ch in channels]
+
+    async def _fetch_channel_details(self, ch: Dict) -> Dict:
+        """검색 결과 채널 하나의 상세 수집 (실패 시 검색 결과만 0점으로)"""
+        try:
+            details = await self.get_channel_with_videos(ch['url'])
+            details['name'] = ch['name'] or details.get('name', '')
+            details['subscribers'] = ch['subscribers'] or details.get('subscribers', '')
+            details['keyword'] = ch['keyword']
+            return details
+        except Exception as e:
+            return {**ch, 'error': str(e), 'scores': {'total': 0}}
+
+    async def _fetch_unique_channels(self, candidates: List[Dict]) -> List[Dict]:
+        """채널 키 기준으로 중복 제거 후 상세 수집 (채널 페이지는 한 번씩만 방문)
+
+        동시 방문 수는 공유 브라우저 풀의 페이지 수 제한을 따른다.
+        수집이 끝난 채널들은 한 번에 채점한다.
+        """
+        unique = {}
+        for ch in candidates:
+            unique.setdefault(normalize_channel_url(ch['url']), ch)
+        channels = list(await asyncio.gather(
+            *[self._fetch_channel_details(ch) for ch in unique.values()]
+        ))
+
+        collected = [ch for ch in channels if 'error' not in ch]
+        for ch, scores in zip(collected, score_channels(collected)):
+            ch['scores'] = scores
+        return channels
+
+    async def search_channels(self, keyword: str, max_channels: int = 8) -> List[Dict]:
+        """키워드로 채널 검색 및 스코어링"""
+        try:
+            channels = await self._search_channel_list(keyword, max_channels)
+            return await self._fetch_unique_channels(channels)
         except Exception as e:
             return [{'error': str(e), 'keyword': keyword}]
 
-    def analyze_with_llm(self, channels: List[Dict], channel_name: str, field: str) -> Dict:
+    async def analyze_with_llm(self, channels: List[Dict], channel_name: str, field: str) -> Dict:
         """LLM으로 분석 및 선정"""
         summaries = []
         for i, ch in enumerate(channels[:10], 1):
@@ -308,49 +195,59 @@ JSON 형식:
 {{"top5": [{{"rank": 1, "name": "채널명", "reason": "선정 이유", "content_style": "콘텐츠 스타일", "key_learning": "배울 점", "differentiation": "차별점"}}], "overall_insight": "전체 인사이트", "content_strategy": "추천 콘텐츠 전략"}}"""
 
         try:
-            resp = requests.post(LLM_URL, json={
-                'model': 'gpt-oss-120b-longctx',
-                'messages': [{'role': 'user', 'content': prompt}],
-                'max_tokens': 2048
-            }, timeout=120)
-
-            if resp.status_code == 200:
-                content = resp.json()['choices'][0]['message']['content']
-                if '```json' in content:
-                    content = content.split('```json')[1].split('```')[0]
-                elif '```' in content:
-                    content = content.split('```')[1].split('```')[0]
-                return json.loads(content.strip())
-            return {'error': f'LLM {resp.status_code}'}
+            content = await llm_service.generate(prompt, max_tokens=2048)
+            return parse_llm_json(content)
         except Exception as e:
             return {'error': str(e)}
 
-    async def deep_research(self, channel_name: str, field: str, max_keywords: int = 5) -> Dict:
-        """트렌드 기반 딥리서치 실행"""
+    async def _search_keywords(self, keywords: List[str]) -> List[Dict]:
+        """키워드 동시 검색 - 검색 결과 채널 목록을 키워드 순서대로 합침"""
+        listings = await asyncio.gather(
+            *[self._search_channel_list(kw, max_channels=5) for kw in keywords],
+            return_exceptions=True
+        )
+        candidates = []
+        for kw, listing in zip(keywords, listings):
+            if isinstance(listing, Exception):
+                print(f'   검색 실패: {kw} ({listing})')
+                continue
+            print(f'   검색: {kw} -> {len(listing)}개')
+            candidates.extend(listing)
+        return candidates
+
+    async def deep_research(
+        self,
+        channel_name: str,
+        field: str,
+        max_keywords: int = 5,
+        seed_keywords: Optional[List[str]] = None
+    ) -> Dict:
+        """트렌드 기반 딥리서치 실행
+
+        seed_keywords(이미 알고 있는 키워드)를 주면 트렌드 키워드 생성(LLM)과
+        해당 키워드의 채널 검색을 동시에 시작하고, 새로 생성된 키워드만 추가로 검색한다.
+        """
         print(f'=== 트렌드 기반 YouTube 딥리서치 ===')
         print(f'채널: {channel_name} | 분야: {field}\n')
 
-        # 1. 트렌드 키워드 생성
+        # 1. 트렌드 키워드 생성 (+ 알고 있는 키워드 검색 동시 진행)
         print('1. 트렌드 키워드 생성 중...')
-        keywords = self.generate_trending_keywords(channel_name, field, max_keywords)
-        print(f'   생성된 키워드: {keywords}\n')
+        seeds = list(dict.fromkeys(seed_keywords or []))
+        if seeds:
+            print(f'   기존 키워드 검색 동시 진행: {seeds}')
+        generated, seed_candidates = await asyncio.gather(
+            self.generate_trending_keywords(channel_name, field, max_keywords),
+            self._search_keywords(seeds)
+        )
+        new_keywords = [kw for kw in dict.fromkeys(generated) if kw not in seeds]
+        keywords = seeds + new_keywords
+        print(f'   생성된 키워드: {generated}\n')
 
-        # 2. 각 키워드로 채널 검색
+        # 2. 새 키워드 동시 검색 → 채널 중복 제거 → 채널별 상세 수집
         print('2. 채널 검색 및 스코어링...')
-        all_channels = []
-        for kw in keywords:
-            print(f'   검색: {kw}')
-            channels = await self.search_channels(kw, max_channels=5)
-            all_channels.extend(channels)
-
-        # 중복 제거 (URL 기준)
-        seen_urls = set()
-        unique_channels = []
-        for ch in all_channels:
-            url = ch.get('url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_channels.append(ch)
+        candidates = seed_candidates + await self._search_keywords(new_keywords)
+
+        unique_channels = await self._fetch_unique_channels(candidates)
 
         # 스코어 기준 정렬
         unique_channels.sort(key=lambda x: x.get('scores', {}).get('total', 0), reverse=True)
@@ -362,7 +259,7 @@ JSON 형식:
 
         # 3. LLM 분석
         print('\n3. LLM 분석 중...')
-        analysis = self.analyze_with_llm(unique_channels[:10], channel_name, field)
+        analysis = await self.analyze_with_llm(unique_channels[:10], channel_name, field)
 
         if 'top5' in analysis:
             print('\n=== 선정된 레퍼런스 채널 ===')
@@ -374,17 +271,14 @@ JSON 형식:
             print(f"\n인사이트: {analysis.get('overall_insight', '')}")
             print(f"전략: {analysis.get('content_strategy', '')}")
 
-        # 4. 상위 채널 자막 수집
+        # 4. 상위 채널 자막 수집 (동시 실행)
         print('\n4. 상위 채널 영상 자막 수집...')
-        for ch in unique_channels[:3]:
-            videos = ch.get('videos', [])[:2]
-            for v in videos:
-                if v.get('url'):
-                    print(f"   자막: {v.get('title', '')[:30]}...")
-                    transcript = self.download_transcript(v['url'])
-                    if transcript:
-                        v['transcript'] = transcript[:2000]
-                        print(f"      -> {len(transcript)} chars")
+        targets = [v for ch in unique_channels[:3] for v in ch.get('videos', [])[:2] if v.get('url')]
+        transcripts = await asyncio.gather(*[self.download_transcript(v['url']) for v in targets])
+        for v, transcript in zip(targets, transcripts):
+            if transcript:
+                v['transcript'] = transcript[:2000]
+                print(f"   자막: {v.get('title', '')[:30]}... -> {len(transcript)} chars")
 
         # 5. 결과 저장
         result = {
@@ -451,7 +345,7 @@ JSON 형식:
 
         return prompt
 
-    def generate_video_ideas_with_prompts(self, channel_name: str, field: str, reference_channels: List[Dict], count: int = 20) -> Dict:
+    async def generate_video_ideas_with_prompts(self, channel_name: str, field: str, reference_channels: List[Dict], count: int = 20) -> Dict:
         """레퍼런스 채널 기반 영상 아이디어 + 대본 프롬프트 생성"""
         # 레퍼런스 채널 영상 제목들 수집
         ref_titles = []
@@ -474,34 +368,20 @@ JSON 형식:
 {{"ideas": [{{"title": "제목", "hook": "후킹문장", "summary": "내용요약"}}]}}"""
 
         try:
-            resp = requests.post(LLM_URL, json={
-                'model': 'gpt-oss-120b-longctx',
-                'messages': [{'role': 'user', 'content': prompt}],
-                'max_tokens': 4096,
-                'temperature': 0.8
-            }, timeout=120)
-
-            if resp.status_code == 200:
-                content = resp.json()['choices'][0]['message']['content']
-                if '```json' in content:
-                    content = content.split('```json')[1].split('```')[0]
-                elif '```' in content:
-                    content = content.split('```')[1].split('```')[0]
-
-                ideas = json.loads(content.strip())
-
-                # 각 아이디어에 대본 프롬프트 추가
-                for idea in ideas.get('ideas', []):
-                    idea['script_prompt'] = self.generate_script_prompt(channel_name, idea)
-
-                return ideas
-            return {'error': f'LLM {resp.status_code}'}
+            content = await llm_service.generate(prompt, max_tokens=4096, temperature=0.8)
+            ideas = parse_llm_json(content)
+
+            # 각 아이디어에 대본 프롬프트 추가
+            for idea in ideas.get('ideas', []):
+                idea['script_prompt'] = self.generate_script_prompt(channel_name, idea)
+
+            return ideas
         except Exception as e:
             return {'error': str(e)}
 
     async def close(self):
-        if self.browser:
-            await self.browser.close()
+        # 공유 브라우저 풀 종료 (CLI 종료 시)
+        await browser_pool.close()
 
 
 async def main():
@@ -510,17 +390,19 @@ async def main():
     # 기본값 또는 인자로 받기
     channel_name = sys.argv[1] if len(sys.argv) > 1 else 'MoneyMindset'
     field = sys.argv[2] if len(sys.argv) > 2 else '재테크 투자'
+    # 이미 알고 있는 키워드 (쉼표 구분) - 키워드 생성과 동시에 검색
+    seed_keywords = [kw.strip() for kw in sys.argv[3].split(',') if kw.strip()] if len(sys.argv) > 3 else None
 
     researcher = TrendYouTubeResearcher()
 
     try:
         # 1. 딥리서치 실행
-        result = await researcher.deep_research(channel_name, field)
+        result = await researcher.deep_research(channel_name, field, seed_keywords=seed_keywords)
         print(f"\n완료! 총 {len(result.get('channels', []))}개 채널 분석")
 
         # 2. 영상 아이디어 + 대본 프롬프트 생성
         print('\n5. 영상 아이디어 + 대본 프롬프트 생성...')
-        ideas_result = researcher.generate_video_ideas_with_prompts(
+        ideas_result = await researcher.generate_video_ideas_with_prompts(
             channel_name, field, result.get('channels', []), count=20
         )
 